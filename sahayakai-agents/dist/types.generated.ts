@@ -314,9 +314,11 @@ export interface LessonPlanResponse {
   language?: string | null;
   sidecarVersion: string;
   latencyMs: number;
+  cacheHit?: boolean;
   modelUsed: string;
   cacheHitRatio?: number | null;
   revisionsRun: number;
+  modelCallsSaved?: number;
   rubric: EvaluatorVerdict;
 }
 
@@ -487,6 +489,7 @@ export interface QuizVariantsResponse {
   topic: string;
   sidecarVersion: string;
   latencyMs: number;
+  cacheHit?: boolean;
   modelUsed: string;
   variantsGenerated: number;
 }
@@ -933,5 +936,6 @@ export interface WorksheetResponse {
   answerKey: WorksheetAnswerKeyEntry[];
   sidecarVersion: string;
   latencyMs: number;
+  cacheHit?: boolean;
   modelUsed: string;
 }
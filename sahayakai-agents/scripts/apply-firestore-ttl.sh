@@ -5,6 +5,9 @@
 #
 #   agent_sessions/{callSid}                 .expireAt   (24h)
 #   agent_shadow_diffs/{date}/calls/{id}     .expireAt   (14d)
+#   agent_request_nonces/{nonce}             .expireAt   (6min, shared replay guard)
+#   agent_response_cache/{route}/cached_responses/{key}
+#                                            .expireAt   (24h default, shared response cache)
 #
 # Phase 2 will add a third for `agent_voice_sessions/{callSid}` (24h);
 # this script accepts a `--include-voice` flag to enable it once the
@@ -72,6 +75,8 @@ apply_ttl agent_sessions expireAt
 # `calls` collection in the project; `shadow_calls` is unique.
 apply_ttl shadow_calls expireAt
 apply_ttl agent_auto_abort_seen expireAt   # auto-abort incident-id dedupe sentinel (Wave 2 fix 2)
+apply_ttl agent_request_nonces expireAt    # shared HMAC replay guard (SAHAYAKAI_REPLAY_GUARD_BACKEND=firestore)
+apply_ttl cached_responses expireAt        # shared response cache (SAHAYAKAI_RESPONSE_CACHE_BACKEND=firestore)
 
 if [[ "$INCLUDE_VOICE" == "1" ]]; then
   apply_ttl agent_voice_sessions expireAt
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-request ADK object construction, before/after.
+
+Measures only the work a router does BEFORE the first model byte goes
+out — cloning the agent graph, pinning the key, building the Runner
+and opening a session — for the VIDYA supervisor and the quiz
+`ParallelAgent`. No network: `run_async` is never called. The pooled
+`genai.Client` registry is started for both sides so client
+construction is not part of either number.
+
+  before  The pre-`_adk_prepared` path, reproduced inline: a fresh
+          `Gemini` subclass + instance, `model_copy` of the template
+          (x3 variants + a new `ParallelAgent` for quiz), a new
+          `InMemoryRunner` and `create_session`, per attempt.
+  after   The router's `_prepared_runner(key)` lookup plus the
+          single-use session (`create_session` + `delete_session`).
+
+Usage:
+
+  uv run python scripts/bench_adk_prepared.py --iterations 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sahayakai_agents._adk_keyed_gemini import _resolve_model_name
+from sahayakai_agents.agents.quiz import router as quiz_router
+from sahayakai_agents.agents.quiz.agent import (
+    build_quiz_agent,
+    build_variant_wrapper,
+    render_generator_prompt,
+)
+from sahayakai_agents.agents.vidya import router as vidya_router
+from sahayakai_agents.agents.vidya.agent import build_vidya_agent
+from sahayakai_agents.config import get_settings
+from sahayakai_agents.genai_clients import (
+    close_genai_clients,
+    get_genai_client,
+    start_genai_clients,
+)
+
+_KEY = "bench-key"
+_QUIZ_CONTEXT: dict[str, Any] = {
+    "topic": "Photosynthesis",
+    "numQuestions": 5,
+    "questionTypes": ["multiple_choice", "short_answer"],
+    "gradeLevel": "Class 7",
+    "language": "English",
+    "bloomsTaxonomyLevels": ["Remember", "Understand"],
+    "hasImage": False,
+}
+
+
+def _legacy_keyed_gemini(model_name: str, api_key: str) -> Any:
+    """The old `build_keyed_gemini`: a new subclass per call."""
+    from google.adk.models.google_llm import Gemini  # noqa: PLC0415
+
+    class _KeyedGemini(Gemini):
+        pass
+
+    instance = _KeyedGemini(model=model_name)
+    client = get_genai_client(api_key, headers=instance._tracking_headers())
+    object.__setattr__(
+        instance, "__dict__", {**instance.__dict__, "api_client": client},
+    )
+    return instance
+
+
+async def _legacy_session(agent: Any, app_name: str) -> None:
+    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
+
+    runner = InMemoryRunner(agent=agent, app_name=app_name)
+    await runner.session_service.create_session(
+        app_name=app_name, user_id="bench", session_id="bench",
+    )
+
+
+async def vidya_before() -> None:
+    template = build_vidya_agent()
+    agent = template.model_copy(update={
+        "model": _legacy_keyed_gemini(
+            _resolve_model_name(template.model), _KEY,
+        ),
+    })
+    await _legacy_session(agent, "bench-vidya")
+
+
+async def vidya_after() -> None:
+    prepared = vidya_router._prepared_runner(_KEY)
+    async with prepared.session(user_id="bench", prefix="bench"):
+        pass
+
+
+async def quiz_before() -> None:
+    from google.adk.agents import ParallelAgent  # noqa: PLC0415
+
+    template = build_quiz_agent()
+    wrappers = []
+    for wrapper, difficulty in zip(
+        template.sub_agents, ("easy", "medium", "hard"), strict=True,
+    ):
+        inner = wrapper.sub_agents[0]
+        prompt = render_generator_prompt(
+            {**_QUIZ_CONTEXT, "targetDifficulty": difficulty},
+        )
+        cloned = inner.model_copy(update={
+            "instruction": lambda _ctx, p=prompt: p,
+            "model": _legacy_keyed_gemini(
+                _resolve_model_name(inner.model), _KEY,
+            ),
+        })
+        wrappers.append(build_variant_wrapper(difficulty, inner_override=cloned))
+    agent = ParallelAgent(name=template.name, sub_agents=wrappers)
+    await _legacy_session(agent, "bench-quiz")
+
+
+async def quiz_after() -> None:
+    prepared = quiz_router._prepared_runner(_KEY)
+    async with prepared.session(
+        user_id="bench",
+        prefix="bench",
+        state=quiz_router._render_variant_prompts(_QUIZ_CONTEXT),
+    ):
+        pass
+
+
+async def _measure(
+    fn: Callable[[], Awaitable[None]], iterations: int,
+) -> list[float]:
+    await fn()  # warm caches / imports outside the timed loop
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def _summary(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"p50={statistics.median(ordered):9.1f}us  p95={p95:9.1f}us"
+
+
+async def _main(iterations: int) -> None:
+    # Pooled clients on both sides, so the numbers isolate agent/runner
+    # construction from `genai.Client` construction.
+    start_genai_clients(get_settings())
+    cases = (
+        ("vidya", vidya_before, vidya_after),
+        ("quiz", quiz_before, quiz_after),
+    )
+    for name, before, after in cases:
+        slow = await _measure(before, iterations)
+        fast = await _measure(after, iterations)
+        speedup = statistics.median(slow) / statistics.median(fast)
+        print(f"{name:6s} before  {_summary(slow)}")
+        print(f"{name:6s} after   {_summary(fast)}  ({speedup:.1f}x)")
+    await close_genai_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(_main(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Benchmark: assessment-scanner Pass 1 under concurrent scans.
+
+Serves page images from a LOCAL threaded HTTP server (with a simulated
+Storage latency) and replaces the Gemini call with a stub that sleeps
+for a fixed model latency, so no Google endpoint is contacted. Each
+mode runs `--scans` concurrent scans of `--pages` pages and reports
+wall time, the peak number of simultaneous model calls, how many calls
+started above the simulated per-key rate limit (the ones that would
+have come back 429), and the TCP connections the image server saw.
+
+  legacy  The pre-pool path, reproduced inline: a new
+          `httpx.AsyncClient` per page and an unbounded
+          `asyncio.gather` over fetch + model call for every page.
+  pooled  The current `_run_pass1`: shared download pool, per-request
+          and process-wide Pass-1 caps, extraction overlapped with the
+          remaining downloads.
+
+Usage:
+
+  uv run python scripts/bench_assessment_pass1.py --scans 4 --pages 15 \\
+      --fetch-ms 80 --gemini-ms 400 --rate-limit 24
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import http.server
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+
+os.environ.setdefault("GOOGLE_GENAI_API_KEY", "bench-key")
+
+import httpx  # noqa: E402
+
+from sahayakai_agents.agents.assessment_scanner import router as sut  # noqa: E402
+from sahayakai_agents.agents.assessment_scanner.pass1_pool import (  # noqa: E402
+    close_page_client,
+    reset_pass1_pool,
+)
+from sahayakai_agents.agents.assessment_scanner.schemas import (  # noqa: E402
+    AssessmentScannerRequest,
+)
+from sahayakai_agents.config import get_settings  # noqa: E402
+
+_PAGE_BYTES = b"\xff\xd8\xff" + os.urandom(300_000)  # ~300KB "JPEG"
+
+
+class _ImageServer:
+    """Threaded local server; counts distinct client connections."""
+
+    def __init__(self, latency_s: float) -> None:
+        connections: set[tuple[str, int]] = set()
+        lock = threading.Lock()
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 — stdlib API
+                with lock:
+                    connections.add(self.client_address)
+                time.sleep(latency_s)
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(_PAGE_BYTES)))
+                self.end_headers()
+                self.wfile.write(_PAGE_BYTES)
+
+            def log_message(self, *_args: Any) -> None:
+                pass
+
+        self.connections = connections
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+
+
+class _StubGemini:
+    def __init__(self, latency_s: float, rate_limit: int) -> None:
+        self.latency_s = latency_s
+        self.rate_limit = rate_limit
+        self.in_flight = 0
+        self.peak = 0
+        self.over_limit = 0
+
+    async def __call__(self, *, contents: Any, **_kwargs: Any) -> Any:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        if self.in_flight > self.rate_limit:
+            self.over_limit += 1
+        try:
+            await asyncio.sleep(self.latency_s)
+        finally:
+            self.in_flight -= 1
+        page = sut._unreadable_page(0).model_copy(
+            update={"pageType": "answer_only", "handwritingConfidence": 0.9}
+        )
+        return SimpleNamespace(text=page.model_dump_json(), candidates=[])
+
+
+async def _legacy_pass1(payload: AssessmentScannerRequest, stub: _StubGemini) -> str:
+    async def one(url: str, i: int) -> Any:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            resp = await client.get(url)
+            resp.raise_for_status()
+        result = await stub(contents=None)
+        return sut.PageScan.model_validate_json(result.text).model_copy(
+            update={"pageIndex": i}
+        )
+
+    pages = await asyncio.gather(*(one(u, i) for i, u in enumerate(payload.pageUrls)))
+    return json.dumps([p.model_dump(mode="json") for p in pages], indent=2)
+
+
+async def _run(mode: str, args: argparse.Namespace) -> None:
+    server = _ImageServer(args.fetch_ms / 1000)
+    stub = _StubGemini(args.gemini_ms / 1000, args.rate_limit)
+    sut._call_gemini_structured = stub  # type: ignore[assignment]
+    reset_pass1_pool()
+    settings = get_settings()
+
+    def payload(scan: int) -> AssessmentScannerRequest:
+        return AssessmentScannerRequest.model_validate({
+            "userId": "bench",
+            "assessmentId": f"123e4567-e89b-12d3-a456-{scan:012d}",
+            "pageUrls": [f"{server.url}/scan{scan}/page{p}.jpg" for p in range(args.pages)],
+            "subject": "Science",
+            "gradeLevel": "Class 7",
+            "language": "en",
+        })
+
+    async def scan(i: int) -> float:
+        started = time.perf_counter()
+        if mode == "legacy":
+            await _legacy_pass1(payload(i), stub)
+        else:
+            await sut._run_pass1(payload(i), settings.genai_keys, settings)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    per_scan = await asyncio.gather(*(scan(i) for i in range(args.scans)))
+    wall = time.perf_counter() - started
+    await close_page_client()
+    server.close()
+    print(
+        f"  {mode:<7} wall={wall * 1000:7.0f}ms  "
+        f"scan p50={sorted(per_scan)[len(per_scan) // 2] * 1000:7.0f}ms  "
+        f"peak_calls={stub.peak:<3} over_limit={stub.over_limit:<3} "
+        f"connections={len(server.connections)}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scans", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=15)
+    parser.add_argument("--fetch-ms", type=float, default=80.0)
+    parser.add_argument("--gemini-ms", type=float, default=400.0)
+    parser.add_argument(
+        "--rate-limit", type=int, default=24,
+        help="Simultaneous model calls above which the stub counts a would-be 429",
+    )
+    args = parser.parse_args()
+
+    settings = get_settings()
+    print(
+        f"{args.scans} concurrent scans x {args.pages} pages "
+        f"(caps: {settings.assessment_pass1_per_request_concurrency}/request, "
+        f"{settings.assessment_pass1_concurrency}/process):"
+    )
+    for mode in ("legacy", "pooled"):
+        await _run(mode, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
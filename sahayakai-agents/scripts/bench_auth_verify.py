@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Latency benchmark: `authenticate_request` under concurrent load.
+
+Runs the ID-token gate end to end against a LOCAL stub certs server (a
+throwaway RSA key + self-signed cert, served with `Cache-Control:
+max-age`), so no Google endpoint is contacted. For each concurrency
+level it fires N requests at once with `asyncio.gather` and reports
+per-request latency percentiles plus wall time.
+
+  legacy  The pre-cache path, reproduced inline: synchronous
+          `verify_oauth2_token` on the event loop with a plain
+          `google.auth` transport (certs re-downloaded every call).
+  cached  The current `authenticate_request`: verified-token cache,
+          cert cache, and verification in a worker thread. Caches are
+          cleared before each level, so the first requests pay a cold
+          verification.
+
+Usage:
+
+  uv run python scripts/bench_auth_verify.py --levels 50 200 --cert-latency-ms 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import http.server
+import json
+import os
+import statistics
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+AUDIENCE = "https://sahayakai-agents-bench.run.app"
+INVOKER = "svc-next@sahayakai-b4248.iam.gserviceaccount.com"
+KEY_ID = "bench-kid"
+
+# Production-mode settings so the ID-token gate actually runs; the body
+# is empty (HMAC skipped) and App Check is off to isolate the ID token.
+os.environ.update({
+    "SAHAYAKAI_AGENTS_ENV": "production",
+    "SAHAYAKAI_AGENTS_AUDIENCE": AUDIENCE,
+    "SAHAYAKAI_AGENTS_ALLOWED_INVOKERS": INVOKER,
+    "SAHAYAKAI_REQUEST_SIGNING_KEY": "b" * 64,
+    "SAHAYAKAI_REQUIRE_APP_CHECK": "false",
+    "GOOGLE_GENAI_API_KEY": "bench-key",
+})
+
+from cryptography import x509  # noqa: E402
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from google.auth import crypt, jwt  # noqa: E402
+from google.auth.transport import requests as google_requests  # noqa: E402
+from google.oauth2 import id_token as google_id_token  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from sahayakai_agents import auth  # noqa: E402
+
+
+def _make_key_and_cert() -> tuple[bytes, bytes]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, "bench")])
+    now = dt.datetime.now(dt.UTC)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(days=1))
+        .not_valid_after(now + dt.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return private_pem, cert.public_bytes(serialization.Encoding.PEM)
+
+
+def _serve_certs(cert_pem: bytes, latency_s: float) -> tuple[str, Callable[[], int]]:
+    body = json.dumps({KEY_ID: cert_pem.decode("ascii")}).encode("utf-8")
+    hits = [0]
+
+    class _Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 — http.server API
+            hits[0] += 1
+            time.sleep(latency_s)  # stand-in for the Google round trip
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", "public, max-age=3600")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_: Any) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/certs", lambda: hits[0]
+
+
+def _sign_token(private_pem: bytes) -> str:
+    signer = crypt.RSASigner.from_string(private_pem, key_id=KEY_ID)
+    now = int(time.time())
+    token = jwt.encode(signer, {
+        "iss": "https://accounts.google.com",
+        "aud": AUDIENCE,
+        "email": INVOKER,
+        "email_verified": True,
+        "iat": now,
+        "exp": now + 3600,
+    })
+    return token.decode("ascii")
+
+
+def _request(token: str) -> Request:
+    async def _receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/v1/vidya/orchestrate",
+        "headers": [(b"authorization", f"Bearer {token}".encode("ascii"))],
+    }, _receive)
+
+
+async def _legacy_authenticate(request: Request) -> None:
+    token = auth._extract_bearer(request)
+    auth._verify_id_token(token, AUDIENCE)  # sync, on the loop
+
+
+async def _run_level(
+    fn: Callable[[Request], Awaitable[Any]], token: str, concurrency: int,
+) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    # Latency is measured from the moment the burst arrives, so time a
+    # request spends queued behind a blocked event loop counts.
+    started = time.perf_counter()
+
+    async def _one() -> None:
+        await fn(_request(token))
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(_one() for _ in range(concurrency)))
+    return latencies, (time.perf_counter() - started) * 1000
+
+
+def _summary(latencies: list[float], wall_ms: float) -> str:
+    ordered = sorted(latencies)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    return (
+        f"p50={statistics.median(ordered):8.1f}ms  p95={pct(0.95):8.1f}ms  "
+        f"p99={pct(0.99):8.1f}ms  wall={wall_ms:8.1f}ms"
+    )
+
+
+async def _main(levels: list[int], cert_latency_ms: float) -> None:
+    private_pem, cert_pem = _make_key_and_cert()
+    certs_url, cert_hits = _serve_certs(cert_pem, cert_latency_ms / 1000)
+    # `verify_oauth2_token` reads this module global on every call.
+    google_id_token._GOOGLE_OAUTH2_CERTS_URL = certs_url
+    token = _sign_token(private_pem)
+
+    cached_transport = auth._google_request
+    for concurrency in levels:
+        auth._google_request = google_requests.Request()
+        before = cert_hits()
+        latencies, wall = await _run_level(_legacy_authenticate, token, concurrency)
+        print(f"legacy  n={concurrency:<4d} {_summary(latencies, wall)}  "
+              f"cert_fetches={cert_hits() - before}")
+
+        auth._google_request = cached_transport
+        cached_transport.clear()
+        auth._ID_TOKEN_CACHE.clear()
+        before = cert_hits()
+        latencies, wall = await _run_level(auth.authenticate_request, token, concurrency)
+        print(f"cached  n={concurrency:<4d} {_summary(latencies, wall)}  "
+              f"cert_fetches={cert_hits() - before}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--cert-latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(_main(args.levels, args.cert_latency_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark: query-embedding cache and micro-batching vs one call per query.
+
+Replays `--queries` lesson-plan style retrieval queries drawn from
+`--distinct` topics with a Zipf(`--zipf`) popularity skew (a few
+chapters are asked for far more than the rest), `--concurrency` at a
+time. The embedding backend is a stub that blocks for
+`--call-ms` + `--per-text-ms` x batch size, like a Vertex round trip.
+No Google endpoint is contacted.
+
+  direct   one backend call per query in `asyncio.to_thread` (what a
+           plain `embed_query` costs).
+  service  `EmbeddingService`: LRU cache, single-flight and
+           micro-batching with `--window-ms` / `--batch-max`.
+
+Reports backend calls, p50 / p99 query latency, throughput, and for
+the service its hit ratio and batch-size histogram.
+
+Usage:
+
+  uv run python scripts/bench_embedding_service.py --queries 5000 \\
+      --distinct 800 --concurrency 64 --call-ms 60
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
+
+import numpy as np
+
+from sahayakai_agents.rag.embedding_service import EmbeddingService
+from sahayakai_agents.rag.embeddings import HashEmbedder
+
+
+class _SlowBackend(HashEmbedder):
+    def __init__(self, call_s: float, per_text_s: float) -> None:
+        super().__init__()
+        self.call_s = call_s
+        self.per_text_s = per_text_s
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        time.sleep(self.call_s + self.per_text_s * len(texts))
+        return super().embed(texts)
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def _replay(
+    embed: Callable[[str], Awaitable[object]], queries: list[str], concurrency: int
+) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    todo = iter(queries)
+
+    async def worker() -> None:
+        for text in todo:
+            started = time.perf_counter()
+            await embed(text)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+def _report(label: str, calls: int, latencies: list[float], wall_s: float) -> None:
+    print(
+        f"  {label:<8} backend calls={calls:5d}  p50={_pct(latencies, 0.5):7.1f}ms "
+        f"p99={_pct(latencies, 0.99):7.1f}ms  {len(latencies) / wall_s:7.0f} q/s"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    picks = (rng.zipf(args.zipf, size=args.queries) - 1) % args.distinct
+    queries = [
+        f"Topic {p}: NCERT Class {p % 12 + 1} chapter {p % 17} learning outcomes"
+        for p in picks.tolist()
+    ]
+    print(f"{args.queries} queries, {len(set(queries))} distinct, "
+          f"concurrency {args.concurrency}")
+    call_s, per_text_s = args.call_ms / 1000, args.per_text_ms / 1000
+
+    direct = _SlowBackend(call_s, per_text_s)
+
+    async def embed_direct(text: str) -> object:
+        return await asyncio.to_thread(direct.embed, [text])
+
+    latencies, wall_s = await _replay(embed_direct, queries, args.concurrency)
+    _report("direct", direct.calls, latencies, wall_s)
+
+    backend = _SlowBackend(call_s, per_text_s)
+    service = EmbeddingService(
+        backend, batch_window_ms=args.window_ms, batch_max=args.batch_max
+    )
+
+    async def embed_service(text: str) -> object:
+        return await service.embed(text, "en")
+
+    latencies, wall_s = await _replay(embed_service, queries, args.concurrency)
+    _report("service", backend.calls, latencies, wall_s)
+    snap = service.snapshot()
+    histogram = {k: v for k, v in snap["batchSizeHistogram"].items() if v}
+    print(
+        f"           hitRatio={snap['hitRatio']:.3f} coalesced={snap['coalesced']} "
+        f"meanBatchSize={snap['meanBatchSize']} batchSizes(<=)={histogram}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--distinct", type=int, default=800)
+    parser.add_argument("--zipf", type=float, default=1.3)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--call-ms", type=float, default=60.0)
+    parser.add_argument("--per-text-ms", type=float, default=1.0)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--batch-max", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
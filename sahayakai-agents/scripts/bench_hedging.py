@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark: tail latency of `run_resiliently` with and without hedging.
+
+Replaces the Gemini call with a stub whose latency is log-normal around
+`--median-ms`, except that a `--slow-pct` share of calls land on a
+"slow replica" and take `--slow-ms`. No Google endpoint is contacted.
+Each mode runs `--calls` calls (`--concurrency` at a time) through
+`run_resiliently` with the parent-call per-attempt timeout and reports
+p50 / p90 / p99 latency of the calls that succeeded, how many failed
+(ran out of the 7s total budget), and the share of extra model calls
+that hedging cost.
+
+  off  Sequential failover only: a slow replica costs the full
+       per-attempt timeout, or its own latency if that is shorter.
+  on   `hedge=True` with `SAHAYAKAI_HEDGE_ENABLED`: the delay starts at
+       `SAHAYAKAI_HEDGE_DELAY_MS`, then tracks the span's p95.
+
+Usage:
+
+  uv run python scripts/bench_hedging.py --calls 2000 --slow-pct 3 \\
+      --median-ms 900 --slow-ms 6000 --timeout-s 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import time
+
+os.environ.setdefault("GOOGLE_GENAI_API_KEY", "k1,k2,k3")
+
+from sahayakai_agents.config import get_settings  # noqa: E402
+from sahayakai_agents.hedging import get_hedger, reset_hedger  # noqa: E402
+from sahayakai_agents.resilience import run_resiliently  # noqa: E402
+
+
+class _StubModel:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.calls = 0
+
+    async def __call__(self, _key: str) -> str:
+        self.calls += 1
+        if random.random() * 100 < self.args.slow_pct:
+            latency = self.args.slow_ms / 1000
+        else:
+            latency = self.args.median_ms / 1000 * math.exp(random.gauss(0, 0.25))
+        await asyncio.sleep(latency)
+        return "ok"
+
+
+async def _run(mode: str, args: argparse.Namespace) -> None:
+    os.environ["SAHAYAKAI_HEDGE_ENABLED"] = "true" if mode == "on" else "false"
+    get_settings.cache_clear()
+    reset_hedger()
+    random.seed(args.seed)
+    model = _StubModel(args)
+    keys = get_settings().genai_keys
+    gate = asyncio.Semaphore(args.concurrency)
+    samples: list[float] = []
+    failed = 0
+
+    async def one() -> None:
+        nonlocal failed
+        async with gate:
+            started = time.perf_counter()
+            try:
+                await run_resiliently(
+                    model, keys, span_name="bench.hedge",
+                    max_total_backoff_seconds=7.0,
+                    per_call_timeout_seconds=args.timeout_s, hedge=True,
+                )
+            except TimeoutError:
+                failed += 1
+                return
+            samples.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(args.calls)))
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    stats = get_hedger().snapshot()["spans"].get("bench.hedge", {})
+    extra = (model.calls - args.calls) / args.calls
+    print(
+        f"  hedge {mode:<3} p50={pct(0.50):6.0f}ms  p90={pct(0.90):6.0f}ms  "
+        f"p99={pct(0.99):6.0f}ms  failed={failed:<3} extra_calls={extra:5.1%}  "
+        f"fired={stats.get('hedgesFired', 0):<4} won={stats.get('hedgesWon', 0):<4} "
+        f"delay={stats.get('delayMs', 0)}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--median-ms", type=float, default=900.0)
+    parser.add_argument("--slow-pct", type=float, default=3.0)
+    parser.add_argument("--slow-ms", type=float, default=6000.0)
+    parser.add_argument("--timeout-s", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(
+        f"{args.calls} calls, median {args.median_ms:.0f}ms, "
+        f"{args.slow_pct:g}% on a {args.slow_ms:.0f}ms replica, "
+        f"{args.timeout_s:g}s per-attempt timeout:"
+    )
+    for mode in ("off", "on"):
+        await _run(mode, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Benchmark: `MmapVectorRetriever` open time, query latency and recall.
+
+Builds a synthetic index of `--rows` random 768-dim chunks spread
+evenly over `--partitions` (class, subject, language) partitions and
+writes it with `write_mmap_index` (int8 and float16, BM25 included).
+Chunk text is `--words` Zipf-distributed Devanagari pseudo-words. For
+each dtype it reports:
+
+  open    `MmapVectorRetriever(...)` wall time (what container start
+          pays), cold in a fresh retriever.
+  query   p50 / p99 of `search()` over one partition, `--queries` times
+          (a cold pass, then the same queries warm),
+          with the query embedding supplied (no Vertex call) and query
+          text that matches no chunk, so the order is pure cosine.
+  recall  recall@10 of that order against exact float32 cosine on the
+          source vectors.
+  rerank  p50 / p99 of the BM25 rerank (the retriever is opened with
+          `rerank=True`) of the 20 cosine candidates for a 4-word
+          query drawn from the partition's text.
+  bm25    p50 / p99 of BM25-only `search(query, None)` (the
+          embedding-unavailable fallback) for the same queries.
+  scan    one query against a single partition holding every row (the
+          worst case for the blocked matmul).
+
+No Google endpoint is contacted. The source matrix and the indexes are
+written under `--workdir` (about 5 GB at 1M rows).
+
+Usage:
+
+  uv run python scripts/bench_mmap_retriever.py --rows 1000000 \\
+      --partitions 1188 --workdir /tmp/mmap-bench
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+
+from sahayakai_agents.rag.corpus_ingest import Chunk
+from sahayakai_agents.rag.embeddings import EMBEDDING_DIM
+from sahayakai_agents.rag.mmap_retriever import (
+    MmapVectorRetriever,
+    Quantization,
+    write_mmap_index,
+)
+from sahayakai_agents.rag.schemas import RetrievalQuery
+
+_SUBJECTS = ("science", "mathematics", "english", "hindi", "social_science",
+             "history", "geography", "civics", "environmental_studies")
+_LANGUAGES = ("en", "hi", "bn", "te", "mr", "ta", "gu", "kn", "pa", "ml", "or")
+
+
+def _keys(partitions: int) -> list[tuple[int, str, str]]:
+    every = itertools.product(range(1, 13), _SUBJECTS, _LANGUAGES)
+    return list(itertools.islice(every, partitions))
+
+
+def _vocabulary(size: int) -> list[str]:
+    consonants = [chr(c) for c in range(0x0915, 0x0939)]
+    signs = ["", *(chr(c) for c in range(0x093E, 0x094D))]
+    syllables = [c + s for c in consonants for s in signs]
+    return [a + b for a, b in itertools.product(syllables, repeat=2)][:size]
+
+
+def _texts(rows: int, words: int, seed: int) -> list[str]:
+    vocabulary = _vocabulary(20_000)
+    picks = np.random.default_rng(seed).zipf(1.2, size=(rows, words)) % len(vocabulary)
+    return [
+        f"c{i} " + " ".join(vocabulary[w] for w in row)
+        for i, row in enumerate(picks.tolist())
+    ]
+
+
+def _chunks(rows: int, keys: list[tuple[int, str, str]], texts: list[str]) -> list[Chunk]:
+    per = -(-rows // len(keys))
+    return [
+        Chunk(
+            text=texts[i],
+            subject=keys[i // per][1],
+            class_number=keys[i // per][0],
+            chapter_number=1,
+            chapter_title="Synthetic",
+            language=keys[i // per][2],
+            source_url="https://ncert.nic.in/",
+            page_start=1,
+            page_end=1,
+            edition="bench",
+            sha256="0" * 64,
+        )
+        for i in range(rows)
+    ]
+
+
+def _source(path: Path, rows: int, seed: int) -> np.ndarray:
+    source = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.float16, shape=(rows, EMBEDDING_DIM)
+    )
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, 65_536):
+        stop = min(rows, start + 65_536)
+        source[start:stop] = rng.standard_normal((stop - start, EMBEDDING_DIM))
+    source.flush()
+    return np.load(path, mmap_mode="r")
+
+
+def _query(key: tuple[int, str, str], top_k: int, text: str = "bench") -> RetrievalQuery:
+    return RetrievalQuery(
+        query_text=text, language=key[2], class_number=key[0],
+        subject=key[1], chapter_number=None, top_k=top_k,
+    )
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def _bench_dtype(
+    dtype: Quantization,
+    directory: Path,
+    *,
+    chunks: list[Chunk],
+    texts: list[str],
+    source: np.ndarray,
+    probes: list[tuple[tuple[int, str, str], int, int]],
+    vectors: np.ndarray,
+) -> None:
+    """Build, open and query one dtype; `probes` are (key, start, stop)."""
+    shutil.rmtree(directory, ignore_errors=True)
+    started = time.perf_counter()
+    write_mmap_index(directory, chunks, source, dtype=dtype)
+    built_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    retriever = MmapVectorRetriever(directory, rerank=True)
+    open_ms = (time.perf_counter() - started) * 1000
+
+    print(f"  {dtype:<7} build={built_s:5.1f}s  open={open_ms:5.1f}ms")
+    # First pass faults the touched pages in; the second is steady state.
+    for label in ("cold", "warm"):
+        latencies: list[float] = []
+        reranks: list[float] = []
+        lexical: list[float] = []
+        hits = 0
+        for (key, first, stop), vector in zip(probes, vectors, strict=True):
+            started = time.perf_counter()
+            found = retriever.search(_query(key, 10), vector).chunks
+            latencies.append((time.perf_counter() - started) * 1000)
+            # Exact float32 cosine over the same partition's source rows.
+            exact = np.asarray(source[first:stop], dtype=np.float32)
+            exact /= np.linalg.norm(exact, axis=1, keepdims=True)
+            truth = {f"c{first + int(i)}" for i in np.argsort(-(exact @ vector))[:10]}
+            hits += len(truth & {c.chunk_text.split(" ", 1)[0] for c in found})
+
+            words = texts[first + (first * 7919) % (stop - first)].split()[1:5]
+            query = _query(key, 10, " ".join(words))
+            reranks.append(retriever.search(query, vector).rerank_ms)
+            started = time.perf_counter()
+            retriever.search(query, None)
+            lexical.append((time.perf_counter() - started) * 1000)
+        print(
+            f"    {label}  query p50={_pct(latencies, 0.5):5.2f}ms "
+            f"p99={_pct(latencies, 0.99):6.2f}ms  "
+            f"rerank p50={_pct(reranks, 0.5):4.2f}ms p99={_pct(reranks, 0.99):5.2f}ms  "
+            f"bm25-only p50={_pct(lexical, 0.5):4.2f}ms p99={_pct(lexical, 0.99):5.2f}ms  "
+            f"recall@10={hits / (10 * len(probes)):.3f}"
+        )
+    retriever.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--partitions", type=int, default=1188)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--words", type=int, default=64)
+    parser.add_argument("--workdir", type=Path, default=Path("/tmp/mmap-bench"))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    keys = _keys(args.partitions)
+    started = time.perf_counter()
+    texts = _texts(args.rows, args.words, args.seed)
+    chunks = _chunks(args.rows, keys, texts)
+    source = _source(args.workdir / "source.npy", args.rows, args.seed)
+    print(
+        f"{args.rows} rows over {len(keys)} partitions "
+        f"(generated in {time.perf_counter() - started:.1f}s)"
+    )
+    rng = np.random.default_rng(args.seed + 1)
+    probes = [int(i) for i in rng.integers(len(keys), size=args.queries)]
+    per = -(-args.rows // len(keys))
+    vectors = rng.standard_normal((args.queries, EMBEDDING_DIM)).astype(np.float32)
+
+    dtypes: tuple[Quantization, ...] = ("int8", "float16")
+    for dtype in dtypes:
+        _bench_dtype(
+            dtype, args.workdir / dtype, chunks=chunks, texts=texts, source=source,
+            probes=[(keys[p], p * per, min(args.rows, (p + 1) * per)) for p in probes],
+            vectors=vectors,
+        )
+
+    # Worst case: every row in one partition.
+    directory = args.workdir / "scan"
+    shutil.rmtree(directory, ignore_errors=True)
+    write_mmap_index(directory, _chunks(args.rows, keys[:1], texts), source)
+    retriever = MmapVectorRetriever(directory)
+    retriever.search(_query(keys[0], 10), vectors[0])  # fault pages in
+    started = time.perf_counter()
+    retriever.search(_query(keys[0], 10), vectors[1])
+    print(f"  scan    int8 full {args.rows}-row partition: "
+          f"{(time.perf_counter() - started) * 1000:.0f}ms")
+    retriever.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Latency benchmark: Firestore time per parent-call turn, by store mode.
+
+Runs against the Firestore EMULATOR (set `FIRESTORE_EMULATOR_HOST`, e.g.
+`gcloud emulators firestore start --host-port=localhost:8085`). Each
+mode plays `--calls` concurrent calls of `--turns` turns and times the
+session-store work of every turn, i.e. what `parent_call_reply` spends
+on Firestore around the model call:
+
+  thread  The pre-cache path: `SessionStore` (sync client via
+          `asyncio.to_thread`) doing a full `load_transcript`, then one
+          transactional `append_turn` for the parent and one for the
+          agent.
+  async   `CachedSessionStore`: meta-doc validated transcript cache and
+          one `append_turn_pair` transaction on the async client.
+
+Usage:
+
+  FIRESTORE_EMULATOR_HOST=localhost:8085 \\
+    uv run python scripts/bench_session_store.py --calls 20 --turns 6
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "sahayakai-bench")
+
+from sahayakai_agents.session_store import (  # noqa: E402
+    CachedSessionStore,
+    SessionStore,
+    TurnRecord,
+)
+
+
+def _turn(call_sid: str, n: int, role: str) -> TurnRecord:
+    return TurnRecord(
+        call_sid=call_sid,
+        turn_number=n,
+        role=role,
+        text="नमस्ते जी, मैं स्कूल से बोल रही हूँ" if role == "agent" else "जी बोलिए",
+        created_at=datetime.now(UTC),
+    )
+
+
+async def _thread_turn(store: SessionStore, call_sid: str, n: int) -> None:
+    await store.load_transcript(call_sid)
+    await store.append_turn(_turn(call_sid, n, "parent"))
+    await store.append_turn(_turn(call_sid, n, "agent"))
+
+
+async def _async_turn(store: CachedSessionStore, call_sid: str, n: int) -> None:
+    await store.load_transcript(call_sid)
+    await store.append_turn_pair(_turn(call_sid, n, "parent"), _turn(call_sid, n, "agent"))
+
+
+async def _run(mode: str, calls: int, turns: int) -> list[float]:
+    store: SessionStore = SessionStore() if mode == "thread" else CachedSessionStore()
+    play = _thread_turn if mode == "thread" else _async_turn
+    samples: list[float] = []
+
+    async def one_call() -> None:
+        call_sid = f"CA-bench-{mode}-{uuid.uuid4().hex[:12]}"
+        for n in range(1, turns + 1):
+            started = time.perf_counter()
+            await play(store, call_sid, n)  # type: ignore[arg-type]
+            samples.append((time.perf_counter() - started) * 1000)
+        await store.clear_for_test(call_sid)
+
+    await asyncio.gather(*(one_call() for _ in range(calls)))
+    return samples
+
+
+def _report(mode: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    print(
+        f"  {mode:<7} turns={len(samples):<5} p50={pct(0.50):7.2f}ms  "
+        f"p95={pct(0.95):7.2f}ms  mean={statistics.fmean(samples):7.2f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=6)
+    args = parser.parse_args()
+
+    if not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        sys.exit("FIRESTORE_EMULATOR_HOST is not set — start the emulator first.")
+
+    print(f"{args.calls} concurrent calls x {args.turns} turns, Firestore time per turn:")
+    results = {}
+    for mode in ("thread", "async"):
+        results[mode] = await _run(mode, args.calls, args.turns)
+        _report(mode, results[mode])
+    ratio = statistics.median(results["async"]) / statistics.median(results["thread"])
+    print(f"\n  async vs thread (p50): {ratio:.0%} of the Firestore time")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
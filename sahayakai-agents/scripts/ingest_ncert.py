@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Ingest NCERT chapter PDFs into the chunk store and build the index.
+
+Reads the manifest (`{"pdfs": [{file, subject, class_number, ...}]}`),
+skips PDFs whose SHA-256 the store already has, extracts and chunks
+the rest in `--workers` processes, embeds in batches of up to 250 and
+appends each batch to the columnar store under `--store`. Re-running
+after a crash resumes at the first batch that was not stored. With
+`--index-dir` it then writes the `MmapVectorRetriever` index from
+every completed PDF.
+
+Per-stage throughput is printed at the end:
+
+  hash     MB/s of PDF bytes hashed for the skip check.
+  extract  pages/s and chunks/s per worker (pdfplumber + chunking).
+  embed    pages/s and chunks/s of embedding calls.
+  store    pages/s and chunks/s of segment writes.
+  wall     end to end.
+
+`--embedder hash` swaps Vertex for deterministic fake vectors, for dry
+runs that exercise everything but the embedding endpoint. Needs the
+`ingest` extra (pdfplumber; google-cloud-aiplatform for Vertex).
+
+Usage:
+
+  uv run --extra ingest python scripts/ingest_ncert.py \\
+      --pdf-dir data/ncert_pdfs --manifest data/ncert_manifest.json \\
+      --store data/ncert_store --index-dir data/ncert_index --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+
+from sahayakai_agents.rag.chunk_store import ChunkStore
+from sahayakai_agents.rag.corpus_ingest import ingest_corpus, load_manifest
+from sahayakai_agents.rag.embeddings import Embedder, HashEmbedder, VertexEmbedder
+from sahayakai_agents.rag.mmap_retriever import write_mmap_index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdf-dir", type=Path, required=True)
+    parser.add_argument("--manifest", type=Path, default=Path("data/ncert_manifest.json"))
+    parser.add_argument("--store", type=Path, required=True)
+    parser.add_argument("--index-dir", type=Path)
+    parser.add_argument("--index-dtype", choices=("int8", "float16"), default="int8")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--embedder", choices=("vertex", "hash"), default="vertex")
+    args = parser.parse_args()
+
+    embedder: Embedder = VertexEmbedder() if args.embedder == "vertex" else HashEmbedder()
+    store = ChunkStore(args.store)
+    stats = ingest_corpus(
+        load_manifest(args.manifest), args.pdf_dir, store, embedder, workers=args.workers
+    )
+    print(
+        f"{stats.pdfs} PDFs ingested, {stats.skipped} already stored, "
+        f"{stats.failed} failed; {stats.pages} pages ({stats.ocr_pages} need OCR), "
+        f"{stats.chunks} chunks, {stats.batches} batches "
+        f"({stats.batches_resumed} resumed)"
+    )
+    for stage, rates in stats.throughput().items():
+        detail = "  ".join(f"{k}={v:,.1f}" for k, v in rates.items() if k != "seconds")
+        print(f"  {stage:<8} {rates['seconds']:8.2f}s  {detail}")
+
+    if args.index_dir:
+        chunks, vectors = store.read()
+        write_mmap_index(args.index_dir, chunks, vectors, dtype=args.index_dtype)
+        print(f"index: {len(chunks)} chunks -> {args.index_dir}")
+
+
+if __name__ == "__main__":
+    main()
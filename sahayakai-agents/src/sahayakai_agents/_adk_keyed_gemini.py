@@ -6,20 +6,25 @@ access and caches it on the instance forever. That breaks the sidecar's
 key-pool failover (concurrent requests would race on the env var, and
 the cached client would never rotate).
 
-Workaround: subclass `Gemini`, pre-populate the `api_client`
-cached_property with a `genai.Client(api_key=...)` instance built from
-an explicit key. ADK then uses our pre-populated client for every call
-instead of constructing one from env.
+Workaround: subclass `Gemini` and override `api_client` so it returns
+a `genai.Client(api_key=...)` for an explicit key. ADK then uses our
+client for every call instead of constructing one from env.
 
 Lifted out of `agents/vidya/router.py` (Phase L.1) so L.3 lesson-plan
 LoopAgent + L.4 quiz/visual-aid + L.5 voice-to-text can share the same
 helper instead of each duplicating the subclass.
 
+The client comes from the process-wide registry in `genai_clients.py`,
+so every keyed wrapper for the same key shares one long-lived client +
+pooled transport instead of handshaking per call. The wrappers
+themselves are cached per `(model, key)` as well.
+
 Local imports keep tests that don't exercise ADK fast — the heavy
 `google.genai` machinery only loads on the hot path.
 """
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Callable
 
 
@@ -64,9 +69,50 @@ def build_keyed_gemini_from_template(
     return build_keyed_gemini(model_name=model_name, api_key=api_key)
 
 
+@lru_cache(maxsize=1)
+def _keyed_gemini_class() -> type:
+    """The one `Gemini` subclass every keyed wrapper is an instance of.
+
+    Defined once (lazily, so ADK only loads on the hot path) instead of
+    once per call — a fresh class object per attempt defeated Pydantic's
+    per-class schema caching and made every construction pay for a
+    full model rebuild.
+
+    `api_client` is a plain property rather than ADK's cached_property:
+    it resolves through the pooled registry on every access, so a
+    cached wrapper never holds on to a client whose transport was closed
+    by a lifespan shutdown. ADK's own docstring recommends `@property`
+    for exactly this kind of override.
+    """
+    from google.adk.models.google_llm import Gemini  # noqa: PLC0415
+    from pydantic import PrivateAttr  # noqa: PLC0415
+
+    from .genai_clients import get_genai_client  # noqa: PLC0415
+
+    class _KeyedGemini(Gemini):
+        """Gemini wrapper pinned to an explicit api_key."""
+
+        _pinned_api_key: str = PrivateAttr(default="")
+
+        @property
+        def api_client(self) -> Any:
+            return get_genai_client(
+                self._pinned_api_key, headers=self._tracking_headers()
+            )
+
+    return _KeyedGemini
+
+
+@lru_cache(maxsize=256)
 def build_keyed_gemini(*, model_name: str, api_key: str) -> Any:
     """Build a `Gemini` model wrapper pinned to a specific api_key.
 
+    Cached per `(model_name, api_key)`: the wrapper carries no
+    per-request state (ADK threads that through the invocation
+    context), so one instance per pair is safe to share across
+    concurrent requests. 256 entries comfortably covers every model id
+    times every key in the live + shadow pools.
+
     Args:
         model_name: The Gemini model identifier (e.g. ``"gemini-2.5-flash"``).
         api_key: The Gemini API key for this single call. Different keys
@@ -74,32 +120,12 @@ def build_keyed_gemini(*, model_name: str, api_key: str) -> Any:
             sidecar's key-pool failover rotates between attempts.
 
     Returns:
-        A ``Gemini`` instance whose ``api_client`` property is already
-        populated with a ``genai.Client(api_key=...)`` so ADK never
-        falls back to env-based client construction.
+        A ``Gemini`` instance whose ``api_client`` resolves to the pooled
+        ``genai.Client`` for ``api_key`` so ADK never falls back to
+        env-based client construction.
     """
-    from google.adk.models.google_llm import Gemini  # noqa: PLC0415
-    from google.genai import Client  # noqa: PLC0415
-    from google.genai import types as genai_types  # noqa: PLC0415
-
-    class _KeyedGemini(Gemini):
-        """Per-call Gemini wrapper with explicit api_key."""
-
-    instance = _KeyedGemini(model=model_name)
-    # Pre-populate the api_client cached_property. cached_property
-    # writes to instance.__dict__ on first access; we just write
-    # directly so the lazy construction never fires.
-    pinned_client = Client(
-        api_key=api_key,
-        http_options=genai_types.HttpOptions(
-            headers=instance._tracking_headers(),
-        ),
-    )
-    object.__setattr__(
-        instance,
-        "__dict__",
-        {**instance.__dict__, "api_client": pinned_client},
-    )
+    instance = _keyed_gemini_class()(model=model_name)
+    instance._pinned_api_key = api_key
     return instance
 
 
@@ -0,0 +1,166 @@
+"""Prepared ADK runners, cached per `(agent template, api_key)`.
+
+Before this module every ADK-backed router did, on EVERY
+`run_resiliently` attempt:
+
+  1. `template.model_copy(...)` / `.clone(...)` of the cached agent,
+  2. a keyed `Gemini` wrapper (plus, until recently, a brand-new
+     subclass object),
+  3. a fresh `ParallelAgent` / `SequentialAgent` composite,
+  4. a fresh `InMemoryRunner` with its own `InMemorySessionService`,
+     artifact service, memory service and plugin manager.
+
+None of that depends on the request. The only per-request inputs are
+the rendered prompt(s) and the user `new_message`, and ADK already
+has a request-scoped channel for both: session state (read by
+`InstructionProvider` callables, see `visual_aid/agent.py`) and the
+`new_message` Content. So the pinned agent graph + runner are built
+once per `(template, key)` and reused; each request gets its own
+session, which is deleted as soon as the run finishes so the shared
+`InMemorySessionService` never accumulates history.
+
+Concurrency: building happens synchronously (no `await`), so two
+coroutines on the event loop cannot race inside `prepare_runner`.
+ADK agents and runners hold no per-invocation state — everything
+request-scoped lives in the `InvocationContext` + session — which is
+what makes sharing one runner across concurrent requests safe.
+"""
+from __future__ import annotations
+
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+# Enough for every ADK agent x every key in the live + shadow pools
+# with headroom. Eviction only matters in tests, where templates are
+# rebuilt after `cache_clear()` and the old entries become garbage.
+_MAX_PREPARED = 256
+
+
+@dataclass(frozen=True)
+class SessionRef:
+    """Identifies one ephemeral session on a prepared runner."""
+
+    user_id: str
+    session_id: str
+
+
+@dataclass(frozen=True)
+class PreparedRunner:
+    """A keyed agent graph + its long-lived `InMemoryRunner`."""
+
+    runner: Any
+    app_name: str
+
+    @asynccontextmanager
+    async def session(
+        self,
+        *,
+        user_id: str,
+        prefix: str,
+        state: dict[str, Any] | None = None,
+    ) -> AsyncIterator[SessionRef]:
+        """Create a single-use session seeded with `state`; always
+        delete it on exit (success, error or cancellation by the
+        per-call timeout)."""
+        ref = SessionRef(user_id=user_id, session_id=f"{prefix}-{uuid.uuid4().hex}")
+        await self.runner.session_service.create_session(
+            app_name=self.app_name,
+            user_id=ref.user_id,
+            session_id=ref.session_id,
+            state=state,
+        )
+        try:
+            yield ref
+        finally:
+            await self.runner.session_service.delete_session(
+                app_name=self.app_name,
+                user_id=ref.user_id,
+                session_id=ref.session_id,
+            )
+
+    def run(
+        self, ref: SessionRef, new_message: Any, run_config: Any | None = None,
+    ) -> Any:
+        """`Runner.run_async` against the session `ref` points at.
+
+        `run_config` is passed through when given (the `/stream` routes
+        use it to switch the agent to SSE streaming).
+        """
+        extra: dict[str, Any] = {}
+        if run_config is not None:
+            extra["run_config"] = run_config
+        return self.runner.run_async(
+            user_id=ref.user_id,
+            session_id=ref.session_id,
+            new_message=new_message,
+            **extra,
+        )
+
+    async def state(self, ref: SessionRef) -> dict[str, Any] | None:
+        """Snapshot of the session state after a run (None if gone)."""
+        session = await self.runner.session_service.get_session(
+            app_name=self.app_name,
+            user_id=ref.user_id,
+            session_id=ref.session_id,
+        )
+        return None if session is None else dict(session.state)
+
+
+# (app_name, id(template), api_key) -> (template, prepared). The template
+# is held alongside so its id cannot be recycled while the entry lives.
+_prepared: OrderedDict[tuple[str, int, str], tuple[Any, PreparedRunner]] = OrderedDict()
+
+
+def prepare_runner(
+    *,
+    app_name: str,
+    template: Any,
+    api_key: str,
+    pin: Callable[[str], Any],
+) -> PreparedRunner:
+    """Return the cached runner for `(template, api_key)`, building it
+    on first use.
+
+    Args:
+        app_name: ADK app name; also namespaces the cache.
+        template: The cached `build_X_agent()` result. Identity is the
+            cache key, so rebuilding the template (tests clearing the
+            factory's `lru_cache`) naturally yields a fresh runner.
+        api_key: The Gemini key the agent graph is pinned to. Pass
+            ``""`` for agents that resolve keys themselves (lesson plan).
+        pin: ``pin(api_key) -> agent``. Builds the keyed agent graph;
+            called only on a cache miss.
+    """
+    cache_key = (app_name, id(template), api_key)
+    hit = _prepared.get(cache_key)
+    if hit is not None:
+        _prepared.move_to_end(cache_key)
+        return hit[1]
+
+    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
+
+    prepared = PreparedRunner(
+        runner=InMemoryRunner(agent=pin(api_key), app_name=app_name),
+        app_name=app_name,
+    )
+    _prepared[cache_key] = (template, prepared)
+    while len(_prepared) > _MAX_PREPARED:
+        _prepared.popitem(last=False)
+    return prepared
+
+
+def clear_prepared_runners() -> None:
+    """Drop every cached runner. Tests call this between cases."""
+    _prepared.clear()
+
+
+__all__ = [
+    "PreparedRunner",
+    "SessionRef",
+    "clear_prepared_runners",
+    "prepare_runner",
+]
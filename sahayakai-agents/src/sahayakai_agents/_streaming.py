@@ -0,0 +1,429 @@
+"""Server-Sent Events mode for the long-form structured generators.
+
+Lesson plan, worksheet, exam paper, virtual field trip and teacher
+training each return one large JSON document that takes 10-30s to
+generate. Their opt-in `/stream` routes stream the model's output as
+it is produced and forward every *completed* JSON subtree the route
+cares about (an activity, a question, a field-trip stop) the moment
+its closing bracket arrives.
+
+Pieces:
+
+- `JsonSubtreeScanner` — incremental scanner over the streamed JSON
+  text. Reports `(spec, path, value)` for each completed value whose
+  path matches a watched spec such as `"activities[*]"` or
+  `"sections[*].questions[*]"`. Chunk boundaries can fall anywhere,
+  including inside strings and escape sequences.
+- `StreamSink` — the channel the generation side writes text deltas
+  into. The ADK routers run their `LlmAgent` with
+  `streaming_run_config()` (ADK then calls `generate_content_stream`)
+  and forward `partial` events' text. The lesson-plan `LoopAgent`'s
+  writer picks the sink up from `current_stream_sink` and streams its
+  own Gemini call.
+- `stream_structured` — the driver. Produces the SSE frames:
+
+    event: partial    {"path": [...], "value": ...}  one per subtree
+    event: reset      {"attempt": n}                 retry started; drop partials
+    event: validated  <the route's normal JSON response>
+    event: error      {"error": {...}, "httpStatus": n}
+
+  Partials are schema-checked against the item model when one is
+  given, and pass the forbidden-phrase check (the one behavioural rule
+  that holds per fragment: a fragment that fails it fails the whole
+  document) BEFORE they are sent. The route's full guard runs
+  on the finished document; only `validated` is authoritative.
+
+Time to first useful byte (request start → first `partial` frame) is
+logged as `stream.first_partial` and again on `stream.completed`.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+
+from ._behavioural import assert_no_forbidden_phrases
+from .shared.errors import AgentError
+
+log = structlog.get_logger(__name__)
+
+_WILDCARD = "*"
+
+PathItem = str | int
+
+
+def _parse_watch(spec: str) -> tuple[PathItem, ...]:
+    """`"sections[*].questions[*]"` → `("sections", "*", "questions", "*")`."""
+    parsed: list[PathItem] = []
+    for segment in spec.split("."):
+        name, _, rest = segment.partition("[")
+        if name:
+            parsed.append(name)
+        while rest:
+            index, _, rest = rest.partition("]")
+            parsed.append(_WILDCARD if index == _WILDCARD else int(index))
+            rest = rest.removeprefix("[")
+    return tuple(parsed)
+
+
+def _matches(pattern: tuple[PathItem, ...], path: tuple[PathItem, ...]) -> bool:
+    return len(pattern) == len(path) and all(
+        want == got or (want == _WILDCARD and isinstance(got, int))
+        for want, got in zip(pattern, path, strict=True)
+    )
+
+
+@dataclass
+class _Frame:
+    """One open object / array on the scanner's stack."""
+
+    path: tuple[PathItem, ...]
+    is_object: bool
+    # Current member key (object) or element index (array).
+    key: PathItem | None = None
+    # Buffer offset where the current member's value began.
+    value_start: int = 0
+    expect_key: bool = False
+
+
+class JsonSubtreeScanner:
+    """Incremental scanner reporting completed values at watched paths.
+
+    Only structure is tracked (open containers, string / escape state,
+    bare scalars); a value is parsed with `json.loads` once, when it
+    closes. Text before the root object (e.g. a stray code fence) is
+    skipped; text after it is ignored.
+    """
+
+    def __init__(self, watch: Iterable[str]) -> None:
+        self._patterns = [(spec, _parse_watch(spec)) for spec in watch]
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything fed so far (a retry restarts the document)."""
+        self._buf = ""
+        self._pos = 0
+        self._stack: list[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._string_start = 0
+        self._in_scalar = False
+        self._done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, tuple[PathItem, ...], Any]]:
+        """Consume `chunk`; return the watched values it completed."""
+        self._buf += chunk
+        completed: list[tuple[str, tuple[PathItem, ...], Any]] = []
+        while self._pos < len(self._buf) and not self._done:
+            if self._in_string:
+                self._string_char(self._pos, completed)
+            else:
+                self._structural_char(self._pos, completed)
+            self._pos += 1
+        return completed
+
+    def _string_char(
+        self, i: int, completed: list[tuple[str, tuple[PathItem, ...], Any]],
+    ) -> None:
+        ch = self._buf[i]
+        if self._escape:
+            self._escape = False
+        elif ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            if self._string_is_key:
+                frame = self._stack[-1]
+                frame.key = json.loads(self._buf[self._string_start : i + 1])
+                frame.expect_key = False
+            else:
+                self._close_value(i + 1, completed)
+
+    def _structural_char(
+        self, i: int, completed: list[tuple[str, tuple[PathItem, ...], Any]],
+    ) -> None:
+        ch = self._buf[i]
+        if self._in_scalar and ch in ",}] \t\r\n":
+            self._in_scalar = False
+            self._close_value(i, completed)
+        top = self._stack[-1] if self._stack else None
+        if ch == '"':
+            self._in_string = True
+            self._string_start = i
+            self._string_is_key = bool(top and top.is_object and top.expect_key)
+            if top is not None and not self._string_is_key:
+                top.value_start = i
+        elif ch in "{[":
+            path: tuple[PathItem, ...] = ()
+            if top is not None:
+                top.value_start = i
+                path = (*top.path, top.key)  # type: ignore[arg-type]
+            is_object = ch == "{"
+            self._stack.append(_Frame(
+                path=path,
+                is_object=is_object,
+                key=None if is_object else 0,
+                expect_key=is_object,
+            ))
+        elif ch in "}]" and top is not None:
+            self._stack.pop()
+            if self._stack:
+                self._close_value(i + 1, completed)
+            else:
+                self._done = True
+        elif ch == "," and top is not None:
+            if top.is_object:
+                top.expect_key = True
+            else:
+                top.key = int(top.key or 0) + 1
+        elif ch not in ",: \t\r\n" and top is not None and not self._in_scalar:
+            self._in_scalar = True
+            top.value_start = i
+
+    def _close_value(
+        self, end: int, completed: list[tuple[str, tuple[PathItem, ...], Any]],
+    ) -> None:
+        top = self._stack[-1]
+        path = (*top.path, top.key)
+        for spec, pattern in self._patterns:
+            if _matches(pattern, path):  # type: ignore[arg-type]
+                try:
+                    value = json.loads(self._buf[top.value_start : end])
+                except ValueError:
+                    return
+                completed.append((spec, path, value))  # type: ignore[arg-type]
+                return
+
+
+class StreamSink:
+    """Where a generation attempt writes its text deltas."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue()
+
+    def begin_attempt(self) -> None:
+        """Mark the start of a (possibly retried) attempt."""
+        self._queue.put_nowait(("attempt", ""))
+
+    def write(self, text: str) -> None:
+        if text:
+            self._queue.put_nowait(("text", text))
+
+    def close(self, *_: Any) -> None:
+        self._queue.put_nowait(None)
+
+    async def get(self) -> tuple[str, str] | None:
+        return await self._queue.get()
+
+
+# Set for the duration of a streamed generation. Read by generators that
+# make their own Gemini calls deep inside an agent graph (the lesson-plan
+# writer), where threading a parameter through ADK isn't possible.
+current_stream_sink: ContextVar[StreamSink | None] = ContextVar(
+    "current_stream_sink", default=None,
+)
+
+
+def streaming_run_config() -> Any:
+    """ADK `RunConfig` that makes an `LlmAgent` call
+    `generate_content_stream` and yield `partial` text events."""
+    from google.adk.agents.run_config import RunConfig, StreamingMode  # noqa: PLC0415
+
+    return RunConfig(streaming_mode=StreamingMode.SSE)
+
+
+def event_text(event: Any) -> str:
+    """Concatenated non-thought text parts of an ADK event."""
+    content = getattr(event, "content", None)
+    if not content or not content.parts:
+        return ""
+    return "".join(
+        str(part.text)
+        for part in content.parts
+        if getattr(part, "text", None) and not getattr(part, "thought", False)
+    )
+
+
+def sse_frame(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _error_frame(exc: AgentError) -> str:
+    return sse_frame("error", {
+        "error": {
+            "code": exc.code,
+            "message": exc.message,
+            "retryAfterSeconds": exc.retry_after_seconds,
+        },
+        "httpStatus": exc.http_status,
+    })
+
+
+def _strings(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " ".join(_strings(v) for v in value.values())
+    if isinstance(value, list):
+        return " ".join(_strings(v) for v in value)
+    return ""
+
+
+@dataclass
+class _StreamStats:
+    partials: int = 0
+    attempts: int = 0
+    ttfb_ms: int | None = None
+    suppressed: bool = False
+
+
+class _GuardBlocked(Exception):
+    pass
+
+
+def _admit(
+    route: str,
+    path: tuple[PathItem, ...],
+    value: Any,
+    model: type[BaseModel] | None,
+) -> Any | None:
+    """Schema-check and guard one subtree. None = skip it quietly;
+    `_GuardBlocked` = it failed the forbidden-phrase check."""
+    if model is not None:
+        try:
+            value = model.model_validate(value).model_dump(mode="json")
+        except ValidationError:
+            log.debug("stream.partial_invalid", route=route, path=path)
+            return None
+    try:
+        assert_no_forbidden_phrases(_strings(value))
+    except AssertionError as exc:
+        log.warning(
+            "stream.guard_blocked", route=route, path=path, reason=str(exc)[:200],
+        )
+        raise _GuardBlocked(str(exc)) from exc
+    return value
+
+
+async def stream_structured[T](
+    *,
+    route: str,
+    started: float,
+    generate: Callable[[StreamSink], Coroutine[Any, Any, T]],
+    finalize: Callable[[T], BaseModel],
+    watch: Mapping[str, type[BaseModel] | None],
+    abort_on_guard_failure: bool = True,
+) -> AsyncIterator[str]:
+    """Run `generate(sink)` and turn its text deltas into SSE frames.
+
+    Args:
+        route: Log label, e.g. ``"worksheet"``.
+        started: `time.perf_counter()` at request arrival (TTFB origin).
+        generate: The route's generation, retries included. Calls
+            `sink.begin_attempt()` per attempt and `sink.write()` per
+            delta; returns the parsed core model.
+        finalize: The route's non-streaming tail — full behavioural
+            guard + response model. Raises `AgentError` to fail.
+        watch: Spec → item model (or None to skip validation) for the
+            subtrees to forward as `partial` frames.
+        abort_on_guard_failure: Single-shot generators end the stream
+            on a fragment that fails the guard (the finished document
+            would fail the same check). Multi-pass generators (lesson
+            plan may revise) just stop sending partials.
+    """
+    sink = StreamSink()
+    scanner = JsonSubtreeScanner(watch)
+    stats = _StreamStats()
+
+    token = current_stream_sink.set(sink)
+    task = asyncio.create_task(generate(sink))
+    current_stream_sink.reset(token)
+    task.add_done_callback(sink.close)
+
+    try:
+        while (item := await sink.get()) is not None:
+            kind, text = item
+            if kind == "attempt":
+                stats.attempts += 1
+                scanner.reset()
+                stats.suppressed = False
+                if stats.partials:
+                    yield sse_frame("reset", {"attempt": stats.attempts})
+                continue
+            for spec, path, raw in [] if stats.suppressed else scanner.feed(text):
+                try:
+                    value = _admit(route, path, raw, watch[spec])
+                except _GuardBlocked as exc:
+                    if not abort_on_guard_failure:
+                        stats.suppressed = True
+                        break
+                    yield _error_frame(AgentError(
+                        code="INTERNAL",
+                        message=f"Behavioural guard failed: {exc}",
+                        http_status=502,
+                    ))
+                    return
+                if value is None:
+                    continue
+                if stats.ttfb_ms is None:
+                    stats.ttfb_ms = int((time.perf_counter() - started) * 1000)
+                    log.info("stream.first_partial", route=route, ttfb_ms=stats.ttfb_ms)
+                stats.partials += 1
+                yield sse_frame("partial", {"path": list(path), "value": value})
+
+        response = finalize(await task)
+    except AgentError as exc:
+        log.warning("stream.failed", route=route, code=exc.code, partials=stats.partials)
+        yield _error_frame(exc)
+        return
+    except Exception as exc:
+        log.error("stream.failed", route=route, error=str(exc)[:200], partials=stats.partials)
+        yield _error_frame(AgentError(
+            code="INTERNAL", message=f"{route} stream failed", http_status=502,
+        ))
+        return
+    finally:
+        # Client went away (generator closed) or we bailed early.
+        if not task.done():
+            task.cancel()
+
+    yield sse_frame("validated", response.model_dump(mode="json"))
+    log.info(
+        "stream.completed",
+        route=route,
+        ttfb_ms=stats.ttfb_ms,
+        partials=stats.partials,
+        attempts=stats.attempts,
+        latency_ms=int((time.perf_counter() - started) * 1000),
+    )
+
+
+def sse_response(frames: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        # No proxy buffering / caching: each frame must reach a 3G
+        # client as soon as it is written.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+__all__ = [
+    "JsonSubtreeScanner",
+    "StreamSink",
+    "current_stream_sink",
+    "event_text",
+    "sse_frame",
+    "sse_response",
+    "stream_structured",
+    "streaming_run_config",
+]
@@ -19,6 +19,7 @@ from typing import Any
 import pybars
 import structlog
 
+from ...context_cache import SplitPrompt, split_template
 from .schemas import SubjectRubricFamily
 
 log = structlog.get_logger(__name__)
@@ -61,22 +62,39 @@ _compiler = pybars.Compiler()
 
 
 @lru_cache(maxsize=2)
-def _compiled(template_name: str) -> Any:
+def _compiled(template_name: str) -> tuple[Any, Any]:
+    """(static prefix, per-request suffix) templates; see `context_cache`."""
     if template_name == "pass1":
         source = load_pass1_prompt()
     elif template_name == "pass2":
         source = load_pass2_prompt()
     else:
         raise ValueError(f"Unknown assessment-scanner template: {template_name!r}")
-    return _compiler.compile(source)
+    prefix, suffix = split_template(source)
+    return _compiler.compile(prefix), _compiler.compile(suffix)
+
+
+def _render_split(template_name: str, context: dict[str, Any]) -> SplitPrompt:
+    prefix, suffix = _compiled(template_name)
+    return SplitPrompt(
+        agent=f"assessment_scanner.{template_name}",
+        prefix=str(prefix(context)),
+        suffix=str(suffix(context)),
+    )
 
 
 def render_pass1_prompt(context: dict[str, Any]) -> str:
-    return str(_compiled("pass1")(context))
+    return _render_split("pass1", context).text
 
 
 def render_pass2_prompt(context: dict[str, Any]) -> str:
-    return str(_compiled("pass2")(context))
+    return render_pass2_prompt_split(context).text
+
+
+def render_pass2_prompt_split(context: dict[str, Any]) -> SplitPrompt:
+    """Pass-2 prompt with the per-family rubric block kept apart, so it
+    can be served from the explicit context cache."""
+    return _render_split("pass2", context)
 
 
 # ---- Model selection ------------------------------------------------------
@@ -229,5 +247,6 @@ __all__ = [
     "load_pass2_prompt",
     "render_pass1_prompt",
     "render_pass2_prompt",
+    "render_pass2_prompt_split",
     "rubric_for",
 ]
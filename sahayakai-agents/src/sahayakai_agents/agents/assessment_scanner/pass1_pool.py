@@ -0,0 +1,123 @@
+"""Shared Pass-1 resources for the assessment scanner.
+
+A 15-page answer script used to open 15 fresh HTTPS connections to
+Storage and fire 15 simultaneous multimodal Gemini calls, which hit the
+per-key rate limit together and all backed off at once. This module
+holds what every scan now shares:
+
+- ONE pooled `httpx.AsyncClient` for page downloads (keep-alive,
+  bounded connections). Storage download URLs all resolve to the same
+  host, so pages after the first reuse warm connections.
+- A process-wide `Pass1Limiter` capping concurrent Pass-1 model calls
+  across every in-flight scan
+  (`SAHAYAKAI_ASSESSMENT_PASS1_CONCURRENCY`). The router adds a
+  per-request cap on top
+  (`SAHAYAKAI_ASSESSMENT_PASS1_PER_REQUEST_CONCURRENCY`), so one large
+  scan cannot starve the others.
+
+Both are bound to the event loop that first uses them and are rebuilt
+if a different loop asks (`TestClient` without a `with` block runs each
+request on a fresh loop). `close_page_client()` drains the pool on
+shutdown.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+import structlog
+
+from ...config import get_settings
+
+log = structlog.get_logger(__name__)
+
+# Storage download URLs should resolve in <5s even on a poor connection;
+# anything longer is an outage signal.
+PAGE_FETCH_TIMEOUT_S = 10.0
+# Keep-alive slots match the connection cap: with fewer, a burst of page
+# downloads closes the surplus connections as they free up instead of
+# handing them to the queued requests, and every page opens a new one.
+_FETCH_MAX_CONNECTIONS = 32
+
+
+class Pass1Limiter:
+    """Process-wide cap on concurrent Pass-1 model calls.
+
+    `in_flight` / `peak` are exposed for logs and the benchmark.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._sem = asyncio.Semaphore(self.limit)
+        self.in_flight = 0
+        self.peak = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._sem:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_limiter: Pass1Limiter | None = None
+_limiter_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_page_client() -> httpx.AsyncClient:
+    """The pooled client page downloads go through."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=PAGE_FETCH_TIMEOUT_S,
+            limits=httpx.Limits(
+                max_connections=_FETCH_MAX_CONNECTIONS,
+                max_keepalive_connections=_FETCH_MAX_CONNECTIONS,
+            ),
+            follow_redirects=True,
+        )
+        _client_loop = loop
+    return _client
+
+
+def get_pass1_limiter() -> Pass1Limiter:
+    """The process-wide Pass-1 limiter for the running loop."""
+    global _limiter, _limiter_loop
+    loop = asyncio.get_running_loop()
+    if _limiter is None or _limiter_loop is not loop:
+        _limiter = Pass1Limiter(get_settings().assessment_pass1_concurrency)
+        _limiter_loop = loop
+    return _limiter
+
+
+async def close_page_client() -> None:
+    """Close the pooled download client. Idempotent."""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+        log.info("assessment_scanner.page_client_closed")
+
+
+def reset_pass1_pool() -> None:
+    """Drop the shared client and limiter without awaiting. Tests only."""
+    global _client, _client_loop, _limiter, _limiter_loop
+    _client = _client_loop = _limiter = _limiter_loop = None
+
+
+__all__ = [
+    "PAGE_FETCH_TIMEOUT_S",
+    "Pass1Limiter",
+    "close_page_client",
+    "get_page_client",
+    "get_pass1_limiter",
+    "reset_pass1_pool",
+]
@@ -1,11 +1,21 @@
 """FastAPI sub-router for the assessment-scanner agent.
 
 Two-pass orchestration:
-  PASS 1 -- per-page extraction, run in parallel via `asyncio.gather`
-            with `return_exceptions=True` so one bad page doesn't kill
-            the whole scan. Pages that fail to FETCH (Storage URL 404,
-            expired token) raise `AssessmentPageUnreadableError` and
-            surface as HTTP 422 naming the offending page.
+  PASS 1 -- per-page extraction. Every page download starts at once
+            over the pooled client in `pass1_pool`; each page's model
+            call starts as soon as its bytes arrive and a Pass-1 slot
+            is free (per-request AND process-wide caps), so page 1 is
+            being extracted while page 5 still downloads. A page whose
+            model call or JSON fails becomes an "unreadable"
+            placeholder instead of killing the scan. Pages that fail to
+            FETCH (Storage URL 404, expired token) raise
+            `AssessmentPageUnreadableError`, cancel the rest of the
+            scan, and surface as HTTP 422 naming the offending page.
+            Each finished page is serialised for the Pass-2 prompt as
+            it lands, not after the slowest page. Downloaded pages go
+            through `shared.image_pipeline` first (downscale, re-encode),
+            and a page uploaded twice reuses the first copy's
+            extraction instead of making its own model call.
   PASS 2 -- single rubric-grounded scoring call across all pages.
 
 Aggregation + status classification + concept-mastery rollup happen
@@ -18,16 +28,17 @@ from __future__ import annotations
 
 import asyncio
 import json
+import textwrap
 import time
 from typing import Any
 
-import httpx
 import structlog
 from fastapi import APIRouter
-from google import genai
 from google.genai import types as genai_types
 
 from ...config import get_settings
+from ...context_cache import SplitPrompt, get_context_cache
+from ...genai_clients import get_genai_client
 from ...resilience import run_resiliently
 from ...shared.errors import (
     AgentError,
@@ -36,6 +47,7 @@ from ...shared.errors import (
     AssessmentPageUnreadableError,
 )
 from ...shared.gemini_schema import gemini_response_schema
+from ...shared.image_pipeline import PreparedImage, is_duplicate, prepare_image_async
 from ...shared.prompt_safety import sanitize, sanitize_optional
 from .agent import (
     confidence_guidance_for,
@@ -43,9 +55,10 @@ from .agent import (
     get_pass2_model,
     letter_grade_for,
     render_pass1_prompt,
-    render_pass2_prompt,
+    render_pass2_prompt_split,
     rubric_for,
 )
+from .pass1_pool import PAGE_FETCH_TIMEOUT_S, get_page_client, get_pass1_limiter
 from .schemas import (
     AssessmentScannerRequest,
     AssessmentScannerResponse,
@@ -71,10 +84,6 @@ SIDECAR_VERSION = "phase-w.alpha"
 _PASS1_PER_CALL_TIMEOUT_S = 30.0
 _PASS2_PER_CALL_TIMEOUT_S = 45.0
 
-# Image fetch timeout -- Storage download URLs should resolve in <5s
-# even on a poor connection; anything longer is an outage signal.
-_IMAGE_FETCH_TIMEOUT_S = 10.0
-
 
 # ---- Image fetching ------------------------------------------------------
 
@@ -86,7 +95,8 @@ async def _fetch_page_bytes(
     """Fetch one page URL -> (mime, bytes). Mirrors fetchImageAsBase64.
 
     `data:` URIs are decoded inline. Storage HTTPS URLs are fetched
-    with a short timeout. ANY failure here is fatal for the page --
+    over the shared pooled client with a short timeout. ANY failure
+    here is fatal for the page --
     we wrap it in `AssessmentPageUnreadableError` so the route returns
     a 422 naming the 1-based page number.
     """
@@ -101,11 +111,10 @@ async def _fetch_page_bytes(
             raise AssessmentPageUnreadableError(page_index + 1, exc) from exc
 
     try:
-        async with httpx.AsyncClient(timeout=_IMAGE_FETCH_TIMEOUT_S) as client:
-            resp = await client.get(page_url)
-            resp.raise_for_status()
-            mime = resp.headers.get("content-type", "image/jpeg").split(";")[0].strip()
-            return mime, resp.content
+        resp = await get_page_client().get(page_url, timeout=PAGE_FETCH_TIMEOUT_S)
+        resp.raise_for_status()
+        mime = resp.headers.get("content-type", "image/jpeg").split(";")[0].strip()
+        return mime, resp.content
     except Exception as exc:
         log.error(
             "assessment_scanner.page_fetch_failed",
@@ -125,16 +134,24 @@ async def _call_gemini_structured(
     contents: Any,
     response_schema: type,
 ) -> Any:
-    """One structured-output Gemini call. Mirrors lesson_plan/agent.py."""
-    client = genai.Client(api_key=api_key)
+    """One structured-output Gemini call. Mirrors lesson_plan/agent.py.
+
+    A `SplitPrompt` goes through the explicit context cache.
+    """
+    config = genai_types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=gemini_response_schema(response_schema),
+        temperature=0.3,
+    )
+    if isinstance(contents, SplitPrompt):
+        return await get_context_cache().generate(
+            api_key=api_key, model=model, prompt=contents, config=config,
+        )
+    client = get_genai_client(api_key)
     return await client.aio.models.generate_content(
         model=model,
         contents=contents,
-        config=genai_types.GenerateContentConfig(
-            response_mime_type="application/json",
-            response_schema=gemini_response_schema(response_schema),
-            temperature=0.3,
-        ),
+        config=config,
     )
 
 
@@ -160,6 +177,91 @@ def _extract_text(result: Any) -> str:
 # ---- PASS 1 -------------------------------------------------------------
 
 
+def _unreadable_page(page_index: int) -> PageScan:
+    """Placeholder for a page Pass-1 could not extract."""
+    return PageScan(
+        pageIndex=page_index,
+        pageType="unreadable",
+        handwritingConfidence=0.0,
+        imageQualityIssues=["none"],
+        detectedLanguage="unknown",
+        questions=[],
+    )
+
+
+def _page_json(page: PageScan) -> str:
+    """One page as it appears in the Pass-2 `extractedPages` blob.
+
+    Joined by `_extracted_pages_json` this is byte-identical to
+    `json.dumps([...pages], indent=2)`, but each page is serialised as
+    soon as its extraction lands.
+    """
+    return textwrap.indent(json.dumps(page.model_dump(mode="json"), indent=2), "  ")
+
+
+def _extracted_pages_json(fragments: list[str]) -> str:
+    if not fragments:
+        return "[]"
+    return "[\n" + ",\n".join(fragments) + "\n]"
+
+
+class _PageDeduper:
+    """Per-scan registry of prepared pages, keyed by perceptual hash.
+
+    Teachers often upload the same page photo twice. The lowest-indexed
+    copy is extracted; later copies reuse its result with no questions,
+    so Pass 2 neither pays for nor double-counts the repeat. To keep
+    that choice independent of download and preprocessing order, a
+    page decides only once every lower page has been prepared.
+    """
+
+    def __init__(self, page_count: int) -> None:
+        loop = asyncio.get_running_loop()
+        self._prepared: list[asyncio.Future[PreparedImage | None]] = [
+            loop.create_future() for _ in range(page_count)
+        ]
+        self._decided: list[asyncio.Future[int | None]] = [
+            loop.create_future() for _ in range(page_count)
+        ]
+        self._results: list[asyncio.Future[PageScan]] = [
+            loop.create_future() for _ in range(page_count)
+        ]
+        self.duplicates: dict[int, int] = {}
+
+    async def claim(
+        self, image: PreparedImage, page_index: int
+    ) -> asyncio.Future[PageScan] | None:
+        """The original page's pending result if `image` repeats a
+        lower page, else None (and `page_index` is an original)."""
+        self._prepared[page_index].set_result(image)
+        original = None
+        for lower in range(page_index):
+            seen = await self._prepared[lower]
+            if seen is not None and is_duplicate(image, seen):
+                # A repeat of a repeat points at the first copy.
+                repeat_of = await self._decided[lower]
+                original = lower if repeat_of is None else repeat_of
+                break
+        self._decided[page_index].set_result(original)
+        if original is None:
+            return None
+        self.duplicates[page_index] = original
+        return self._results[original]
+
+    def release(self, page_index: int, page: PageScan | None = None) -> None:
+        """Settle whatever `page_index` left pending, so no later page
+        waits on it forever (fetch failure, cancellation, extraction)."""
+        for future, value in (
+            (self._prepared[page_index], None),
+            (self._decided[page_index], None),
+        ):
+            if not future.done():
+                future.set_result(value)
+        result = self._results[page_index]
+        if page is not None and not result.done():
+            result.set_result(page)
+
+
 async def _extract_page(
     page_url: str,
     page_index: int,
@@ -167,10 +269,51 @@ async def _extract_page(
     payload: AssessmentScannerRequest,
     api_keys: tuple[str, ...],
     settings: Any,
+    request_slots: asyncio.Semaphore,
+    deduper: _PageDeduper,
 ) -> PageScan:
-    """Pass-1 for ONE page. Fetch + render + call Gemini."""
-    mime, image_bytes = await _fetch_page_bytes(page_url, page_index)
+    """Pass-1 for ONE page. Fetch + prepare + render + call Gemini.
+
+    The download runs unthrottled (the HTTP pool bounds it); only the
+    model call waits for a per-request and a process-wide slot.
+    """
+    # Placeholder until extraction lands, so duplicates waiting on this
+    # page are released even if it is cancelled or raises.
+    page = _unreadable_page(page_index)
+    try:
+        mime, image_bytes = await _fetch_page_bytes(page_url, page_index)
+        image = await prepare_image_async(image_bytes, mime, fingerprint=True)
+
+        original = await deduper.claim(image, page_index)
+        if original is not None:
+            source = await original
+            log.info(
+                "assessment_scanner.pass1.duplicate_page",
+                page_index=page_index,
+                duplicate_of=deduper.duplicates[page_index],
+            )
+            return source.model_copy(update={"pageIndex": page_index, "questions": []})
+
+        page = await _extract_prepared_page(
+            image, page_index, page_count, payload, api_keys,
+            settings=settings, request_slots=request_slots,
+        )
+    finally:
+        deduper.release(page_index, page)
+    return page
 
+
+async def _extract_prepared_page(
+    image: PreparedImage,
+    page_index: int,
+    page_count: int,
+    payload: AssessmentScannerRequest,
+    api_keys: tuple[str, ...],
+    *,
+    settings: Any,
+    request_slots: asyncio.Semaphore,
+) -> PageScan:
+    """Render the Pass-1 prompt and extract one prepared page."""
     prompt = render_pass1_prompt({
         "pageIndex": page_index,
         "pageCount": page_count,
@@ -179,10 +322,12 @@ async def _extract_page(
         "language": sanitize(payload.language, max_length=20),
     })
 
-    image_part = genai_types.Part.from_bytes(data=image_bytes, mime_type=mime)
     contents = genai_types.Content(
         role="user",
-        parts=[image_part, genai_types.Part(text=prompt)],
+        parts=[
+            genai_types.Part.from_bytes(data=image.data, mime_type=image.mime_type),
+            genai_types.Part(text=prompt),
+        ],
     )
     model = get_pass1_model()
 
@@ -195,13 +340,14 @@ async def _extract_page(
         )
 
     try:
-        result = await run_resiliently(
-            _do,
-            api_keys,
-            span_name=f"assessment_scanner.pass1.page{page_index}",
-            max_total_backoff_seconds=settings.max_total_backoff_seconds,
-            per_call_timeout_seconds=_PASS1_PER_CALL_TIMEOUT_S,
-        )
+        async with request_slots, get_pass1_limiter().slot():
+            result = await run_resiliently(
+                _do,
+                api_keys,
+                span_name=f"assessment_scanner.pass1.page{page_index}",
+                max_total_backoff_seconds=settings.max_total_backoff_seconds,
+                per_call_timeout_seconds=_PASS1_PER_CALL_TIMEOUT_S,
+            )
     except AISafetyBlockError:
         raise
     except Exception as exc:
@@ -213,14 +359,7 @@ async def _extract_page(
             page_index=page_index,
             error=str(exc),
         )
-        return PageScan(
-            pageIndex=page_index,
-            pageType="unreadable",
-            handwritingConfidence=0.0,
-            imageQualityIssues=["none"],
-            detectedLanguage="unknown",
-            questions=[],
-        )
+        return _unreadable_page(page_index)
 
     text = _extract_text(result)
     try:
@@ -232,18 +371,64 @@ async def _extract_page(
             raw_excerpt=text[:200],
             error=str(exc),
         )
-        return PageScan(
-            pageIndex=page_index,
-            pageType="unreadable",
-            handwritingConfidence=0.0,
-            imageQualityIssues=["none"],
-            detectedLanguage="unknown",
-            questions=[],
-        )
+        return _unreadable_page(page_index)
     # Pin the page index even if the model echoed a different value.
     return page.model_copy(update={"pageIndex": page_index})
 
 
+async def _run_pass1(
+    payload: AssessmentScannerRequest,
+    api_keys: tuple[str, ...],
+    settings: Any,
+) -> tuple[list[PageScan], str, dict[int, int]]:
+    """Extract every page; returns the pages in order, the Pass-2
+    `extractedPages` JSON assembled from them, and the duplicate pages
+    found (page index -> index of the page it repeats).
+
+    A fetch failure or safety block cancels the pages still running and
+    is re-raised; any other per-page error leaves an unreadable
+    placeholder (matching the TS Promise.allSettled hardening).
+    """
+    page_count = len(payload.pageUrls)
+    request_slots = asyncio.Semaphore(
+        max(1, settings.assessment_pass1_per_request_concurrency)
+    )
+    deduper = _PageDeduper(page_count)
+    tasks = {
+        asyncio.create_task(
+            _extract_page(
+                url, i, page_count, payload, api_keys, settings, request_slots, deduper
+            )
+        ): i
+        for i, url in enumerate(payload.pageUrls)
+    }
+    pages: list[PageScan | None] = [None] * page_count
+    fragments: list[str] = [""] * page_count
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                i = tasks[task]
+                exc = task.exception()
+                if isinstance(exc, (AssessmentPageUnreadableError, AISafetyBlockError)):
+                    raise exc
+                page = task.result() if exc is None else _unreadable_page(i)
+                pages[i] = page
+                fragments[i] = _page_json(page)
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return (
+        [p for p in pages if p is not None],
+        _extracted_pages_json(fragments),
+        deduper.duplicates,
+    )
+
+
 # ---- PASS 2 -------------------------------------------------------------
 
 
@@ -257,7 +442,7 @@ def _default_ncert_context(payload: AssessmentScannerRequest) -> str:
 
 
 async def _score_assessment(
-    pages: list[PageScan],
+    extracted_pages: str,
     payload: AssessmentScannerRequest,
     api_keys: tuple[str, ...],
     settings: Any,
@@ -269,16 +454,15 @@ async def _score_assessment(
         else _default_ncert_context(payload)
     )
 
-    prompt = render_pass2_prompt({
+    # The rubric block depends only on `family`, so it is the cached
+    # prefix; everything per-request renders into the suffix.
+    prompt = render_pass2_prompt_split({
         "subject": sanitize(payload.subject, max_length=100),
         "gradeLevel": sanitize(payload.gradeLevel, max_length=50),
         "language": sanitize(payload.language, max_length=20),
-        # JSON-encode the extracted pages; the model will reason over
-        # this structured blob.
-        "extractedPages": json.dumps(
-            [p.model_dump(mode="json") for p in pages],
-            indent=2,
-        ),
+        # JSON-encoded extracted pages (see `_run_pass1`); the model
+        # will reason over this structured blob.
+        "extractedPages": extracted_pages,
         "ncertContext": ncert_context,
         "teacherAnswerKeyText": sanitize_optional(
             payload.teacherAnswerKeyText, max_length=20000,
@@ -291,15 +475,12 @@ async def _score_assessment(
     })
 
     model = get_pass2_model()
-    contents = genai_types.Content(
-        role="user", parts=[genai_types.Part(text=prompt)],
-    )
 
     async def _do(api_key: str) -> Any:
         return await _call_gemini_structured(
             api_key=api_key,
             model=model,
-            contents=contents,
+            contents=prompt,
             response_schema=Pass2Output,
         )
 
@@ -344,9 +525,18 @@ async def _score_assessment(
 # ---- Aggregation --------------------------------------------------------
 
 
-def _image_quality_warnings(pages: list[PageScan]) -> list[str]:
+def _image_quality_warnings(
+    pages: list[PageScan],
+    duplicates: dict[int, int] | None = None,
+) -> list[str]:
     warnings: list[str] = []
     for p in pages:
+        if duplicates and p.pageIndex in duplicates:
+            warnings.append(
+                f"Page {p.pageIndex + 1}: looks like a repeat of page "
+                f"{duplicates[p.pageIndex] + 1} -- graded once."
+            )
+            continue
         issues = [i for i in p.imageQualityIssues if i != "none"]
         if issues:
             warnings.append(f"Page {p.pageIndex + 1}: {', '.join(issues)}")
@@ -364,6 +554,7 @@ def _aggregate(
     pages: list[PageScan],
     pass2: Pass2Output,
     latency_ms: int,
+    duplicates: dict[int, int] | None = None,
 ) -> AssessmentScannerResponse:
     gradable = pass2.questions
     total_awarded = sum(q.marksAwarded for q in gradable)
@@ -419,7 +610,7 @@ def _aggregate(
         recommendedNextSteps=list(pass2.recommendedNextSteps),
         studentRecommendations=list(pass2.studentRecommendations),
         needsReviewCount=needs_review,
-        imageQualityWarnings=_image_quality_warnings(pages),
+        imageQualityWarnings=_image_quality_warnings(pages, duplicates),
         teacherEditedAt=None,
         errorMessage=None,
         sidecarVersion=SIDECAR_VERSION,
@@ -443,43 +634,12 @@ async def grade_assessment(
 
     page_count = len(payload.pageUrls)
 
-    # PASS 1 -- per-page extraction in parallel. `return_exceptions=True`
-    # so one page raising `AssessmentPageUnreadableError` doesn't cancel
-    # siblings; we surface the FIRST such error after the gather
-    # completes (matching the TS Promise.allSettled hardening).
-    pass1_results = await asyncio.gather(
-        *[
-            _extract_page(url, i, page_count, payload, api_keys, settings)
-            for i, url in enumerate(payload.pageUrls)
-        ],
-        return_exceptions=True,
-    )
-
-    # If any page failed to fetch, surface that specifically.
-    for r in pass1_results:
-        if isinstance(r, AssessmentPageUnreadableError):
-            raise r
-
-    pages: list[PageScan] = []
-    for i, r in enumerate(pass1_results):
-        if isinstance(r, PageScan):
-            pages.append(r)
-        elif isinstance(r, AISafetyBlockError):
-            raise r
-        else:
-            # Transient model/parse error on this page -- placeholder.
-            pages.append(PageScan(
-                pageIndex=i,
-                pageType="unreadable",
-                handwritingConfidence=0.0,
-                imageQualityIssues=["none"],
-                detectedLanguage="unknown",
-                questions=[],
-            ))
+    # PASS 1 -- overlapped fetch + extraction under the Pass-1 caps.
+    pages, extracted_pages, duplicates = await _run_pass1(payload, api_keys, settings)
 
     # PASS 2 -- single scoring call.
     try:
-        pass2 = await _score_assessment(pages, payload, api_keys, settings)
+        pass2 = await _score_assessment(extracted_pages, payload, api_keys, settings)
     except AISafetyBlockError as exc:
         log.warning("assessment_scanner.safety_block", reason=str(exc))
         raise
@@ -500,7 +660,7 @@ async def grade_assessment(
         raise AssessmentEmptyExtractionError()
 
     latency_ms = int((time.perf_counter() - started) * 1000)
-    response = _aggregate(payload, pages, pass2, latency_ms)
+    response = _aggregate(payload, pages, pass2, latency_ms, duplicates)
 
     log.info(
         "assessment_scanner.graded",
@@ -27,9 +27,11 @@ import structlog
 from fastapi import APIRouter
 
 from ..._adk_keyed_gemini import build_keyed_gemini_from_template
+from ..._adk_prepared import PreparedRunner, prepare_runner
 from ...config import get_settings
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
+from ...shared.image_pipeline import prepare_image_async
 from ...shared.prompt_safety import sanitize_optional
 from .agent import (
     DEFAULT_RUBRIC,
@@ -79,6 +81,27 @@ def _effective_rubric(snapshot: RubricSnapshot | None) -> dict[str, Any]:
     return DEFAULT_RUBRIC
 
 
+def _build_pinned_agent(api_key: str) -> Any:
+    """Clone the cached template with `.model` pinned to `api_key`.
+
+    The cached agent itself is never mutated — `model_copy()` returns
+    a fresh Pydantic instance.
+    """
+    return build_assignment_assessor_agent().model_copy(
+        update={"model": _build_keyed_gemini(api_key)}
+    )
+
+
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned agent + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_ASSESSOR_APP_NAME,
+        template=build_assignment_assessor_agent(),
+        api_key=api_key,
+        pin=_build_pinned_agent,
+    )
+
+
 async def _run_pipeline_via_runner(
     *, prompt: str, image_mime: str, image_bytes: bytes, api_key: str,
 ) -> AssessAssignmentCore:
@@ -88,25 +111,9 @@ async def _run_pipeline_via_runner(
     image is a separate `Part.from_bytes` part. Same `(image_part,
     text_part)` order as the worksheet wizard router.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    template = build_assignment_assessor_agent()
-    agent_for_call = template.model_copy(
-        update={"model": _build_keyed_gemini(api_key)}
-    )
-
-    runner = InMemoryRunner(
-        agent=agent_for_call, app_name=_ASSESSOR_APP_NAME,
-    )
-
-    user_id = "assignment-assessor"
-    session_id = f"assignment-assessor-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_ASSESSOR_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+    prepared = _prepared_runner(api_key)
 
     image_part = genai_types.Part.from_bytes(
         data=image_bytes, mime_type=image_mime,
@@ -117,16 +124,15 @@ async def _run_pipeline_via_runner(
     )
 
     final_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                text = getattr(part, "text", None)
-                if text and not getattr(part, "thought", False):
-                    final_text += str(text)
+    async with prepared.session(
+        user_id="assignment-assessor", prefix="assignment-assessor",
+    ) as ref:
+        async for event in prepared.run(ref, new_message):
+            if event.content and event.content.parts:
+                for part in event.content.parts:
+                    text = getattr(part, "text", None)
+                    if text and not getattr(part, "thought", False):
+                        final_text += str(text)
 
     if not final_text.strip():
         raise AgentError(
@@ -169,6 +175,9 @@ async def _run_assessor(
             message=f"Invalid imageDataUri: {exc}",
             http_status=400,
         ) from exc
+    # Downscale / re-encode once; every retry sends the prepared bytes.
+    image = await prepare_image_async(image_bytes, image_mime)
+    image_bytes, image_mime = image.data, image.mime_type
 
     rubric_dict = _effective_rubric(payload.rubricSnapshot)
     language = payload.language or "English"
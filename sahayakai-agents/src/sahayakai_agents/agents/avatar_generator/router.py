@@ -18,13 +18,13 @@ from __future__ import annotations
 import asyncio
 import base64
 import time
-import uuid
 from typing import Any
 
 import structlog
 from fastapi import APIRouter
 
 from ..._adk_keyed_gemini import build_keyed_gemini
+from ..._adk_prepared import PreparedRunner, prepare_runner
 from ...config import get_settings
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
@@ -70,8 +70,9 @@ _PORTRAIT_AGENT_NAME = "avatar_portrait"
 
 
 def _build_pinned_pipeline(api_key: str) -> Any:
-    """Build a per-call SequentialAgent with the sub-agent's `.model`
-    swapped to a `Gemini` instance pinned to `api_key`."""
+    """Build a SequentialAgent with the sub-agent's `.model` swapped
+    to a `Gemini` instance pinned to `api_key`. Called once per key by
+    `_prepared_runner`."""
     from google.adk.agents import LlmAgent  # noqa: PLC0415
 
     template = build_avatar_agent()
@@ -96,6 +97,16 @@ def _build_pinned_pipeline(api_key: str) -> Any:
     return template.clone(update={"sub_agents": pinned_subs})
 
 
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned pipeline + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_AVATAR_APP_NAME,
+        template=build_avatar_agent(),
+        api_key=api_key,
+        pin=_build_pinned_pipeline,
+    )
+
+
 async def _run_pipeline_via_runner(
     *,
     portrait_prompt: str,
@@ -106,20 +117,9 @@ async def _run_pipeline_via_runner(
     Returns `(image_bytes, image_mime)` extracted from the runner
     events. Raises `AgentError` if the image data is missing.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    pipeline = _build_pinned_pipeline(api_key)
-    runner = InMemoryRunner(agent=pipeline, app_name=_AVATAR_APP_NAME)
-
-    user_id = "avatar-pipeline"
-    session_id = f"avatar-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_AVATAR_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-        state={STATE_PORTRAIT_PROMPT: portrait_prompt},
-    )
+    prepared = _prepared_runner(api_key)
 
     trigger_message = genai_types.Content(
         role="user",
@@ -129,30 +129,31 @@ async def _run_pipeline_via_runner(
     image_bytes: bytes | None = None
     image_mime: str | None = None
 
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=trigger_message,
-    ):
-        author = getattr(event, "author", None) or ""
-        if author != _PORTRAIT_AGENT_NAME:
-            continue
-        if not event.content or not event.content.parts:
-            continue
-        for part in event.content.parts:
-            inline = getattr(part, "inline_data", None)
-            if inline is not None:
-                data = getattr(inline, "data", None)
-                mime = getattr(inline, "mime_type", None) or "image/png"
-                if data:
-                    if isinstance(data, str):
-                        try:
-                            image_bytes = base64.b64decode(data, validate=True)
-                        except Exception:
-                            image_bytes = data.encode("utf-8")
-                    else:
-                        image_bytes = data
-                    image_mime = mime
+    async with prepared.session(
+        user_id="avatar-pipeline",
+        prefix="avatar",
+        state={STATE_PORTRAIT_PROMPT: portrait_prompt},
+    ) as ref:
+        async for event in prepared.run(ref, trigger_message):
+            author = getattr(event, "author", None) or ""
+            if author != _PORTRAIT_AGENT_NAME:
+                continue
+            if not event.content or not event.content.parts:
+                continue
+            for part in event.content.parts:
+                inline = getattr(part, "inline_data", None)
+                if inline is not None:
+                    data = getattr(inline, "data", None)
+                    mime = getattr(inline, "mime_type", None) or "image/png"
+                    if data:
+                        if isinstance(data, str):
+                            try:
+                                image_bytes = base64.b64decode(data, validate=True)
+                            except Exception:
+                                image_bytes = data.encode("utf-8")
+                        else:
+                            image_bytes = data
+                        image_mime = mime
 
     if image_bytes is None or image_mime is None:
         raise AgentError(
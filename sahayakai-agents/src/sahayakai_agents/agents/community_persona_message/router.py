@@ -14,13 +14,13 @@ from __future__ import annotations
 
 import re
 import time
-import uuid
 from typing import Any
 
 import structlog
 from fastapi import APIRouter
 
 from ..._adk_keyed_gemini import build_keyed_gemini_from_template
+from ..._adk_prepared import PreparedRunner, prepare_runner
 from ...config import get_settings
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
@@ -84,6 +84,27 @@ def _render_recent_block(
     return "\n".join(lines)
 
 
+def _build_pinned_agent(api_key: str) -> Any:
+    """Clone the cached template with `.model` pinned to `api_key`.
+
+    The cached agent itself is never mutated — `model_copy()` returns
+    a fresh Pydantic instance.
+    """
+    return build_community_persona_message_agent().model_copy(
+        update={"model": _build_keyed_gemini(api_key)}
+    )
+
+
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned agent + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_PERSONA_APP_NAME,
+        template=build_community_persona_message_agent(),
+        api_key=api_key,
+        pin=_build_pinned_agent,
+    )
+
+
 async def _run_pipeline_via_runner(
     *, prompt: str, api_key: str,
 ) -> str:
@@ -94,25 +115,9 @@ async def _run_pipeline_via_runner(
     router collects the model's text and returns it raw. Cleanup +
     length checks happen one layer up.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    template = build_community_persona_message_agent()
-    agent_for_call = template.model_copy(
-        update={"model": _build_keyed_gemini(api_key)}
-    )
-
-    runner = InMemoryRunner(
-        agent=agent_for_call, app_name=_PERSONA_APP_NAME,
-    )
-
-    user_id = "community-persona-message-generator"
-    session_id = f"community-persona-message-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_PERSONA_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+    prepared = _prepared_runner(api_key)
 
     new_message = genai_types.Content(
         role="user",
@@ -120,16 +125,15 @@ async def _run_pipeline_via_runner(
     )
 
     final_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                text = getattr(part, "text", None)
-                if text and not getattr(part, "thought", False):
-                    final_text += str(text)
+    async with prepared.session(
+        user_id="community-persona-message-generator", prefix="community-persona-message",
+    ) as ref:
+        async for event in prepared.run(ref, new_message):
+            if event.content and event.content.parts:
+                for part in event.content.parts:
+                    text = getattr(part, "text", None)
+                    if text and not getattr(part, "thought", False):
+                        final_text += str(text)
 
     if not final_text.strip():
         raise AgentError(
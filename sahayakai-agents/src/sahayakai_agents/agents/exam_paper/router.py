@@ -23,17 +23,31 @@ LLM validator (Option A from the Phase U.γ brief):
 Marks-balance + behavioural guard live in `_guard.py`. The router
 applies them after the Runner returns; on failure we map AssertionError
 → 502 same as the pre-U.γ flow.
+
+`POST /v1/exam-paper/generate/stream` is the SSE variant (see
+`_streaming`): each question is forwarded as soon as it completes; the
+marks-balance check can only run on the whole paper, so the final
+`validated` frame remains authoritative.
 """
 from __future__ import annotations
 
 import time
-import uuid
+from collections.abc import Callable
 from typing import Any
 
 import structlog
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
 from ..._adk_keyed_gemini import build_keyed_gemini
+from ..._adk_prepared import PreparedRunner, prepare_runner
+from ..._streaming import (
+    StreamSink,
+    event_text,
+    sse_response,
+    stream_structured,
+    streaming_run_config,
+)
 from ...config import get_settings
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
@@ -44,7 +58,12 @@ from .agent import (
     get_generator_model,
     render_generator_prompt,
 )
-from .schemas import ExamPaperCore, ExamPaperRequest, ExamPaperResponse
+from .schemas import (
+    ExamPaperCore,
+    ExamPaperQuestion,
+    ExamPaperRequest,
+    ExamPaperResponse,
+)
 
 log = structlog.get_logger(__name__)
 
@@ -73,6 +92,15 @@ _PER_CALL_TIMEOUT_S = 60.0
 # This is opaque to the model — it's just a session-store key prefix.
 _EXAM_PAPER_APP_NAME = "sahayakai-exam-paper"
 
+# Subtrees forwarded as `partial` frames by the `/stream` route.
+_STREAM_WATCH = {
+    "title": None,
+    "generalInstructions[*]": None,
+    "sections[*].name": None,
+    "sections[*].label": None,
+    "sections[*].questions[*]": ExamPaperQuestion,
+}
+
 _LANGUAGE_NAME_TO_ISO: dict[str, str] = {
     "english": "en", "hindi": "hi", "tamil": "ta", "telugu": "te",
     "kannada": "kn", "malayalam": "ml", "bengali": "bn", "marathi": "mr",
@@ -91,8 +119,9 @@ def _iso_for_lang(language: str | None) -> str:
 
 
 def _build_pinned_agent(api_key: str) -> Any:
-    """Build a per-call `LlmAgent` with `.model` swapped to a `Gemini`
-    instance pinned to `api_key`.
+    """Build an `LlmAgent` with `.model` swapped to a `Gemini`
+    instance pinned to `api_key`. Called once per key by
+    `_prepared_runner`.
 
     Uses ADK 1.31's canonical `clone(update={...})` API (per Phase U
     finding #4); does NOT mutate the cached template. The template's
@@ -116,15 +145,28 @@ def _build_pinned_agent(api_key: str) -> Any:
     )
 
 
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned agent + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_EXAM_PAPER_APP_NAME,
+        template=build_exam_paper_agent(),
+        api_key=api_key,
+        pin=_build_pinned_agent,
+    )
+
+
 async def _run_generator_via_runner(
-    *, prompt: str, api_key: str,
+    *,
+    prompt: str,
+    api_key: str,
+    on_text: Callable[[str], None] | None = None,
 ) -> ExamPaperCore:
     """One ADK Runner invocation against the exam-paper LlmAgent.
 
-    Drives the cached `LlmAgent` template with a per-call clone whose
-    `.model` is a key-pinned `Gemini` instance. The rendered prompt is
-    passed as `new_message` (user content) — NOT as the agent's
-    `instruction` — because:
+    Drives the prepared (built once per key) clone of the cached
+    `LlmAgent` template whose `.model` is a key-pinned `Gemini`. The
+    rendered prompt is passed as `new_message` (user content) — NOT as
+    the agent's `instruction` — because:
       - The agent's `instruction` would go through ADK's
         `inject_session_state()` which scans for `{name}` patterns;
         teacher-controlled inputs may legitimately contain `{...}`
@@ -134,6 +176,9 @@ async def _run_generator_via_runner(
         per-request user input through ADK; matches what the previous
         `_call_gemini_structured` did (prompt → `contents`).
 
+    With `on_text` the agent runs in ADK's SSE mode: `partial` events'
+    text deltas go to `on_text` and are left out of the final text.
+
     Returns a parsed `ExamPaperCore` from the final event's text.
     Raises `AgentError(502)` on empty / unparseable output.
 
@@ -143,23 +188,9 @@ async def _run_generator_via_runner(
     (which is itself covered by ADK's own test suite + the static
     shape tests in `tests/unit/test_exam_paper_adk.py`).
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    agent_for_call = _build_pinned_agent(api_key)
-    runner = InMemoryRunner(
-        agent=agent_for_call, app_name=_EXAM_PAPER_APP_NAME,
-    )
-
-    # InMemoryRunner uses InMemorySessionService; we must create a
-    # session before run_async (no auto_create_session by default).
-    user_id = "exam-paper-generator"
-    session_id = f"exam-paper-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_EXAM_PAPER_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+    prepared = _prepared_runner(api_key)
 
     new_message = genai_types.Content(
         role="user",
@@ -167,19 +198,18 @@ async def _run_generator_via_runner(
     )
 
     final_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        # Accumulate text from final-response events. A single
-        # output_schema call typically yields one final event whose
-        # content.parts[0].text is the full JSON.
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                text = getattr(part, "text", None)
-                if text and not getattr(part, "thought", False):
-                    final_text += str(text)
+    async with prepared.session(
+        user_id="exam-paper-generator", prefix="exam-paper",
+    ) as ref:
+        run_config = streaming_run_config() if on_text is not None else None
+        async for event in prepared.run(ref, new_message, run_config):
+            if on_text is not None and getattr(event, "partial", False):
+                on_text(event_text(event))
+                continue
+            # Accumulate text from final-response events. A single
+            # output_schema call typically yields one final event whose
+            # content.parts[0].text is the full JSON.
+            final_text += event_text(event)
 
     if not final_text.strip():
         raise AgentError(
@@ -207,6 +237,7 @@ async def _run_generator(
     payload: ExamPaperRequest,
     api_keys: tuple[str, ...],
     settings: Any,
+    sink: StreamSink | None = None,
 ) -> ExamPaperCore:
     """Render the prompt and dispatch one ADK Runner invocation through
     the resilience layer.
@@ -233,8 +264,13 @@ async def _run_generator(
     prompt = render_generator_prompt(context)
 
     async def _do(api_key: str) -> ExamPaperCore:
+        if sink is None:
+            return await _run_generator_via_runner(
+                prompt=prompt, api_key=api_key,
+            )
+        sink.begin_attempt()
         return await _run_generator_via_runner(
-            prompt=prompt, api_key=api_key,
+            prompt=prompt, api_key=api_key, on_text=sink.write,
         )
 
     return await run_resiliently(
@@ -246,30 +282,13 @@ async def _run_generator(
     )
 
 
-# ---- Endpoint ------------------------------------------------------------
-
-
-@exam_paper_router.post("/generate", response_model=ExamPaperResponse)
-async def exam_paper_generate(payload: ExamPaperRequest) -> ExamPaperResponse:
-    settings = get_settings()
-    started = time.perf_counter()
-    api_keys = settings.genai_keys
+# ---- Endpoints -----------------------------------------------------------
 
-    try:
-        core = await _run_generator(payload, api_keys, settings)
-    except AISafetyBlockError as exc:
-        log.warning("exam_paper.safety_block", reason=str(exc))
-        raise
-    except AgentError:
-        raise
-    except Exception as exc:
-        log.error("exam_paper.generator.failed", error=str(exc))
-        raise AgentError(
-            code="INTERNAL",
-            message="Exam paper generator agent failed",
-            http_status=502,
-        ) from exc
 
+def _to_response(
+    payload: ExamPaperRequest, core: ExamPaperCore, started: float,
+) -> ExamPaperResponse:
+    """Behavioural guard + wire response, shared by both routes."""
     # Marks-balance + behavioural guard. Stays in pure-Python (Option B
     # from the Phase U.γ brief) — see `agent.py` module docstring.
     try:
@@ -323,3 +342,43 @@ async def exam_paper_generate(payload: ExamPaperRequest) -> ExamPaperResponse:
         latencyMs=latency_ms,
         modelUsed=get_generator_model(),
     )
+
+
+@exam_paper_router.post("/generate", response_model=ExamPaperResponse)
+async def exam_paper_generate(payload: ExamPaperRequest) -> ExamPaperResponse:
+    settings = get_settings()
+    started = time.perf_counter()
+    api_keys = settings.genai_keys
+
+    try:
+        core = await _run_generator(payload, api_keys, settings)
+    except AISafetyBlockError as exc:
+        log.warning("exam_paper.safety_block", reason=str(exc))
+        raise
+    except AgentError:
+        raise
+    except Exception as exc:
+        log.error("exam_paper.generator.failed", error=str(exc))
+        raise AgentError(
+            code="INTERNAL",
+            message="Exam paper generator agent failed",
+            http_status=502,
+        ) from exc
+
+    return _to_response(payload, core, started)
+
+
+@exam_paper_router.post("/generate/stream")
+async def exam_paper_generate_stream(payload: ExamPaperRequest) -> StreamingResponse:
+    """SSE variant of `/generate`; the `validated` frame is authoritative."""
+    settings = get_settings()
+    started = time.perf_counter()
+    api_keys = settings.genai_keys
+
+    return sse_response(stream_structured(
+        route="exam_paper",
+        started=started,
+        generate=lambda sink: _run_generator(payload, api_keys, settings, sink),
+        finalize=lambda core: _to_response(payload, core, started),
+        watch=_STREAM_WATCH,
+    ))
@@ -19,6 +19,7 @@ import structlog
 from fastapi import APIRouter
 
 from ...config import get_settings
+from ...genai_clients import get_genai_client
 from ...resilience import extract_cache_metrics, run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
 from ...shared.gemini_schema import gemini_response_schema
@@ -66,10 +67,9 @@ async def _call_gemini_grounded(
     compatible — the model returns JSON matching the schema while
     still being able to ground via search.
     """
-    from google import genai
     from google.genai import types as genai_types
 
-    client = genai.Client(api_key=api_key)
+    client = get_genai_client(api_key)
     # Gemini rejects `response_mime_type='application/json'` (structured output)
     # combined with `tools=[google_search]` — the API explicitly errors with
     # "Tool use with a response mime type: 'application/json' is unsupported".
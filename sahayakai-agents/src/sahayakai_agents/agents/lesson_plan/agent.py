@@ -47,7 +47,9 @@ ended after evaluator.
 
 Cost cap remains at most 4 model calls per request — same as the
 old procedural loop. The hard-fail short-circuit (no reviser run)
-is preserved.
+is preserved. The evaluator runs a deterministic pre-check first
+(``pre_evaluator``); when it decides locally, that evaluator call is
+not made.
 
 State keys used through the run (all stored on
 ``ctx.session.state`` via ``EventActions.state_delta``):
@@ -61,6 +63,9 @@ State keys used through the run (all stored on
   - ``lesson_plan_decision``: classification string (pass / revise /
     hard_fail) of the LATEST verdict — the router reads this to
     decide what to ship.
+  - ``lesson_plan_pre_eval_v1`` / ``lesson_plan_pre_eval_v2``: the
+    pre-check decision (pass / revise / defer) for that version; any
+    but ``defer`` means its verdict is local and saved a model call.
   - ``lesson_plan_request``: the dict the router pre-populated (used
     by sub-agents to render prompts and run the resilience layer).
   - ``lesson_plan_api_keys``: tuple of API keys.
@@ -69,13 +74,26 @@ State keys used through the run (all stored on
 The router seeds the request / api_keys / settings into the session
 state BEFORE invoking the LoopAgent's Runner.
 
+Streaming (`/v1/lesson-plan/generate/stream`): when
+``_streaming.current_stream_sink`` is set, the writer makes its call
+with ``generate_content_stream`` and forwards each text delta to the
+sink. Only the writer streams — v1 is what the teacher watches being
+built; a revision replaces it wholesale via the final ``validated``
+frame.
+
+Context caching: the evaluator and reviser templates are split at their
+``{{! cache-boundary }}`` comment. The static half (rubric / revision
+rules) is sent as a Gemini explicit cache via ``context_cache``; only
+the request and plan travel with each call.
+
 Phase L.3 deliverable. See
 ``sahayakai-main/.claude/plans/ai-agent-quality-and-migration-plan.md``.
 """
 from __future__ import annotations
 
 import os
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -86,6 +104,9 @@ import structlog
 from ..._behavioural import (
     _CONFUSABLE_FOLD as _UNUSED,  # noqa: F401 — keeps import-time pybars warm
 )
+from ..._streaming import current_stream_sink
+from ...context_cache import SplitPrompt, get_context_cache, split_template
+from ...genai_clients import get_genai_client
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError
 from .schemas import (
@@ -146,7 +167,8 @@ _compiler = pybars.Compiler()
 
 
 @lru_cache(maxsize=3)
-def _compiled(template_name: str) -> Any:
+def _compiled(template_name: str) -> tuple[Any, Any]:
+    """(static prefix, per-request suffix) templates; see `context_cache`."""
     if template_name == "writer":
         source = load_writer_prompt()
     elif template_name == "evaluator":
@@ -155,22 +177,42 @@ def _compiled(template_name: str) -> Any:
         source = load_reviser_prompt()
     else:
         raise ValueError(f"Unknown lesson-plan template name: {template_name!r}")
-    return _compiler.compile(source)
+    prefix, suffix = split_template(source)
+    return _compiler.compile(prefix), _compiler.compile(suffix)
+
+
+def _render_split(template_name: str, context: dict[str, Any]) -> SplitPrompt:
+    prefix, suffix = _compiled(template_name)
+    return SplitPrompt(
+        agent=f"lesson_plan.{template_name}",
+        prefix=str(prefix(context)),
+        suffix=str(suffix(context)),
+    )
 
 
 def render_writer_prompt(context: dict[str, Any]) -> str:
     """Render the writer prompt against the request context."""
-    return str(_compiled("writer")(context))
+    return _render_split("writer", context).text
 
 
 def render_evaluator_prompt(context: dict[str, Any]) -> str:
     """Render the evaluator prompt with the request + draft plan."""
-    return str(_compiled("evaluator")(context))
+    return render_evaluator_prompt_split(context).text
+
+
+def render_evaluator_prompt_split(context: dict[str, Any]) -> SplitPrompt:
+    """`render_evaluator_prompt`, with the static rubric kept apart."""
+    return _render_split("evaluator", context)
 
 
 def render_reviser_prompt(context: dict[str, Any]) -> str:
     """Render the reviser prompt with v1 + fail reasons + request."""
-    return str(_compiled("reviser")(context))
+    return render_reviser_prompt_split(context).text
+
+
+def render_reviser_prompt_split(context: dict[str, Any]) -> SplitPrompt:
+    """`render_reviser_prompt`, with the static rules kept apart."""
+    return _render_split("reviser", context)
 
 
 # ---- Model selection ------------------------------------------------------
@@ -243,11 +285,27 @@ def classify_verdict(verdict: EvaluatorVerdict) -> str:
 _PER_CALL_TIMEOUT_S = 30.0
 
 
+def _structured_config(response_schema: type) -> Any:
+    from google.genai import types as genai_types  # noqa: PLC0415
+
+    from ...shared.gemini_schema import gemini_response_schema  # noqa: PLC0415
+
+    return genai_types.GenerateContentConfig(
+        response_mime_type="application/json",
+        # Strip `additionalProperties` (and friends) before handing the schema
+        # to Gemini — the API rejects the raw Pydantic JSON-Schema dump.
+        response_schema=gemini_response_schema(response_schema),
+        # Lower temperature for structured output — lesson plans
+        # are pedagogical artefacts, not creative writing.
+        temperature=0.4,
+    )
+
+
 async def _call_gemini_structured(
     *,
     api_key: str,
     model: str,
-    prompt: str,
+    prompt: str | SplitPrompt,
     response_schema: type,
 ) -> Any:
     """One Gemini call with structured JSON output.
@@ -255,26 +313,60 @@ async def _call_gemini_structured(
     Identical pattern to the old router-level helper. Kept inside the
     agent module now so each sub-agent can run its own resilient call
     without the router needing to know about Gemini at all.
+
+    A `SplitPrompt` (evaluator, reviser) goes through the explicit
+    context cache for its static prefix.
     """
-    from google import genai  # noqa: PLC0415
-    from google.genai import types as genai_types  # noqa: PLC0415
+    if isinstance(prompt, SplitPrompt):
+        return await get_context_cache().generate(
+            api_key=api_key,
+            model=model,
+            prompt=prompt,
+            config=_structured_config(response_schema),
+        )
+    client = get_genai_client(api_key)
+    return await client.aio.models.generate_content(
+        model=model,
+        contents=prompt,
+        config=_structured_config(response_schema),
+    )
 
-    from ...shared.gemini_schema import gemini_response_schema  # noqa: PLC0415
 
-    client = genai.Client(api_key=api_key)
-    return await client.aio.models.generate_content(
+@dataclass
+class _StreamedResult:
+    """Aggregate of a streamed call, shaped like a `generate_content`
+    result for `_extract_text` and `ai_resilience` token accounting."""
+
+    text: str
+    usage_metadata: Any = None
+
+
+async def _call_gemini_structured_stream(
+    *,
+    api_key: str,
+    model: str,
+    prompt: str,
+    response_schema: type,
+    on_text: Callable[[str], None],
+) -> _StreamedResult:
+    """`_call_gemini_structured`, streamed: each chunk's text goes to
+    `on_text` as it arrives. The last chunk carries the usage metadata.
+    """
+    client = get_genai_client(api_key)
+    stream = await client.aio.models.generate_content_stream(
         model=model,
         contents=prompt,
-        config=genai_types.GenerateContentConfig(
-            response_mime_type="application/json",
-            # Strip `additionalProperties` (and friends) before handing the schema
-            # to Gemini — the API rejects the raw Pydantic JSON-Schema dump.
-            response_schema=gemini_response_schema(response_schema),
-            # Lower temperature for structured output — lesson plans
-            # are pedagogical artefacts, not creative writing.
-            temperature=0.4,
-        ),
+        config=_structured_config(response_schema),
     )
+    parts: list[str] = []
+    usage = None
+    async for chunk in stream:
+        text = getattr(chunk, "text", None)
+        if text:
+            parts.append(text)
+            on_text(text)
+        usage = getattr(chunk, "usage_metadata", None) or usage
+    return _StreamedResult(text="".join(parts), usage_metadata=usage)
 
 
 def _extract_text(result: Any) -> str:
@@ -344,8 +436,18 @@ def _build_writer_sub_agent() -> BaseAgent:
 
             prompt = render_writer_prompt(_request_to_render_dict(request))
             model = get_writer_model()
+            sink = current_stream_sink.get()
 
             async def _do(api_key: str) -> Any:
+                if sink is not None:
+                    sink.begin_attempt()
+                    return await _call_gemini_structured_stream(
+                        api_key=api_key,
+                        model=model,
+                        prompt=prompt,
+                        response_schema=LessonPlanCore,
+                        on_text=sink.write,
+                    )
                 return await _call_gemini_structured(
                     api_key=api_key,
                     model=model,
@@ -387,13 +489,65 @@ def _build_writer_sub_agent() -> BaseAgent:
     return _WriterSubAgent(name="lesson_plan_writer")
 
 
+async def _model_verdict(
+    plan: LessonPlanCore,
+    request: LessonPlanRequest,
+    api_keys: tuple[str, ...],
+    settings: Any,
+) -> EvaluatorVerdict:
+    """Score ``plan`` with the evaluator model (one Gemini call)."""
+    context = {
+        "plan": plan.model_dump_json(),
+        "request": request.model_dump_json(exclude_none=True),
+    }
+    prompt = render_evaluator_prompt_split(context)
+    model = get_evaluator_model()
+
+    async def _do(api_key: str) -> Any:
+        return await _call_gemini_structured(
+            api_key=api_key,
+            model=model,
+            prompt=prompt,
+            response_schema=EvaluatorVerdict,
+        )
+
+    result = await run_resiliently(
+        _do,
+        api_keys,
+        span_name="lesson_plan.evaluator",
+        max_total_backoff_seconds=settings.max_total_backoff_seconds,
+        per_call_timeout_seconds=_PER_CALL_TIMEOUT_S,
+    )
+    text = _extract_text(result)
+    try:
+        verdict = EvaluatorVerdict.model_validate_json(text)
+    except Exception as exc:
+        log.error(
+            "lesson_plan.evaluator.json_parse_failed",
+            raw_excerpt=text[:200],
+            error=str(exc),
+        )
+        raise AgentError(
+            code="INTERNAL",
+            message=(
+                "Evaluator returned text that does not match "
+                "EvaluatorVerdict"
+            ),
+            http_status=502,
+        ) from exc
+    return verdict
+
+
 def _build_evaluator_sub_agent() -> BaseAgent:
     """Sub-agent that scores the latest plan and gates the loop.
 
     Reads ``state["lesson_plan_v2"]`` if present; falls back to
-    ``state["lesson_plan_v1"]``. Stores its verdict to a key suffixed
-    with the version it scored. Sets ``state["lesson_plan_decision"]``
-    to the classification.
+    ``state["lesson_plan_v1"]``. Runs the deterministic pre-check
+    (``pre_evaluator.pre_evaluate``) and only calls the evaluator
+    model when it defers. Stores its verdict to a key suffixed
+    with the version it scored, and the pre-check decision to
+    ``lesson_plan_pre_eval_v1`` / ``_v2``. Sets
+    ``state["lesson_plan_decision"]`` to the classification.
 
     Emits ``escalate=True`` when the loop should stop:
       - ``pass`` or ``hard_fail`` on v1 → escalate.
@@ -405,6 +559,8 @@ def _build_evaluator_sub_agent() -> BaseAgent:
     from google.adk.events.event import Event  # noqa: PLC0415
     from google.adk.events.event_actions import EventActions  # noqa: PLC0415
 
+    from .pre_evaluator import pre_evaluate  # noqa: PLC0415
+
     class _EvaluatorSubAgent(BaseAgent):
         async def _run_async_impl(
             self, ctx: InvocationContext
@@ -428,45 +584,25 @@ def _build_evaluator_sub_agent() -> BaseAgent:
             request = LessonPlanRequest.model_validate(request_dict)
             plan = LessonPlanCore.model_validate(target_dict)
 
-            context = {
-                "plan": plan.model_dump_json(),
-                "request": request.model_dump_json(exclude_none=True),
-            }
-            prompt = render_evaluator_prompt(context)
-            model = get_evaluator_model()
-
-            async def _do(api_key: str) -> Any:
-                return await _call_gemini_structured(
-                    api_key=api_key,
-                    model=model,
-                    prompt=prompt,
-                    response_schema=EvaluatorVerdict,
-                )
-
-            result = await run_resiliently(
-                _do,
-                api_keys,
-                span_name="lesson_plan.evaluator",
-                max_total_backoff_seconds=settings.max_total_backoff_seconds,
-                per_call_timeout_seconds=_PER_CALL_TIMEOUT_S,
+            # Deterministic pre-check (see pre_evaluator.py): a local
+            # verdict replaces the evaluator call; `defer` falls through
+            # to the model.
+            local = pre_evaluate(
+                plan,
+                request,
+                mode=settings.lesson_plan_pre_eval,
+                scoring_v2=scoring_v2,
             )
-            text = _extract_text(result)
-            try:
-                verdict = EvaluatorVerdict.model_validate_json(text)
-            except Exception as exc:
-                log.error(
-                    "lesson_plan.evaluator.json_parse_failed",
-                    raw_excerpt=text[:200],
-                    error=str(exc),
+            if local.verdict is not None:
+                log.info(
+                    "lesson_plan.pre_eval_decided",
+                    decision=local.decision,
+                    failed=list(local.failed),
+                    scoring_v2=scoring_v2,
                 )
-                raise AgentError(
-                    code="INTERNAL",
-                    message=(
-                        "Evaluator returned text that does not match "
-                        "EvaluatorVerdict"
-                    ),
-                    http_status=502,
-                ) from exc
+                verdict = local.verdict
+            else:
+                verdict = await _model_verdict(plan, request, api_keys, settings)
 
             decision = classify_verdict(verdict)
             verdict_key = (
@@ -475,6 +611,7 @@ def _build_evaluator_sub_agent() -> BaseAgent:
             state_delta: dict[str, object] = {
                 verdict_key: verdict.model_dump(mode="json"),
                 "lesson_plan_decision": decision,
+                f"lesson_plan_pre_eval_v{2 if scoring_v2 else 1}": local.decision,
             }
 
             # Escalation policy:
@@ -550,7 +687,7 @@ def _build_reviser_sub_agent() -> BaseAgent:
                 "request": request.model_dump_json(exclude_none=True),
                 "fail_reasons": list(verdict_v1.fail_reasons),
             }
-            prompt = render_reviser_prompt(context)
+            prompt = render_reviser_prompt_split(context)
             model = get_reviser_model()
 
             async def _do(api_key: str) -> Any:
@@ -676,7 +813,9 @@ __all__ = [
     "get_reviser_model",
     "render_writer_prompt",
     "render_evaluator_prompt",
+    "render_evaluator_prompt_split",
     "render_reviser_prompt",
+    "render_reviser_prompt_split",
     "QUALITY_HARD_FAIL_AXIS_COUNT",
     "QUALITY_PASS_AXIS_COUNT",
     "QUALITY_PASS_THRESHOLD",
@@ -0,0 +1,235 @@
+"""Deterministic pre-check that runs before the lesson-plan evaluator.
+
+The evaluator is a full Gemini call on every plan, even when the
+writer's output is structurally broken in ways a few lines of Python
+can see: no assessment, a missing 5E phase, activity timings that add
+up to twice the period, the wrong script, a stub. ``pre_evaluate``
+runs those checks first and returns one of three decisions:
+
+- **revise** — at least one check failed. The failed checks become
+  ``fail_reasons`` for the reviser and each lowers the rubric axis it
+  belongs to (``_CHECK_AXES``) to 0.0; every other axis sits at the
+  pass threshold. The decision is whatever ``classify_verdict`` makes
+  of that verdict, and only ``"revise"`` is acted on: a single failed
+  axis still classifies as ``pass`` and four or more as ``hard_fail``,
+  and both defer to the model. Only v1 is ever revised locally, so
+  the plan that ships has always been through the model evaluator.
+- **pass** — every check passed with margin (timings parse and land
+  within ``_PASS_TIMING_TOLERANCE`` of the lesson duration). This
+  skips the model's safety judgement, so it only happens in ``full``
+  mode.
+- **defer** — anything else. The model evaluator runs as before.
+
+``SAHAYAKAI_LESSON_PLAN_PRE_EVAL`` picks the mode: ``off``, ``revise``
+(default) or ``full``. Each local decision replaces exactly one
+evaluator call; the router reports the total as ``modelCallsSaved``.
+
+The length and script checks are the ones the router's post-loop
+behavioural guard runs (``_behavioural.assert_lesson_plan_length`` /
+``assert_script_matches_language``) on the same text
+(``guard_text``), so a plan the guard would reject is sent back to the
+reviser instead of reaching it.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Literal, get_args
+
+from ..._behavioural import assert_lesson_plan_length, assert_script_matches_language
+from .agent import QUALITY_PASS_THRESHOLD, classify_verdict
+from .schemas import (
+    ActivityPhase,
+    EvaluatorVerdict,
+    LessonPlanCore,
+    LessonPlanRequest,
+    RubricScores,
+)
+
+PreEvalMode = Literal["off", "revise", "full"]
+PreEvalDecision = Literal["pass", "revise", "defer"]
+
+_PHASES: tuple[str, ...] = get_args(ActivityPhase)
+# More than two activities per 5E phase is padding, not scaffolding.
+_MAX_ACTIVITIES = 2 * len(_PHASES)
+# Activity minutes may drift this far from the lesson duration before
+# the timing check fails ...
+_FAIL_TIMING_TOLERANCE = 0.25
+# ... and must be this close for a confident pass.
+_PASS_TIMING_TOLERANCE = 0.10
+
+# Rubric axis each check speaks to.
+_CHECK_AXES: dict[str, str] = {
+    "objectives": "objective_assessment_match",
+    "assessment": "objective_assessment_match",
+    "phases": "scaffolding_present",
+    "activities": "scaffolding_present",
+    "timing": "resource_level_realism",
+    "script": "language_naturalness",
+    "length": "grade_level_alignment",
+}
+
+# "10 minutes", "1 hour 30 min", "1h30m", "5-7 min", "१० मिनट", "1 घंटा".
+_DURATION_PART = re.compile(
+    r"(\d+(?:\.\d+)?)(?:\s*[-–]\s*(\d+(?:\.\d+)?))?\s*([^\d\s]*)"
+)
+_HOUR_UNITS = ("h", "घंट", "ঘণ্ট")
+
+
+def guard_text(plan: LessonPlanCore) -> str:
+    """The text the behavioural guard checks: title, objectives and
+    activity names and descriptions."""
+    return " ".join(
+        [
+            plan.title,
+            *plan.objectives,
+            *(act.name + " " + act.description for act in plan.activities),
+        ]
+    )
+
+
+def parse_minutes(text: str | None) -> float | None:
+    """Minutes in a free-text duration, or ``None`` if it has no number.
+
+    Digits in any script count; a range counts as its midpoint; a
+    number is hours if the word after it starts with an hour unit and
+    minutes otherwise.
+    """
+    if not text:
+        return None
+    ascii_digits = "".join(
+        str(unicodedata.digit(ch)) if ch.isdigit() else ch for ch in text
+    )
+    total: float | None = None
+    for low, high, unit in _DURATION_PART.findall(ascii_digits):
+        value = (float(low) + float(high)) / 2 if high else float(low)
+        if unit.casefold().startswith(_HOUR_UNITS):
+            value *= 60
+        total = (total or 0.0) + value
+    return total
+
+
+@dataclass(frozen=True)
+class PreEvaluation:
+    """Outcome of ``pre_evaluate``. ``verdict`` is set unless deferring."""
+
+    decision: PreEvalDecision
+    failed: tuple[str, ...] = ()
+    verdict: EvaluatorVerdict | None = field(default=None, compare=False)
+
+
+def _timing(plan: LessonPlanCore) -> tuple[str | None, bool]:
+    """(fail reason, within the pass tolerance)."""
+    planned = parse_minutes(plan.duration)
+    spent = [parse_minutes(act.duration) for act in plan.activities]
+    if not planned or any(m is None for m in spent):
+        return None, False
+    total = sum(m for m in spent if m is not None)
+    drift = abs(total - planned) / planned
+    if drift > _FAIL_TIMING_TOLERANCE:
+        return (
+            f"Activity durations add up to {total:g} minutes but the lesson "
+            f"is {planned:g} minutes; rebalance the activities to fit the period.",
+            False,
+        )
+    return None, drift <= _PASS_TIMING_TOLERANCE
+
+
+def _findings(
+    plan: LessonPlanCore, language: str
+) -> tuple[dict[str, str], bool]:
+    """Failed checks (name -> fail reason) and whether the timing check
+    passed with margin."""
+    failed: dict[str, str] = {}
+    if not any(o.strip() for o in plan.objectives):
+        failed["objectives"] = "The plan has no learning objectives; add measurable ones."
+    if not (plan.assessment or "").strip():
+        failed["assessment"] = (
+            "The plan has no assessment; add one that checks the stated objectives."
+        )
+    covered = {a.phase for a in plan.activities}
+    missing = [p for p in _PHASES if p not in covered]
+    if missing:
+        failed["phases"] = (
+            f"Activities do not cover the 5E phases: missing {', '.join(missing)}."
+        )
+    blank = [
+        i + 1 for i, a in enumerate(plan.activities)
+        if not (a.name.strip() and a.description.strip())
+    ]
+    if blank or len(plan.activities) > _MAX_ACTIVITIES:
+        failed["activities"] = (
+            f"Activities {', '.join(map(str, blank))} have no name or description."
+            if blank
+            else f"{len(plan.activities)} activities is too many for one lesson; "
+            f"keep at most {_MAX_ACTIVITIES}."
+        )
+    timing_reason, timing_tight = _timing(plan)
+    if timing_reason:
+        failed["timing"] = timing_reason
+    text = guard_text(plan)
+    try:
+        assert_script_matches_language(text, language)
+    except AssertionError as exc:
+        failed["script"] = str(exc)
+    try:
+        assert_lesson_plan_length(text)
+    except AssertionError as exc:
+        failed["length"] = str(exc)
+    return failed, timing_tight
+
+
+def _verdict(failed: dict[str, str]) -> EvaluatorVerdict:
+    low = {_CHECK_AXES[name] for name in failed}
+    scores = {
+        axis: 0.0 if axis in low else QUALITY_PASS_THRESHOLD
+        for axis in RubricScores.model_fields
+    }
+    rationale = (
+        f"Deterministic pre-check: {len(failed)} structural check(s) failed."
+        if failed
+        else "Deterministic pre-check: all structural checks passed."
+    )
+    return EvaluatorVerdict(
+        scores=RubricScores(**scores),
+        safety=True,
+        rationale=rationale,
+        fail_reasons=[reason[:500] for reason in failed.values()],
+    )
+
+
+def pre_evaluate(
+    plan: LessonPlanCore,
+    request: LessonPlanRequest,
+    *,
+    mode: PreEvalMode,
+    scoring_v2: bool,
+) -> PreEvaluation:
+    """Decide ``plan`` locally if the mode and checks allow it; see the
+    module docstring."""
+    if mode == "off":
+        return PreEvaluation("defer")
+    failed, timing_tight = _findings(plan, request.language or "en")
+    if failed:
+        if scoring_v2:
+            return PreEvaluation("defer", tuple(failed))
+        verdict = _verdict(failed)
+        if classify_verdict(verdict) != "revise":
+            return PreEvaluation("defer", tuple(failed))
+        return PreEvaluation("revise", tuple(failed), verdict)
+    if mode == "full" and timing_tight:
+        verdict = _verdict({})
+        if classify_verdict(verdict) == "pass":
+            return PreEvaluation("pass", (), verdict)
+    return PreEvaluation("defer")
+
+
+__all__ = [
+    "PreEvalDecision",
+    "PreEvalMode",
+    "PreEvaluation",
+    "guard_text",
+    "parse_minutes",
+    "pre_evaluate",
+]
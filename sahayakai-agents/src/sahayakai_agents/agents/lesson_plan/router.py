@@ -21,27 +21,54 @@ Cost cap: still max 4 model calls (writer + evaluator + reviser +
 evaluator-on-v2) per lesson plan. The cap is enforced both by the
 ``LoopAgent``'s ``max_iterations=2`` and by the sub-agents' state-
 based no-op guards.
+
+The evaluator's deterministic pre-check (``pre_evaluator``) can decide
+a version without its model call; ``modelCallsSaved`` reports how
+many were skipped.
+
+``POST /v1/lesson-plan/generate/stream`` is the SSE variant (see
+``_streaming``): the writer's v1 is streamed and its title,
+objectives, materials and activities are forwarded as they complete.
+The evaluator (and a possible revision) still run before the final
+``validated`` frame, which is authoritative — it may carry v2.
+
+``/generate`` responses are served through the content-addressed
+response cache (see ``response_cache``), keyed on the sanitized
+request minus ``userId``.
 """
 from __future__ import annotations
 
 import time
-import uuid
 from typing import Any
 
 import structlog
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import StreamingResponse
 
+from ..._adk_prepared import prepare_runner
 from ..._behavioural import assert_lesson_plan_rules
+from ..._streaming import sse_response, stream_structured
 from ...config import get_settings
 from ...resilience import extract_cache_metrics
+from ...response_cache import (
+    get_response_cache,
+    mark_cache,
+    prompt_version,
+    response_cache_key,
+    wants_fresh,
+)
 from ...shared.errors import AgentError, AISafetyBlockError
 from ...shared.prompt_safety import sanitize, sanitize_list, sanitize_optional
 from .agent import (
     build_lesson_plan_agent,
     classify_verdict,
+    get_evaluator_model,
+    get_reviser_model,
     get_writer_model,
 )
+from .pre_evaluator import guard_text
 from .schemas import (
+    Activity,
     EvaluatorVerdict,
     LessonPlanCore,
     LessonPlanRequest,
@@ -61,6 +88,15 @@ SIDECAR_VERSION = "phase-l.3"
 # Opaque to the model — just a session-store key prefix.
 _LESSON_PLAN_APP_NAME = "sahayakai-lesson-plan"
 
+# Subtrees of the writer's v1 forwarded as `partial` frames by the
+# `/stream` route.
+_STREAM_WATCH = {
+    "title": None,
+    "objectives[*]": None,
+    "materials[*]": None,
+    "activities[*]": Activity,
+}
+
 
 # ---- Request sanitization (unchanged from pre-L.3) ----------------------
 
@@ -122,14 +158,17 @@ async def _run_lesson_plan_loop(
     / ``lesson_plan_verdict_v2`` / ``lesson_plan_decision`` were
     populated during the run.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
+    # The LoopAgent resolves keys itself (from session state), so one
+    # prepared runner serves every request: key slot left empty.
     agent = build_lesson_plan_agent()
-    runner = InMemoryRunner(agent=agent, app_name=_LESSON_PLAN_APP_NAME)
-
-    user_id = sanitized_request.get("userId") or "lesson-plan-user"
-    session_id = f"lesson-plan-{uuid.uuid4().hex}"
+    prepared = prepare_runner(
+        app_name=_LESSON_PLAN_APP_NAME,
+        template=agent,
+        api_key="",
+        pin=lambda _api_key: agent,
+    )
 
     # Seed session state with the inputs each sub-agent reads.
     initial_state: dict[str, Any] = {
@@ -137,12 +176,6 @@ async def _run_lesson_plan_loop(
         "lesson_plan_api_keys": api_keys,
         "lesson_plan_settings": settings,
     }
-    await runner.session_service.create_session(
-        app_name=_LESSON_PLAN_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-        state=initial_state,
-    )
 
     # Driver kick-off message. The sub-agents don't read this — they
     # work off session state — but Runner requires a non-empty
@@ -152,67 +185,42 @@ async def _run_lesson_plan_loop(
         parts=[genai_types.Part(text="run lesson-plan loop")],
     )
 
-    async for _event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        # We don't consume events directly — the sub-agents push their
-        # outputs into session state via ``state_delta``. The Runner
-        # applies those deltas to the InMemorySessionService session
-        # before yielding. Read the final state when the generator
-        # completes.
-        pass
-
-    final_session = await runner.session_service.get_session(
-        app_name=_LESSON_PLAN_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
-    if final_session is None:
+    async with prepared.session(
+        user_id=sanitized_request.get("userId") or "lesson-plan-user",
+        prefix="lesson-plan",
+        state=initial_state,
+    ) as ref:
+        async for _event in prepared.run(ref, new_message):
+            # We don't consume events directly — the sub-agents push
+            # their outputs into session state via ``state_delta``. The
+            # Runner applies those deltas to the InMemorySessionService
+            # session before yielding. Read the final state when the
+            # generator completes (and before the session is dropped).
+            pass
+
+        final_state = await prepared.state(ref)
+    if final_state is None:
         # Defensive: should never happen because we just created it.
         raise AgentError(
             code="INTERNAL",
             message="Lesson plan session disappeared mid-run",
             http_status=502,
         )
-    return dict(final_session.state)
+    return final_state
 
 
-# ---- Endpoint -----------------------------------------------------------
+# ---- Endpoints ----------------------------------------------------------
 
 
-@router.post("/generate", response_model=LessonPlanResponse)
-async def lesson_plan_generate(  # noqa: PLR0915 — single-purpose handler with linear flow
+def _to_response(  # noqa: PLR0915 — single-purpose handler with linear flow
     payload: LessonPlanRequest,
+    final_state: dict[str, Any],
+    started: float,
 ) -> LessonPlanResponse:
-    """Generate a lesson plan via the ADK LoopAgent.
+    """Pick the plan to ship, guard it and build the wire response.
 
-    Flow:
-        1. Sanitize the request and seed it into session state.
-        2. ADK ``LoopAgent`` runs writer → evaluator → (revise →
-           evaluator-on-v2) until escalate or max_iterations.
-        3. Read final state:
-             - decision == "pass"  → ship v1.
-             - decision == "hard_fail" on v1 → 502 (canned safe).
-             - revised path → ship v2 unless v2 hard-failed (then v1
-               per "never amplify" rule).
-        4. Behavioural guard on the shipped plan. Fail-closed.
+    Shared by both routes; ``started`` is a ``time.monotonic()`` stamp.
     """
-    settings = get_settings()
-    started = time.monotonic()
-    api_keys = settings.genai_keys
-
-    sanitized_request = _request_to_dict(payload)
-
-    try:
-        final_state = await _run_lesson_plan_loop(
-            sanitized_request, api_keys, settings,
-        )
-    except AISafetyBlockError as exc:
-        log.warning("lesson_plan.safety_block", reason=str(exc))
-        raise
-
     # Read sub-agent outputs from final state. The sub-agents always
     # populate v1 + verdict_v1; v2 + verdict_v2 only on the revise
     # path.
@@ -234,6 +242,13 @@ async def lesson_plan_generate(  # noqa: PLR0915 — single-purpose handler with
     plan_v1 = LessonPlanCore.model_validate(v1_dict)
     verdict_v1 = EvaluatorVerdict.model_validate(verdict_v1_dict)
     decision_v1 = classify_verdict(verdict_v1)
+    # Each verdict the pre-evaluator decided locally is one evaluator
+    # call not made (see pre_evaluator.py).
+    pre_eval = (
+        final_state.get("lesson_plan_pre_eval_v1"),
+        final_state.get("lesson_plan_pre_eval_v2"),
+    )
+    model_calls_saved = sum(d in ("pass", "revise") for d in pre_eval)
 
     final_plan: LessonPlanCore
     final_verdict: EvaluatorVerdict
@@ -275,6 +290,24 @@ async def lesson_plan_generate(  # noqa: PLR0915 — single-purpose handler with
         verdict_v2 = EvaluatorVerdict.model_validate(verdict_v2_dict)
         revisions_run = 1
         decision_v2 = classify_verdict(verdict_v2)
+        if decision_v2 == "hard_fail" and pre_eval[0] == "revise":
+            # v1 went to the reviser on the local pre-check, so no
+            # model ever judged it: there is no safe plan to fall
+            # back to.
+            log.error(
+                "lesson_plan.hard_fail_v2",
+                scores=verdict_v2.scores.model_dump(),
+                safety=verdict_v2.safety,
+                v1_pre_eval_failed=verdict_v1.fail_reasons,
+            )
+            raise AgentError(
+                code="INTERNAL",
+                message=(
+                    "Lesson plan failed safety / quality gate; "
+                    "route returns canned safe response."
+                ),
+                http_status=502,
+            )
         if decision_v2 == "hard_fail":
             # Reviser made it worse. Per Phase 3 plan §Risks/Reviser-
             # hallucinations: never amplify; ship v1 with v1's verdict.
@@ -290,16 +323,9 @@ async def lesson_plan_generate(  # noqa: PLR0915 — single-purpose handler with
             final_verdict = verdict_v2
 
     # Behavioural guard. Fail-closed.
-    plan_text_for_guard = " ".join(
-        [
-            final_plan.title,
-            *final_plan.objectives,
-            *(act.name + " " + act.description for act in final_plan.activities),
-        ]
-    )
     try:
         assert_lesson_plan_rules(
-            plan_text=plan_text_for_guard,
+            plan_text=guard_text(final_plan),
             language=payload.language or "en",
         )
     except AssertionError as exc:
@@ -325,6 +351,7 @@ async def lesson_plan_generate(  # noqa: PLR0915 — single-purpose handler with
         latency_ms=latency_ms,
         revisions_run=revisions_run,
         decision_v1=decision_v1,
+        model_calls_saved=model_calls_saved,
         language=final_plan.language,
         grade_level=final_plan.gradeLevel,
         model_used=get_writer_model(),
@@ -350,5 +377,104 @@ async def lesson_plan_generate(  # noqa: PLR0915 — single-purpose handler with
         modelUsed=get_writer_model(),
         cacheHitRatio=metrics.cache_hit_ratio if metrics else None,
         revisionsRun=revisions_run,
+        modelCallsSaved=model_calls_saved,
         rubric=final_verdict,
     )
+
+
+@router.post("/generate", response_model=LessonPlanResponse)
+async def lesson_plan_generate(
+    payload: LessonPlanRequest,
+    request: Request,
+    response: Response,
+) -> LessonPlanResponse:
+    """Generate a lesson plan via the ADK LoopAgent.
+
+    Flow:
+        1. Sanitize the request and seed it into session state.
+        2. ADK ``LoopAgent`` runs writer → evaluator → (revise →
+           evaluator-on-v2) until escalate or max_iterations.
+        3. Read final state:
+             - decision == "pass"  → ship v1.
+             - decision == "hard_fail" on v1 → 502 (canned safe).
+             - revised path → ship v2 unless v2 hard-failed (then v1
+               per "never amplify" rule).
+        4. Behavioural guard on the shipped plan. Fail-closed.
+
+    Identical sanitized requests are answered from the response cache
+    (``X-Cache: hit``); concurrent ones share a single loop run.
+    """
+    settings = get_settings()
+    started = time.monotonic()
+    api_keys = settings.genai_keys
+
+    sanitized_request = _request_to_dict(payload)
+
+    async def _generate() -> LessonPlanResponse:
+        try:
+            final_state = await _run_lesson_plan_loop(
+                sanitized_request, api_keys, settings,
+            )
+        except AISafetyBlockError as exc:
+            log.warning("lesson_plan.safety_block", reason=str(exc))
+            raise
+        return _to_response(payload, final_state, started)
+
+    key = response_cache_key(
+        "lesson_plan",
+        {k: v for k, v in sanitized_request.items() if k != "userId"},
+        prompts=prompt_version("lesson-plan"),
+        model="/".join(
+            (get_writer_model(), get_evaluator_model(), get_reviser_model()),
+        ),
+    )
+    result, status = await get_response_cache().get_or_compute(
+        key,
+        route="lesson_plan",
+        model=LessonPlanResponse,
+        compute=_generate,
+        fresh=wants_fresh(request),
+    )
+    mark_cache(response, status)
+    if status == "hit":
+        # No model call ran for this request: reset the per-run counters
+        # instead of replaying the original run's.
+        result = result.model_copy(
+            update={
+                "cacheHit": True,
+                "sidecarVersion": SIDECAR_VERSION,
+                "latencyMs": int((time.monotonic() - started) * 1000),
+                "cacheHitRatio": None,
+                "revisionsRun": 0,
+                "modelCallsSaved": 0,
+            },
+        )
+    return result
+
+
+@router.post("/generate/stream")
+async def lesson_plan_generate_stream(
+    payload: LessonPlanRequest,
+) -> StreamingResponse:
+    """SSE variant of `/generate`; the `validated` frame is authoritative.
+
+    Unlike the single-shot routes, a writer fragment that trips the
+    forbidden-phrase check only stops the partials: the loop may still
+    revise it away, so the final guard decides.
+    """
+    settings = get_settings()
+    started = time.monotonic()
+    api_keys = settings.genai_keys
+    sanitized_request = _request_to_dict(payload)
+
+    return sse_response(stream_structured(
+        route="lesson_plan",
+        started=time.perf_counter(),
+        # The writer picks the sink up from `current_stream_sink`.
+        generate=lambda _sink: _run_lesson_plan_loop(
+            sanitized_request, api_keys, settings,
+        ),
+        finalize=lambda final_state: _to_response(payload, final_state, started),
+        watch=_STREAM_WATCH,
+        abort_on_guard_failure=False,
+    ))
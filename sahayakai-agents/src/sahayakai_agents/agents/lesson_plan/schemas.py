@@ -204,11 +204,15 @@ class LessonPlanResponse(BaseModel):
     # Additive telemetry.
     sidecarVersion: str = Field(max_length=64)
     latencyMs: int = Field(ge=0)
+    cacheHit: bool = Field(default=False, description="Served from the response cache.")
     modelUsed: str = Field(max_length=200)
     cacheHitRatio: float | None = Field(default=None, ge=0.0, le=1.0)
     # Number of evaluator-revise loops actually run (0 = writer
     # passed first time; 1 = one revise; 2 = max per cost cap).
     revisionsRun: int = Field(ge=0, le=2)
+    # Evaluator calls the deterministic pre-check made unnecessary
+    # (0-2; one per plan version it decided locally).
+    modelCallsSaved: int = Field(default=0, ge=0, le=2)
     # Final evaluator verdict — exposed so the dispatcher can see
     # the rubric breakdown for observability without the model body.
     rubric: EvaluatorVerdict
@@ -30,8 +30,9 @@ from fastapi import APIRouter
 
 from ..._behavioural import assert_all_rules
 from ...config import get_settings
+from ...genai_clients import get_genai_client
 from ...resilience import extract_cache_metrics, run_resiliently
-from ...session_store import SessionStore, TurnRecord
+from ...session_store import TranscriptStore, TurnRecord, build_session_store
 from ...shared.errors import AgentError, AISafetyBlockError
 from .agent import (
     AgentReplyCore,
@@ -63,13 +64,13 @@ router = APIRouter(prefix="/v1/parent-call", tags=["parent-call"])
 _PER_CALL_TIMEOUT_S = 5.0
 
 # Process-scoped session store. Initialised lazily so tests can swap it.
-_session_store: SessionStore | None = None
+_session_store: TranscriptStore | None = None
 
 
-def _get_session_store() -> SessionStore:
+def _get_session_store() -> TranscriptStore:
     global _session_store
     if _session_store is None:
-        _session_store = SessionStore()
+        _session_store = build_session_store(get_settings())
     return _session_store
 
 
@@ -94,12 +95,11 @@ async def _call_gemini_structured(
     https://googleapis.github.io/python-genai/ \u2014 "For async operations,
     replace `client.models` with `client.aio.models`."
     """
-    from google import genai
     from google.genai import types as genai_types
 
     from ...shared.gemini_schema import gemini_response_schema  # noqa: PLC0415
 
-    client = genai.Client(api_key=api_key)
+    client = get_genai_client(api_key)
     return await client.aio.models.generate_content(
         model=model,
         contents=prompt,
@@ -140,14 +140,18 @@ async def parent_call_reply(payload: AgentReplyRequest) -> AgentReplyResponse:
 
     Flow:
       1. Load or accept transcript.
-      2. Persist the parent's turn with OCC.
-      3. Render shared prompt via pybars3 (Handlebars).
-      4. Call Gemini structured, wrapped in run_resiliently.
-      5. Parse into AgentReplyCore.
-      6. Apply turn-cap enforcement (shouldEndCall at turn >= 6).
-      7. Run post-response behavioural guard. Fail-closed on violation.
-      8. Persist the agent's turn.
-      9. Return wire response with telemetry.
+      2. Render shared prompt via pybars3 (Handlebars).
+      3. Call Gemini structured, wrapped in run_resiliently.
+      4. Parse into AgentReplyCore.
+      5. Apply turn-cap enforcement (shouldEndCall at turn >= 6).
+      6. Run post-response behavioural guard. Fail-closed on violation.
+      7. Persist the parent's turn and the agent's reply with OCC.
+      8. Return wire response with telemetry.
+
+    The parent's turn is persisted together with the reply, not before
+    the model call: the async store writes the pair in one transaction,
+    and a turn that fails (502/422) leaves nothing behind, so Twilio's
+    retry of it is not rejected as a replay.
     """
     settings = get_settings()
     started = time.monotonic()
@@ -164,16 +168,13 @@ async def parent_call_reply(payload: AgentReplyRequest) -> AgentReplyResponse:
             if r.role in ("agent", "parent")
         ]
 
-    # Record the parent's turn first.
-    now_parent = datetime.now(UTC)
-    await store.append_turn(
-        TurnRecord(
-            call_sid=payload.callSid,
-            turn_number=payload.turnNumber,
-            role="parent",
-            text=payload.parentSpeech,
-            created_at=now_parent,
-        )
+    # Persisted with the reply at the end of the turn.
+    parent_turn = TurnRecord(
+        call_sid=payload.callSid,
+        turn_number=payload.turnNumber,
+        role="parent",
+        text=payload.parentSpeech,
+        created_at=datetime.now(UTC),
     )
 
     # Render + call.
@@ -218,6 +219,7 @@ async def parent_call_reply(payload: AgentReplyRequest) -> AgentReplyResponse:
             span_name="parent_call.reply",
             max_total_backoff_seconds=settings.max_total_backoff_seconds,
             per_call_timeout_seconds=_PER_CALL_TIMEOUT_S,
+            hedge=True,
         )
     except AISafetyBlockError as exc:
         # Safety block: do NOT retry, do NOT surface the raw reason to the
@@ -267,14 +269,15 @@ async def parent_call_reply(payload: AgentReplyRequest) -> AgentReplyResponse:
             http_status=502,
         ) from exc
 
-    await store.append_turn(
+    await store.append_turn_pair(
+        parent_turn,
         TurnRecord(
             call_sid=payload.callSid,
             turn_number=payload.turnNumber,
             role="agent",
             text=core.reply,
             created_at=datetime.now(UTC),
-        )
+        ),
     )
     if core.shouldEndCall:
         await store.mark_ended(payload.callSid)
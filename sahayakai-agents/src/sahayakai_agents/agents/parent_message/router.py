@@ -22,13 +22,13 @@ Defence-in-depth:
 from __future__ import annotations
 
 import time
-import uuid
 from typing import Any
 
 import structlog
 from fastapi import APIRouter
 
 from ..._adk_keyed_gemini import build_keyed_gemini_from_template
+from ..._adk_prepared import PreparedRunner, prepare_runner
 from ...config import get_settings
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
@@ -79,15 +79,36 @@ def _build_keyed_gemini(api_key: str) -> Any:
     return build_keyed_gemini_from_template(build_parent_message_agent, api_key)
 
 
+def _build_pinned_agent(api_key: str) -> Any:
+    """Clone the cached template with `.model` pinned to `api_key`.
+
+    The cached agent itself is never mutated — `model_copy()` returns
+    a fresh Pydantic instance.
+    """
+    return build_parent_message_agent().model_copy(
+        update={"model": _build_keyed_gemini(api_key)}
+    )
+
+
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned agent + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_PARENT_MESSAGE_APP_NAME,
+        template=build_parent_message_agent(),
+        api_key=api_key,
+        pin=_build_pinned_agent,
+    )
+
+
 async def _run_pipeline_via_runner(
     *, prompt: str, api_key: str
 ) -> ParentMessageCore:
     """One ADK Runner invocation against the parent-message LlmAgent.
 
-    Builds a per-call `LlmAgent` by `model_copy`-ing the cached template
-    and swapping in a `Gemini` instance pinned to `api_key`. The cached
-    agent itself is never mutated — `model_copy()` returns a fresh
-    Pydantic instance.
+    Runs against the prepared (built once per key) `LlmAgent` clone
+    whose `Gemini` is pinned to `api_key`, in a single-use session that
+    is dropped as soon as the run finishes. The cached template itself
+    is never mutated.
 
     The rendered prompt is passed as `new_message` (user content), NOT
     as `instruction`, because:
@@ -99,25 +120,9 @@ async def _run_pipeline_via_runner(
         per-request user input through ADK; matches what the previous
         `_call_gemini_structured` did (prompt → `contents`).
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    template = build_parent_message_agent()
-    agent_for_call = template.model_copy(
-        update={"model": _build_keyed_gemini(api_key)}
-    )
-
-    runner = InMemoryRunner(
-        agent=agent_for_call, app_name=_PARENT_MESSAGE_APP_NAME,
-    )
-
-    user_id = "parent-message-generator"
-    session_id = f"parent-message-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_PARENT_MESSAGE_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+    prepared = _prepared_runner(api_key)
 
     new_message = genai_types.Content(
         role="user",
@@ -125,19 +130,18 @@ async def _run_pipeline_via_runner(
     )
 
     final_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        # Accumulate text from final-response events. A single
-        # output_schema call typically yields one final event whose
-        # content.parts[0].text is the full JSON.
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                text = getattr(part, "text", None)
-                if text and not getattr(part, "thought", False):
-                    final_text += str(text)
+    async with prepared.session(
+        user_id="parent-message-generator", prefix="parent-message",
+    ) as ref:
+        async for event in prepared.run(ref, new_message):
+            # Accumulate text from final-response events. A single
+            # output_schema call typically yields one final event whose
+            # content.parts[0].text is the full JSON.
+            if event.content and event.content.parts:
+                for part in event.content.parts:
+                    text = getattr(part, "text", None)
+                    if text and not getattr(part, "thought", False):
+                        final_text += str(text)
 
     if not final_text.strip():
         raise AgentError(
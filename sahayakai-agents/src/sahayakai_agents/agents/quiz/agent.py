@@ -25,9 +25,11 @@ cancel sibling tasks the moment any task raises — meaning a single
 malformed-JSON variant would tear down the other two. The wrapper
 catches the exception, logs at WARNING (matching the previous
 `Promise.allSettled` / `asyncio.gather(return_exceptions=False)`
-log shape), and yields no events. The runner then sees a clean exit
-with no `output_key` written to session state — the router post-Runner
-treats a missing slot as "that variant failed → None".
+log shape), and yields only a failure record (`variant_error_state_key`)
+in place of output. The runner then sees a clean exit with no
+`output_key` written to session state — the router post-Runner treats a
+missing slot as "that variant failed → None", and re-dispatches the
+difficulties whose recorded failure is retryable (429 / 401 / 403).
 
 The router collects all three slots from `runner.session_service.
 get_session(...).state` and applies the same post-processing
@@ -159,6 +161,46 @@ def variant_state_key(difficulty: str) -> str:
     return f"variant_{difficulty}"
 
 
+def variant_prompt_state_key(difficulty: str) -> str:
+    """Session-state key carrying a variant's rendered prompt.
+
+    The router seeds all three keys when it creates the per-request
+    session; each variant's `instruction` callable reads its own.
+    """
+    return f"quiz.prompt_{difficulty}"
+
+
+def variant_error_state_key(difficulty: str) -> str:
+    """Session-state key recording why a variant produced no output.
+
+    Written by `_VariantWrapper` when it swallows the variant's
+    exception; the value is `{"errorType": str, "status": int | None}`
+    with `status` from `resilience.classify_status`. The router uses
+    it to decide which difficulties are worth re-dispatching.
+    """
+    return f"variant_{difficulty}_error"
+
+
+def _variant_instruction_provider(difficulty: str) -> Any:
+    """InstructionProvider reading one variant's prompt from session state.
+
+    Same shape as `visual_aid/agent.py`: a callable instruction makes
+    ADK skip `inject_session_state()` (so `{x}` fragments leaking out of
+    sanitized user input cannot KeyError), and keeps the `LlmAgent`
+    request-independent so the router can reuse one keyed agent graph
+    across requests.
+    """
+    key = variant_prompt_state_key(difficulty)
+
+    def _provider(ctx: Any) -> str:
+        text = ctx.state.get(key)
+        if not isinstance(text, str) or not text:
+            raise RuntimeError(f"{key} missing from session state")
+        return text
+
+    return _provider
+
+
 def build_variant_agent(difficulty: str) -> LlmAgent:
     """Build one `LlmAgent` for a single difficulty variant.
 
@@ -170,14 +212,14 @@ def build_variant_agent(difficulty: str) -> LlmAgent:
     by the time the slot is written, the value is a validated dict
     matching the schema — not raw text.
 
-    The `instruction` field is empty at build time. The router
-    replaces it per call by `model_copy()`-ing this template with a
-    per-difficulty rendered prompt wrapped in an `InstructionProvider`
-    callable. Wrapping in a callable bypasses ADK's
-    `inject_session_state()` (which scans for `{name}` placeholders
-    that could collide with our rendered prompt content — a real
-    risk because Handlebars output may contain `{x}` patterns from
-    sanitized user input).
+    The `instruction` is an `InstructionProvider` callable that reads
+    the per-difficulty rendered prompt from session state under
+    `variant_prompt_state_key(difficulty)`. The router seeds that key
+    per request; the agent itself never changes. Wrapping in a callable
+    bypasses ADK's `inject_session_state()` (which scans for `{name}`
+    placeholders that could collide with our rendered prompt content —
+    a real risk because Handlebars output may contain `{x}` patterns
+    from sanitized user input).
 
     `new_message` carries only the optional textbook-page image
     (shared across all three variants because `ParallelAgent` shares
@@ -199,7 +241,7 @@ def build_variant_agent(difficulty: str) -> LlmAgent:
     return LlmAgent(
         name=f"quiz_variant_{difficulty}",
         model=get_generator_model(),
-        instruction="",
+        instruction=_variant_instruction_provider(difficulty),
         sub_agents=[],
         output_schema=QuizGeneratorCore,
         output_key=variant_state_key(difficulty),
@@ -220,14 +262,19 @@ def build_variant_wrapper(difficulty: str, *, inner_override: Any = None):  # ty
 
     The wrapper's `_run_async_impl` does:
 
-      1. Run the wrapped variant.
-      2. Yield every event the variant emits — so ADK's normal
+      1. Skip the variant entirely when its prompt is absent from
+         session state — the router seeds only the difficulties it
+         wants run, which is how a retry re-dispatches just the
+         variants that failed.
+      2. Run the wrapped variant.
+      3. Yield every event the variant emits — so ADK's normal
          `__maybe_save_output_to_state` populates session state for
          the success path.
-      3. If any exception bubbles up, swallow it, log at WARNING
+      4. If any exception bubbles up, swallow it, log at WARNING
          (matching the existing router's `quiz.variant.failed` shape),
-         and exit cleanly. The runner sees no exception; sibling
-         variants keep running.
+         and yield a single content-less event whose `state_delta`
+         records the failure under `variant_error_state_key`. The
+         runner sees no exception; sibling variants keep running.
 
     `output_key` lives on the inner `LlmAgent` (where ADK's
     `__maybe_save_output_to_state` runs); the wrapper has no
@@ -236,14 +283,18 @@ def build_variant_wrapper(difficulty: str, *, inner_override: Any = None):  # ty
     Args:
         difficulty: One of "easy" / "medium" / "hard".
         inner_override: Optional pre-built inner `LlmAgent`. When the
-            router clones a per-call variant (e.g. with a pinned-key
-            Gemini wrapper or a per-call rendered instruction), it
-            calls this builder with `inner_override=cloned_inner` so
-            the closure captures the right inner. Defaults to a
+            router clones a keyed variant (with a pinned-key Gemini
+            wrapper), it calls this builder with
+            `inner_override=cloned_inner` so the closure captures the
+            right inner. Defaults to a
             freshly built variant agent — used by the cached
             `build_quiz_agent()` template.
     """
     from google.adk.agents.base_agent import BaseAgent  # noqa: PLC0415
+    from google.adk.events.event import Event  # noqa: PLC0415
+    from google.adk.events.event_actions import EventActions  # noqa: PLC0415
+
+    from ...resilience import classify_status  # noqa: PLC0415
 
     inner = inner_override if inner_override is not None else build_variant_agent(difficulty)
 
@@ -251,17 +302,21 @@ def build_variant_wrapper(difficulty: str, *, inner_override: Any = None):  # ty
         """Error-isolating shim for one quiz difficulty variant.
 
         Closes over `inner` from the enclosing function — that's why
-        per-call variant cloning rebuilds the wrapper via this
-        function instead of `model_copy`-ing the cached template.
+        keyed variant cloning rebuilds the wrapper via this function
+        instead of `model_copy`-ing the cached template.
         """
 
         async def _run_async_impl(
             self, ctx: InvocationContext,
         ) -> AsyncGenerator[Event, None]:
+            if variant_prompt_state_key(difficulty) not in ctx.session.state:
+                # Not scheduled for this run.
+                return
             try:
                 async for event in inner.run_async(ctx):
                     yield event
             except Exception as exc:
+                status = classify_status(exc)
                 # Match the existing `quiz.variant.failed` log shape so
                 # dashboards / log filters keep working through the
                 # ADK migration.
@@ -270,11 +325,25 @@ def build_variant_wrapper(difficulty: str, *, inner_override: Any = None):  # ty
                     difficulty=difficulty,
                     error=str(exc),
                     error_type=type(exc).__name__,
+                    error_status=status,
+                )
+                # Eat the exception. The runner sees a clean exit,
+                # sibling variants are not cancelled, and the variant's
+                # `output_key` stays absent from session state (router
+                # treats absence as None). The only thing emitted is
+                # the failure record the router's retry scheduling
+                # reads.
+                yield Event(
+                    invocation_id=ctx.invocation_id,
+                    author=self.name,
+                    branch=ctx.branch,
+                    actions=EventActions(state_delta={
+                        variant_error_state_key(difficulty): {
+                            "errorType": type(exc).__name__,
+                            "status": status,
+                        },
+                    }),
                 )
-                # Eat the exception — yield nothing. The runner sees
-                # a clean exit, sibling variants are not cancelled,
-                # and the variant's `output_key` stays absent from
-                # session state (router treats absence as None).
                 return
 
     wrapper = _VariantWrapper(name=f"quiz_variant_{difficulty}_wrapped")
@@ -296,9 +365,9 @@ def build_quiz_agent() -> ParallelAgent:
 
     Cached via `lru_cache(1)` because the same `ParallelAgent` is safe
     to re-use across requests; ADK threads per-call state through the
-    `Runner` + session, not the agent itself. The router's per-call
-    pinned-key Gemini wrapper is applied via `model_copy()` on each
-    variant before invocation.
+    `Runner` + session, not the agent itself. The router's pinned-key
+    Gemini wrapper is applied via `model_copy()` on each variant, once
+    per key (see `_adk_prepared.py`).
 
     Returns:
         A `ParallelAgent` whose `sub_agents` are three `_VariantWrapper`
@@ -325,5 +394,7 @@ __all__ = [
     "load_generator_prompt",
     "parse_data_uri_optional",
     "render_generator_prompt",
+    "variant_error_state_key",
+    "variant_prompt_state_key",
     "variant_state_key",
 ]
@@ -12,6 +12,13 @@ branch contexts, and per-variant `output_key` slots in session state
 that prevent shared-state races. See `agent.py` for the agent shape +
 the `_VariantWrapper` error-isolation rationale.
 
+Per-variant retry: the `run_resiliently` budget (key rotation, backoff,
+total-wait cap) applies across attempts, but each attempt dispatches
+only the difficulties still missing. Variants that succeeded are kept;
+a variant whose swallowed error was retryable (429 / 401 / 403) is
+re-run on the next key in the pool. Non-retryable failures (safety
+block, malformed JSON) stay `null`, as before.
+
 Wire shape unchanged:
   - 0 variants succeed → 502.
   - 1-2 variants succeed → 200 with `null` for the failed slots.
@@ -21,16 +28,26 @@ Wire shape unchanged:
 from __future__ import annotations
 
 import time
-import uuid
+from dataclasses import dataclass
 from typing import Any
 
 import structlog
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from ..._adk_keyed_gemini import build_keyed_gemini
+from ..._adk_prepared import PreparedRunner, prepare_runner
 from ...config import get_settings
 from ...resilience import run_resiliently
+from ...response_cache import (
+    digest_bytes,
+    get_response_cache,
+    mark_cache,
+    prompt_version,
+    response_cache_key,
+    wants_fresh,
+)
 from ...shared.errors import AgentError, AISafetyBlockError
+from ...shared.image_pipeline import prepare_image_async
 from ...shared.prompt_safety import sanitize, sanitize_optional
 from ._guard import assert_quiz_response_rules
 from .agent import (
@@ -40,6 +57,8 @@ from .agent import (
     get_generator_model,
     parse_data_uri_optional,
     render_generator_prompt,
+    variant_error_state_key,
+    variant_prompt_state_key,
     variant_state_key,
 )
 from .schemas import (
@@ -76,6 +95,41 @@ _LANGUAGE_NAME_TO_ISO: dict[str, str] = {
 
 _DIFFICULTIES: tuple[QuizDifficulty, ...] = ("easy", "medium", "hard")
 
+# Same retryable set as `run_resiliently`: quota and key-auth failures
+# are worth another key; safety blocks and malformed output are not.
+_RETRYABLE_VARIANT_STATUSES = frozenset({429, 401, 403})
+
+
+@dataclass(frozen=True)
+class _VariantFailure:
+    """Why one variant produced no output in a runner invocation."""
+
+    error_type: str
+    status: int | None = None
+
+    @property
+    def retryable(self) -> bool:
+        return self.status in _RETRYABLE_VARIANT_STATUSES
+
+
+_VariantOutcome = QuizGeneratorCore | _VariantFailure
+
+
+class _VariantsPendingError(Exception):
+    """Raised out of one attempt while retryable variants are missing.
+
+    Carries the variants' HTTP-ish `status` so `run_resiliently`
+    classifies it like the underlying Gemini error — rotating the key
+    and backing off within its budget.
+    """
+
+    def __init__(self, difficulties: list[QuizDifficulty], status: int | None) -> None:
+        super().__init__(
+            f"quiz variants pending retry: {', '.join(difficulties)} (status {status})"
+        )
+        self.difficulties = difficulties
+        self.status = status
+
 
 def _iso_for_lang(language: str | None) -> str:
     if not language:
@@ -87,57 +141,20 @@ def _iso_for_lang(language: str | None) -> str:
 # ---- Per-call agent assembly --------------------------------------------
 
 
-def _make_instruction_provider(prompt: str) -> Any:
-    """Wrap a pre-rendered prompt string in a 1-arg callable.
+def _build_pinned_parallel_agent(api_key: str) -> Any:
+    """Build a keyed `ParallelAgent` clone of the cached template.
 
-    ADK's `LlmAgent.canonical_instruction` returns
-    `(text, bypass_state_injection)`. When `instruction` is a CALLABLE
-    (an `InstructionProvider`), `bypass_state_injection=True` and ADK
-    SKIPS `inject_session_state()` entirely — meaning rendered prompts
-    that happen to contain `{var}` shapes (from sanitized user input)
-    won't trigger ADK's state-variable lookup + KeyError.
+    For each variant: pull out the cached inner `LlmAgent`,
+    `model_copy()` it with a pinned-key `Gemini` wrapper as `model`,
+    and build a fresh `_VariantWrapper` whose closure captures the
+    CLONED inner (re-using `build_variant_wrapper` from agent.py with
+    `inner_override`). Cleaner than monkey-patching a Pydantic-validated
+    wrapper instance.
 
-    When `instruction` is a plain `str`, ADK treats `{name}` patterns
-    as state-variable refs. Our Handlebars-rendered prompts can leak
-    `{x}`-shaped fragments through user-controlled fields (topic,
-    teacherContext, etc.). Wrapping in a lambda is the canonical ADK
-    escape hatch — same pattern the upstream multi-agent guide
-    recommends for InstructionProvider use cases.
-
-    The callable takes a `ReadonlyContext` arg (we ignore it; our
-    prompt is pre-rendered against the request, not session state).
-    """
-    def _provider(_ctx: Any) -> str:
-        return prompt
-    return _provider
-
-
-def _attach_per_call_state(
-    *,
-    api_key: str,
-    image_bytes: bytes | None,
-    image_mime: str | None,
-    base_context: dict[str, Any],
-) -> tuple[Any, Any]:
-    """Build a per-call `ParallelAgent` clone with each variant's
-    rendered prompt + pinned-key Gemini wired in.
-
-    The cached `build_quiz_agent()` template stays untouched. Per call
-    we:
-      1. Render one prompt per difficulty against `base_context`.
-      2. For each variant: pull out the cached inner `LlmAgent`,
-         `model_copy()` it with the rendered prompt as a callable
-         `instruction` + a pinned-key `Gemini` wrapper as `model`.
-      3. Build a fresh `_VariantWrapper` whose closure captures the
-         CLONED inner (re-using `build_variant_wrapper` from agent.py
-         with `inner_override`). Cleaner than monkey-patching a
-         Pydantic-validated wrapper instance.
-      4. Build a fresh `ParallelAgent` with the new wrappers.
-
-    Returns:
-        `(parallel_agent, new_message)` — the per-call ParallelAgent
-        ready for `Runner.run_async` and the shared user Content
-        (image if supplied + a sentinel text part).
+    Nothing here depends on the request — the variants read their
+    rendered prompts from session state (see
+    `variant_prompt_state_key`) — so the result is built once per key
+    and reused via `_prepared_runner`.
     """
     # Local import keeps modules that don't exercise ADK fast.
     from google.adk.agents import LlmAgent, ParallelAgent  # noqa: PLC0415
@@ -155,48 +172,52 @@ def _attach_per_call_state(
         assert isinstance(inner, LlmAgent), (
             "build_variant_wrapper places an LlmAgent at sub_agents[0]"
         )
-
-        # Per-difficulty rendered prompt.
-        variant_context = {**base_context, "targetDifficulty": difficulty}
-        prompt = render_generator_prompt(variant_context)
-
-        # Clone the inner LlmAgent with per-call instruction + model.
-        # Wrapping the prompt in a callable bypasses ADK's
-        # `inject_session_state()` (which would otherwise scan for
-        # `{var}` placeholders that could leak through sanitized user
-        # input — see `_make_instruction_provider` docstring).
         model_name = (
             inner.model
             if isinstance(inner.model, str)
             else inner.model.model
         )
         cloned_inner = inner.model_copy(update={
-            "instruction": _make_instruction_provider(prompt),
             "model": build_keyed_gemini(
                 model_name=model_name,
                 api_key=api_key,
             ),
         })
-
-        # Build a fresh wrapper whose closure captures the cloned
-        # inner (NOT the cached template's). Doing this via the
-        # public `build_variant_wrapper(difficulty, inner_override=...)`
-        # builder means we don't have to monkey-patch a Pydantic
-        # instance to redirect dispatch — the closure does it cleanly.
         cloned_wrappers.append(build_variant_wrapper(
             difficulty, inner_override=cloned_inner,
         ))
 
-    # Re-instantiate the ParallelAgent with the per-call wrappers.
-    # `model_copy` would also work here, but constructing fresh
-    # makes the per-call agent's identity unambiguous in traces.
-    parallel_agent_for_call = ParallelAgent(
+    # Constructing fresh (rather than `model_copy`) makes the keyed
+    # agent's identity unambiguous in traces.
+    return ParallelAgent(
         name=template.name,
         sub_agents=cloned_wrappers,
     )
 
-    new_message = _build_new_message(image_bytes, image_mime)
-    return parallel_agent_for_call, new_message
+
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached keyed `ParallelAgent` + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_QUIZ_APP_NAME,
+        template=build_quiz_agent(),
+        api_key=api_key,
+        pin=_build_pinned_parallel_agent,
+    )
+
+
+def _render_variant_prompts(
+    base_context: dict[str, Any],
+    difficulties: tuple[QuizDifficulty, ...] = _DIFFICULTIES,
+) -> dict[str, str]:
+    """Render one prompt per difficulty into the session-state seed the
+    variants' instruction providers read from. Variants left out of the
+    seed are skipped by their `_VariantWrapper`."""
+    return {
+        variant_prompt_state_key(difficulty): render_generator_prompt(
+            {**base_context, "targetDifficulty": difficulty},
+        )
+        for difficulty in difficulties
+    }
 
 
 def _build_new_message(
@@ -246,68 +267,57 @@ async def _run_quiz_via_runner(
     image_bytes: bytes | None,
     image_mime: str | None,
     base_context: dict[str, Any],
-) -> dict[QuizDifficulty, QuizGeneratorCore | None]:
+    difficulties: tuple[QuizDifficulty, ...] = _DIFFICULTIES,
+) -> dict[QuizDifficulty, _VariantOutcome]:
     """One ADK Runner invocation against the quiz `ParallelAgent`.
 
-    Runs all 3 difficulty variants in parallel under a single Runner
-    + InMemorySession. After the run, reads each variant's slot
-    from `session.state[variant_state_key(d)]`. Missing slots
-    (variant raised, `_VariantWrapper` swallowed the exception)
-    map to `None`.
+    Runs the requested difficulty variants in parallel under the
+    prepared (cached per key) Runner, in a single-use session seeded
+    with their rendered prompts — the others are skipped. After the
+    run, reads each variant's slot from
+    `session.state[variant_state_key(d)]`. A missing slot (variant
+    raised, `_VariantWrapper` swallowed the exception) maps to a
+    `_VariantFailure` built from the wrapper's failure record.
 
     Returns:
-        Dict of `{difficulty: QuizGeneratorCore | None}` for every
-        difficulty in `_DIFFICULTIES`.
+        Dict of `{difficulty: QuizGeneratorCore | _VariantFailure}`
+        for every difficulty in `difficulties`.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
-
-    parallel_agent, new_message = _attach_per_call_state(
-        api_key=api_key,
-        image_bytes=image_bytes,
-        image_mime=image_mime,
-        base_context=base_context,
-    )
-
-    runner = InMemoryRunner(agent=parallel_agent, app_name=_QUIZ_APP_NAME)
-
-    user_id = "quiz-generator"
-    session_id = f"quiz-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_QUIZ_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
-
-    # Drain all events. We don't need the events themselves (variants
-    # write to session state via `output_key`); we just need to fully
-    # exhaust the async iterator so ADK's `__maybe_save_output_to_state`
-    # has a chance to fire on every variant's final event.
-    async for _event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        # Drain — ADK accumulates state via append_event side-effects.
-        pass
+    prepared = _prepared_runner(api_key)
+    new_message = _build_new_message(image_bytes, image_mime)
 
-    # Read post-run session state.
-    session = await runner.session_service.get_session(
-        app_name=_QUIZ_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
-    if session is None:  # pragma: no cover — InMemorySession never returns None
+    async with prepared.session(
+        user_id="quiz-generator",
+        prefix="quiz",
+        state=_render_variant_prompts(base_context, difficulties),
+    ) as ref:
+        # Drain all events. We don't need the events themselves
+        # (variants write to session state via `output_key`); we just
+        # need to fully exhaust the async iterator so ADK's
+        # `__maybe_save_output_to_state` has a chance to fire on every
+        # variant's final event.
+        async for _event in prepared.run(ref, new_message):
+            # Drain — ADK accumulates state via append_event side-effects.
+            pass
+
+        # Read post-run session state before the session is dropped.
+        state = await prepared.state(ref)
+    if state is None:  # pragma: no cover — InMemorySession never returns None
         raise AgentError(
             code="INTERNAL",
             message="ADK session disappeared mid-quiz",
             http_status=502,
         )
 
-    results: dict[QuizDifficulty, QuizGeneratorCore | None] = {}
-    for difficulty in _DIFFICULTIES:
-        slot = session.state.get(variant_state_key(difficulty))
+    results: dict[QuizDifficulty, _VariantOutcome] = {}
+    for difficulty in difficulties:
+        slot = state.get(variant_state_key(difficulty))
         if slot is None:
-            results[difficulty] = None
+            error = state.get(variant_error_state_key(difficulty)) or {}
+            results[difficulty] = _VariantFailure(
+                error_type=error.get("errorType", "MissingOutput"),
+                status=error.get("status"),
+            )
             continue
         # ADK's `validate_schema` already validated the JSON against
         # QuizGeneratorCore and stored a dict (model_dump). Reconstruct
@@ -320,7 +330,7 @@ async def _run_quiz_via_runner(
                 difficulty=difficulty,
                 error=str(exc),
             )
-            results[difficulty] = None
+            results[difficulty] = _VariantFailure(error_type=type(exc).__name__)
     return results
 
 
@@ -328,10 +338,19 @@ async def _run_quiz_via_runner(
 
 
 @quiz_router.post("/generate", response_model=QuizVariantsResponse)
-async def quiz_generate(payload: QuizGeneratorRequest) -> QuizVariantsResponse:
+async def quiz_generate(
+    payload: QuizGeneratorRequest,
+    request: Request,
+    response: Response,
+) -> QuizVariantsResponse:
+    """Three difficulty variants from one ParallelAgent run.
+
+    Identical sanitized requests are answered from the response cache
+    (``X-Cache: hit``); concurrent ones share a single run. A result
+    missing a variant is served but not cached.
+    """
     settings = get_settings()
     started = time.perf_counter()
-    api_keys = settings.genai_keys
 
     # Decode the optional image once (avoid re-parsing per variant).
     try:
@@ -363,37 +382,130 @@ async def quiz_generate(payload: QuizGeneratorRequest) -> QuizVariantsResponse:
         ),
         "hasImage": image_bytes is not None,
         # `targetDifficulty` is filled in per-variant inside
-        # `_attach_per_call_state` — one prompt rendered per difficulty.
+        # `_render_variant_prompts` — one prompt rendered per difficulty.
     }
 
-    async def _do(api_key: str) -> dict[QuizDifficulty, QuizGeneratorCore | None]:
-        return await _run_quiz_via_runner(
+    key = response_cache_key(
+        "quiz",
+        {**base_context, "image": digest_bytes(payload.imageDataUri)},
+        prompts=prompt_version("quiz"),
+        model=get_generator_model(),
+    )
+    result, status = await get_response_cache().get_or_compute(
+        key,
+        route="quiz",
+        model=QuizVariantsResponse,
+        compute=lambda: _generate_variants(
+            payload,
+            base_context,
+            image_bytes=image_bytes,
+            image_mime=image_mime,
+            settings=settings,
+            started=started,
+        ),
+        cacheable=lambda r: r.variantsGenerated == len(_DIFFICULTIES),
+        fresh=wants_fresh(request),
+    )
+    mark_cache(response, status)
+    if status == "hit":
+        result = result.model_copy(
+            update={
+                "cacheHit": True,
+                "sidecarVersion": SIDECAR_VERSION,
+                "latencyMs": int((time.perf_counter() - started) * 1000),
+            },
+        )
+    return result
+
+
+async def _generate_variants(  # noqa: PLR0915 — single-purpose handler with linear flow
+    payload: QuizGeneratorRequest,
+    base_context: dict[str, Any],
+    *,
+    image_bytes: bytes | None,
+    image_mime: str | None,
+    settings: Any,
+    started: float,
+) -> QuizVariantsResponse:
+    """Generate, retry pending variants, guard and build the response."""
+    api_keys = settings.genai_keys
+    if image_bytes is not None and image_mime is not None:
+        # Downscale once on a cache miss; all three variants and every
+        # retry send the same prepared bytes.
+        image = await prepare_image_async(image_bytes, image_mime)
+        image_bytes, image_mime = image.data, image.mime_type
+
+    # Survives across attempts: a variant that succeeded on one key is
+    # never regenerated, and each attempt dispatches only `pending`.
+    results: dict[QuizDifficulty, QuizGeneratorCore | None] = dict.fromkeys(
+        _DIFFICULTIES,
+    )
+    pending: list[QuizDifficulty] = list(_DIFFICULTIES)
+    attempts = 0
+
+    async def _do(api_key: str) -> None:
+        nonlocal attempts
+        attempts += 1
+        batch = await _run_quiz_via_runner(
             api_key=api_key,
             image_bytes=image_bytes,
             image_mime=image_mime,
             base_context=base_context,
+            difficulties=tuple(pending),
         )
+        retry: list[tuple[QuizDifficulty, int | None]] = []
+        for difficulty, outcome in batch.items():
+            if isinstance(outcome, QuizGeneratorCore):
+                results[difficulty] = outcome
+            elif outcome.retryable:
+                retry.append((difficulty, outcome.status))
+        # Non-retryable failures drop out of `pending` and stay None.
+        pending[:] = [difficulty for difficulty, _ in retry]
+        if retry:
+            statuses = [status for _, status in retry]
+            log.info(
+                "quiz.variants_pending_retry",
+                attempt=attempts,
+                pending=list(pending),
+                kept=[d for d, core in results.items() if core is not None],
+                statuses=statuses,
+            )
+            raise _VariantsPendingError(
+                list(pending), 429 if 429 in statuses else statuses[0],
+            )
 
     try:
-        # ParallelAgent runs all 3 variants concurrently inside one
-        # Runner invocation. The retry / key-rotation budget applies
-        # to the WHOLE 3-variant run as a unit — if 0 variants succeed
-        # AND a retryable error surfaces (rare with the wrapper's
-        # exception-swallowing), run_resiliently rotates to the next
-        # key and re-runs all 3. In practice, the `_VariantWrapper`
-        # eats per-variant errors so the parent run almost always
-        # exits cleanly with partial results, and retries only fire
-        # on infrastructure-level failures (network drop, etc.).
-        results = await run_resiliently(
+        # ParallelAgent runs the pending variants concurrently inside
+        # one Runner invocation; `run_resiliently` supplies the key
+        # rotation and the telephony-style budget across attempts. An
+        # attempt that leaves retryable variants missing raises
+        # `_VariantsPendingError`, so the next attempt (on the next
+        # key) re-runs just those. Infrastructure-level failures of the
+        # whole run retry the same way, still without touching the
+        # variants already kept.
+        await run_resiliently(
             _do,
             api_keys,
             span_name="quiz.parallel_agent",
             max_total_backoff_seconds=settings.max_total_backoff_seconds,
             per_call_timeout_seconds=_PER_CALL_TIMEOUT_S,
         )
-    except AISafetyBlockError as exc:
-        log.warning("quiz.safety_block", reason=str(exc))
-        raise
+    except Exception as exc:
+        # Budget exhausted with some variants in hand → serve the
+        # partial result, exactly as if those variants had failed on
+        # the first attempt. With nothing in hand, the typed error
+        # (quota / safety / timeout) propagates as before; a final
+        # `_VariantsPendingError` falls through to the 502 below.
+        if not isinstance(exc, _VariantsPendingError) and not any(results.values()):
+            if isinstance(exc, AISafetyBlockError):
+                log.warning("quiz.safety_block", reason=str(exc))
+            raise
+        log.warning(
+            "quiz.variants_retry_exhausted",
+            attempts=attempts,
+            pending=list(pending),
+            error_type=type(exc).__name__,
+        )
 
     easy_core = results["easy"]
     medium_core = results["medium"]
@@ -458,6 +570,7 @@ async def quiz_generate(payload: QuizGeneratorRequest) -> QuizVariantsResponse:
         "quiz.generated",
         latency_ms=latency_ms,
         variants_generated=variants_generated,
+        attempts=attempts,
         easy_ok=easy_core is not None,
         medium_ok=medium_core is not None,
         hard_ok=hard_core is not None,
@@ -103,5 +103,6 @@ class QuizVariantsResponse(BaseModel):
 
     sidecarVersion: str = Field(min_length=1, max_length=64)
     latencyMs: int = Field(ge=0)
+    cacheHit: bool = Field(default=False, description="Served from the response cache.")
     modelUsed: str = Field(min_length=1, max_length=200)
     variantsGenerated: int = Field(ge=0, le=3)
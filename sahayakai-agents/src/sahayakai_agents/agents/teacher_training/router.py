@@ -10,17 +10,31 @@ request / response schemas, behavioural guard, retry semantics — all
 unchanged. Only the INTERNAL call mechanism switches from a hand-rolled
 `google.genai.Client.aio.models.generate_content` to ADK's canonical
 LlmAgent + Runner pattern.
+
+`POST /v1/teacher-training/advise/stream` is the SSE variant (see
+`_streaming`): the introduction, each advice point and the conclusion
+are forwarded as soon as they complete; the final `validated` frame is
+authoritative.
 """
 from __future__ import annotations
 
 import time
-import uuid
+from collections.abc import Callable
 from typing import Any
 
 import structlog
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
 from ..._adk_keyed_gemini import build_keyed_gemini_from_template
+from ..._adk_prepared import PreparedRunner, prepare_runner
+from ..._streaming import (
+    StreamSink,
+    event_text,
+    sse_response,
+    stream_structured,
+    streaming_run_config,
+)
 from ...config import get_settings
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
@@ -32,6 +46,7 @@ from .agent import (
     render_advisor_prompt,
 )
 from .schemas import (
+    TeacherTrainingAdvicePoint,
     TeacherTrainingCore,
     TeacherTrainingRequest,
     TeacherTrainingResponse,
@@ -56,6 +71,13 @@ _PER_CALL_TIMEOUT_S = 20.0
 _TEACHER_TRAINING_APP_NAME = "sahayakai-teacher-training"
 
 
+# Subtrees forwarded as `partial` frames by the `/stream` route.
+_STREAM_WATCH = {
+    "introduction": None,
+    "advice[*]": TeacherTrainingAdvicePoint,
+    "conclusion": None,
+}
+
 _LANGUAGE_NAME_TO_ISO: dict[str, str] = {
     "english": "en", "hindi": "hi", "tamil": "ta", "telugu": "te",
     "kannada": "kn", "malayalam": "ml", "bengali": "bn", "marathi": "mr",
@@ -82,15 +104,39 @@ def _build_keyed_gemini(api_key: str) -> Any:
     return build_keyed_gemini_from_template(build_teacher_training_agent, api_key)
 
 
+def _build_pinned_agent(api_key: str) -> Any:
+    """Clone the cached template with `.model` pinned to `api_key`.
+
+    The cached agent itself is never mutated — `model_copy()` returns
+    a fresh Pydantic instance.
+    """
+    return build_teacher_training_agent().model_copy(
+        update={"model": _build_keyed_gemini(api_key)}
+    )
+
+
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned agent + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_TEACHER_TRAINING_APP_NAME,
+        template=build_teacher_training_agent(),
+        api_key=api_key,
+        pin=_build_pinned_agent,
+    )
+
+
 async def _run_pipeline_via_runner(
-    *, prompt: str, api_key: str,
+    *,
+    prompt: str,
+    api_key: str,
+    on_text: Callable[[str], None] | None = None,
 ) -> TeacherTrainingCore:
     """One ADK Runner invocation against the teacher-training LlmAgent.
 
-    Builds a per-call `LlmAgent` by `model_copy`-ing the cached template
-    and swapping in a `Gemini` instance pinned to `api_key`. The cached
-    agent itself is never mutated — `model_copy()` returns a fresh
-    Pydantic instance.
+    Runs against the prepared (built once per key) `LlmAgent` clone
+    whose `Gemini` is pinned to `api_key`, in a single-use session that
+    is dropped as soon as the run finishes. The cached template itself
+    is never mutated.
 
     The rendered prompt is passed as `new_message` (user content), NOT
     as `instruction`, because:
@@ -101,26 +147,13 @@ async def _run_pipeline_via_runner(
       - Putting it in `new_message` is the canonical way to pass
         per-request user input through ADK; matches what the previous
         `_call_gemini_structured` did (prompt → `contents`).
+
+    With `on_text` the agent runs in ADK's SSE mode: `partial` events'
+    text deltas go to `on_text` and are left out of the final text.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    template = build_teacher_training_agent()
-    agent_for_call = template.model_copy(
-        update={"model": _build_keyed_gemini(api_key)}
-    )
-
-    runner = InMemoryRunner(
-        agent=agent_for_call, app_name=_TEACHER_TRAINING_APP_NAME,
-    )
-
-    user_id = "teacher-training-advisor"
-    session_id = f"teacher-training-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_TEACHER_TRAINING_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+    prepared = _prepared_runner(api_key)
 
     new_message = genai_types.Content(
         role="user",
@@ -128,16 +161,15 @@ async def _run_pipeline_via_runner(
     )
 
     final_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                text = getattr(part, "text", None)
-                if text and not getattr(part, "thought", False):
-                    final_text += str(text)
+    async with prepared.session(
+        user_id="teacher-training-advisor", prefix="teacher-training",
+    ) as ref:
+        run_config = streaming_run_config() if on_text is not None else None
+        async for event in prepared.run(ref, new_message, run_config):
+            if on_text is not None and getattr(event, "partial", False):
+                on_text(event_text(event))
+                continue
+            final_text += event_text(event)
 
     if not final_text.strip():
         raise AgentError(
@@ -168,6 +200,7 @@ async def _run_advisor(
     payload: TeacherTrainingRequest,
     api_keys: tuple[str, ...],
     settings: Any,
+    sink: StreamSink | None = None,
 ) -> TeacherTrainingCore:
     """Run the advisor agent. Returns the parsed `TeacherTrainingCore`.
 
@@ -189,8 +222,13 @@ async def _run_advisor(
     prompt = render_advisor_prompt(context)
 
     async def _do(api_key: str) -> TeacherTrainingCore:
+        if sink is None:
+            return await _run_pipeline_via_runner(
+                prompt=prompt, api_key=api_key,
+            )
+        sink.begin_attempt()
         return await _run_pipeline_via_runner(
-            prompt=prompt, api_key=api_key,
+            prompt=prompt, api_key=api_key, on_text=sink.write,
         )
 
     return await run_resiliently(
@@ -202,31 +240,10 @@ async def _run_advisor(
     )
 
 
-@teacher_training_router.post(
-    "/advise", response_model=TeacherTrainingResponse,
-)
-async def teacher_training_advise(
-    payload: TeacherTrainingRequest,
+def _to_response(
+    payload: TeacherTrainingRequest, core: TeacherTrainingCore, started: float,
 ) -> TeacherTrainingResponse:
-    settings = get_settings()
-    started = time.perf_counter()
-    api_keys = settings.genai_keys
-
-    try:
-        core = await _run_advisor(payload, api_keys, settings)
-    except AISafetyBlockError as exc:
-        log.warning("teacher_training.advisor.safety_block", reason=str(exc))
-        raise
-    except AgentError:
-        raise
-    except Exception as exc:
-        log.error("teacher_training.advisor.failed", error=str(exc))
-        raise AgentError(
-            code="INTERNAL",
-            message="Teacher-training agent failed",
-            http_status=502,
-        ) from exc
-
+    """Behavioural guard + wire response, shared by both routes."""
     try:
         assert_teacher_training_response_rules(
             introduction=core.introduction,
@@ -268,3 +285,49 @@ async def teacher_training_advise(
         latencyMs=latency_ms,
         modelUsed=get_advisor_model(),
     )
+
+
+@teacher_training_router.post(
+    "/advise", response_model=TeacherTrainingResponse,
+)
+async def teacher_training_advise(
+    payload: TeacherTrainingRequest,
+) -> TeacherTrainingResponse:
+    settings = get_settings()
+    started = time.perf_counter()
+    api_keys = settings.genai_keys
+
+    try:
+        core = await _run_advisor(payload, api_keys, settings)
+    except AISafetyBlockError as exc:
+        log.warning("teacher_training.advisor.safety_block", reason=str(exc))
+        raise
+    except AgentError:
+        raise
+    except Exception as exc:
+        log.error("teacher_training.advisor.failed", error=str(exc))
+        raise AgentError(
+            code="INTERNAL",
+            message="Teacher-training agent failed",
+            http_status=502,
+        ) from exc
+
+    return _to_response(payload, core, started)
+
+
+@teacher_training_router.post("/advise/stream")
+async def teacher_training_advise_stream(
+    payload: TeacherTrainingRequest,
+) -> StreamingResponse:
+    """SSE variant of the route above; the `validated` frame is authoritative."""
+    settings = get_settings()
+    started = time.perf_counter()
+    api_keys = settings.genai_keys
+
+    return sse_response(stream_structured(
+        route="teacher_training",
+        started=started,
+        generate=lambda sink: _run_advisor(payload, api_keys, settings, sink),
+        finalize=lambda core: _to_response(payload, core, started),
+        watch=_STREAM_WATCH,
+    ))
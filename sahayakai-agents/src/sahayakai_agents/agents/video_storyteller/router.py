@@ -13,20 +13,21 @@ INTERNAL call mechanism switches from a hand-rolled
 `google.genai.Client.aio.models.generate_content` to ADK's canonical
 single-agent Runner.
 
-Per-call the cached agent's `.model` is `model_copy()`-ed to swap in a
-`Gemini` instance pinned to the current api_key, leaving the cached
-template untouched between concurrent requests.
+Per key the cached agent's `.model` is `model_copy()`-ed once to swap
+in a `Gemini` instance pinned to that api_key (see `_adk_prepared`),
+leaving the cached template untouched; each request only gets its own
+throwaway session.
 """
 from __future__ import annotations
 
 import time
-import uuid
 from typing import Any
 
 import structlog
 from fastapi import APIRouter
 
 from ..._adk_keyed_gemini import build_keyed_gemini
+from ..._adk_prepared import PreparedRunner, prepare_runner
 from ...config import get_settings
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
@@ -74,10 +75,11 @@ def _iso_for_lang(language: str | None) -> str:
 
 
 def _build_pinned_agent(api_key: str) -> Any:
-    """Build a per-call `LlmAgent` clone with `.model` pinned to api_key.
+    """Build an `LlmAgent` clone with `.model` pinned to api_key.
 
     The cached agent template is never mutated — `model_copy()` returns
-    a fresh Pydantic instance each call.
+    a fresh Pydantic instance. Called once per key by
+    `_prepared_runner`.
     """
     template = build_video_storyteller_agent()
     template_model = template.model
@@ -95,13 +97,23 @@ def _build_pinned_agent(api_key: str) -> Any:
     )
 
 
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned agent + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_VIDEO_STORYTELLER_APP_NAME,
+        template=build_video_storyteller_agent(),
+        api_key=api_key,
+        pin=_build_pinned_agent,
+    )
+
+
 async def _run_pipeline_via_runner(
     *, prompt: str, api_key: str,
 ) -> VideoStorytellerCore:
     """One ADK Runner invocation against the recommender LlmAgent.
 
-    Builds a per-call `LlmAgent` by `model_copy`-ing the cached template
-    and swapping in a `Gemini` instance pinned to `api_key`. The rendered
+    Runs against the prepared (built once per key) `LlmAgent` clone
+    whose `Gemini` is pinned to `api_key`, in a single-use session. The rendered
     prompt is shipped as the user `new_message` (NOT `instruction`) so
     ADK's `inject_session_state()` can't trip on `{var}` shapes leaking
     through sanitised user input.
@@ -110,21 +122,9 @@ async def _run_pipeline_via_runner(
     parts from the final event(s) into the JSON payload that
     `output_schema=VideoStorytellerCore` produced.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    agent_for_call = _build_pinned_agent(api_key)
-    runner = InMemoryRunner(
-        agent=agent_for_call, app_name=_VIDEO_STORYTELLER_APP_NAME,
-    )
-
-    user_id = "video-storyteller-recommender"
-    session_id = f"video-storyteller-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_VIDEO_STORYTELLER_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+    prepared = _prepared_runner(api_key)
 
     new_message = genai_types.Content(
         role="user",
@@ -132,16 +132,15 @@ async def _run_pipeline_via_runner(
     )
 
     final_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                text = getattr(part, "text", None)
-                if text and not getattr(part, "thought", False):
-                    final_text += str(text)
+    async with prepared.session(
+        user_id="video-storyteller-recommender", prefix="video-storyteller",
+    ) as ref:
+        async for event in prepared.run(ref, new_message):
+            if event.content and event.content.parts:
+                for part in event.content.parts:
+                    text = getattr(part, "text", None)
+                    if text and not getattr(part, "thought", False):
+                        final_text += str(text)
 
     if not final_text.strip():
         raise AgentError(
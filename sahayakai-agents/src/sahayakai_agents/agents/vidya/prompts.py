@@ -7,6 +7,9 @@ small and focused on ADK construct wiring. This module owns:
 - Reading `orchestrator.handlebars` and `instant_answer.handlebars`
   off disk (with `SAHAYAKAI_PROMPTS_DIR` override).
 - Compiling each template once via pybars3 and caching.
+- Splitting the orchestrator template at its `{{! cache-boundary }}`
+  marker so the static rules + flow index can be served from a Gemini
+  context cache (see `context_cache.py`).
 - Rendering against a context dict.
 
 Plus the intent string constants — they live with the prompts because
@@ -25,6 +28,8 @@ from typing import Any
 
 import pybars
 
+from ...context_cache import SplitPrompt, split_template
+
 # ---- Prompt resolution ---------------------------------------------------
 
 # `parents[4]` from this file resolves to the `sahayakai-agents/` repo
@@ -69,9 +74,14 @@ _compiler = pybars.Compiler()
 
 
 @lru_cache(maxsize=2)
-def _compile_orchestrator_template() -> Any:
-    """Compile the orchestrator template once and cache."""
-    return _compiler.compile(load_orchestrator_prompt())
+def _compile_orchestrator_template() -> tuple[Any, Any]:
+    """Compile the orchestrator template once and cache.
+
+    Returns `(prefix, suffix)` compiled halves split at the cache
+    boundary; the prefix only references request-independent keys.
+    """
+    prefix, suffix = split_template(load_orchestrator_prompt())
+    return _compiler.compile(prefix), _compiler.compile(suffix)
 
 
 @lru_cache(maxsize=2)
@@ -91,7 +101,17 @@ def render_orchestrator_prompt(context: dict[str, Any]) -> str:
       - `detectedLanguage`: str | None
       - `allowedFlows`: list[str] (the 9 routable flow names)
     """
-    return str(_compile_orchestrator_template()(context))
+    return render_orchestrator_prompt_split(context).text
+
+
+def render_orchestrator_prompt_split(context: dict[str, Any]) -> SplitPrompt:
+    """Render the orchestrator prompt as a cacheable prefix + per-request suffix."""
+    prefix, suffix = _compile_orchestrator_template()
+    return SplitPrompt(
+        agent="vidya.orchestrator",
+        prefix=str(prefix(context)),
+        suffix=str(suffix(context)),
+    )
 
 
 def render_instant_answer_prompt(context: dict[str, Any]) -> str:
@@ -134,4 +154,5 @@ __all__ = [
     "load_orchestrator_prompt",
     "render_instant_answer_prompt",
     "render_orchestrator_prompt",
+    "render_orchestrator_prompt_split",
 ]
@@ -20,8 +20,9 @@ Two-stage flow (unchanged):
 Every model call still goes through `run_resiliently` so the same
 retry + key-rotation + telephony-bounded backoff applies as the
 parent-call / lesson-plan routers. The Runner is invoked inside the
-resilience callback; per-attempt the agent's `.model` is swapped to
-a `Gemini` instance pinned to the current api_key, leaving the cached
+resilience callback; each attempt runs on the prepared agent whose
+`.model` is a `Gemini` instance pinned to the current api_key, built
+once per key and reused (see `_adk_prepared.py`), leaving the cached
 agent template untouched between requests.
 
 Cost cap: max 2 Gemini calls per request (classifier + optional
@@ -31,15 +32,21 @@ so net cost is unchanged.
 from __future__ import annotations
 
 import time
-import uuid
 from typing import Any
 
 import structlog
 from fastapi import APIRouter
 
 from ..._adk_keyed_gemini import build_keyed_gemini_from_template
+from ..._adk_prepared import PreparedRunner, prepare_runner
 from ..._behavioural import assert_vidya_response_rules
 from ...config import get_settings
+from ...context_cache import (
+    SplitPrompt,
+    adk_context_cache_callbacks,
+    get_context_cache,
+    is_stale_cache_error,
+)
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
 from ...shared.prompt_safety import sanitize, sanitize_optional
@@ -49,8 +56,8 @@ from .agent import (
     build_vidya_agent,
     classify_action,
     get_orchestrator_model,
-    render_orchestrator_prompt,
 )
+from .prompts import render_orchestrator_prompt_split
 from .registry import render_capability_index
 from .schemas import (
     IntentClassification,
@@ -87,6 +94,9 @@ _MAX_TOTAL_BACKOFF_S = 5.0
 # This is opaque to the model — it's just a session-store key prefix.
 _VIDYA_APP_NAME = "sahayakai-vidya"
 
+# Agent label for the context-cache usage stats on `/readyz`.
+_CACHE_AGENT = "vidya.orchestrator"
+
 
 # ---- ADK Runner helpers -------------------------------------------------
 
@@ -103,15 +113,45 @@ def _build_keyed_gemini(api_key: str) -> Any:
     return build_keyed_gemini_from_template(build_vidya_agent, api_key)
 
 
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached keyed supervisor + Runner for `api_key`.
+
+    The keyed `LlmAgent` is a `model_copy` of the cached template with
+    a pinned `Gemini` swapped in; it and its `InMemoryRunner` are built
+    once per key (see `_adk_prepared.py`) instead of once per attempt.
+    The keyed agent also carries the context-cache callbacks that serve
+    the static prompt prefix from a Gemini cache (see `context_cache.py`).
+    """
+    template = build_vidya_agent()
+
+    def _pin(key: str) -> Any:
+        before_model, on_model_error = adk_context_cache_callbacks(
+            key, agent=_CACHE_AGENT,
+        )
+        return template.model_copy(
+            update={
+                "model": _build_keyed_gemini(key),
+                "before_model_callback": before_model,
+                "on_model_error_callback": on_model_error,
+            }
+        )
+
+    return prepare_runner(
+        app_name=_VIDYA_APP_NAME,
+        template=template,
+        api_key=api_key,
+        pin=_pin,
+    )
+
+
 async def _run_orchestrator_via_runner(
-    *, prompt: str, api_key: str
+    *, prompt: SplitPrompt, api_key: str
 ) -> IntentClassification:
     """One ADK Runner invocation against the VIDYA supervisor.
 
-    Builds a per-call `LlmAgent` by `model_copy`-ing the cached
-    template and swapping in a `Gemini` instance pinned to `api_key`.
-    The cached agent itself is never mutated — `model_copy()` returns
-    a fresh Pydantic instance.
+    Runs on the prepared (cached) keyed supervisor for `api_key`. The
+    cached agent template itself is never mutated — the keyed agent is
+    a `model_copy()` built once per key.
 
     The rendered prompt is passed as `new_message` (user content), NOT
     as `instruction`, because:
@@ -121,47 +161,41 @@ async def _run_orchestrator_via_runner(
         contains a `{var}` shape.
       - Putting it in `new_message` is the canonical way to pass
         per-request user input through ADK; matches what the previous
-        `_call_gemini_structured` did (prompt → `contents`).
+        `_call_gemini_structured` did (prompt → `contents`). It also
+        keeps the keyed agent request-independent, which is what lets
+        it be shared across requests.
+
+    The message carries two text parts, the static prefix then the
+    per-request suffix, so the keyed agent's `before_model_callback`
+    can swap the prefix for a cached-content reference.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    template = build_vidya_agent()
-    agent_for_call = template.model_copy(
-        update={"model": _build_keyed_gemini(api_key)}
-    )
-
-    runner = InMemoryRunner(agent=agent_for_call, app_name=_VIDYA_APP_NAME)
-
-    # InMemoryRunner uses InMemorySessionService; we must create a
-    # session before run_async (no auto_create_session by default).
-    user_id = "vidya-orchestrator"
-    session_id = f"vidya-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_VIDYA_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+    prepared = _prepared_runner(api_key)
 
     new_message = genai_types.Content(
         role="user",
-        parts=[genai_types.Part(text=prompt)],
+        parts=[
+            genai_types.Part(text=prompt.prefix),
+            genai_types.Part(text=prompt.suffix),
+        ],
     )
 
     final_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        # Accumulate text from final-response events. A single
-        # output_schema call typically yields one final event whose
-        # content.parts[0].text is the full JSON.
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                text = getattr(part, "text", None)
-                if text and not getattr(part, "thought", False):
-                    final_text += str(text)
+    # The session is single-use: created here, deleted on exit.
+    async with prepared.session(
+        user_id="vidya-orchestrator", prefix="vidya",
+    ) as ref:
+        async for event in prepared.run(ref, new_message):
+            get_context_cache().record_usage(_CACHE_AGENT, event)
+            # Accumulate text from final-response events. A single
+            # output_schema call typically yields one final event whose
+            # content.parts[0].text is the full JSON.
+            if event.content and event.content.parts:
+                for part in event.content.parts:
+                    text = getattr(part, "text", None)
+                    if text and not getattr(part, "thought", False):
+                        final_text += str(text)
 
     if not final_text.strip():
         raise AgentError(
@@ -262,12 +296,22 @@ async def _run_orchestrator(
         # the right primary flow on a compound request.
         "capabilityIndex": render_capability_index(),
     }
-    prompt = render_orchestrator_prompt(context)
+    prompt = render_orchestrator_prompt_split(context)
 
     async def _do(api_key: str) -> IntentClassification:
-        return await _run_orchestrator_via_runner(
-            prompt=prompt, api_key=api_key
-        )
+        try:
+            return await _run_orchestrator_via_runner(
+                prompt=prompt, api_key=api_key
+            )
+        except Exception as exc:
+            if not is_stale_cache_error(exc):
+                raise
+            # The cache expired or was deleted under us. The error
+            # callback already dropped it, so the retry re-resolves.
+            log.warning("vidya.orchestrator.context_cache_stale")
+            return await _run_orchestrator_via_runner(
+                prompt=prompt, api_key=api_key
+            )
 
     return await run_resiliently(
         _do,
@@ -275,6 +319,7 @@ async def _run_orchestrator(
         span_name="vidya.orchestrator",
         max_total_backoff_seconds=_MAX_TOTAL_BACKOFF_S,
         per_call_timeout_seconds=_PER_CALL_TIMEOUT_S,
+        hedge=True,
     )
 
 
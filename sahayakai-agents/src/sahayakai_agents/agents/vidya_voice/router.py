@@ -32,6 +32,7 @@ import structlog
 from fastapi import APIRouter
 
 from ...config import get_settings
+from ...genai_clients import get_genai_client
 from ...shared.errors import AgentError
 from .agent import (
     build_tool_definitions,
@@ -89,10 +90,9 @@ async def _mint_ephemeral_token(
     a different model with different system instruction. This is the
     main reason we don't just hand the master key to the browser.
     """
-    from google import genai
     from google.genai import types as genai_types
 
-    client = genai.Client(api_key=api_key)
+    client = get_genai_client(api_key)
 
     # Bind the token to the specific model + tools we plan to use.
     # `LiveConnectConfig` accepts `system_instruction` as either a
@@ -8,20 +8,34 @@ INTERNAL call mechanism switches from a hand-rolled
 `google.genai.Client.aio.models.generate_content` to ADK's canonical
 single-agent Runner.
 
-Per-call the cached agent's `.model` is `model_copy()`-ed to swap in a
-`Gemini` instance pinned to the current api_key, leaving the cached
-template untouched between concurrent requests.
+Per key the cached agent's `.model` is `model_copy()`-ed once to swap
+in a `Gemini` instance pinned to that api_key (see `_adk_prepared`),
+leaving the cached template untouched; each request only gets its own
+throwaway session.
+
+`POST /v1/virtual-field-trip/plan/stream` is the SSE variant (see
+`_streaming`): each stop is forwarded as soon as it completes; the
+final `validated` frame is authoritative.
 """
 from __future__ import annotations
 
 import time
-import uuid
+from collections.abc import Callable
 from typing import Any
 
 import structlog
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
 from ..._adk_keyed_gemini import build_keyed_gemini
+from ..._adk_prepared import PreparedRunner, prepare_runner
+from ..._streaming import (
+    StreamSink,
+    event_text,
+    sse_response,
+    stream_structured,
+    streaming_run_config,
+)
 from ...config import get_settings
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
@@ -36,6 +50,7 @@ from .schemas import (
     VirtualFieldTripCore,
     VirtualFieldTripRequest,
     VirtualFieldTripResponse,
+    VirtualFieldTripStop,
 )
 
 log = structlog.get_logger(__name__)
@@ -60,6 +75,12 @@ _PER_CALL_TIMEOUT_S = 35.0
 # ADK Runner needs an app_name for the in-memory session service.
 _VIRTUAL_FIELD_TRIP_APP_NAME = "sahayakai-virtual-field-trip"
 
+# Subtrees forwarded as `partial` frames by the `/stream` route.
+_STREAM_WATCH = {
+    "title": None,
+    "stops[*]": VirtualFieldTripStop,
+}
+
 _LANGUAGE_NAME_TO_ISO: dict[str, str] = {
     "english": "en", "hindi": "hi", "tamil": "ta", "telugu": "te",
     "kannada": "kn", "malayalam": "ml", "bengali": "bn", "marathi": "mr",
@@ -75,10 +96,11 @@ def _iso_for_lang(language: str | None) -> str:
 
 
 def _build_pinned_agent(api_key: str) -> Any:
-    """Build a per-call `LlmAgent` clone with `.model` pinned to api_key.
+    """Build an `LlmAgent` clone with `.model` pinned to api_key.
 
     The cached agent template is never mutated — `model_copy()` returns
-    a fresh Pydantic instance each call.
+    a fresh Pydantic instance. Called once per key by
+    `_prepared_runner`.
     """
     template = build_virtual_field_trip_agent()
     template_model = template.model
@@ -96,13 +118,26 @@ def _build_pinned_agent(api_key: str) -> Any:
     )
 
 
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned agent + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_VIRTUAL_FIELD_TRIP_APP_NAME,
+        template=build_virtual_field_trip_agent(),
+        api_key=api_key,
+        pin=_build_pinned_agent,
+    )
+
+
 async def _run_pipeline_via_runner(
-    *, prompt: str, api_key: str,
+    *,
+    prompt: str,
+    api_key: str,
+    on_text: Callable[[str], None] | None = None,
 ) -> VirtualFieldTripCore:
     """One ADK Runner invocation against the planner LlmAgent.
 
-    Builds a per-call `LlmAgent` by `model_copy`-ing the cached template
-    and swapping in a `Gemini` instance pinned to `api_key`. The rendered
+    Runs against the prepared (built once per key) `LlmAgent` clone
+    whose `Gemini` is pinned to `api_key`, in a single-use session. The rendered
     prompt is shipped as the user `new_message` (NOT `instruction`) so
     ADK's `inject_session_state()` can't trip on `{var}` shapes leaking
     through sanitised user input.
@@ -110,22 +145,13 @@ async def _run_pipeline_via_runner(
     Drains every event from the Runner; accumulates non-`thought` text
     parts from the final event(s) into the JSON payload that
     `output_schema=VirtualFieldTripCore` produced.
+
+    With `on_text` the agent runs in ADK's SSE mode: `partial` events'
+    text deltas go to `on_text` and are left out of the final text.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    agent_for_call = _build_pinned_agent(api_key)
-    runner = InMemoryRunner(
-        agent=agent_for_call, app_name=_VIRTUAL_FIELD_TRIP_APP_NAME,
-    )
-
-    user_id = "virtual-field-trip-planner"
-    session_id = f"virtual-field-trip-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_VIRTUAL_FIELD_TRIP_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+    prepared = _prepared_runner(api_key)
 
     new_message = genai_types.Content(
         role="user",
@@ -133,16 +159,15 @@ async def _run_pipeline_via_runner(
     )
 
     final_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                text = getattr(part, "text", None)
-                if text and not getattr(part, "thought", False):
-                    final_text += str(text)
+    async with prepared.session(
+        user_id="virtual-field-trip-planner", prefix="virtual-field-trip",
+    ) as ref:
+        run_config = streaming_run_config() if on_text is not None else None
+        async for event in prepared.run(ref, new_message, run_config):
+            if on_text is not None and getattr(event, "partial", False):
+                on_text(event_text(event))
+                continue
+            final_text += event_text(event)
 
     if not final_text.strip():
         raise AgentError(
@@ -172,6 +197,7 @@ async def _run_planner(
     payload: VirtualFieldTripRequest,
     api_keys: tuple[str, ...],
     settings: Any,
+    sink: StreamSink | None = None,
 ) -> VirtualFieldTripCore:
     # Phase J §J.3 — sanitize user-controlled strings before render.
     context = {
@@ -182,8 +208,13 @@ async def _run_planner(
     prompt = render_planner_prompt(context)
 
     async def _do(api_key: str) -> VirtualFieldTripCore:
+        if sink is None:
+            return await _run_pipeline_via_runner(
+                prompt=prompt, api_key=api_key,
+            )
+        sink.begin_attempt()
         return await _run_pipeline_via_runner(
-            prompt=prompt, api_key=api_key,
+            prompt=prompt, api_key=api_key, on_text=sink.write,
         )
 
     return await run_resiliently(
@@ -195,31 +226,10 @@ async def _run_planner(
     )
 
 
-@virtual_field_trip_router.post(
-    "/plan", response_model=VirtualFieldTripResponse,
-)
-async def virtual_field_trip_plan(
-    payload: VirtualFieldTripRequest,
+def _to_response(
+    payload: VirtualFieldTripRequest, core: VirtualFieldTripCore, started: float,
 ) -> VirtualFieldTripResponse:
-    settings = get_settings()
-    started = time.perf_counter()
-    api_keys = settings.genai_keys
-
-    try:
-        core = await _run_planner(payload, api_keys, settings)
-    except AISafetyBlockError as exc:
-        log.warning("virtual_field_trip.safety_block", reason=str(exc))
-        raise
-    except AgentError:
-        raise
-    except Exception as exc:
-        log.error("virtual_field_trip.planner.failed", error=str(exc))
-        raise AgentError(
-            code="INTERNAL",
-            message="Virtual field-trip agent failed",
-            http_status=502,
-        ) from exc
-
+    """Behavioural guard + wire response, shared by both routes."""
     try:
         assert_virtual_field_trip_response_rules(
             title=core.title,
@@ -259,3 +269,49 @@ async def virtual_field_trip_plan(
         latencyMs=latency_ms,
         modelUsed=get_planner_model(),
     )
+
+
+@virtual_field_trip_router.post(
+    "/plan", response_model=VirtualFieldTripResponse,
+)
+async def virtual_field_trip_plan(
+    payload: VirtualFieldTripRequest,
+) -> VirtualFieldTripResponse:
+    settings = get_settings()
+    started = time.perf_counter()
+    api_keys = settings.genai_keys
+
+    try:
+        core = await _run_planner(payload, api_keys, settings)
+    except AISafetyBlockError as exc:
+        log.warning("virtual_field_trip.safety_block", reason=str(exc))
+        raise
+    except AgentError:
+        raise
+    except Exception as exc:
+        log.error("virtual_field_trip.planner.failed", error=str(exc))
+        raise AgentError(
+            code="INTERNAL",
+            message="Virtual field-trip agent failed",
+            http_status=502,
+        ) from exc
+
+    return _to_response(payload, core, started)
+
+
+@virtual_field_trip_router.post("/plan/stream")
+async def virtual_field_trip_plan_stream(
+    payload: VirtualFieldTripRequest,
+) -> StreamingResponse:
+    """SSE variant of the route above; the `validated` frame is authoritative."""
+    settings = get_settings()
+    started = time.perf_counter()
+    api_keys = settings.genai_keys
+
+    return sse_response(stream_structured(
+        route="virtual_field_trip",
+        started=started,
+        generate=lambda sink: _run_planner(payload, api_keys, settings, sink),
+        finalize=lambda core: _to_response(payload, core, started),
+        watch=_STREAM_WATCH,
+    ))
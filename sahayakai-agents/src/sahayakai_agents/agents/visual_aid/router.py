@@ -20,13 +20,13 @@ from __future__ import annotations
 import asyncio
 import base64
 import time
-import uuid
 from typing import Any
 
 import structlog
 from fastapi import APIRouter
 
 from ..._adk_keyed_gemini import build_keyed_gemini
+from ..._adk_prepared import PreparedRunner, prepare_runner
 from ...config import get_settings
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
@@ -167,11 +167,12 @@ def _maybe_extract_metadata_text(part: Any, author: str) -> str:
 
 
 def _build_pinned_pipeline(api_key: str) -> Any:
-    """Build a per-call SequentialAgent with each sub-agent's `.model`
-    swapped to a `Gemini` instance pinned to `api_key`.
+    """Build a SequentialAgent with each sub-agent's `.model` swapped
+    to a `Gemini` instance pinned to `api_key`.
 
     The cached agent itself is never mutated — `clone()` returns a
-    fresh agent instance with the requested updates.
+    fresh agent instance with the requested updates. Called once per
+    key by `_prepared_runner`.
     """
     from google.adk.agents import LlmAgent  # noqa: PLC0415
 
@@ -199,6 +200,16 @@ def _build_pinned_pipeline(api_key: str) -> Any:
     return template.clone(update={"sub_agents": pinned_subs})
 
 
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned pipeline + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_VISUAL_AID_APP_NAME,
+        template=build_visual_aid_agent(),
+        api_key=api_key,
+        pin=_build_pinned_pipeline,
+    )
+
+
 async def _run_pipeline_via_runner(
     *,
     image_prompt: str,
@@ -215,23 +226,9 @@ async def _run_pipeline_via_runner(
     runner events. Raises `AgentError` if either stage is missing or
     malformed.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    pipeline = _build_pinned_pipeline(api_key)
-    runner = InMemoryRunner(agent=pipeline, app_name=_VISUAL_AID_APP_NAME)
-
-    user_id = "visual-aid-pipeline"
-    session_id = f"visual-aid-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_VISUAL_AID_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-        state={
-            STATE_IMAGE_PROMPT: image_prompt,
-            STATE_METADATA_PROMPT: metadata_prompt,
-        },
-    )
+    prepared = _prepared_runner(api_key)
 
     # `new_message` is required — pass a no-op user content; each
     # sub-agent sources its actual prompt from session state.
@@ -240,13 +237,17 @@ async def _run_pipeline_via_runner(
         parts=[genai_types.Part(text="proceed")],
     )
 
-    image_bytes, image_mime, metadata_text = await _consume_pipeline_events(
-        runner.run_async(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=trigger_message,
-        ),
-    )
+    async with prepared.session(
+        user_id="visual-aid-pipeline",
+        prefix="visual-aid",
+        state={
+            STATE_IMAGE_PROMPT: image_prompt,
+            STATE_METADATA_PROMPT: metadata_prompt,
+        },
+    ) as ref:
+        image_bytes, image_mime, metadata_text = await _consume_pipeline_events(
+            prepared.run(ref, trigger_message),
+        )
 
     if image_bytes is None or image_mime is None:
         raise AgentError(
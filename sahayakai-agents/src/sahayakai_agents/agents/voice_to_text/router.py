@@ -21,13 +21,13 @@ import asyncio
 import base64
 import re
 import time
-import uuid
 from typing import Any
 
 import structlog
 from fastapi import APIRouter
 
 from ..._adk_keyed_gemini import build_keyed_gemini
+from ..._adk_prepared import PreparedRunner, prepare_runner
 from ...config import get_settings
 from ...resilience import run_resiliently
 from ...shared.errors import AgentError, AISafetyBlockError
@@ -130,8 +130,9 @@ def _decode_audio_data_uri(uri: str) -> tuple[bytes, str]:
 
 
 def _build_pinned_pipeline(api_key: str) -> Any:
-    """Build a per-call SequentialAgent with the sub-agent's `.model`
-    swapped to a `Gemini` instance pinned to `api_key`."""
+    """Build a SequentialAgent with the sub-agent's `.model` swapped
+    to a `Gemini` instance pinned to `api_key`. Called once per key by
+    `_prepared_runner`."""
     from google.adk.agents import LlmAgent  # noqa: PLC0415
 
     template = build_voice_to_text_agent()
@@ -157,6 +158,16 @@ def _build_pinned_pipeline(api_key: str) -> Any:
     return template.clone(update={"sub_agents": pinned_subs})
 
 
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned pipeline + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_VOICE_TO_TEXT_APP_NAME,
+        template=build_voice_to_text_agent(),
+        api_key=api_key,
+        pin=_build_pinned_pipeline,
+    )
+
+
 def _normalize_expected_language(expected_language: str | None) -> str | None:
     """Return the lowercase ISO hint if it's in the supported set, else None.
 
@@ -192,19 +203,9 @@ async def _run_pipeline_via_runner(
     audio_part]`). The sub-agent's `output_schema=VoiceToTextCore`
     triggers structured JSON output.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    pipeline = _build_pinned_pipeline(api_key)
-    runner = InMemoryRunner(agent=pipeline, app_name=_VOICE_TO_TEXT_APP_NAME)
-
-    user_id = "voice-to-text-pipeline"
-    session_id = f"voice-to-text-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_VOICE_TO_TEXT_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+    prepared = _prepared_runner(api_key)
 
     audio_part = genai_types.Part.from_bytes(
         data=audio_bytes, mime_type=audio_mime,
@@ -218,20 +219,19 @@ async def _run_pipeline_via_runner(
     )
 
     final_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        author = getattr(event, "author", None) or ""
-        if author != _TRANSCRIBER_AGENT_NAME:
-            continue
-        if not event.content or not event.content.parts:
-            continue
-        for part in event.content.parts:
-            text = getattr(part, "text", None)
-            if text and not getattr(part, "thought", False):
-                final_text += str(text)
+    async with prepared.session(
+        user_id="voice-to-text-pipeline", prefix="voice-to-text",
+    ) as ref:
+        async for event in prepared.run(ref, new_message):
+            author = getattr(event, "author", None) or ""
+            if author != _TRANSCRIBER_AGENT_NAME:
+                continue
+            if not event.content or not event.content.parts:
+                continue
+            for part in event.content.parts:
+                text = getattr(part, "text", None)
+                if text and not getattr(part, "thought", False):
+                    final_text += str(text)
 
     if not final_text.strip():
         # Soft-empty: short / silent / sub-threshold audio produces no
@@ -10,25 +10,48 @@ INTERNAL call mechanism switches from a hand-rolled
 `google.genai.Client.aio.models.generate_content` to ADK's canonical
 single-agent Runner.
 
-Per-call the cached agent's `.model` is `model_copy()`-ed to swap in a
-`Gemini` instance pinned to the current api_key, leaving the cached
-template untouched between concurrent requests. The decoded image
+Per key the cached agent's `.model` is `model_copy()`-ed once to swap
+in a `Gemini` instance pinned to that api_key (see `_adk_prepared`),
+leaving the cached template untouched; each request only gets its own
+throwaway session. The decoded image
 bytes ride along the user `new_message` Content as a separate
 `Part.from_bytes(...)` alongside the prompt text Part.
+
+`POST /v1/worksheet/generate/stream` is the SSE variant (see
+`_streaming`): same request, same guard, but title, objectives,
+activities and answer-key entries are forwarded as they complete.
 """
 from __future__ import annotations
 
 import time
-import uuid
+from collections.abc import Callable
 from typing import Any
 
 import structlog
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import StreamingResponse
 
 from ..._adk_keyed_gemini import build_keyed_gemini
+from ..._adk_prepared import PreparedRunner, prepare_runner
+from ..._streaming import (
+    StreamSink,
+    event_text,
+    sse_response,
+    stream_structured,
+    streaming_run_config,
+)
 from ...config import get_settings
 from ...resilience import run_resiliently
+from ...response_cache import (
+    digest_bytes,
+    get_response_cache,
+    mark_cache,
+    prompt_version,
+    response_cache_key,
+    wants_fresh,
+)
 from ...shared.errors import AgentError, AISafetyBlockError
+from ...shared.image_pipeline import prepare_image_async
 from ...shared.prompt_safety import sanitize, sanitize_optional
 from ._guard import assert_worksheet_response_rules
 from .agent import (
@@ -38,7 +61,13 @@ from .agent import (
     parse_data_uri,
     render_wizard_prompt,
 )
-from .schemas import WorksheetCore, WorksheetRequest, WorksheetResponse
+from .schemas import (
+    WorksheetActivity,
+    WorksheetAnswerKeyEntry,
+    WorksheetCore,
+    WorksheetRequest,
+    WorksheetResponse,
+)
 
 log = structlog.get_logger(__name__)
 
@@ -59,6 +88,15 @@ _PER_CALL_TIMEOUT_S = 35.0
 # ADK Runner needs an app_name for the in-memory session service.
 _WORKSHEET_APP_NAME = "sahayakai-worksheet"
 
+# Subtrees forwarded as `partial` frames by the `/stream` route.
+_STREAM_WATCH = {
+    "title": None,
+    "learningObjectives[*]": None,
+    "studentInstructions": None,
+    "activities[*]": WorksheetActivity,
+    "answerKey[*]": WorksheetAnswerKeyEntry,
+}
+
 _LANGUAGE_NAME_TO_ISO: dict[str, str] = {
     "english": "en", "hindi": "hi", "tamil": "ta", "telugu": "te",
     "kannada": "kn", "malayalam": "ml", "bengali": "bn", "marathi": "mr",
@@ -74,10 +112,11 @@ def _iso_for_lang(language: str | None) -> str:
 
 
 def _build_pinned_agent(api_key: str) -> Any:
-    """Build a per-call `LlmAgent` clone with `.model` pinned to api_key.
+    """Build an `LlmAgent` clone with `.model` pinned to api_key.
 
     The cached agent template is never mutated — `model_copy()` returns
-    a fresh Pydantic instance each call.
+    a fresh Pydantic instance. Called once per key by
+    `_prepared_runner`.
     """
     template = build_worksheet_agent()
     template_model = template.model
@@ -95,17 +134,28 @@ def _build_pinned_agent(api_key: str) -> Any:
     )
 
 
+def _prepared_runner(api_key: str) -> PreparedRunner:
+    """The cached pinned agent + Runner for `api_key`."""
+    return prepare_runner(
+        app_name=_WORKSHEET_APP_NAME,
+        template=build_worksheet_agent(),
+        api_key=api_key,
+        pin=_build_pinned_agent,
+    )
+
+
 async def _run_pipeline_via_runner(
     *,
     prompt: str,
     image_bytes: bytes,
     image_mime: str,
     api_key: str,
+    on_text: Callable[[str], None] | None = None,
 ) -> WorksheetCore:
     """One ADK Runner invocation against the wizard LlmAgent.
 
-    Builds a per-call `LlmAgent` by `model_copy`-ing the cached template
-    and swapping in a `Gemini` instance pinned to `api_key`. The
+    Runs against the prepared (built once per key) `LlmAgent` clone
+    whose `Gemini` is pinned to `api_key`, in a single-use session. The
     rendered prompt + decoded image bytes ride along as a multipart
     user `new_message` Content (text Part + image Part). ADK forwards
     that to Gemini's `contents=` parameter, preserving the pre-Phase-
@@ -114,22 +164,14 @@ async def _run_pipeline_via_runner(
     Drains every event from the Runner; accumulates non-`thought` text
     parts from the final event(s) into the JSON payload that
     `output_schema=WorksheetCore` produced.
+
+    With `on_text` the agent runs in ADK's SSE mode: each `partial`
+    event's text delta goes to `on_text`, and only the final aggregated
+    event feeds the JSON payload.
     """
-    from google.adk.runners import InMemoryRunner  # noqa: PLC0415
     from google.genai import types as genai_types  # noqa: PLC0415
 
-    agent_for_call = _build_pinned_agent(api_key)
-    runner = InMemoryRunner(
-        agent=agent_for_call, app_name=_WORKSHEET_APP_NAME,
-    )
-
-    user_id = "worksheet-wizard"
-    session_id = f"worksheet-{uuid.uuid4().hex}"
-    await runner.session_service.create_session(
-        app_name=_WORKSHEET_APP_NAME,
-        user_id=user_id,
-        session_id=session_id,
-    )
+    prepared = _prepared_runner(api_key)
 
     image_part = genai_types.Part.from_bytes(
         data=image_bytes, mime_type=image_mime,
@@ -143,16 +185,15 @@ async def _run_pipeline_via_runner(
     )
 
     final_text = ""
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                text = getattr(part, "text", None)
-                if text and not getattr(part, "thought", False):
-                    final_text += str(text)
+    async with prepared.session(
+        user_id="worksheet-wizard", prefix="worksheet",
+    ) as ref:
+        run_config = streaming_run_config() if on_text is not None else None
+        async for event in prepared.run(ref, new_message, run_config):
+            if on_text is not None and getattr(event, "partial", False):
+                on_text(event_text(event))
+                continue
+            final_text += event_text(event)
 
     if not final_text.strip():
         raise AgentError(
@@ -176,10 +217,25 @@ async def _run_pipeline_via_runner(
         ) from exc
 
 
+def _wizard_context(payload: WorksheetRequest) -> dict[str, Any]:
+    # Phase J §J.3 — sanitize user-controlled strings before they
+    # land in the rendered prompt.
+    return {
+        "prompt": sanitize(payload.prompt, max_length=2000),
+        "language": sanitize(payload.language or "English", max_length=20),
+        "gradeLevel": sanitize_optional(payload.gradeLevel, max_length=50),
+        "subject": sanitize_optional(payload.subject, max_length=100),
+        "teacherContext": sanitize_optional(
+            payload.teacherContext, max_length=1000,
+        ),
+    }
+
+
 async def _run_wizard(
     payload: WorksheetRequest,
     api_keys: tuple[str, ...],
     settings: Any,
+    sink: StreamSink | None = None,
 ) -> WorksheetCore:
     # Decode the data URI before any model call.
     try:
@@ -190,26 +246,27 @@ async def _run_wizard(
             message=f"Invalid imageDataUri: {exc}",
             http_status=400,
         ) from exc
+    # Downscale / re-encode once; every retry sends the prepared bytes.
+    image = await prepare_image_async(image_bytes, image_mime)
+    image_bytes, image_mime = image.data, image.mime_type
 
-    # Phase J §J.3 — sanitize user-controlled strings before they
-    # land in the rendered prompt.
-    context = {
-        "prompt": sanitize(payload.prompt, max_length=2000),
-        "language": sanitize(payload.language or "English", max_length=20),
-        "gradeLevel": sanitize_optional(payload.gradeLevel, max_length=50),
-        "subject": sanitize_optional(payload.subject, max_length=100),
-        "teacherContext": sanitize_optional(
-            payload.teacherContext, max_length=1000,
-        ),
-    }
-    prompt = render_wizard_prompt(context)
+    prompt = render_wizard_prompt(_wizard_context(payload))
 
     async def _do(api_key: str) -> WorksheetCore:
+        if sink is None:
+            return await _run_pipeline_via_runner(
+                prompt=prompt,
+                image_bytes=image_bytes,
+                image_mime=image_mime,
+                api_key=api_key,
+            )
+        sink.begin_attempt()
         return await _run_pipeline_via_runner(
             prompt=prompt,
             image_bytes=image_bytes,
             image_mime=image_mime,
             api_key=api_key,
+            on_text=sink.write,
         )
 
     return await run_resiliently(
@@ -221,27 +278,10 @@ async def _run_wizard(
     )
 
 
-@worksheet_router.post("/generate", response_model=WorksheetResponse)
-async def worksheet_generate(payload: WorksheetRequest) -> WorksheetResponse:
-    settings = get_settings()
-    started = time.perf_counter()
-    api_keys = settings.genai_keys
-
-    try:
-        core = await _run_wizard(payload, api_keys, settings)
-    except AISafetyBlockError as exc:
-        log.warning("worksheet.wizard.safety_block", reason=str(exc))
-        raise
-    except AgentError:
-        raise
-    except Exception as exc:
-        log.error("worksheet.wizard.failed", error=str(exc))
-        raise AgentError(
-            code="INTERNAL",
-            message="Worksheet wizard agent failed",
-            http_status=502,
-        ) from exc
-
+def _to_response(
+    payload: WorksheetRequest, core: WorksheetCore, started: float,
+) -> WorksheetResponse:
+    """Behavioural guard + wire response, shared by both routes."""
     try:
         assert_worksheet_response_rules(
             title=core.title,
@@ -288,3 +328,73 @@ async def worksheet_generate(payload: WorksheetRequest) -> WorksheetResponse:
         latencyMs=latency_ms,
         modelUsed=get_wizard_model(),
     )
+
+
+@worksheet_router.post("/generate", response_model=WorksheetResponse)
+async def worksheet_generate(
+    payload: WorksheetRequest,
+    request: Request,
+    response: Response,
+) -> WorksheetResponse:
+    """Identical sanitized requests (same image bytes) are served from
+    the response cache with `X-Cache: hit`."""
+    settings = get_settings()
+    started = time.perf_counter()
+    api_keys = settings.genai_keys
+
+    async def _generate() -> WorksheetResponse:
+        try:
+            core = await _run_wizard(payload, api_keys, settings)
+        except AISafetyBlockError as exc:
+            log.warning("worksheet.wizard.safety_block", reason=str(exc))
+            raise
+        except AgentError:
+            raise
+        except Exception as exc:
+            log.error("worksheet.wizard.failed", error=str(exc))
+            raise AgentError(
+                code="INTERNAL",
+                message="Worksheet wizard agent failed",
+                http_status=502,
+            ) from exc
+        return _to_response(payload, core, started)
+
+    key = response_cache_key(
+        "worksheet",
+        {**_wizard_context(payload), "image": digest_bytes(payload.imageDataUri)},
+        prompts=prompt_version("worksheet"),
+        model=get_wizard_model(),
+    )
+    result, status = await get_response_cache().get_or_compute(
+        key,
+        route="worksheet",
+        model=WorksheetResponse,
+        compute=_generate,
+        fresh=wants_fresh(request),
+    )
+    mark_cache(response, status)
+    if status == "hit":
+        result = result.model_copy(
+            update={
+                "cacheHit": True,
+                "sidecarVersion": SIDECAR_VERSION,
+                "latencyMs": int((time.perf_counter() - started) * 1000),
+            },
+        )
+    return result
+
+
+@worksheet_router.post("/generate/stream")
+async def worksheet_generate_stream(payload: WorksheetRequest) -> StreamingResponse:
+    """SSE variant of `/generate`; the `validated` frame is authoritative."""
+    settings = get_settings()
+    started = time.perf_counter()
+    api_keys = settings.genai_keys
+
+    return sse_response(stream_structured(
+        route="worksheet",
+        started=started,
+        generate=lambda sink: _run_wizard(payload, api_keys, settings, sink),
+        finalize=lambda core: _to_response(payload, core, started),
+        watch=_STREAM_WATCH,
+    ))
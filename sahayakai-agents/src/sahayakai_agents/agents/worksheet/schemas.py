@@ -91,4 +91,5 @@ class WorksheetResponse(BaseModel):
 
     sidecarVersion: str = Field(min_length=1, max_length=64)
     latencyMs: int = Field(ge=0)
+    cacheHit: bool = Field(default=False, description="Served from the response cache.")
     modelUsed: str = Field(min_length=1, max_length=200)
@@ -27,19 +27,25 @@ eliminates.
 """
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
 import hmac
+import re
+import threading
 import time
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
 
 import structlog
-from cachetools import TTLCache  # type: ignore[import-untyped]
+from cachetools import TLRUCache, TTLCache  # type: ignore[import-untyped]
 from fastapi import Request, Response
 from google.auth.transport import requests as google_requests
 from google.oauth2 import id_token as google_id_token
 
 from .config import get_settings
+from .replay_guard import get_replay_guard
 from .shared.errors import (
     AuthenticationError,
     AuthorizationError,
@@ -52,8 +58,158 @@ log = structlog.get_logger(__name__)
 _PUBLIC_PATHS: frozenset[str] = frozenset({"/healthz", "/readyz", "/.well-known/agent.json"})
 
 # IAM ID-token verification is expensive (public key fetch, JWT parse, sig
-# check). Cache the Google request transport per-process; it reuses keys.
-_google_request = google_requests.Request()
+# check). Three layers keep it off the hot path:
+#
+#   1. `_ID_TOKEN_CACHE` — verified claims keyed by the token's SHA-256,
+#      so a caller re-using one ID token for its ~1h lifetime (the
+#      Next.js runtime does) pays for verification once.
+#   2. `_CachedCertsRequest` — Google's signing certs are cached for the
+#      certs endpoint's `Cache-Control: max-age` (hours) and refreshed
+#      in the background shortly before they expire. `google-auth`
+#      itself re-downloads them on every `verify_oauth2_token` call.
+#   3. What is left (JWT parse + RSA verify, plus a cert fetch on a cold
+#      or expired cache) runs in a worker thread, not on the event loop.
+_CERTS_REFRESH_FRACTION = 0.8  # refresh once 80% of max-age has elapsed
+_CACHE_CONTROL_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+@dataclass(frozen=True)
+class _CachedCertsResponse:
+    response: Any
+    fetched_at: float
+    max_age: float
+
+    @property
+    def expires_at(self) -> float:
+        return self.fetched_at + self.max_age
+
+    @property
+    def refresh_at(self) -> float:
+        return self.fetched_at + self.max_age * _CERTS_REFRESH_FRACTION
+
+
+def _cache_control_max_age(headers: Mapping[str, str]) -> int | None:
+    for name, value in headers.items():
+        if name.lower() == "cache-control":
+            match = _CACHE_CONTROL_MAX_AGE.search(value)
+            return int(match.group(1)) if match else None
+    return None
+
+
+class _CachedCertsRequest:
+    """`google.auth.transport.Request` that caches successful GETs.
+
+    `verify_oauth2_token` only ever GETs the certs URL through the
+    request object we hand it, so wrapping the transport is enough to
+    cache the certs without re-implementing any of the verification.
+    Responses without a `max-age` (or non-200s) are never cached.
+
+    Thread-safe: verification runs in worker threads. A cold or expired
+    entry is fetched under a lock so a burst of requests triggers one
+    download, not one per request; an entry past its refresh point is
+    served as-is while a daemon thread re-fetches it.
+    """
+
+    def __init__(
+        self,
+        inner: Callable[..., Any],
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._inner = inner
+        self._clock = clock
+        self._entries: dict[str, _CachedCertsResponse] = {}
+        self._fetch_lock = threading.Lock()
+        self._refreshing: set[str] = set()
+
+    def __call__(
+        self,
+        url: str,
+        method: str = "GET",
+        body: bytes | None = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        if method != "GET" or body is not None:
+            return self._inner(
+                url, method=method, body=body, headers=headers, timeout=timeout, **kwargs
+            )
+
+        entry = self._entries.get(url)
+        now = self._clock()
+        if entry is not None and now < entry.expires_at:
+            if now >= entry.refresh_at:
+                self._refresh_in_background(url, headers, timeout)
+            return entry.response
+
+        with self._fetch_lock:
+            # Another thread may have fetched while we waited.
+            entry = self._entries.get(url)
+            if entry is not None and self._clock() < entry.expires_at:
+                return entry.response
+            return self._fetch(url, headers, timeout)
+
+    def _fetch(
+        self, url: str, headers: Mapping[str, str] | None, timeout: float | None
+    ) -> Any:
+        response = self._inner(url, method="GET", headers=headers, timeout=timeout)
+        max_age = _cache_control_max_age(response.headers or {})
+        if response.status == 200 and max_age:
+            self._entries[url] = _CachedCertsResponse(
+                response=response, fetched_at=self._clock(), max_age=float(max_age)
+            )
+            log.info("auth.certs.fetched", max_age_s=max_age)
+        return response
+
+    def _refresh_in_background(
+        self, url: str, headers: Mapping[str, str] | None, timeout: float | None
+    ) -> None:
+        with self._fetch_lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def _run() -> None:
+            try:
+                with self._fetch_lock:
+                    self._fetch(url, headers, timeout)
+            except Exception as exc:  # noqa: BLE001 — keep serving the cached certs
+                log.warning("auth.certs.refresh_failed", error=str(exc)[:200])
+            finally:
+                with self._fetch_lock:
+                    self._refreshing.discard(url)
+
+        threading.Thread(target=_run, name="auth-certs-refresh", daemon=True).start()
+
+    def clear(self) -> None:
+        with self._fetch_lock:
+            self._entries.clear()
+
+
+_google_request = _CachedCertsRequest(google_requests.Request())
+
+
+# Verified claims keyed by sha256(token) + audience. Each entry lives
+# until the token's own `exp` (TLRU), never longer than an hour; 1k
+# entries is far above the handful of invoker SAs that call us.
+_ID_TOKEN_CACHE_MAX_TTL_S = 3600
+
+
+def _id_token_ttu(_key: object, value: dict[str, object], now: float) -> float:
+    exp = value.get("exp")
+    deadline = now + _ID_TOKEN_CACHE_MAX_TTL_S
+    if isinstance(exp, (int, float)):
+        return min(float(exp), deadline)
+    return now  # no exp claim → never cache
+
+
+_ID_TOKEN_CACHE: TLRUCache[tuple[str, str], dict[str, object]] = TLRUCache(
+    maxsize=1_000,
+    ttu=_id_token_ttu,
+    timer=time.time,
+)
+_ID_TOKEN_INFLIGHT: dict[tuple[str, str], asyncio.Future[dict[str, object]]] = {}
 
 # Phase R.2: Firebase App Check header. The Next.js bridge attaches this
 # after `getToken(appCheck)` on the browser; the value is a Firebase-signed
@@ -91,6 +247,36 @@ def _verify_id_token(token: str, audience: str) -> dict[str, object]:
     return payload
 
 
+async def _verify_id_token_cached(token: str, audience: str) -> dict[str, object]:
+    """`_verify_id_token` behind the verified-token cache, off the loop.
+
+    Concurrent misses for the same token share one verification (a
+    burst right after a cold start or token rotation verifies once,
+    not once per request). Returns a fresh dict each call — callers
+    annotate the claims (`_verified_at`, `_app_check_app_id`) and must
+    not mutate the cached copy.
+    """
+    cache_key = (hashlib.sha256(token.encode("utf-8")).hexdigest(), audience)
+    cached = _ID_TOKEN_CACHE.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
+    pending = _ID_TOKEN_INFLIGHT.get(cache_key)
+    if pending is None:
+        pending = asyncio.ensure_future(
+            asyncio.to_thread(_verify_id_token, token, audience)
+        )
+        _ID_TOKEN_INFLIGHT[cache_key] = pending
+        try:
+            payload = await asyncio.shield(pending)
+        finally:
+            _ID_TOKEN_INFLIGHT.pop(cache_key, None)
+        _ID_TOKEN_CACHE[cache_key] = dict(payload)
+    else:
+        payload = await asyncio.shield(pending)
+    return dict(payload)
+
+
 # Round-2 audit P1 REPLAY-1 fix (30-agent review, group A5 + B3):
 # HMAC + ID-token alone do NOT prevent replay. A captured
 # (Authorization, X-Content-Digest, body) tuple is replayable for the
@@ -116,13 +302,18 @@ _TIMESTAMP_HEADER = "x-request-timestamp"
 # in-flight when its timestamp ages out cannot be replayed at the edge.
 # 10k entries ≈ 5 MB worst case (key tuple + bool); we run at < 100 rps
 # steady state so the cache never gets close to its bound.
+#
+# This cache is per process. With a shared `replay_guard.ReplayGuard`
+# configured, it is that guard's front cache: `authenticate_request`
+# consults the guard next so replays are also caught across Cloud Run
+# instances.
 _REPLAY_GUARD: TTLCache[tuple[int, str], bool] = TTLCache(
     maxsize=10_000,
     ttl=360,
 )
 
 
-def _verify_content_digest(request: Request, raw_body: bytes) -> None:
+def _verify_content_digest(request: Request, raw_body: bytes) -> str | None:
     """Recompute HMAC-SHA256 of (timestamp + body) and compare against
     `X-Content-Digest`.
 
@@ -136,10 +327,13 @@ def _verify_content_digest(request: Request, raw_body: bytes) -> None:
     A missing timestamp on a non-empty body is a hard failure (no
     backwards-compat with the pre-fix shape — every Next.js client is
     upgraded in lockstep).
+
+    Returns the request nonce (`"{timestamp_ms}_{digest_hex}"`) for the
+    shared replay guard, or None for an empty body.
     """
     if not raw_body:
         # Empty bodies (e.g. idempotent GET) don't need HMAC.
-        return
+        return None
 
     header = request.headers.get("x-content-digest")
     if not header:
@@ -197,6 +391,7 @@ def _verify_content_digest(request: Request, raw_body: bytes) -> None:
         )
         raise ReplayDetectedError("Request replay rejected")
     _REPLAY_GUARD[nonce_key] = True
+    return f"{timestamp_ms}_{digest_hex}"
 
 
 def _verify_app_check_token(request: Request, project_id: str) -> dict[str, object]:
@@ -307,7 +502,7 @@ async def authenticate_request(request: Request) -> dict[str, object]:
         return {"email": "dev@localhost", "env": "development"}
 
     token = _extract_bearer(request)
-    claims = _verify_id_token(token, settings.audience)
+    claims = await _verify_id_token_cached(token, settings.audience)
 
     email = str(claims.get("email") or "")
     if not email:
@@ -324,7 +519,19 @@ async def authenticate_request(request: Request) -> dict[str, object]:
     # Body integrity. Reading the body here consumes the stream — we must
     # stash it back onto the request so downstream handlers can re-read.
     raw_body = await request.body()
-    _verify_content_digest(request, raw_body)
+    nonce = _verify_content_digest(request, raw_body)
+
+    # The check above only sees this instance's traffic. With a shared
+    # ReplayGuard configured (Firestore), it is the authority and
+    # `_REPLAY_GUARD` acts as its zero-cost front cache.
+    replay_guard = get_replay_guard()
+    if (
+        nonce is not None
+        and replay_guard is not None
+        and not await replay_guard.claim(nonce)
+    ):
+        log.warning("auth.hmac.replay_detected", shared=True)
+        raise ReplayDetectedError("Request replay rejected")
 
     # Phase R.2: App Check (client attestation). Optional via env so dev
     # mode + first staging deploys can skip it before reCAPTCHA is wired.
@@ -67,15 +67,143 @@ class Settings(BaseSettings):
         default=SecretStr(""), alias="GOOGLE_GENAI_SHADOW_API_KEY"
     )
 
+    # --- Pooled google-genai transport (see genai_clients.py) ---
+    # One keep-alive HTTP/2 pool shared by every key's client so failover
+    # attempts reuse warm TLS connections instead of handshaking per call.
+    genai_http_max_connections: int = Field(
+        default=100, alias="SAHAYAKAI_GENAI_HTTP_MAX_CONNECTIONS"
+    )
+    genai_http_max_keepalive_connections: int = Field(
+        default=20, alias="SAHAYAKAI_GENAI_HTTP_MAX_KEEPALIVE"
+    )
+    genai_http_keepalive_expiry_seconds: float = Field(
+        default=60.0, alias="SAHAYAKAI_GENAI_HTTP_KEEPALIVE_EXPIRY_SECONDS"
+    )
+    genai_http2: bool = Field(default=True, alias="SAHAYAKAI_GENAI_HTTP2")
+
+    # --- Key scheduling (see key_pool.py) ---
+    # Per-key Gemini quota for the token buckets; 0 disables a bucket.
+    genai_key_rpm: int = Field(default=0, alias="SAHAYAKAI_GENAI_KEY_RPM")
+    genai_key_tpm: int = Field(default=0, alias="SAHAYAKAI_GENAI_KEY_TPM")
+
+    # --- Assessment scanner Pass 1 (see assessment_scanner/pass1_pool.py) ---
+    # Concurrent per-page multimodal calls: across all scans in the
+    # process, and within one scan.
+    assessment_pass1_concurrency: int = Field(
+        default=24, alias="SAHAYAKAI_ASSESSMENT_PASS1_CONCURRENCY"
+    )
+    assessment_pass1_per_request_concurrency: int = Field(
+        default=8, alias="SAHAYAKAI_ASSESSMENT_PASS1_PER_REQUEST_CONCURRENCY"
+    )
+
+    # --- Multimodal image uploads (see shared/image_pipeline.py) ---
+    # Long-side cap in pixels and JPEG re-encode quality.
+    image_max_side_px: int = Field(default=1_536, alias="SAHAYAKAI_IMAGE_MAX_SIDE_PX")
+    image_jpeg_quality: int = Field(default=85, alias="SAHAYAKAI_IMAGE_JPEG_QUALITY")
+
     # --- Session store (P0 #10) ---
     firestore_database: str = Field(default="(default)", alias="SAHAYAKAI_FIRESTORE_DATABASE")
     session_collection: str = Field(default="agent_sessions", alias="SAHAYAKAI_SESSION_COLLECTION")
     session_ttl_hours: int = Field(default=24, alias="SAHAYAKAI_SESSION_TTL_HOURS")
+    # `thread` runs the sync client via asyncio.to_thread; `async` uses the
+    # async client with a per-call transcript cache and one transaction
+    # per turn (see session_store.CachedSessionStore).
+    session_store_mode: Literal["thread", "async"] = Field(
+        default="thread", alias="SAHAYAKAI_SESSION_STORE_MODE"
+    )
+    session_cache_max_calls: int = Field(
+        default=1_024, alias="SAHAYAKAI_SESSION_CACHE_MAX_CALLS"
+    )
+
+    # --- Replay guard (see replay_guard.py) ---
+    # `memory` keeps the per-process nonce cache only; `firestore` adds a
+    # shared insert-if-absent so a captured request cannot be replayed
+    # once per Cloud Run instance.
+    replay_guard_backend: Literal["memory", "firestore"] = Field(
+        default="memory", alias="SAHAYAKAI_REPLAY_GUARD_BACKEND"
+    )
+    replay_guard_collection: str = Field(
+        default="agent_request_nonces", alias="SAHAYAKAI_REPLAY_GUARD_COLLECTION"
+    )
+
+    # --- Response cache (see response_cache.py) ---
+    # In-process LRU tier is always on while enabled; `disk` / `firestore`
+    # add a shared second tier. Prompt edits change the cache key, so the
+    # TTL only bounds how long an unchanged prompt's output is reused.
+    response_cache_enabled: bool = Field(
+        default=True, alias="SAHAYAKAI_RESPONSE_CACHE_ENABLED"
+    )
+    response_cache_backend: Literal["memory", "disk", "firestore"] = Field(
+        default="memory", alias="SAHAYAKAI_RESPONSE_CACHE_BACKEND"
+    )
+    response_cache_ttl_seconds: int = Field(
+        default=86_400, alias="SAHAYAKAI_RESPONSE_CACHE_TTL_SECONDS"
+    )
+    response_cache_max_entries: int = Field(
+        default=256, alias="SAHAYAKAI_RESPONSE_CACHE_MAX_ENTRIES"
+    )
+    response_cache_dir: str = Field(
+        default="/tmp/sahayakai-response-cache", alias="SAHAYAKAI_RESPONSE_CACHE_DIR"
+    )
+    response_cache_collection: str = Field(
+        default="agent_response_cache", alias="SAHAYAKAI_RESPONSE_CACHE_COLLECTION"
+    )
+
+    # --- Gemini explicit context caching (see context_cache.py) ---
+    # A `cachedContents` entry per (key, model, static prompt prefix) is
+    # reused until `ttl - refresh_margin`, then its TTL is extended.
+    # Failed creations fall back to the uncached call and are not
+    # retried for `retry_after` seconds.
+    context_cache_enabled: bool = Field(
+        default=True, alias="SAHAYAKAI_CONTEXT_CACHE_ENABLED"
+    )
+    context_cache_ttl_seconds: int = Field(
+        default=3_600, alias="SAHAYAKAI_CONTEXT_CACHE_TTL_SECONDS"
+    )
+    context_cache_refresh_margin_seconds: int = Field(
+        default=300, alias="SAHAYAKAI_CONTEXT_CACHE_REFRESH_MARGIN_SECONDS"
+    )
+    context_cache_retry_after_seconds: int = Field(
+        default=600, alias="SAHAYAKAI_CONTEXT_CACHE_RETRY_AFTER_SECONDS"
+    )
+
+    # --- RAG query embeddings (see rag/embedding_service.py) ---
+    # LRU of query vectors keyed by normalized text, plus an optional
+    # disk tier (empty dir disables it). Misses arriving within
+    # `batch_window_ms` of each other share one embedding request.
+    embedding_backend: Literal["vertex", "hash"] = Field(
+        default="vertex", alias="SAHAYAKAI_EMBEDDING_BACKEND"
+    )
+    embedding_cache_max_entries: int = Field(
+        default=4_096, alias="SAHAYAKAI_EMBEDDING_CACHE_MAX_ENTRIES"
+    )
+    embedding_cache_dir: str = Field(default="", alias="SAHAYAKAI_EMBEDDING_CACHE_DIR")
+    embedding_batch_window_ms: float = Field(
+        default=5.0, alias="SAHAYAKAI_EMBEDDING_BATCH_WINDOW_MS"
+    )
+    embedding_batch_max: int = Field(default=32, alias="SAHAYAKAI_EMBEDDING_BATCH_MAX")
+
+    # --- Lesson-plan pre-evaluator (see agents/lesson_plan/pre_evaluator.py) ---
+    # `revise` sends structurally broken v1 plans straight to the reviser
+    # without an evaluator call; `full` also passes clean plans locally,
+    # which skips the model's safety judgement for them.
+    lesson_plan_pre_eval: Literal["off", "revise", "full"] = Field(
+        default="revise", alias="SAHAYAKAI_LESSON_PLAN_PRE_EVAL"
+    )
 
     # --- Resilience (P1 #11) ---
     max_total_backoff_seconds: float = Field(
         default=7.0, alias="SAHAYAKAI_MAX_TOTAL_BACKOFF_SECONDS"
     )
+    # Hedged attempts on routes that opt in (see hedging.py): delay is the
+    # span's `hedge_percentile` latency, `hedge_delay_ms` until enough
+    # samples; extra calls are capped at `hedge_budget_percent`.
+    hedge_enabled: bool = Field(default=False, alias="SAHAYAKAI_HEDGE_ENABLED")
+    hedge_delay_ms: int = Field(default=2_000, alias="SAHAYAKAI_HEDGE_DELAY_MS")
+    hedge_percentile: float = Field(default=0.95, alias="SAHAYAKAI_HEDGE_PERCENTILE")
+    hedge_budget_percent: float = Field(
+        default=10.0, alias="SAHAYAKAI_HEDGE_BUDGET_PERCENT"
+    )
 
     # --- App Check (Phase R.2 — Firebase client attestation) ---
     # Layer 3 of the auth chain: ID token + HMAC + App Check token. Proves
@@ -126,6 +254,7 @@ class Settings(BaseSettings):
           verification will 401).
         - R2 extra: `allowed_invokers` must contain at least one entry,
           `genai_keys` must have at least one key.
+        - The RAG query embedder must not be the test `hash` backend.
         """
         if not self.is_production:
             return
@@ -174,6 +303,12 @@ class Settings(BaseSettings):
                 "GOOGLE_GENAI_API_KEY pool is empty; model calls will fail."
             )
 
+        if self.embedding_backend == "hash":
+            errors.append(
+                "SAHAYAKAI_EMBEDDING_BACKEND=hash in production; retrieval "
+                "would rank by meaningless test vectors."
+            )
+
         if errors:
             joined = "\n  - ".join(errors)
             raise RuntimeError(
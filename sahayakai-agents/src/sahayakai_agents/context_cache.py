@@ -0,0 +1,447 @@
+"""Managed Gemini explicit context caching for static prompt prefixes.
+
+`resilience.extract_cache_metrics` only observes IMPLICIT cache hits,
+which Gemini grants opportunistically. Several prompts open with a
+large block that never changes between requests and is resent on
+every call:
+
+- lesson-plan evaluator / reviser — the rubric and the revision rules;
+- assessment-scanner pass 2 — the subject rubric (`rubric_for`), the
+  confidence guidance and the universal scoring rules;
+- VIDYA orchestrator — the intent taxonomy plus the registry's
+  capability index (`render_capability_index`).
+
+Those templates carry a `{{! cache-boundary }}` comment (see
+`CACHE_BOUNDARY`) splitting them into a static prefix and a per-request
+suffix; agents render the two halves separately into a `SplitPrompt`.
+Handlebars drops comments, so the Node runtime sharing a template is
+unaffected.
+
+`ContextCacheManager` owns the `cachedContents` resources:
+
+- One entry per (API key, model, prefix digest). Cached contents live
+  in the key's project, so every pooled key gets its own.
+- Reused until `ttl - refresh_margin`, then its TTL is extended with
+  `caches.update` (re-created if that fails). Idle entries simply
+  expire server-side.
+- Creation is single-flight per entry.
+- Creation failures FALL BACK to the plain call with the full prompt.
+  A 400 (prefix below the model's minimum cacheable size, model
+  without caching support) marks the (model, prefix) unsupported for
+  the process lifetime. Anything else (quota, 5xx) is retried after
+  `retry_after_seconds`.
+- A call that hits a cache deleted behind our back is re-issued
+  uncached and the entry dropped.
+
+Per-agent usage (calls, calls served from an explicit cache, input and
+cached tokens, realized `cacheHitRatio`) is logged and surfaced on
+`/readyz` under `contextCache`.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from .config import Settings, get_settings
+from .genai_clients import get_genai_client
+from .resilience import classify_status, extract_cache_metrics
+
+log = structlog.get_logger(__name__)
+
+# Handlebars comment marking the end of a template's static prefix.
+CACHE_BOUNDARY = "{{! cache-boundary }}"
+
+
+def split_template(source: str) -> tuple[str, str]:
+    """Split template source at `CACHE_BOUNDARY` into (prefix, suffix).
+
+    A template without the marker is all suffix: nothing to cache.
+    """
+    prefix, marker, suffix = source.partition(CACHE_BOUNDARY)
+    if not marker:
+        return "", source
+    return prefix, suffix.removeprefix("\n")
+
+
+@dataclass(frozen=True)
+class SplitPrompt:
+    """A rendered prompt whose `prefix` is identical across requests.
+
+    `agent` labels the call in stats and in the cached content's
+    display name.
+    """
+
+    agent: str
+    prefix: str
+    suffix: str
+
+    @property
+    def text(self) -> str:
+        return self.prefix + self.suffix
+
+
+def is_stale_cache_error(exc: BaseException) -> bool:
+    """True when a call failed because its cached content is gone."""
+    message = str(exc).lower()
+    return "cachedcontent" in message or "cached content" in message
+
+
+@dataclass
+class AgentCacheUsage:
+    calls: int = 0
+    explicit: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+
+    def snapshot(self) -> dict[str, float | int]:
+        ratio = self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+        return {
+            "calls": self.calls,
+            "explicit": self.explicit,
+            "inputTokens": self.input_tokens,
+            "cachedTokens": self.cached_tokens,
+            "cacheHitRatio": round(ratio, 3),
+        }
+
+
+@dataclass
+class ContextCacheStats:
+    """Counters for one manager. Mutated only from the event loop."""
+
+    creates: int = 0
+    refreshes: int = 0
+    create_failures: int = 0
+    stale: int = 0
+    agents: dict[str, AgentCacheUsage] = field(default_factory=dict)
+
+    def agent(self, name: str) -> AgentCacheUsage:
+        return self.agents.setdefault(name, AgentCacheUsage())
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "creates": self.creates,
+            "refreshes": self.refreshes,
+            "createFailures": self.create_failures,
+            "stale": self.stale,
+            "agents": {name: u.snapshot() for name, u in sorted(self.agents.items())},
+        }
+
+
+@dataclass
+class _Entry:
+    name: str
+    expires_at: float  # time.monotonic()
+
+
+_EntryKey = tuple[str, str, str]  # (key fingerprint, model, prefix digest)
+
+
+def _fingerprint(api_key: str) -> str:
+    # Never hold raw keys in long-lived dict keys / logs.
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class ContextCacheManager:
+    """Process-wide registry of explicit `cachedContents` entries.
+
+    Not thread-safe by design, same as `GenaiClientRegistry`: every
+    caller is on the one event loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        ttl_seconds: int = 3_600,
+        refresh_margin_seconds: int = 300,
+        retry_after_seconds: int = 600,
+    ) -> None:
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.stats = ContextCacheStats()
+        self._entries: dict[_EntryKey, _Entry] = {}
+        self._locks: dict[_EntryKey, asyncio.Lock] = {}
+        self._retry_at: dict[_EntryKey, float] = {}
+        self._unsupported: set[tuple[str, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"enabled": self.enabled, "entries": len(self), **self.stats.snapshot()}
+
+    async def resolve(
+        self,
+        client: Any,
+        *,
+        api_key: str,
+        model: str,
+        prefix: str,
+        agent: str,
+        system_instruction: str | None = None,
+    ) -> str | None:
+        """Name of a live cached content holding `prefix`, or None.
+
+        None means "send the full prompt": caching is off, the prefix
+        is empty or unsupported, or creation just failed.
+        """
+        usage = self.stats.agent(agent)
+        usage.calls += 1
+        if not self.enabled or not prefix:
+            return None
+        digest = hashlib.sha256(
+            f"{system_instruction or ''}\0{prefix}".encode()
+        ).hexdigest()
+        key = (_fingerprint(api_key), model, digest)
+        name = self._fresh_name(key)
+        if name is None and not self._blocked(key):
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                # Re-check: a concurrent caller may have just created
+                # (or failed to create) this entry.
+                name = self._fresh_name(key)
+                if name is None and not self._blocked(key):
+                    name = await self._create_or_refresh(
+                        client, key, prefix=prefix, agent=agent,
+                        system_instruction=system_instruction,
+                    )
+        if name is not None:
+            usage.explicit += 1
+        return name
+
+    def _blocked(self, key: _EntryKey) -> bool:
+        _, model, digest = key
+        if (model, digest) in self._unsupported:
+            return True
+        return self._retry_at.get(key, 0.0) > time.monotonic()
+
+    def _fresh_name(self, key: _EntryKey) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at - time.monotonic() <= self.refresh_margin_seconds:
+            return None
+        return entry.name
+
+    async def _create_or_refresh(
+        self,
+        client: Any,
+        key: _EntryKey,
+        *,
+        prefix: str,
+        agent: str,
+        system_instruction: str | None,
+    ) -> str | None:
+        from google.genai import types as genai_types  # noqa: PLC0415
+
+        _, model, digest = key
+        ttl = f"{self.ttl_seconds}s"
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            try:
+                await client.aio.caches.update(
+                    name=entry.name,
+                    config=genai_types.UpdateCachedContentConfig(ttl=ttl),
+                )
+            except Exception as exc:  # noqa: BLE001 — re-create below
+                log.info(
+                    "context_cache.refresh_failed",
+                    agent=agent,
+                    error_type=type(exc).__name__,
+                )
+            else:
+                entry.expires_at = time.monotonic() + self.ttl_seconds
+                self.stats.refreshes += 1
+                return entry.name
+        self._entries.pop(key, None)
+
+        contents: list[genai_types.ContentUnion] = [
+            genai_types.Content(role="user", parts=[genai_types.Part(text=prefix)])
+        ]
+        started = time.monotonic()
+        try:
+            cached = await client.aio.caches.create(
+                model=model,
+                config=genai_types.CreateCachedContentConfig(
+                    contents=contents,
+                    system_instruction=system_instruction,
+                    ttl=ttl,
+                    display_name=f"sahayakai-{agent}-{digest[:12]}",
+                ),
+            )
+        except Exception as exc:  # noqa: BLE001 — fail open, see module docstring
+            self.stats.create_failures += 1
+            status = classify_status(exc)
+            if status == 400:
+                self._unsupported.add((model, digest))
+            else:
+                self._retry_at[key] = time.monotonic() + self.retry_after_seconds
+            log.warning(
+                "context_cache.create_failed",
+                agent=agent,
+                model=model,
+                status=status,
+                permanent=status == 400,
+                error_type=type(exc).__name__,
+                error=str(exc)[:200],
+            )
+            return None
+
+        # Count the TTL from before the create call: conservative.
+        self._entries[key] = _Entry(name=cached.name, expires_at=started + self.ttl_seconds)
+        self._retry_at.pop(key, None)
+        self.stats.creates += 1
+        log.info(
+            "context_cache.created",
+            agent=agent,
+            model=model,
+            prefix_digest=digest[:12],
+            latency_ms=int((time.monotonic() - started) * 1000),
+        )
+        return str(cached.name)
+
+    def forget(self, name: str) -> None:
+        """Drop the entry for a cached content the API no longer has."""
+        for key, entry in list(self._entries.items()):
+            if entry.name == name:
+                del self._entries[key]
+                self.stats.stale += 1
+
+    def record_usage(self, agent: str, result: Any) -> None:
+        """Add a response's token counts to `agent`'s usage."""
+        metrics = extract_cache_metrics(result)
+        if metrics is None:
+            return
+        usage = self.stats.agent(agent)
+        usage.input_tokens += metrics.input_tokens
+        usage.cached_tokens += metrics.cached_content_tokens
+
+    async def generate(
+        self,
+        *,
+        api_key: str,
+        model: str,
+        prompt: SplitPrompt,
+        config: Any,
+    ) -> Any:
+        """`generate_content` for a split prompt, via the prefix cache
+        when one is available and with the full prompt otherwise."""
+        client = get_genai_client(api_key)
+        name = await self.resolve(
+            client, api_key=api_key, model=model, prefix=prompt.prefix, agent=prompt.agent,
+        )
+        result = None
+        if name is not None:
+            try:
+                result = await client.aio.models.generate_content(
+                    model=model,
+                    contents=prompt.suffix,
+                    config=config.model_copy(update={"cached_content": name}),
+                )
+            except Exception as exc:
+                if not is_stale_cache_error(exc):
+                    raise
+                log.warning("context_cache.stale", agent=prompt.agent, error=str(exc)[:200])
+                self.forget(name)
+        if result is None:
+            result = await client.aio.models.generate_content(
+                model=model, contents=prompt.text, config=config,
+            )
+        self.record_usage(prompt.agent, result)
+        return result
+
+
+def adk_context_cache_callbacks(
+    api_key: str, *, agent: str,
+) -> tuple[Callable[..., Awaitable[None]], Callable[..., Awaitable[None]]]:
+    """`(before_model_callback, on_model_error_callback)` for an ADK
+    `LlmAgent` pinned to `api_key`.
+
+    Convention: the caller sends the prompt as a final user turn of two
+    text parts, `[prefix, suffix]`. When a cache is available the
+    callback moves the prefix (and the agent's system instruction,
+    which a cached-content request may not carry) into it. The error
+    callback drops an entry the API reports as gone; the exception
+    still propagates, and `is_stale_cache_error` lets the caller retry.
+    """
+
+    async def _before_model(callback_context: Any, llm_request: Any) -> None:
+        contents = llm_request.contents
+        parts = contents[-1].parts if contents else None
+        if not parts or len(parts) < 2 or not parts[0].text:
+            return None
+        config = llm_request.config
+        system = config.system_instruction
+        if system is not None and not isinstance(system, str):
+            return None
+        name = await get_context_cache().resolve(
+            get_genai_client(api_key),
+            api_key=api_key,
+            model=llm_request.model,
+            prefix=parts[0].text,
+            agent=agent,
+            system_instruction=system,
+        )
+        if name is None:
+            return None
+        contents[-1] = contents[-1].model_copy(update={"parts": parts[1:]})
+        config.system_instruction = None
+        config.cached_content = name
+        return None
+
+    async def _on_model_error(
+        callback_context: Any, llm_request: Any, error: Exception,
+    ) -> None:
+        name = llm_request.config.cached_content
+        if name and is_stale_cache_error(error):
+            get_context_cache().forget(name)
+
+    return _before_model, _on_model_error
+
+
+def build_context_cache(settings: Settings) -> ContextCacheManager:
+    return ContextCacheManager(
+        enabled=settings.context_cache_enabled,
+        ttl_seconds=settings.context_cache_ttl_seconds,
+        refresh_margin_seconds=settings.context_cache_refresh_margin_seconds,
+        retry_after_seconds=settings.context_cache_retry_after_seconds,
+    )
+
+
+_manager: ContextCacheManager | None = None
+
+
+def get_context_cache() -> ContextCacheManager:
+    global _manager
+    if _manager is None:
+        _manager = build_context_cache(get_settings())
+    return _manager
+
+
+def reset_context_cache(manager: ContextCacheManager | None = None) -> None:
+    """Swap (or drop, with no argument) the process manager. Tests only."""
+    global _manager
+    _manager = manager
+
+
+__all__ = [
+    "CACHE_BOUNDARY",
+    "AgentCacheUsage",
+    "ContextCacheManager",
+    "ContextCacheStats",
+    "SplitPrompt",
+    "adk_context_cache_callbacks",
+    "build_context_cache",
+    "get_context_cache",
+    "is_stale_cache_error",
+    "reset_context_cache",
+    "split_template",
+]
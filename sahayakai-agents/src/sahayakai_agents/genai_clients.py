@@ -0,0 +1,193 @@
+"""Process-wide pooled `google-genai` client registry.
+
+Every model call used to build a brand-new `genai.Client(api_key=...)`
+inside the `run_resiliently` attempt closure. Each client owns its own
+HTTP connection pool, so every attempt paid a fresh TCP + TLS handshake
+to `generativelanguage.googleapis.com` — a visible slice of p50 for the
+short calls (VIDYA classifier, parent-call reply) on Cloud Run.
+
+The registry fixes that:
+
+- ONE shared `httpx.AsyncClient` transport (keep-alive, bounded
+  connections, HTTP/2) is opened at lifespan startup. All keys share it;
+  the API key travels as a request header, so a warm connection is
+  reusable regardless of which key the failover loop picked.
+- ONE long-lived `genai.Client` per `(api_key, headers)` pair, built
+  eagerly for every key in `Settings.genai_keys` / `genai_shadow_keys`
+  and lazily for anything else. The `headers` axis exists because the
+  ADK wrapper stamps ADK tracking headers on its client; direct
+  google-genai callers do not.
+- `close_genai_clients()` drains the transport on shutdown.
+
+Outside the lifespan (unit tests, scripts, `TestClient(app)` without a
+`with` block) `get_genai_client` falls back to building a throwaway
+`genai.Client(api_key=...)` exactly as before, so the test fakes that
+swap `google.genai.Client` keep working unchanged.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:  # pragma: no cover — import-only.
+    import httpx
+
+    from .config import Settings
+
+log = structlog.get_logger(__name__)
+
+
+def _headers_key(headers: dict[str, str] | None) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((headers or {}).items()))
+
+
+def _build_client(
+    api_key: str,
+    *,
+    headers: dict[str, str] | None,
+    transport: httpx.AsyncClient | None,
+) -> Any:
+    """Construct one `genai.Client`.
+
+    `google.genai` is imported lazily (and looked up on every call) so
+    tests that monkeypatch `google.genai` see their fake. Without a
+    shared transport and without headers we call `Client(api_key=...)`
+    with no extra kwargs — the exact shape the integration-test fakes
+    accept.
+    """
+    from google import genai  # noqa: PLC0415
+
+    if transport is None and not headers:
+        return genai.Client(api_key=api_key)
+
+    from google.genai import types as genai_types  # noqa: PLC0415
+
+    return genai.Client(
+        api_key=api_key,
+        http_options=genai_types.HttpOptions(
+            headers=headers,
+            httpx_async_client=transport,
+        ),
+    )
+
+
+class GenaiClientRegistry:
+    """Long-lived `genai.Client` instances sharing one pooled transport.
+
+    Not thread-safe by design: the sidecar is a single asyncio event
+    loop, and `get()` never awaits, so two coroutines cannot interleave
+    inside it.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 60.0,
+        http2: bool = True,
+    ) -> None:
+        import httpx  # noqa: PLC0415
+
+        self._transport: httpx.AsyncClient | None = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry_seconds,
+            ),
+            # Per-attempt deadlines are enforced by `run_resiliently`;
+            # the transport only needs a generous outer cap so a dead
+            # socket cannot hang forever.
+            timeout=httpx.Timeout(600.0, connect=10.0),
+        )
+        self._clients: dict[tuple[str, tuple[tuple[str, str], ...]], Any] = {}
+
+    @property
+    def closed(self) -> bool:
+        return self._transport is None
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, api_key: str, *, headers: dict[str, str] | None = None) -> Any:
+        """Return the shared client for `api_key`, building it on first use."""
+        if self._transport is None:
+            raise RuntimeError("GenaiClientRegistry is closed")
+        cache_key = (api_key, _headers_key(headers))
+        client = self._clients.get(cache_key)
+        if client is None:
+            client = _build_client(api_key, headers=headers, transport=self._transport)
+            self._clients[cache_key] = client
+        return client
+
+    def warm(self, api_keys: tuple[str, ...]) -> None:
+        """Eagerly build the plain (header-less) client for every key."""
+        for api_key in api_keys:
+            self.get(api_key)
+
+    async def aclose(self) -> None:
+        """Drop every client and close the shared transport. Idempotent."""
+        transport, self._transport = self._transport, None
+        self._clients.clear()
+        if transport is not None:
+            await transport.aclose()
+
+
+# Process-scoped registry. `None` until the lifespan starts it.
+_registry: GenaiClientRegistry | None = None
+
+
+def get_genai_client(api_key: str, *, headers: dict[str, str] | None = None) -> Any:
+    """The client every router should use for `api_key`.
+
+    Pooled when the lifespan has started the registry; a fresh
+    per-call client otherwise (see module docstring).
+    """
+    if _registry is None or _registry.closed:
+        return _build_client(api_key, headers=headers, transport=None)
+    return _registry.get(api_key, headers=headers)
+
+
+def start_genai_clients(settings: Settings) -> GenaiClientRegistry:
+    """Open the shared transport and pre-build a client per pooled key.
+
+    Called once from `main._lifespan`. Idempotent: a second call returns
+    the running registry.
+    """
+    global _registry
+    if _registry is not None and not _registry.closed:
+        return _registry
+    registry = GenaiClientRegistry(
+        max_connections=settings.genai_http_max_connections,
+        max_keepalive_connections=settings.genai_http_max_keepalive_connections,
+        keepalive_expiry_seconds=settings.genai_http_keepalive_expiry_seconds,
+        http2=settings.genai_http2,
+    )
+    registry.warm(settings.genai_keys + settings.genai_shadow_keys)
+    _registry = registry
+    log.info(
+        "genai_clients.started",
+        client_count=len(registry),
+        http2=settings.genai_http2,
+        max_connections=settings.genai_http_max_connections,
+    )
+    return registry
+
+
+async def close_genai_clients() -> None:
+    """Close the registry started by `start_genai_clients`. Idempotent."""
+    global _registry
+    registry, _registry = _registry, None
+    if registry is not None:
+        await registry.aclose()
+        log.info("genai_clients.closed")
+
+
+__all__ = [
+    "GenaiClientRegistry",
+    "close_genai_clients",
+    "get_genai_client",
+    "start_genai_clients",
+]
@@ -0,0 +1,221 @@
+"""Hedged model calls across the API key pool.
+
+`run_resiliently` tries keys one after another: the next key only gets
+a turn once the current attempt fails or runs out its
+`per_call_timeout_seconds`. One slow Gemini replica therefore costs a
+telephony turn the full 5s timeout even though a fresh attempt on
+another key would usually answer in ~1s.
+
+With hedging, an attempt that has not answered after the span's
+*hedge delay* gets a twin on the next key. Whichever succeeds first
+wins and the other is cancelled. An attempt that fails does not end
+the race while its twin is still running.
+
+- **Delay.** Per span, the `SAHAYAKAI_HEDGE_PERCENTILE` (p95 by
+  default) of recent successful attempt latencies. Until a span has
+  `_MIN_SAMPLES` of them, `SAHAYAKAI_HEDGE_DELAY_MS` is used.
+- **Budget.** Process-wide token bucket. Each primary attempt earns
+  `SAHAYAKAI_HEDGE_BUDGET_PERCENT` / 100 of a token, and each hedge
+  spends one. So at most that share of extra calls goes out, plus a
+  small burst. When the bucket is empty the attempt simply runs
+  unhedged.
+- **Opt-in.** Routes pass `hedge=True` to `run_resiliently`, and
+  nothing hedges unless `SAHAYAKAI_HEDGE_ENABLED` is set. Pools with a
+  single key never hedge, because a twin on the same key only adds load.
+
+Per-span counters (`primaryAttempts`, `hedgesFired`, `hedgesWon`,
+`budgetDenied`, current `delayMs`) are logged as
+`ai_resilience.hedge_*` events and surfaced on `/readyz` under
+`hedging`.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from .config import Settings, get_settings
+
+log = structlog.get_logger(__name__)
+
+# Successful-attempt latencies kept per span for the percentile.
+_WINDOW = 256
+# Below this many samples the configured fallback delay applies.
+_MIN_SAMPLES = 20
+# Never hedge sooner than this: below it a twin is pure extra load.
+_MIN_DELAY_S = 0.1
+# Hedges the bucket can bank, so a quiet instance can still hedge the
+# first slow calls after an idle spell.
+_BUDGET_BURST = 5.0
+
+
+@dataclass
+class SpanHedgeStats:
+    """Counters for one span. Mutated only from the event loop."""
+
+    primary_attempts: int = 0
+    hedges_fired: int = 0
+    hedges_won: int = 0
+    budget_denied: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=_WINDOW))
+
+    def snapshot(self, delay_s: float) -> dict[str, int]:
+        return {
+            "primaryAttempts": self.primary_attempts,
+            "hedgesFired": self.hedges_fired,
+            "hedgesWon": self.hedges_won,
+            "budgetDenied": self.budget_denied,
+            "delayMs": int(delay_s * 1000),
+        }
+
+
+class Hedger:
+    """Hedge delays, the shared budget and per-span stats."""
+
+    def __init__(self, settings: Settings) -> None:
+        self.enabled = settings.hedge_enabled
+        self._fallback_delay_s = settings.hedge_delay_ms / 1000
+        self._percentile = min(max(settings.hedge_percentile, 0.5), 0.99)
+        self._earn = max(settings.hedge_budget_percent, 0.0) / 100
+        self._tokens = _BUDGET_BURST
+        self._spans: dict[str, SpanHedgeStats] = {}
+
+    def _span(self, span_name: str) -> SpanHedgeStats:
+        stats = self._spans.get(span_name)
+        if stats is None:
+            stats = self._spans[span_name] = SpanHedgeStats()
+        return stats
+
+    def delay_for(self, span_name: str) -> float:
+        """Seconds an attempt on `span_name` may run before it is hedged."""
+        samples = self._span(span_name).latencies
+        if len(samples) < _MIN_SAMPLES:
+            return self._fallback_delay_s
+        ordered = sorted(samples)
+        return max(_MIN_DELAY_S, ordered[int(self._percentile * (len(ordered) - 1))])
+
+    def _take_token(self, stats: SpanHedgeStats) -> bool:
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        stats.budget_denied += 1
+        return False
+
+    async def attempt[T](
+        self,
+        fn: Callable[[str], Awaitable[T]],
+        keys: tuple[str, str],
+        *,
+        span_name: str,
+        timeout_s: float,
+        on_hedge: Callable[[], None] | None = None,
+    ) -> tuple[T, int]:
+        """Run `fn(keys[0])`, hedged with `fn(keys[1])` past the delay.
+
+        Returns the winning result and which key produced it (0 or 1;
+        1 means the hedge fired, so the caller skips that key). Raises
+        `TimeoutError` if neither answered within `timeout_s` of the
+        primary's start, or the primary's error (else the hedge's) if
+        both failed. `on_hedge` is called when the twin is launched.
+        """
+        stats = self._span(span_name)
+        stats.primary_attempts += 1
+        self._tokens = min(_BUDGET_BURST, self._tokens + self._earn)
+
+        started = time.monotonic()
+        deadline = started + timeout_s
+        hedge_at = started + self.delay_for(span_name)
+        primary = asyncio.ensure_future(fn(keys[0]))
+        running: dict[asyncio.Future[T], int] = {primary: 0}
+        errors: dict[int, BaseException] = {}
+        hedge_started = 0.0
+        hedged = False
+        try:
+            while running:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise TimeoutError
+                wake = deadline if hedged else min(hedge_at, deadline)
+                done, _ = await asyncio.wait(
+                    running, timeout=max(0.0, wake - now),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    which = running.pop(task)
+                    exc = task.exception()
+                    if exc is not None:
+                        errors[which] = exc
+                        continue
+                    finished = time.monotonic()
+                    own_start = hedge_started if which else started
+                    stats.latencies.append(finished - own_start)
+                    if which:
+                        stats.hedges_won += 1
+                        log.info(
+                            "ai_resilience.hedge_won",
+                            span_name=span_name,
+                            latency_ms=int((finished - started) * 1000),
+                        )
+                    return task.result(), which
+                if (
+                    not hedged
+                    and primary in running
+                    and time.monotonic() >= hedge_at
+                ):
+                    hedged = True
+                    if self._take_token(stats):
+                        stats.hedges_fired += 1
+                        hedge_started = time.monotonic()
+                        log.info(
+                            "ai_resilience.hedge_fired",
+                            span_name=span_name,
+                            delay_ms=int((hedge_started - started) * 1000),
+                        )
+                        running[asyncio.ensure_future(fn(keys[1]))] = 1
+                        if on_hedge is not None:
+                            on_hedge()
+            raise errors.get(0) or errors[1]
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "budgetTokens": round(self._tokens, 2),
+            "spans": {
+                name: stats.snapshot(self.delay_for(name))
+                for name, stats in self._spans.items()
+            },
+        }
+
+
+_hedger: Hedger | None = None
+
+
+def get_hedger() -> Hedger:
+    global _hedger
+    if _hedger is None:
+        _hedger = Hedger(get_settings())
+    return _hedger
+
+
+def reset_hedger(hedger: Hedger | None = None) -> None:
+    """Swap (or drop, with no argument) the process hedger. Tests only."""
+    global _hedger
+    _hedger = hedger
+
+
+__all__ = [
+    "Hedger",
+    "SpanHedgeStats",
+    "get_hedger",
+    "reset_hedger",
+]
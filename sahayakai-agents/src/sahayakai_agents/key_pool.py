@@ -0,0 +1,319 @@
+"""Health-aware scheduling across the Gemini API key pool.
+
+`run_resiliently` used to start each request on a random key and rotate
+blindly from there. A key that had just been 429'd kept getting picked
+by every other concurrent request, each of which then paid a failed
+attempt plus backoff to learn what the previous one already knew.
+
+`KeyPool` is the process-wide record of how each key is doing:
+
+- **in-flight** attempts right now;
+- **latency EWMA** of finished attempts. Attempts cut off by a timeout
+  or by losing a hedge count as at least as slow as the current
+  average;
+- **error rate** (EWMA) of quota / auth failures (429 / 401 / 403);
+- **cooldown**: a 429 benches the key for 1s, doubling per consecutive
+  429 up to 60s. A 401 / 403 benches it for `_AUTH_COOLDOWN_S`;
+- optional **token buckets** matched to the key's Gemini quota
+  (`SAHAYAKAI_GENAI_KEY_RPM` / `SAHAYAKAI_GENAI_KEY_TPM`; 0 disables).
+  Tokens used are debited from the response's usage metadata.
+
+`pick()` hands out the healthiest key not already tried by the request.
+Keys that are not cooling down come first, then keys within quota, then
+the least loaded: `(in_flight + 1) x latency x (1 + error penalty)`.
+Ties break randomly, so a fresh pool still spreads load. Scheduling
+never blocks: when every key is cooling down or over quota, the least
+bad one is still handed out and the usual retry / backoff applies.
+
+State is keyed by the key itself (live and shadow pools never mix) and
+is reported by a short digest, never the key. It is surfaced on
+`/readyz` under `keyPool` and as OpenTelemetry observable gauges
+(`sahayakai.genai_key.*`, attribute `key_id`).
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+import time
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from .config import Settings, get_settings
+
+log = structlog.get_logger(__name__)
+
+_EWMA_ALPHA = 0.2
+# Assumed latency for a key with no finished attempts yet, when no key
+# has any (otherwise the pool average is used, so new keys get traffic).
+_DEFAULT_LATENCY_S = 1.0
+_THROTTLE_COOLDOWN_S = 1.0
+_MAX_THROTTLE_COOLDOWN_S = 60.0
+_AUTH_COOLDOWN_S = 120.0
+# An error rate of 1.0 weighs like five extra in-flight attempts.
+_ERROR_PENALTY = 4.0
+
+
+def key_id(key: str) -> str:
+    """Stable, non-reversible label for a key in logs and metrics."""
+    return hashlib.sha256(key.encode()).hexdigest()[:8]
+
+
+@dataclass
+class KeyHealth:
+    """Live state of one key. Mutated only from the event loop."""
+
+    key_id: str
+    in_flight: int = 0
+    latency_ewma_s: float | None = None
+    error_rate: float = 0.0
+    cooldown_until: float = 0.0
+    consecutive_throttles: int = 0
+    rpm_tokens: float = 0.0
+    tpm_tokens: float = 0.0
+    refilled_at: float = 0.0
+    attempts: int = 0
+    throttled: int = 0
+    auth_failures: int = 0
+
+    def cooldown_remaining(self, now: float) -> float:
+        return max(0.0, self.cooldown_until - now)
+
+    def snapshot(self, now: float, *, quotas: bool) -> dict[str, Any]:
+        snap: dict[str, Any] = {
+            "keyId": self.key_id,
+            "inFlight": self.in_flight,
+            "latencyEwmaMs": (
+                None if self.latency_ewma_s is None
+                else int(self.latency_ewma_s * 1000)
+            ),
+            "errorRate": round(self.error_rate, 3),
+            "cooldownRemainingS": round(self.cooldown_remaining(now), 1),
+            "attempts": self.attempts,
+            "throttled": self.throttled,
+            "authFailures": self.auth_failures,
+        }
+        if quotas:
+            snap["rpmTokens"] = round(self.rpm_tokens, 1)
+            snap["tpmTokens"] = int(self.tpm_tokens)
+        return snap
+
+
+class KeyPool:
+    """Per-key health and the scheduling decision built on it."""
+
+    def __init__(self, settings: Settings) -> None:
+        self._rpm = max(0, settings.genai_key_rpm)
+        self._tpm = max(0, settings.genai_key_tpm)
+        self._keys: dict[str, KeyHealth] = {}
+        for key in (*settings.genai_keys, *settings.genai_shadow_keys):
+            self._health(key)
+
+    def _health(self, key: str) -> KeyHealth:
+        health = self._keys.get(key)
+        if health is None:
+            health = self._keys[key] = KeyHealth(
+                key_id=key_id(key),
+                rpm_tokens=float(self._rpm),
+                tpm_tokens=float(self._tpm),
+                refilled_at=time.monotonic(),
+            )
+        return health
+
+    def _refill(self, health: KeyHealth, now: float) -> None:
+        elapsed = now - health.refilled_at
+        health.refilled_at = now
+        if self._rpm:
+            health.rpm_tokens = min(self._rpm, health.rpm_tokens + elapsed * self._rpm / 60)
+        if self._tpm:
+            health.tpm_tokens = min(self._tpm, health.tpm_tokens + elapsed * self._tpm / 60)
+
+    def _over_quota(self, health: KeyHealth) -> bool:
+        return (self._rpm > 0 and health.rpm_tokens < 1.0) or (
+            self._tpm > 0 and health.tpm_tokens <= 0.0
+        )
+
+    def pick(self, keys: tuple[str, ...], exclude: Collection[str] = ()) -> str:
+        """The healthiest key in `keys`, preferring ones not in `exclude`."""
+        candidates = [k for k in keys if k not in exclude] or list(keys)
+        now = time.monotonic()
+        known = [
+            h.latency_ewma_s for k in keys
+            if (h := self._health(k)).latency_ewma_s is not None
+        ]
+        unknown_latency = sum(known) / len(known) if known else _DEFAULT_LATENCY_S
+
+        def rank(position: int) -> tuple[bool, bool, float, float, int]:
+            health = self._health(candidates[position])
+            self._refill(health, now)
+            latency = health.latency_ewma_s
+            load = (health.in_flight + 1) * (unknown_latency if latency is None else latency)
+            return (
+                health.cooldown_until > now,
+                self._over_quota(health),
+                load * (1 + _ERROR_PENALTY * health.error_rate),
+                random.random(),
+                position,
+            )
+
+        return candidates[min(range(len(candidates)), key=rank)]
+
+    def begin(self, key: str) -> None:
+        """An attempt on `key` is starting."""
+        health = self._health(key)
+        health.in_flight += 1
+        health.attempts += 1
+        if self._rpm:
+            health.rpm_tokens -= 1.0
+
+    def end(
+        self,
+        key: str,
+        *,
+        latency_s: float,
+        status: int | None = None,
+        failed: bool = False,
+        cancelled: bool = False,
+        total_tokens: int = 0,
+    ) -> None:
+        """Record how the attempt on `key` finished.
+
+        `status` is the classified HTTP status of a failure (`failed`);
+        `cancelled` marks an attempt cut off by a timeout or a lost
+        hedge.
+        """
+        health = self._health(key)
+        health.in_flight = max(0, health.in_flight - 1)
+        if self._tpm and total_tokens:
+            health.tpm_tokens -= total_tokens
+
+        ewma = health.latency_ewma_s
+        if cancelled:
+            # At least as slow as the average, or we would have an answer.
+            latency_s = max(latency_s, ewma or 0.0)
+        if not failed or cancelled:
+            health.latency_ewma_s = (
+                latency_s if ewma is None
+                else ewma + _EWMA_ALPHA * (latency_s - ewma)
+            )
+
+        quota_or_auth = failed and status in (429, 401, 403)
+        health.error_rate += _EWMA_ALPHA * (float(quota_or_auth) - health.error_rate)
+        now = time.monotonic()
+        if quota_or_auth and status == 429:
+            health.throttled += 1
+            health.consecutive_throttles += 1
+            cooldown = min(
+                _MAX_THROTTLE_COOLDOWN_S,
+                _THROTTLE_COOLDOWN_S * 2 ** (health.consecutive_throttles - 1),
+            )
+            health.cooldown_until = max(health.cooldown_until, now + cooldown)
+            log.info(
+                "key_pool.cooldown",
+                key_id=health.key_id,
+                status=status,
+                cooldown_s=cooldown,
+            )
+        elif quota_or_auth:
+            health.auth_failures += 1
+            health.cooldown_until = max(health.cooldown_until, now + _AUTH_COOLDOWN_S)
+            log.warning(
+                "key_pool.cooldown",
+                key_id=health.key_id,
+                status=status,
+                cooldown_s=_AUTH_COOLDOWN_S,
+            )
+        elif not failed:
+            health.consecutive_throttles = 0
+
+    def health(self) -> Iterable[KeyHealth]:
+        return self._keys.values()
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        quotas = bool(self._rpm or self._tpm)
+        for health in self._keys.values():
+            self._refill(health, now)
+        return {
+            "rpmPerKey": self._rpm,
+            "tpmPerKey": self._tpm,
+            "keys": [h.snapshot(now, quotas=quotas) for h in self._keys.values()],
+        }
+
+
+_pool: KeyPool | None = None
+_gauges_registered = False
+
+
+def _register_gauges() -> None:
+    """Observable gauges over the current pool. Once per process: meter
+    instruments cannot be unregistered, so callbacks read `_pool` late."""
+    global _gauges_registered
+    if _gauges_registered:
+        return
+    _gauges_registered = True
+    try:
+        from opentelemetry import metrics  # noqa: PLC0415
+    except ImportError as exc:  # pragma: no cover — api ships with the distro
+        log.warning("key_pool.otel_missing", error=str(exc))
+        return
+
+    def observe(value: Any) -> Any:
+        def callback(_options: Any) -> Iterable[Any]:
+            if _pool is None:
+                return []
+            now = time.monotonic()
+            return [
+                metrics.Observation(value(h, now), {"key_id": h.key_id})
+                for h in _pool.health()
+            ]
+        return callback
+
+    meter = metrics.get_meter(__name__)
+    meter.create_observable_gauge(
+        "sahayakai.genai_key.in_flight",
+        callbacks=[observe(lambda h, _now: h.in_flight)],
+        description="Model attempts in flight on the key",
+    )
+    meter.create_observable_gauge(
+        "sahayakai.genai_key.latency_ewma",
+        callbacks=[observe(lambda h, _now: h.latency_ewma_s or 0.0)],
+        unit="s",
+        description="EWMA of attempt latency on the key",
+    )
+    meter.create_observable_gauge(
+        "sahayakai.genai_key.error_rate",
+        callbacks=[observe(lambda h, _now: h.error_rate)],
+        description="EWMA share of attempts failing with 429/401/403",
+    )
+    meter.create_observable_gauge(
+        "sahayakai.genai_key.cooldown_remaining",
+        callbacks=[observe(lambda h, now: h.cooldown_remaining(now))],
+        unit="s",
+        description="Seconds until the key leaves cooldown",
+    )
+
+
+def get_key_pool() -> KeyPool:
+    global _pool
+    if _pool is None:
+        _pool = KeyPool(get_settings())
+        _register_gauges()
+    return _pool
+
+
+def reset_key_pool(pool: KeyPool | None = None) -> None:
+    """Swap (or drop, with no argument) the process pool. Tests only."""
+    global _pool
+    _pool = pool
+
+
+__all__ = [
+    "KeyHealth",
+    "KeyPool",
+    "get_key_pool",
+    "key_id",
+    "reset_key_pool",
+]
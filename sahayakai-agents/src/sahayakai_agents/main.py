@@ -23,6 +23,7 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
 from .agent_card import build_agent_card
+from .agents.assessment_scanner.pass1_pool import close_page_client
 from .agents.assessment_scanner.router import assessment_scanner_router
 from .agents.assignment_assessor.router import assignment_assessor_router
 from .agents.avatar_generator.router import avatar_generator_router
@@ -46,7 +47,14 @@ from .agents.voice_to_text.router import voice_to_text_router
 from .agents.worksheet.router import worksheet_router
 from .auth import auth_middleware
 from .config import get_settings
+from .context_cache import get_context_cache
+from .genai_clients import close_genai_clients, start_genai_clients
+from .hedging import get_hedger
+from .key_pool import get_key_pool
 from .logging_config import configure_logging
+from .rag.embedding_service import get_embedding_service
+from .replay_guard import get_replay_guard
+from .response_cache import get_response_cache
 from .shared.errors import AgentError
 from .shared.genai_patch import apply_genai_schema_patch
 from .telemetry import init_telemetry
@@ -63,7 +71,8 @@ log = structlog.get_logger(__name__)
 
 @asynccontextmanager
 async def _lifespan(app: FastAPI):  # type: ignore[no-untyped-def]
-    """Lifespan context: init telemetry on startup; flush on shutdown.
+    """Lifespan context: init telemetry + pooled Gemini clients on
+    startup; close the pooled transports on shutdown.
 
     `get_settings()` is called here (not at import) so environment variables
     set by Cloud Run at container start are visible.
@@ -78,8 +87,13 @@ async def _lifespan(app: FastAPI):  # type: ignore[no-untyped-def]
     )
     # Pass the app so FastAPIInstrumentor actually wraps it (Round-2 P1-8).
     init_telemetry(app)
-    yield
-    log.info("app.shutdown")
+    start_genai_clients(settings)
+    try:
+        yield
+    finally:
+        await close_genai_clients()
+        await close_page_client()
+        log.info("app.shutdown")
 
 
 app = FastAPI(
@@ -181,12 +195,28 @@ async def readyz() -> dict[str, object]:
     already handles.
     """
     settings = get_settings()
+    replay_guard = get_replay_guard()
+    response_cache = get_response_cache()
     return {
         "status": "ok",
         "env": settings.env,
         "allowedInvokerCount": len(settings.allowed_invokers),
         "liveKeyCount": len(settings.genai_keys),
         "shadowKeyCount": len(settings.genai_shadow_keys),
+        "replayGuard": (
+            {"backend": replay_guard.backend, **replay_guard.stats.snapshot()}
+            if replay_guard is not None
+            else {"backend": "memory"}
+        ),
+        "responseCache": {
+            "backend": response_cache.backend,
+            "enabled": response_cache.enabled,
+            **response_cache.stats.snapshot(),
+        },
+        "contextCache": get_context_cache().snapshot(),
+        "hedging": get_hedger().snapshot(),
+        "keyPool": get_key_pool().snapshot(),
+        "embeddingCache": get_embedding_service().snapshot(),
     }
 
 
@@ -14,20 +14,31 @@ Public re-exports:
       ``schemas`` — Pydantic v2 contracts for the retrieval API.
     - ``Retriever``, ``VectorSearchRetriever`` from ``retriever`` — the
       runtime contract used by the lesson-plan router.
+    - ``MmapVectorRetriever``, ``write_mmap_index`` from
+      ``mmap_retriever`` — in-process memory-mapped index implementing
+      the same contract without Vertex AI.
+    - ``Bm25Index``, ``tokenize`` from ``bm25`` — Indic-aware BM25
+      used for the rerank stage and the embedding-less fallback.
     - ``embed_query`` from ``embeddings`` — Vertex AI multilingual
       embedding wrapper pinned to ``text-multilingual-embedding-002@001``.
 """
 from __future__ import annotations
 
+from .bm25 import Bm25Index, tokenize
 from .embeddings import embed_query
+from .mmap_retriever import MmapVectorRetriever, write_mmap_index
 from .retriever import Retriever, VectorSearchRetriever
 from .schemas import RetrievalContext, RetrievalQuery, RetrievedChunk
 
 __all__ = [
+    "Bm25Index",
+    "MmapVectorRetriever",
     "RetrievalContext",
     "RetrievalQuery",
     "RetrievedChunk",
     "Retriever",
     "VectorSearchRetriever",
     "embed_query",
+    "tokenize",
+    "write_mmap_index",
 ]
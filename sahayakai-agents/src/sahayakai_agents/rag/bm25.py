@@ -0,0 +1,305 @@
+"""BM25 over NCERT chunks: Indic-aware tokenizer + per-partition inverted index.
+
+Two uses, both per ``(class_number, subject, language)`` partition:
+
+- **Rerank.** Score the ~20 vector-search candidates so exact-token
+  matches the embedding missed (chapter terms, names, formulas) move
+  up. ``fuse`` combines the result with the cosine into
+  ``RetrievedChunk.score``.
+- **BM25-only retrieval.** When the query embedding is unavailable,
+  ``search`` ranks the whole partition lexically.
+
+**Tokenizer.** Python's ``\\w`` treats Indic vowel signs and the virama
+as non-word characters, so ``r"\\w+"`` shreds "भोजन" into "भ" + "जन".
+``tokenize`` keeps whole words in every ``RetrievalLanguage`` script
+(Devanagari, Bengali, Gurmukhi, Gujarati, Odia, Tamil, Telugu,
+Kannada, Malayalam) plus Latin and digits. It NFC-normalizes (so
+nukta forms match), drops ZWJ / ZWNJ and casefolds. The danda (।, ॥)
+and other punctuation split words. There is no stemming and no
+stopword list: IDF already discounts the common words, and per-language
+stemmers are a corpus-quality decision for later.
+
+**Index layout** (written next to the vector index by
+``write_bm25_index``; row ids are the vector index's)::
+
+    bm25.json           k1, b, counts and, per partition, row range,
+                        doc count and average length
+    bm25_keys.u64       sorted 64-bit hash of (partition start, term)
+    bm25_fence.npy      every ``_FENCE``-th key, read into memory at open
+    bm25_at.u64         postings offset per key
+    bm25_df.u32         postings count (document frequency) per key
+    bm25_idf.f32        IDF per key, precomputed for its partition
+    bm25_rows.u32       postings row ids, sorted within each term
+    bm25_tf.u16         postings term frequencies (clipped to 65535)
+    bm25_doclen.u32     token count per row
+
+Everything but the fence is memory-mapped. A term is found by a
+``searchsorted`` over the fence, then over one 4 KB block of keys, so a
+lookup touches one key page even on a cold page cache, and nothing is
+decoded at open or on a partition's first query. A 64-bit collision
+would merge two terms' postings in one partition; at corpus scale the
+odds are negligible. Scoring is vectorized per query term.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+import unicodedata
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import structlog
+
+log = structlog.get_logger(__name__)
+
+BM25_FORMAT = 1
+K1 = 1.2
+B = 0.75
+# Share of the fused score taken by cosine similarity; the rest is
+# BM25 normalized by the best candidate's BM25.
+VECTOR_WEIGHT = 0.7
+_TF_MAX = 65_535
+# Keys per fence entry: 512 x 8 bytes = one 4 KB page of bm25_keys.u64.
+_FENCE = 512
+
+# Letters, digits, combining marks of the Indic blocks (U+0900-U+0D7F:
+# Devanagari through Malayalam), minus the dandas, which are sentence
+# punctuation.
+_TOKEN = re.compile(r"(?:[^\W_]|[\u0900-\u0963\u0966-\u0d7f])+")
+_ZWNJ, _ZWJ = "\u200c", "\u200d"
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased, NFC-normalized word tokens for any retrieval language."""
+    normalized = unicodedata.normalize("NFC", text).replace(_ZWNJ, "").replace(_ZWJ, "")
+    return _TOKEN.findall(normalized.casefold())
+
+
+def _term_key(start: int, term: str) -> int:
+    digest = hashlib.blake2b(f"{start}\x00{term}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _idf(doc_count: int, doc_freq: int) -> float:
+    # Lucene's BM25 IDF: never negative, even for terms in every doc.
+    return math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def write_bm25_index(
+    directory: Path,
+    texts: Iterable[str],
+    partitions: Sequence[tuple[int, int]],
+) -> None:
+    """Build the inverted index for rows already grouped by partition.
+
+    Args:
+        directory: Index directory (normally the vector index's).
+        texts: Chunk text per row, in row order.
+        partitions: ``[start, stop)`` row ranges covering every row,
+            in order.
+    """
+    texts = iter(texts)
+    entries: list[dict[str, Any]] = []
+    lengths: list[int] = []
+    keys: list[int] = []
+    starts: list[int] = []
+    dfs: list[int] = []
+    idfs: list[float] = []
+    posted = 0
+    with (
+        (directory / "bm25_rows.u32").open("wb") as rows_out,
+        (directory / "bm25_tf.u16").open("wb") as tf_out,
+    ):
+        for start, stop in partitions:
+            # Flat (term id, row, tf) triples in row order; one stable
+            # sort by term id then yields each term's postings by row.
+            vocabulary: dict[str, int] = {}
+            term_ids: list[int] = []
+            rows: list[int] = []
+            tfs: list[int] = []
+            partition_lengths = 0
+            for row in range(start, stop):
+                tokens = tokenize(next(texts))
+                lengths.append(len(tokens))
+                partition_lengths += len(tokens)
+                for term, tf in Counter(tokens).items():
+                    term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                    rows.append(row)
+                    tfs.append(tf)
+
+            docs = stop - start
+            ids = np.asarray(term_ids, dtype=np.int64)
+            order = np.argsort(ids, kind="stable")
+            rows_out.write(np.asarray(rows, dtype=np.uint32)[order].tobytes())
+            tf_out.write(
+                np.minimum(np.asarray(tfs, dtype=np.int64), _TF_MAX)[order]
+                .astype(np.uint16).tobytes()
+            )
+            df = np.bincount(ids, minlength=len(vocabulary))
+            offsets = posted + np.cumsum(df) - df
+            keys.extend(_term_key(start, term) for term in vocabulary)
+            starts.extend(offsets.tolist())
+            dfs.extend(df.tolist())
+            idfs.extend(_idf(docs, int(n)) for n in df)
+            posted += len(rows)
+            entries.append({
+                "start": start,
+                "stop": stop,
+                "docs": docs,
+                "avgdl": partition_lengths / docs if docs else 0.0,
+            })
+
+    sorted_keys = np.asarray(keys, dtype=np.uint64)
+    order = np.argsort(sorted_keys, kind="stable")
+    sorted_keys = sorted_keys[order]
+    sorted_keys.tofile(directory / "bm25_keys.u64")
+    np.save(directory / "bm25_fence.npy", sorted_keys[::_FENCE])
+    np.asarray(starts, dtype=np.uint64)[order].tofile(directory / "bm25_at.u64")
+    np.asarray(dfs, dtype=np.uint32)[order].tofile(directory / "bm25_df.u32")
+    np.asarray(idfs, dtype=np.float32)[order].tofile(directory / "bm25_idf.f32")
+    np.asarray(lengths, dtype=np.uint32).tofile(directory / "bm25_doclen.u32")
+    (directory / "bm25.json").write_text(json.dumps({
+        "format": BM25_FORMAT,
+        "k1": K1,
+        "b": B,
+        "terms": len(keys),
+        "postings": posted,
+        "partitions": entries,
+    }, indent=1))
+    log.info(
+        "rag.bm25_index.written",
+        directory=str(directory),
+        rows=len(lengths),
+        partitions=len(entries),
+        postings=posted,
+    )
+
+
+def _memmap(path: Path, dtype: type[np.generic], count: int) -> np.ndarray:
+    # np.memmap refuses zero-length files.
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class Bm25Index:
+    """Read side of ``write_bm25_index``. Read-only, so thread-safe;
+    the maps are released with the object."""
+
+    def __init__(self, directory: Path) -> None:
+        """Open the index. Cost is independent of the corpus size.
+
+        Raises:
+            ValueError: Unsupported format.
+        """
+        meta = json.loads((directory / "bm25.json").read_text())
+        if meta.get("format") != BM25_FORMAT:
+            raise ValueError(f"unsupported BM25 index format {meta.get('format')!r}")
+        self._k1: float = meta["k1"]
+        self._b: float = meta["b"]
+        self._partitions: dict[int, dict[str, Any]] = {
+            p["start"]: p for p in meta["partitions"]
+        }
+        rows = sum(p["docs"] for p in meta["partitions"])
+        self._doclen = _memmap(directory / "bm25_doclen.u32", np.uint32, rows)
+        self._post_rows = _memmap(directory / "bm25_rows.u32", np.uint32, meta["postings"])
+        self._post_tf = _memmap(directory / "bm25_tf.u16", np.uint16, meta["postings"])
+        self._keys = _memmap(directory / "bm25_keys.u64", np.uint64, meta["terms"])
+        self._fence = np.load(directory / "bm25_fence.npy")
+        self._at = _memmap(directory / "bm25_at.u64", np.uint64, meta["terms"])
+        self._df = _memmap(directory / "bm25_df.u32", np.uint32, meta["terms"])
+        self._idf = _memmap(directory / "bm25_idf.f32", np.float32, meta["terms"])
+
+    def _query_terms(self, start: int, query: str) -> list[tuple[int, int, float, int]]:
+        """(postings offset, count, idf, query tf) per indexed query term."""
+        counts = Counter(tokenize(query))
+        if not counts or not len(self._keys):
+            return []
+        found: list[tuple[int, int, float, int]] = []
+        for term, qtf in counts.items():
+            key = np.uint64(_term_key(start, term))
+            block = max(0, int(np.searchsorted(self._fence, key, side="right")) - 1)
+            keys = self._keys[block * _FENCE:(block + 1) * _FENCE]
+            i = int(np.searchsorted(keys, key))
+            if i < len(keys) and keys[i] == key:
+                i += block * _FENCE
+                found.append((int(self._at[i]), int(self._df[i]), float(self._idf[i]), qtf))
+        return found
+
+    def _term_weight(
+        self, tf: np.ndarray, rows: np.ndarray, avgdl: float
+    ) -> np.ndarray:
+        tf = tf.astype(np.float32)
+        norm = self._k1 * (
+            1 - self._b + self._b * self._doclen[rows].astype(np.float32) / (avgdl or 1.0)
+        )
+        weight: np.ndarray = tf * (self._k1 + 1) / (tf + norm)
+        return weight
+
+    def score(self, start: int, rows: np.ndarray, query: str) -> np.ndarray:
+        """BM25 of `query` for each of `rows` (global ids) in the
+        partition beginning at row `start`."""
+        scores = np.zeros(len(rows), dtype=np.float32)
+        if not len(rows) or start not in self._partitions:
+            return scores
+        partition = self._partitions[start]
+        for offset, count, idf, qtf in self._query_terms(start, query):
+            posting = self._post_rows[offset:offset + count]
+            at = np.searchsorted(posting, rows)
+            hit = at < count
+            hit[hit] = posting[at[hit]] == rows[hit]
+            if hit.any():
+                matched = rows[hit]
+                tf = self._post_tf[offset + at[hit]]
+                scores[hit] += qtf * idf * self._term_weight(tf, matched, partition["avgdl"])
+        return scores
+
+    def search(self, start: int, query: str, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top-`top_k` rows of the partition by BM25 alone.
+
+        Returns ``(rows, scores)``, best first, rows with a zero score
+        left out.
+        """
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+        if start not in self._partitions:
+            return empty
+        partition = self._partitions[start]
+        scores = np.zeros(partition["docs"], dtype=np.float32)
+        for offset, count, idf, qtf in self._query_terms(start, query):
+            rows = self._post_rows[offset:offset + count].astype(np.int64)
+            tf = self._post_tf[offset:offset + count]
+            scores[rows - start] += qtf * idf * self._term_weight(tf, rows, partition["avgdl"])
+        k = min(top_k, int(np.count_nonzero(scores)))
+        if not k:
+            return empty
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return top + start, scores[top]
+
+
+def fuse(vector_scores: np.ndarray, bm25_scores: np.ndarray) -> np.ndarray:
+    """Convex blend of cosine (in [0, 1]) and max-normalized BM25.
+
+    BM25 is unbounded and its scale varies by query, so it is divided by
+    the best candidate's BM25 first. When no candidate matches any query
+    token there is no lexical evidence, and the cosine is returned
+    as-is.
+    """
+    best = float(bm25_scores.max()) if len(bm25_scores) else 0.0
+    if best <= 0:
+        return vector_scores.copy()
+    return VECTOR_WEIGHT * vector_scores + (1 - VECTOR_WEIGHT) * bm25_scores / best
+
+
+__all__ = [
+    "BM25_FORMAT",
+    "Bm25Index",
+    "fuse",
+    "tokenize",
+    "write_bm25_index",
+]
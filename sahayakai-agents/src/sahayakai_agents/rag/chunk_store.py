@@ -0,0 +1,157 @@
+"""Columnar on-disk store for embedded ingestion chunks.
+
+Ingestion appends one segment per embedding batch and reads the whole
+corpus back once to build the serving index (``write_mmap_index``):
+
+    <directory>/
+      segments/<sha256>-<batch:05d>.npz   one embedded batch
+      completed.json                      sha256 -> {file, batches, chunks}
+
+Each segment stores the ``Chunk`` fields column by column. String
+columns are UTF-8 bytes plus an ``int64`` offsets array, integer
+columns are ``int32`` and embeddings are ``float32``. No pickles, so
+``np.load(..., allow_pickle=False)`` reads them.
+
+Writes go to a temp file and ``os.replace`` into place, so a segment
+either exists whole or not at all. That is the resume checkpoint: a
+crashed run re-chunks the PDF (deterministic) and skips every batch
+whose segment already exists. ``completed.json`` is the SHA-256 gate.
+A PDF goes in only after all its batches are stored, and only
+completed PDFs are read back.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from collections.abc import Iterable, Sequence
+from dataclasses import fields
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .corpus_ingest import Chunk
+from .embeddings import EMBEDDING_DIM
+
+_STRING_COLUMNS = tuple(f.name for f in fields(Chunk) if f.type == "str")
+_INT_COLUMNS = tuple(f.name for f in fields(Chunk) if f.type == "int")
+
+
+def _atomic_write(path: Path, write: Any) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            write(handle)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _encode(values: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+    encoded = [value.encode() for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode(data: np.ndarray, offsets: np.ndarray) -> list[str]:
+    raw = data.tobytes()
+    bounds = offsets.tolist()
+    return [raw[a:b].decode() for a, b in zip(bounds, bounds[1:], strict=False)]
+
+
+class ChunkStore:
+    """Append-only segment store keyed by (PDF sha256, batch number)."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self._segments = self.directory / "segments"
+        self._segments.mkdir(parents=True, exist_ok=True)
+        self._completed_path = self.directory / "completed.json"
+        self._completed: dict[str, dict[str, Any]] = (
+            json.loads(self._completed_path.read_text())
+            if self._completed_path.exists()
+            else {}
+        )
+
+    def _segment(self, sha256: str, batch: int) -> Path:
+        return self._segments / f"{sha256}-{batch:05d}.npz"
+
+    def has(self, sha256: str, batch: int) -> bool:
+        return self._segment(sha256, batch).exists()
+
+    def is_complete(self, sha256: str) -> bool:
+        return sha256 in self._completed
+
+    @property
+    def completed(self) -> dict[str, dict[str, Any]]:
+        return dict(self._completed)
+
+    def write(
+        self, sha256: str, batch: int, chunks: Sequence[Chunk], embeddings: Any
+    ) -> None:
+        """Store one embedded batch; replaces a same-keyed segment."""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.shape != (len(chunks), EMBEDDING_DIM):
+            raise ValueError(
+                f"embeddings shape {vectors.shape} != ({len(chunks)}, {EMBEDDING_DIM})"
+            )
+        # Any, not np.ndarray: np.savez's **kwds shares a signature with
+        # its allow_pickle flag.
+        columns: dict[str, Any] = {"embedding": vectors}
+        for name in _STRING_COLUMNS:
+            columns[f"{name}.bytes"], columns[f"{name}.offsets"] = _encode(
+                getattr(c, name) for c in chunks
+            )
+        for name in _INT_COLUMNS:
+            columns[name] = np.array([getattr(c, name) for c in chunks], dtype=np.int32)
+        _atomic_write(self._segment(sha256, batch), lambda f: np.savez(f, **columns))
+
+    def mark_complete(self, sha256: str, *, file: str, batches: int, chunks: int) -> None:
+        self._completed[sha256] = {"file": file, "batches": batches, "chunks": chunks}
+        payload = json.dumps(self._completed, indent=2, sort_keys=True).encode()
+        _atomic_write(self._completed_path, lambda f: f.write(payload))
+
+    def read(self) -> tuple[list[Chunk], np.ndarray]:
+        """Every completed PDF's chunks and embeddings, in (sha, batch) order."""
+        chunks: list[Chunk] = []
+        vectors: list[np.ndarray] = []
+        for sha256 in sorted(self._completed):
+            for batch in range(self._completed[sha256]["batches"]):
+                with np.load(self._segment(sha256, batch), allow_pickle=False) as seg:
+                    strings = {
+                        name: _decode(seg[f"{name}.bytes"], seg[f"{name}.offsets"])
+                        for name in _STRING_COLUMNS
+                    }
+                    ints: dict[str, list[int]] = {
+                        name: seg[name].tolist() for name in _INT_COLUMNS
+                    }
+                    vectors.append(seg["embedding"])
+                rows = len(vectors[-1])
+                chunks.extend(
+                    Chunk(
+                        text=strings["text"][i],
+                        subject=strings["subject"][i],
+                        class_number=ints["class_number"][i],
+                        chapter_number=ints["chapter_number"][i],
+                        chapter_title=strings["chapter_title"][i],
+                        language=strings["language"][i],
+                        source_url=strings["source_url"][i],
+                        page_start=ints["page_start"][i],
+                        page_end=ints["page_end"][i],
+                        edition=strings["edition"][i],
+                        sha256=strings["sha256"][i],
+                    )
+                    for i in range(rows)
+                )
+        matrix = (
+            np.concatenate(vectors)
+            if vectors
+            else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        )
+        return chunks, matrix
+
+
+__all__ = ["ChunkStore"]
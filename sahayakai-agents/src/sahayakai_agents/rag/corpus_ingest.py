@@ -1,23 +1,49 @@
 """One-time corpus ingestion pipeline for NCERT textbooks.
 
 Driver script lives at ``sahayakai-agents/scripts/ingest_ncert.py``;
-this module owns the per-PDF unit operations the script composes:
-
-    PDF  ──►  ingest_pdf  ──►  chunk_text  ──►  embed_and_upload
-              (pdfplumber)     (~512 tok,        (Vertex Vector
-                                64 overlap)      Search upsert)
-
-Each step is **idempotent** by design: ``ingest_pdf`` is keyed by
-PDF SHA-256 so re-running on a stable corpus is a no-op; the
-manifest at ``data/ncert_manifest.json`` carries the SHA gate.
+this module owns the per-PDF unit operations and ``ingest_corpus``,
+which composes them into a streaming parallel job:
+
+    hash (main)  ──►  ingest_pdf (worker processes)  ──►  embed_and_store (main)
+    sha256 gate       pdfplumber → dehyphenate →          ≤250-chunk batches →
+                      chunk_text (~512 tok, 64 overlap)   ChunkStore segments
+
+Each step is **idempotent** by design. PDFs whose SHA-256 is already
+in the store's ``completed.json`` are skipped before any extraction,
+so re-running on a stable corpus is a no-op. Chunking is
+deterministic, so batch ``i`` of a PDF is the same on every run; a run
+that crashes mid-PDF resumes at the first batch without a stored
+segment. The manifest at ``data/ncert_manifest.json`` carries the
+per-PDF metadata (``ManifestEntry``). ``write_mmap_index`` then builds
+the serving index from ``ChunkStore.read()``.
 
 Phase 4 §Ingestion pipeline. Plan:
 ``.claude/plans/phase-4-rag-ncert.md``.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import time
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import closing
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+import structlog
+
+from .embeddings import EMBED_BATCH_MAX, Embedder
+
+if TYPE_CHECKING:
+    from .chunk_store import ChunkStore
+
+log = structlog.get_logger(__name__)
 
 # Chunking constants — pinned per Phase 4 §Ingestion pipeline.
 # 512 tokens fits the embedding model input window with margin; 64
@@ -25,15 +51,24 @@ from pathlib import Path
 # passages without inflating storage cost.
 CHUNK_SIZE_TOKENS = 512
 CHUNK_OVERLAP_TOKENS = 64
+# Pages with less extractable text than this are scanned images that
+# need OCR (Document AI, not wired yet); they are flagged, not dropped.
+OCR_MIN_PAGE_CHARS = 100
+
+# A letter, including Indic matras / virama that ``\w`` leaves out
+# (same class as the BM25 tokenizer).
+_LETTER = "(?:[^\\W_]|[\u0900-\u0963\u0966-\u0d7f])"
+_WRAPPED = re.compile(rf"{_LETTER}-$")
+_SENTENCE_END = re.compile(r"(?<=[.?!।॥])\s+")
+_TERMINATORS = tuple(".?!:;।॥\"'”’)")
 
 
 @dataclass(frozen=True)
 class Chunk:
     """One ingestion-time chunk before embedding.
 
-    Mirrors the fields stored alongside the vector in Vector Search;
-    ``text`` is later replaced by the 768-dim embedding when the chunk
-    is upserted, but the metadata travels with the vector.
+    Mirrors the fields stored alongside the vector in the index; the
+    chunk text is embedded and the metadata travels with the vector.
 
     The runtime equivalent — what the retriever returns — is
     ``schemas.RetrievedChunk``; the two diverge only in that
@@ -53,104 +88,485 @@ class Chunk:
     sha256: str
 
 
-def ingest_pdf(path: Path) -> list[Chunk]:
-    """Extract text from one NCERT PDF and chunk it.
+@dataclass(frozen=True)
+class ManifestEntry:
+    """Metadata for one chapter PDF, from ``data/ncert_manifest.json``."""
 
-    Implementation outline (§Ingestion pipeline):
+    file: str
+    subject: str
+    class_number: int
+    chapter_number: int
+    chapter_title: str
+    language: str
+    source_url: str
+    edition: str
 
-    1. Compute SHA-256 of the PDF bytes — used as the idempotency key.
-    2. Run ``pdfplumber`` page-by-page to extract layout-aware text.
-    3. For pages where ``pdfplumber`` returns < 100 chars, fall back
-       to Document AI OCR (older scanned editions).
-    4. Dehyphenate (NCERT PDFs hard-wrap with hyphens at column ends).
-    5. Pass the joined text through ``chunk_text`` to get the chunk
-       boundaries.
-    6. Hydrate metadata from the manifest entry keyed by ``path.name``.
 
-    Args:
-        path: Local filesystem path to the downloaded NCERT chapter
-            PDF.
+def load_manifest(path: Path) -> list[ManifestEntry]:
+    """Read ``{"pdfs": [{<ManifestEntry fields>}, ...]}``."""
+    return [ManifestEntry(**entry) for entry in json.loads(path.read_text())["pdfs"]]
 
-    Returns:
-        List of ``Chunk`` instances ready for ``embed_and_upload``.
 
-    Raises:
-        NotImplementedError: Phase 4.2 — pdfplumber + Document AI
-            wiring not yet in place.
+def file_sha256(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    """Upper-leaning token estimate for the embedding tokenizer.
+
+    Whichever is larger of the word count and characters / 4.
+    SentencePiece-style tokenizers land near the former for English
+    and above it for Indic scripts, where the latter dominates.
     """
-    # TODO Phase 4.2: implement pdfplumber → dehyphenate → chunk_text
-    # → metadata-hydrate pipeline. Document AI fallback gated on the
-    # < 100 chars/page heuristic.
-    raise NotImplementedError(
-        "Phase 4.2: ingest_pdf not yet implemented. "
-        f"Path: {path}"
-    )
+    return max(len(text.split()), -(-len(text) // 4))
+
+
+class _Unit(NamedTuple):
+    text: str
+    page_start: int
+    page_end: int
+    tokens: int
+
+
+def dehyphenate(text: str) -> str:
+    """Undo NCERT's column-end hyphen wraps and reflow wrapped lines.
+
+    ``photo-\\nsynthesis`` becomes ``photosynthesis``. The hyphen is
+    dropped only before a lower-case letter; ``Class-\\nVII`` and Indic
+    compounds such as ``प्रकाश-\\nसंश्लेषण`` (Devanagari is not
+    hyphenated at line ends) keep it and lose only the break. Blank
+    lines (paragraph breaks) are preserved; other newlines become
+    spaces.
+    """
+    return "\n\n".join(u.text for u in _paragraphs([text]))
+
+
+def _paragraphs(pages: Sequence[str]) -> list[_Unit]:
+    """Dehyphenated paragraphs across pages, tagged with 1-based pages.
+
+    pdfplumber rarely emits blank lines between paragraphs, so a line
+    that ends a sentence and is clearly shorter than the page's widest
+    line also ends its paragraph. A paragraph that runs off the bottom
+    of a page without a terminator continues on the next page.
+    """
+    paragraphs: list[_Unit] = []
+    current: list[str] = []
+    first_page = 1
+
+    def close(page: int) -> None:
+        if current:
+            text = " ".join(current)
+            paragraphs.append(_Unit(text, first_page, page, estimate_tokens(text)))
+            current.clear()
+
+    for page, page_text in enumerate(pages, start=1):
+        lines = [line.strip() for line in page_text.splitlines()]
+        width = max((len(line) for line in lines), default=0)
+        for line in lines:
+            if not line:
+                close(page)
+                continue
+            if not current:
+                first_page = page
+            if current and _WRAPPED.search(current[-1]):
+                head = current[-1][:-1] if line[:1].islower() else current[-1]
+                current[-1] = head + line
+            else:
+                current.append(line)
+            if line.endswith(_TERMINATORS) and len(line) < 0.8 * width:
+                close(page)
+        if current and current[-1].endswith(_TERMINATORS):
+            close(page)
+    close(len(pages))
+    return paragraphs
+
+
+def _split_long(unit: _Unit, limit: int) -> list[_Unit]:
+    """Cut an over-long paragraph at sentence ends, else between words."""
+    pieces: list[str] = []
+    for sentence in _SENTENCE_END.split(unit.text):
+        if estimate_tokens(sentence) <= limit:
+            pieces.append(sentence)
+            continue
+        words = sentence.split()
+        while words:
+            take = len(words)
+            while take > 1 and estimate_tokens(" ".join(words[:take])) > limit:
+                take = max(1, take * limit // estimate_tokens(" ".join(words[:take])))
+            pieces.append(" ".join(words[:take]))
+            words = words[take:]
+    return [_Unit(p, unit.page_start, unit.page_end, estimate_tokens(p)) for p in pieces]
+
+
+def _overlap(units: list[_Unit], budget: int) -> list[_Unit]:
+    """The trailing units (or words of the last one) within ``budget``."""
+    tail: list[_Unit] = []
+    used = 0
+    for unit in reversed(units):
+        if used + unit.tokens > budget:
+            break
+        tail.insert(0, unit)
+        used += unit.tokens
+    if tail or not units:
+        return tail
+    last = units[-1]
+    words: list[str] = []
+    for word in reversed(last.text.split()):
+        if estimate_tokens(" ".join([word, *words])) > budget:
+            break
+        words.insert(0, word)
+    text = " ".join(words)
+    return [_Unit(text, last.page_end, last.page_end, estimate_tokens(text))] if words else []
+
+
+def _chunk_units(
+    units: Sequence[_Unit],
+    size: int = CHUNK_SIZE_TOKENS,
+    overlap: int = CHUNK_OVERLAP_TOKENS,
+) -> list[_Unit]:
+    pieces = [p for u in units for p in (_split_long(u, size) if u.tokens > size else [u])]
+    chunks: list[_Unit] = []
+    window: list[_Unit] = []
+    for piece in pieces:
+        if window and sum(u.tokens for u in window) + piece.tokens > size:
+            chunks.append(_join(window))
+            window = _overlap(window, overlap)
+            if sum(u.tokens for u in window) + piece.tokens > size:
+                window = []
+        window.append(piece)
+    if window:
+        chunks.append(_join(window))
+    return chunks
+
+
+def _join(units: Sequence[_Unit]) -> _Unit:
+    text = "\n\n".join(u.text for u in units)
+    return _Unit(text, units[0].page_start, units[-1].page_end, estimate_tokens(text))
 
 
 def chunk_text(text: str) -> list[str]:
     """Split a chapter's full text into ~512-token chunks with 64-token
     overlap, paragraph-respecting where possible.
 
-    Phase 4 §Ingestion pipeline pins the chunk size + overlap. The
-    paragraph-respecting split is the difference between "naive
-    sliding window" (cuts mid-sentence, hurts retrieval) and
-    "paragraph-aware sliding window" (snaps to nearest paragraph
-    boundary within the overlap window).
+    Phase 4 §Ingestion pipeline pins the chunk size + overlap. Whole
+    paragraphs are packed greedily up to ``CHUNK_SIZE_TOKENS``; the
+    next chunk opens with the trailing paragraphs that fit in
+    ``CHUNK_OVERLAP_TOKENS`` (or the tail words of the last one), so
+    boundaries fall between paragraphs rather than mid-sentence.
+    Paragraphs longer than a chunk are cut at sentence ends.
 
     Args:
-        text: The full dehyphenated chapter text.
+        text: The full chapter text (dehyphenated here if needed).
 
     Returns:
-        List of chunk strings. Token count is measured with the
-        embedding model's tokenizer so the chunks fit the input
-        window without truncation.
+        List of chunk strings. Token counts come from
+        ``estimate_tokens``, which errs high, so chunks fit the
+        embedding input window without truncation.
+    """
+    return [unit.text for unit in _chunk_units(_paragraphs([text]))]
+
+
+def extract_pages(path: Path) -> list[str]:
+    """Layout-aware text of every page, via pdfplumber (``ingest`` extra)."""
+    import pdfplumber  # noqa: PLC0415
+
+    with pdfplumber.open(path) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages]
+
+
+def chunks_from_pages(
+    pages: Sequence[str], entry: ManifestEntry, sha256: str
+) -> list[Chunk]:
+    """Dehyphenate, chunk and hydrate manifest metadata."""
+    return [
+        Chunk(
+            text=unit.text,
+            subject=entry.subject,
+            class_number=entry.class_number,
+            chapter_number=entry.chapter_number,
+            chapter_title=entry.chapter_title,
+            language=entry.language,
+            source_url=entry.source_url,
+            page_start=unit.page_start,
+            page_end=unit.page_end,
+            edition=entry.edition,
+            sha256=sha256,
+        )
+        for unit in _chunk_units(_paragraphs(pages))
+    ]
+
+
+def ingest_pdf(
+    path: Path,
+    entry: ManifestEntry,
+    *,
+    sha256: str | None = None,
+    extractor: Callable[[Path], list[str]] = extract_pages,
+) -> list[Chunk]:
+    """Extract text from one NCERT PDF and chunk it.
+
+    1. SHA-256 of the PDF bytes (the idempotency key) unless given.
+    2. ``extractor`` (pdfplumber by default) page by page.
+    3. Pages under ``OCR_MIN_PAGE_CHARS`` are logged for OCR; Document
+       AI is not wired, so their (sparse) text is used as is.
+    4. Dehyphenate, chunk, and hydrate metadata from ``entry``.
 
-    Raises:
-        NotImplementedError: Phase 4.2.
+    Returns:
+        List of ``Chunk`` instances ready for ``embed_and_store``.
     """
-    # TODO Phase 4.2: implement paragraph-aware sliding window using
-    # the Vertex embedding tokenizer for token counts.
-    raise NotImplementedError(
-        f"Phase 4.2: chunk_text not yet implemented. "
-        f"Will use {CHUNK_SIZE_TOKENS}-token chunks with "
-        f"{CHUNK_OVERLAP_TOKENS}-token overlap."
+    return _extract(path, entry, sha256 or file_sha256(path), extractor).chunks
+
+
+class _Extracted(NamedTuple):
+    entry: ManifestEntry
+    sha256: str
+    chunks: list[Chunk]
+    pages: int
+    ocr_pages: list[int]
+    seconds: float
+
+
+def _extract(
+    path: Path,
+    entry: ManifestEntry,
+    sha256: str,
+    extractor: Callable[[Path], list[str]],
+) -> _Extracted:
+    """Worker-process body; everything in and out must pickle."""
+    started = time.perf_counter()
+    pages = extractor(path)
+    ocr_pages = [
+        number for number, text in enumerate(pages, start=1)
+        if len(text.strip()) < OCR_MIN_PAGE_CHARS
+    ]
+    if ocr_pages:
+        log.warning("rag.ingest.ocr_needed", file=entry.file, pages=ocr_pages)
+    chunks = chunks_from_pages(pages, entry, sha256)
+    return _Extracted(
+        entry, sha256, chunks, len(pages), ocr_pages, time.perf_counter() - started
     )
 
 
-def embed_and_upload(chunks: list[Chunk]) -> int:
-    """Embed a batch of chunks and upsert them to Vector Search.
+_STAGES = ("hash", "extract", "embed", "store", "wall")
 
-    Idempotent at the chunk level: each chunk's vector is keyed by
-    ``f"{sha256}:{chunk_index}"``, so re-running ingest after a partial
-    failure resumes from the failed batch rather than re-embedding
-    everything.
 
-    Args:
-        chunks: Output of ``ingest_pdf``.
+@dataclass
+class IngestStats:
+    """Counters and per-stage busy time for one ``ingest_corpus`` run.
 
-    Returns:
-        Count of chunks actually uploaded (excludes idempotent
-        skips). Caller aggregates across PDFs to populate
-        ``ncert_ingest_run.json``.
+    ``extract`` seconds are summed across worker processes, so its
+    rates are per worker; ``wall`` rates are end to end.
+    """
+
+    pdfs: int = 0
+    skipped: int = 0
+    failed: int = 0
+    pages: int = 0
+    ocr_pages: int = 0
+    chunks: int = 0
+    batches: int = 0
+    batches_resumed: int = 0
+    hashed_bytes: int = 0
+    seconds: dict[str, float] = field(
+        default_factory=lambda: dict.fromkeys(_STAGES, 0.0)
+    )
 
-    Raises:
-        NotImplementedError: Phase 4.2.
+    def throughput(self) -> dict[str, dict[str, float]]:
+        """Pages/s and chunks/s per stage (hash reports MB/s)."""
+        rates: dict[str, dict[str, float]] = {}
+        for stage, seconds in self.seconds.items():
+            busy = max(seconds, 1e-9)
+            if stage == "hash":
+                rates[stage] = {"seconds": seconds, "mb_per_s": self.hashed_bytes / 1e6 / busy}
+            else:
+                rates[stage] = {
+                    "seconds": seconds,
+                    "pages_per_s": self.pages / busy,
+                    "chunks_per_s": self.chunks / busy,
+                }
+        return rates
+
+
+def embed_and_store(
+    chunks: Sequence[Chunk],
+    store: ChunkStore,
+    embedder: Embedder,
+    *,
+    batch_size: int = EMBED_BATCH_MAX,
+    stats: IngestStats | None = None,
+) -> int:
+    """Embed one PDF's chunks in batches and append them to ``store``.
+
+    Idempotent at the batch level: batch ``i`` is keyed by
+    ``(sha256, i)``, so re-running after a partial failure resumes
+    from the failed batch rather than re-embedding everything. All
+    chunks must come from the same PDF.
+
+    Returns:
+        Count of chunks actually stored (excludes resumed batches).
+    """
+    if not chunks:
+        return 0
+    batch_size = min(batch_size, EMBED_BATCH_MAX)
+    sha256 = chunks[0].sha256
+    stored = 0
+    for batch, start in enumerate(range(0, len(chunks), batch_size)):
+        if store.has(sha256, batch):
+            if stats is not None:
+                stats.batches_resumed += 1
+            continue
+        part = chunks[start:start + batch_size]
+        started = time.perf_counter()
+        vectors = np.asarray(embedder.embed([c.text for c in part]))
+        embedded = time.perf_counter()
+        store.write(sha256, batch, part, vectors)
+        if stats is not None:
+            stats.seconds["embed"] += embedded - started
+            stats.seconds["store"] += time.perf_counter() - embedded
+            stats.batches += 1
+        stored += len(part)
+    return stored
+
+
+def _extractions(
+    pending: Iterable[tuple[Path, ManifestEntry, str]],
+    workers: int,
+    extractor: Callable[[Path], list[str]],
+) -> Generator[tuple[ManifestEntry, _Extracted | Exception], None, None]:
+    """Extraction results in completion order, at most ``2 * workers``
+    in flight. A failed PDF yields its exception instead of a result."""
+    if workers <= 1:
+        for path, entry, sha256 in pending:
+            try:
+                yield entry, _extract(path, entry, sha256, extractor)
+            except Exception as exc:  # noqa: BLE001 — one bad PDF must not stop the corpus
+                yield entry, exc
+        return
+    # spawn, not fork: the parent may already run threads (gRPC, logging).
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        todo = iter(pending)
+        running: dict[Future[_Extracted], ManifestEntry] = {}
+        try:
+            while True:
+                for path, entry, sha256 in todo:
+                    running[pool.submit(_extract, path, entry, sha256, extractor)] = entry
+                    if len(running) >= 2 * workers:
+                        break
+                if not running:
+                    return
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entry = running.pop(future)
+                    try:
+                        yield entry, future.result()
+                    except Exception as exc:  # noqa: BLE001 — one bad PDF must not stop the corpus
+                        yield entry, exc
+        except BaseException:
+            # Includes GeneratorExit when the consumer's embed step raises.
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def ingest_corpus(
+    entries: Sequence[ManifestEntry],
+    pdf_dir: Path,
+    store: ChunkStore,
+    embedder: Embedder,
+    *,
+    workers: int | None = None,
+    extractor: Callable[[Path], list[str]] = extract_pages,
+    batch_size: int = EMBED_BATCH_MAX,
+) -> IngestStats:
+    """Ingest every manifest PDF not already complete in ``store``.
+
+    PDFs are hashed in this process as the pool asks for work,
+    extracted and chunked in a ``workers``-process pool (``extractor``
+    must be a picklable top-level function; ``workers=1`` runs
+    inline), and embedded and stored here as each extraction finishes. At most ``2 * workers``
+    extractions are in flight, so memory stays flat on any corpus
+    size. A PDF that fails to extract is logged and counted, not
+    fatal; an embedder or store failure propagates, and the next run
+    resumes from the failed batch.
     """
-    # TODO Phase 4.2: batch-embed via the Vertex client (max 250
-    # chunks/batch per the embedding API) and upsert to the deployed
-    # Vector Search index with the metadata payload from
-    # ``schemas.RetrievedChunk`` minus the score fields.
-    raise NotImplementedError(
-        f"Phase 4.2: embed_and_upload not yet implemented. "
-        f"Pending {len(chunks)} chunks."
+    workers = workers or os.cpu_count() or 1
+    stats = IngestStats()
+    started = time.perf_counter()
+
+    def pending() -> Iterator[tuple[Path, ManifestEntry, str]]:
+        # Lazy, so hashing streams ahead of extraction instead of
+        # reading the whole corpus first.
+        queued: set[str] = set()
+        for entry in entries:
+            path = pdf_dir / entry.file
+            hashed = time.perf_counter()
+            sha256 = file_sha256(path)
+            stats.seconds["hash"] += time.perf_counter() - hashed
+            stats.hashed_bytes += path.stat().st_size
+            if store.is_complete(sha256) or sha256 in queued:
+                stats.skipped += 1
+                continue
+            queued.add(sha256)
+            yield path, entry, sha256
+
+    def finish(result: _Extracted) -> None:
+        stats.seconds["extract"] += result.seconds
+        stats.pages += result.pages
+        stats.ocr_pages += len(result.ocr_pages)
+        stats.chunks += len(result.chunks)
+        embed_and_store(result.chunks, store, embedder, batch_size=batch_size, stats=stats)
+        store.mark_complete(
+            result.sha256,
+            file=result.entry.file,
+            batches=-(-len(result.chunks) // min(batch_size, EMBED_BATCH_MAX)),
+            chunks=len(result.chunks),
+        )
+        stats.pdfs += 1
+        log.info(
+            "rag.ingest.pdf_done",
+            file=result.entry.file,
+            pages=result.pages,
+            chunks=len(result.chunks),
+        )
+
+    # closing(): an embed failure must stop the pool now, not at GC.
+    with closing(_extractions(pending(), workers, extractor)) as outcomes:
+        for entry, outcome in outcomes:
+            if isinstance(outcome, Exception):
+                stats.failed += 1
+                log.error("rag.ingest.extract_failed", file=entry.file, error=str(outcome))
+            else:
+                finish(outcome)
+
+    stats.seconds["wall"] = time.perf_counter() - started
+    log.info(
+        "rag.ingest.done",
+        pdfs=stats.pdfs,
+        skipped=stats.skipped,
+        failed=stats.failed,
+        pages=stats.pages,
+        chunks=stats.chunks,
+        wall_s=round(stats.seconds["wall"], 2),
     )
+    return stats
 
 
 __all__ = [
     "CHUNK_OVERLAP_TOKENS",
     "CHUNK_SIZE_TOKENS",
+    "OCR_MIN_PAGE_CHARS",
     "Chunk",
+    "IngestStats",
+    "ManifestEntry",
     "chunk_text",
-    "embed_and_upload",
+    "chunks_from_pages",
+    "dehyphenate",
+    "embed_and_store",
+    "estimate_tokens",
+    "extract_pages",
+    "file_sha256",
+    "ingest_corpus",
     "ingest_pdf",
+    "load_manifest",
 ]
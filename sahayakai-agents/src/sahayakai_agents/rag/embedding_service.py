@@ -0,0 +1,323 @@
+"""Cached, micro-batched query embedding for retrieval.
+
+Lesson-plan retrieval queries repeat heavily. Teachers in different
+schools send the same topic, chapter title and learning outcomes, and
+each of those used to be its own Vertex round trip. ``embed_query``
+now goes through one process-wide ``EmbeddingService``:
+
+- **Key.** ``sha256(EMBEDDING_MODEL, normalize_query(text))``.
+  Normalization is NFC and whitespace collapsing only, and the
+  normalized text is what gets embedded, so every spelling that maps
+  to a key gets the same vector. Case is kept: corpus chunks are
+  embedded as written, and folding only the query side would skew the
+  similarity. The query language is not part of the key: the model is
+  multilingual and reads the script from the text. Vectors never
+  expire because the model is pinned; a model bump changes every key.
+- **Tiers.** An in-process LRU (``SAHAYAKAI_EMBEDDING_CACHE_MAX_ENTRIES``),
+  then an optional disk tier (``SAHAYAKAI_EMBEDDING_CACHE_DIR``; one
+  ``.npy`` file per key, shared by the workers of one instance). Disk
+  errors fail open and bump ``errors``.
+- **Single-flight.** Concurrent calls for the same key share one
+  lookup and one embedding.
+- **Micro-batching.** Misses queue up for ``SAHAYAKAI_EMBEDDING_BATCH_WINDOW_MS``
+  (or until ``SAHAYAKAI_EMBEDDING_BATCH_MAX`` are waiting) and go out
+  as one batch request. The blocking backend call runs in
+  ``asyncio.to_thread``, so the event loop never waits on Vertex. A
+  failed batch fails every caller in it and caches nothing.
+
+The backend is any ``embeddings.Embedder``: ``VertexEmbedder`` with
+``RETRIEVAL_QUERY`` vectors in production, ``HashEmbedder``
+(``SAHAYAKAI_EMBEDDING_BACKEND=hash``) for tests and local dev.
+
+Counters, the cache hit ratio and a batch-size histogram
+(``EmbeddingStats``) are surfaced on ``/readyz`` under
+``embeddingCache``.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import unicodedata
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import structlog
+from cachetools import LRUCache  # type: ignore[import-untyped]
+
+from ..config import Settings, get_settings
+from .embeddings import (
+    EMBED_BATCH_MAX,
+    EMBEDDING_DIM,
+    EMBEDDING_MODEL,
+    Embedder,
+    HashEmbedder,
+    VertexEmbedder,
+)
+
+log = structlog.get_logger(__name__)
+
+# Upper bounds of the batch-size histogram buckets.
+_BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, EMBED_BATCH_MAX)
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    return _SPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def embedding_cache_key(normalized: str) -> str:
+    return hashlib.sha256(f"{EMBEDDING_MODEL}\x00{normalized}".encode()).hexdigest()
+
+
+@dataclass
+class EmbeddingStats:
+    """Counters for one service. Mutated only from the event loop."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    errors: int = 0
+    batches: int = 0
+    batched: int = 0
+    batch_sizes: dict[int, int] = field(
+        default_factory=lambda: dict.fromkeys(_BATCH_BUCKETS, 0)
+    )
+
+    def record_batch(self, size: int) -> None:
+        self.batches += 1
+        self.batched += size
+        bucket = next(b for b in _BATCH_BUCKETS if size <= b)
+        self.batch_sizes[bucket] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """``hitRatio`` is cache hits (memory + disk) over all lookups;
+        ``batchSizeHistogram`` maps each bucket's upper bound to the
+        number of batches no larger than it (and larger than the
+        previous bound)."""
+        lookups = self.memory_hits + self.disk_hits + self.misses + self.coalesced
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memoryHits": self.memory_hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hitRatio": round(hits / lookups, 4) if lookups else 0.0,
+            "batches": self.batches,
+            "meanBatchSize": round(self.batched / self.batches, 2) if self.batches else 0.0,
+            "batchSizeHistogram": {str(b): n for b, n in self.batch_sizes.items()},
+        }
+
+
+class DiskEmbeddingTier:
+    """``<directory>/<key[:2]>/<key>.npy``; blocking I/O, call off-loop."""
+
+    def __init__(self, directory: str | Path) -> None:
+        self._root = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self._root / key[:2] / f"{key}.npy"
+
+    def get(self, key: str) -> np.ndarray | None:
+        try:
+            vector: np.ndarray = np.load(self._path(key), allow_pickle=False)
+        except FileNotFoundError:
+            return None
+        if vector.shape != (EMBEDDING_DIM,):
+            return None
+        return vector
+
+    def set_many(self, entries: list[tuple[str, np.ndarray]]) -> None:
+        for key, vector in entries:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp.open("wb") as handle:
+                np.save(handle, vector)
+            os.replace(tmp, path)
+
+
+def _retrieve_exception(flight: asyncio.Future[np.ndarray]) -> None:
+    # Every caller may have been cancelled; don't log "never retrieved".
+    if not flight.cancelled():
+        flight.exception()
+
+
+class EmbeddingService:
+    """Two-tier query-vector cache in front of a micro-batching backend."""
+
+    def __init__(
+        self,
+        backend: Embedder,
+        *,
+        max_entries: int = 4_096,
+        disk: DiskEmbeddingTier | None = None,
+        batch_window_ms: float = 5.0,
+        batch_max: int = 32,
+    ) -> None:
+        self.backend = backend
+        self.disk = disk
+        self.stats = EmbeddingStats()
+        self._window_s = max(batch_window_ms, 0.0) / 1000
+        self._batch_max = min(max(batch_max, 1), EMBED_BATCH_MAX)
+        self._memory: LRUCache[str, np.ndarray] = LRUCache(maxsize=max_entries)
+        self._inflight: dict[str, asyncio.Future[np.ndarray]] = {}
+        self._queued: list[tuple[str, str]] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def embed(self, text: str, language: str) -> list[float]:
+        """The query vector for ``text``; see the module docstring.
+
+        ``language`` is accepted for the ``embed_query`` contract and
+        does not affect the result.
+        """
+        normalized = normalize_query(text)
+        key = embedding_cache_key(normalized)
+        vector = self._memory.get(key)
+        if vector is not None:
+            self.stats.memory_hits += 1
+            return vector.tolist()  # type: ignore[no-any-return]
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.stats.coalesced += 1
+            return (await asyncio.shield(flight)).tolist()  # type: ignore[no-any-return]
+
+        flight = asyncio.get_running_loop().create_future()
+        flight.add_done_callback(_retrieve_exception)
+        self._inflight[key] = flight
+        # Resolved by a detached task, so a cancelled caller never
+        # strands the callers coalesced on its key.
+        self._spawn(self._resolve(key, normalized))
+        return (await asyncio.shield(flight)).tolist()  # type: ignore[no-any-return]
+
+    def _spawn(self, work: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(work)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, key: str, text: str) -> None:
+        vector = await self._disk_get(key)
+        if vector is not None:
+            self.stats.disk_hits += 1
+            self._memory[key] = vector
+            self._inflight.pop(key).set_result(vector)
+            return
+        self.stats.misses += 1
+        self._enqueue(key, text)
+
+    async def _disk_get(self, key: str) -> np.ndarray | None:
+        if self.disk is None:
+            return None
+        try:
+            return await asyncio.to_thread(self.disk.get, key)
+        except Exception as exc:  # noqa: BLE001 — fail open, see module docstring
+            self.stats.errors += 1
+            log.warning("rag.embedding_cache_read_failed", error=str(exc))
+            return None
+
+    def _enqueue(self, key: str, text: str) -> None:
+        self._queued.append((key, text))
+        if len(self._queued) >= self._batch_max:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self._window_s, self._flush
+            )
+
+    def _flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._queued = self._queued, []
+        if batch:
+            self._spawn(self._run(batch))
+
+    async def _run(self, batch: list[tuple[str, str]]) -> None:
+        self.stats.record_batch(len(batch))
+        try:
+            vectors = await asyncio.to_thread(self.backend.embed, [t for _, t in batch])
+            matrix = np.asarray(vectors, dtype=np.float32)
+            if matrix.shape != (len(batch), EMBEDDING_DIM):
+                raise ValueError(
+                    f"embedding backend returned {matrix.shape}, "
+                    f"expected ({len(batch)}, {EMBEDDING_DIM})"
+                )
+        except Exception as exc:  # noqa: BLE001 — handed to every waiting caller
+            self.stats.errors += 1
+            log.warning("rag.embedding_batch_failed", size=len(batch), error=str(exc))
+            for key, _ in batch:
+                self._inflight.pop(key).set_exception(exc)
+            return
+        for (key, _), vector in zip(batch, matrix, strict=True):
+            self._memory[key] = vector
+            self._inflight.pop(key).set_result(vector)
+        if self.disk is not None:
+            entries = [(key, v) for (key, _), v in zip(batch, matrix, strict=True)]
+            try:
+                await asyncio.to_thread(self.disk.set_many, entries)
+            except Exception as exc:  # noqa: BLE001 — fail open, see module docstring
+                self.stats.errors += 1
+                log.warning("rag.embedding_cache_write_failed", error=str(exc))
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "disk": self.disk is not None,
+            "entries": len(self._memory),
+            **self.stats.snapshot(),
+        }
+
+
+def build_embedding_service(settings: Settings) -> EmbeddingService:
+    """Construct the service selected by `SAHAYAKAI_EMBEDDING_*`."""
+    backend: Embedder = (
+        HashEmbedder()
+        if settings.embedding_backend == "hash"
+        else VertexEmbedder("RETRIEVAL_QUERY")
+    )
+    return EmbeddingService(
+        backend,
+        max_entries=settings.embedding_cache_max_entries,
+        disk=(
+            DiskEmbeddingTier(settings.embedding_cache_dir)
+            if settings.embedding_cache_dir
+            else None
+        ),
+        batch_window_ms=settings.embedding_batch_window_ms,
+        batch_max=settings.embedding_batch_max,
+    )
+
+
+_service: EmbeddingService | None = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    global _service
+    if _service is None:
+        _service = build_embedding_service(get_settings())
+    return _service
+
+
+def reset_embedding_service(service: EmbeddingService | None = None) -> None:
+    """Swap (or drop, with no argument) the process service. Tests only."""
+    global _service
+    _service = service
+
+
+__all__ = [
+    "DiskEmbeddingTier",
+    "EmbeddingService",
+    "EmbeddingStats",
+    "build_embedding_service",
+    "embedding_cache_key",
+    "get_embedding_service",
+    "normalize_query",
+    "reset_embedding_service",
+]
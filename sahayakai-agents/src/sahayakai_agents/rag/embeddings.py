@@ -2,49 +2,129 @@
 
 Pinned to ``text-multilingual-embedding-002@001`` per Phase 4 §Embeddings —
 auto-upgrades would silently invalidate stored chunk vectors. The Vertex
-client is imported lazily inside ``embed_query`` so import paths that do
-not exercise embedding (unit tests, pure schema validation) do not pay
-the SDK init cost or fail when ``google-cloud-aiplatform`` is absent
+client is imported lazily inside ``VertexEmbedder`` so import paths that
+do not exercise embedding (unit tests, pure schema validation) do not
+pay the SDK init cost or fail when ``google-cloud-aiplatform`` is absent
 from the dev environment.
 
+Both sides embed through the ``Embedder`` Protocol, in batches of at
+most ``EMBED_BATCH_MAX``: corpus ingestion with document vectors, and
+``embed_query`` (via the cached, micro-batching
+``embedding_service.EmbeddingService``) with query vectors.
+``VertexEmbedder`` is the production implementation. ``HashEmbedder``
+is a deterministic local stand-in for tests and dry runs; its vectors
+carry no meaning.
+
 Phase 4 §4.3. Plan: ``.claude/plans/phase-4-rag-ncert.md``.
 """
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Sequence
+from typing import Any, Literal, Protocol
+
+import numpy as np
+
 EMBEDDING_MODEL = "text-multilingual-embedding-002@001"
 EMBEDDING_DIM = 768
 EMBEDDING_REGION = "asia-south1"
+# Vertex text-embedding API limit on instances per request.
+EMBED_BATCH_MAX = 250
+
+
+TaskType = Literal["RETRIEVAL_DOCUMENT", "RETRIEVAL_QUERY"]
+
+
+class Embedder(Protocol):
+    """Synchronous batch embedding backend."""
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        """One ``EMBEDDING_DIM`` vector per text, in order. At most
+        ``EMBED_BATCH_MAX`` texts per call."""
+        ...
+
+
+class VertexEmbedder:
+    """``EMBEDDING_MODEL`` in ``EMBEDDING_REGION`` via the Vertex SDK.
+
+    The SDK (``google-cloud-aiplatform``) is imported on first use, so
+    nothing pays for it until the first embedding. ``task_type`` is
+    ``RETRIEVAL_DOCUMENT`` for indexed chunks and ``RETRIEVAL_QUERY``
+    for queries; the model embeds the two asymmetrically.
+    """
 
+    def __init__(self, task_type: TaskType = "RETRIEVAL_DOCUMENT") -> None:
+        self.task_type = task_type
+        self._model: Any = None
 
-def embed_query(text: str, language: str) -> list[float]:
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        if len(texts) > EMBED_BATCH_MAX:
+            raise ValueError(f"{len(texts)} texts > EMBED_BATCH_MAX={EMBED_BATCH_MAX}")
+        if self._model is None:
+            import vertexai  # noqa: PLC0415
+            from vertexai.language_models import TextEmbeddingModel  # noqa: PLC0415
+
+            vertexai.init(location=EMBEDDING_REGION)
+            self._model = TextEmbeddingModel.from_pretrained(EMBEDDING_MODEL)
+        from vertexai.language_models import TextEmbeddingInput  # noqa: PLC0415
+
+        result = self._model.get_embeddings(
+            [TextEmbeddingInput(text, self.task_type) for text in texts]
+        )
+        return [list(embedding.values) for embedding in result]
+
+
+class HashEmbedder:
+    """Deterministic unit vectors seeded by a hash of the text."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        if len(texts) > EMBED_BATCH_MAX:
+            raise ValueError(f"{len(texts)} texts > EMBED_BATCH_MAX={EMBED_BATCH_MAX}")
+        self.calls += 1
+        vectors: list[list[float]] = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM)
+            vectors.append((vector / np.linalg.norm(vector)).tolist())
+        return vectors
+
+
+async def embed_query(text: str, language: str) -> list[float]:
     """Embed a single retrieval query.
 
+    Goes through the process ``EmbeddingService``: repeated queries
+    are answered from its cache, and concurrent misses are coalesced
+    into one batch request run off the event loop.
+
     Args:
         text: The natural-language query, typically derived from the
             lesson-plan request's ``topic`` plus ``ncertChapter.title``
             plus key learning outcomes. Length-bounded by the
             ``RetrievalQuery.query_text`` schema (max 2000 chars).
         language: ISO-639-1 two-letter code from
-            ``RetrievalLanguage``. Passed to Vertex so the embedding is
-            taken in the same script as the indexed chunks; mismatched
-            scripts collapse cosine similarity.
+            ``RetrievalLanguage``. Currently unused: the model is
+            multilingual and reads the script from the text itself.
 
     Returns:
-        A 768-dim float vector. Caller hands this to Vector Search as
-        the query embedding.
-
-    Raises:
-        NotImplementedError: Phase 4.2 — implementation lands when the
-            Vertex client wiring is in place.
+        A 768-dim float vector for the retriever's cosine search.
     """
-    # TODO Phase 4.2: implement via google-cloud-aiplatform's
-    # `TextEmbeddingModel.from_pretrained(EMBEDDING_MODEL)` with
-    # `location=EMBEDDING_REGION`. Lazy-import the SDK here so test
-    # paths that mock the retriever do not require the dependency.
-    raise NotImplementedError(
-        "Phase 4.2: Vertex AI embedding wiring not yet implemented. "
-        f"Will use {EMBEDDING_MODEL} in {EMBEDDING_REGION}."
-    )
+    # Imported here: embedding_service builds on this module.
+    from .embedding_service import get_embedding_service  # noqa: PLC0415
+
+    return await get_embedding_service().embed(text, language)
 
 
-__all__ = ["EMBEDDING_DIM", "EMBEDDING_MODEL", "EMBEDDING_REGION", "embed_query"]
+__all__ = [
+    "EMBEDDING_DIM",
+    "EMBEDDING_MODEL",
+    "EMBEDDING_REGION",
+    "EMBED_BATCH_MAX",
+    "Embedder",
+    "HashEmbedder",
+    "TaskType",
+    "VertexEmbedder",
+    "embed_query",
+]
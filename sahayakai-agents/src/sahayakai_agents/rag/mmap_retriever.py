@@ -0,0 +1,430 @@
+"""In-process, memory-mapped vector index over NCERT chunk embeddings.
+
+``VectorSearchRetriever`` needs a deployed Vertex index before lesson
+plans can be grounded. ``MmapVectorRetriever`` serves the same
+``Retriever`` Protocol from a prebuilt index directory baked into the
+container (or mounted from GCS FUSE), with no network hop per query.
+
+Index layout (written by ``write_mmap_index``)::
+
+    manifest.json   format, dim, dtype, row count, embedding model and
+                    the partition table
+    vectors.npy     (rows, EMBEDDING_DIM) int8 or float16, unit-norm
+    scales.npy      (rows,) float32 per-row dequant scale (int8 only)
+    chunks.jsonl    one ``Chunk`` per row, same order as ``vectors``
+    offsets.npy     (rows + 1,) uint64 byte offsets into chunks.jsonl
+
+Rows are sorted by ``(class_number, subject, language)`` and the
+manifest records each partition's ``[start, stop)`` row range. The
+hard filter is therefore a slice of the matrix, not a post-filter:
+a Class-5 Science query only ever scores Class-5 Science rows.
+
+Opening an index reads the manifest and memory-maps everything else,
+so start-up cost does not grow with the corpus; pages fault in on
+first use. Scoring is a blocked matrix-vector product over the
+partition followed by ``argpartition`` for the top-k.
+
+Language fallback mirrors ``VectorSearchRetriever``: a language with no
+partition for the class + subject falls back to English with
+``fallback_reason="lang_not_indexed"``. A class + subject with no
+partition at all returns no chunks.
+
+With the BM25 index (``bm25.py``, written alongside), a query whose
+embedding fails is ranked by BM25 alone: ``vector_score == 0`` and
+``fallback_reason`` gains ``embedding_unavailable``. Otherwise results
+rank by cosine only (``score == vector_score``, ``bm25_score == 0``)
+unless the retriever is opened with ``rerank=True``. Then the top
+``_RERANK_CANDIDATES`` by cosine are reranked, and ``score`` is cosine
+(clamped to ``[0, 1]``) fused with BM25 (see ``bm25.fuse``).
+
+The rerank is opt-in because it misses the 2 ms budget whenever its
+pages are not resident. It looks up each query term's postings
+through the page cache. Warm, that costs ~0.4 ms at p50, but a cold
+partition or memory pressure pushes p99 to 9-15 ms
+(``scripts/bench_mmap_retriever.py``).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import mmap
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+import structlog
+
+from .bm25 import Bm25Index, fuse, write_bm25_index
+from .corpus_ingest import Chunk
+from .embeddings import EMBEDDING_DIM, EMBEDDING_MODEL, embed_query
+from .schemas import RetrievalContext, RetrievalQuery, RetrievedChunk
+
+log = structlog.get_logger(__name__)
+
+INDEX_FORMAT = 1
+Quantization = Literal["int8", "float16"]
+
+# Rows scored per matmul. Bounds the float32 working copy of an int8 /
+# float16 block to ~200 MB whatever the partition size.
+_BLOCK_ROWS = 65_536
+_FALLBACK_LANGUAGE = "en"
+# Cosine candidates handed to the BM25 rerank (Phase 4 §Retrieval
+# pattern: top-20 by cosine, then rerank).
+_RERANK_CANDIDATES = 20
+
+_PartitionKey = tuple[int, str, str]
+
+
+def _partition_key(chunk: Chunk) -> _PartitionKey:
+    return (chunk.class_number, chunk.subject, chunk.language)
+
+
+def write_mmap_index(
+    directory: Path,
+    chunks: Sequence[Chunk],
+    embeddings: np.ndarray,
+    *,
+    dtype: Quantization = "int8",
+    embedding_model: str = EMBEDDING_MODEL,
+) -> None:
+    """Write an index ``MmapVectorRetriever`` can open, BM25 included.
+
+    Args:
+        directory: Created if missing. Existing index files are
+            overwritten.
+        chunks: Chunk metadata, one per embedding row.
+        embeddings: ``(len(chunks), EMBEDDING_DIM)`` float array. May
+            itself be a memmap; it is read in blocks.
+        dtype: ``int8`` (symmetric per-row scale, 1 byte/dim) or
+            ``float16`` (2 bytes/dim).
+        embedding_model: Recorded in the manifest; queries must be
+            embedded with the same model.
+
+    Raises:
+        ValueError: Shape mismatch between ``chunks`` and
+            ``embeddings``, or an unknown ``dtype``.
+    """
+    rows = len(chunks)
+    if embeddings.shape != (rows, EMBEDDING_DIM):
+        raise ValueError(
+            f"embeddings shape {embeddings.shape} != ({rows}, {EMBEDDING_DIM})"
+        )
+    if dtype not in ("int8", "float16"):
+        raise ValueError(f"unknown index dtype {dtype!r}")
+
+    directory.mkdir(parents=True, exist_ok=True)
+    order = sorted(range(rows), key=lambda i: _partition_key(chunks[i]))
+
+    vectors = np.lib.format.open_memmap(
+        directory / "vectors.npy", mode="w+", dtype=dtype, shape=(rows, EMBEDDING_DIM)
+    )
+    scales = np.ones(rows, dtype=np.float32)
+    for start in range(0, rows, _BLOCK_ROWS):
+        picked = order[start:start + _BLOCK_ROWS]
+        block = np.asarray(embeddings[picked], dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        block /= np.where(norms == 0, 1.0, norms)
+        stop = start + len(picked)
+        if dtype == "int8":
+            peak = np.abs(block).max(axis=1)
+            scale = np.where(peak == 0, 1.0, peak / 127.0).astype(np.float32)
+            vectors[start:stop] = np.rint(block / scale[:, None]).astype(np.int8)
+            scales[start:stop] = scale
+        else:
+            vectors[start:stop] = block.astype(np.float16)
+    vectors.flush()
+    del vectors
+    if dtype == "int8":
+        np.save(directory / "scales.npy", scales)
+
+    offsets = np.zeros(rows + 1, dtype=np.uint64)
+    partitions: list[dict[str, Any]] = []
+    with (directory / "chunks.jsonl").open("wb") as out:
+        position = 0
+        for row, index in enumerate(order):
+            chunk = chunks[index]
+            line = json.dumps(asdict(chunk), ensure_ascii=False).encode() + b"\n"
+            out.write(line)
+            position += len(line)
+            offsets[row + 1] = position
+            key = _partition_key(chunk)
+            if partitions and tuple(partitions[-1]["key"]) == key:
+                partitions[-1]["stop"] = row + 1
+            else:
+                partitions.append({"key": list(key), "start": row, "stop": row + 1})
+    np.save(directory / "offsets.npy", offsets)
+
+    manifest = {
+        "format": INDEX_FORMAT,
+        "dim": EMBEDDING_DIM,
+        "dtype": dtype,
+        "rows": rows,
+        "embedding_model": embedding_model,
+        "partitions": [
+            {
+                "class_number": p["key"][0],
+                "subject": p["key"][1],
+                "language": p["key"][2],
+                "start": p["start"],
+                "stop": p["stop"],
+            }
+            for p in partitions
+        ],
+    }
+    write_bm25_index(
+        directory,
+        (chunks[i].text for i in order),
+        [(p["start"], p["stop"]) for p in partitions],
+    )
+    (directory / "manifest.json").write_text(json.dumps(manifest, indent=1))
+    log.info(
+        "rag.mmap_index.written",
+        directory=str(directory),
+        rows=rows,
+        partitions=len(partitions),
+        dtype=dtype,
+    )
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """What ``MmapVectorRetriever.search`` found, before timing wrap-up."""
+
+    chunks: list[RetrievedChunk]
+    fallback_reason: str | None
+    rerank_ms: float = 0.0
+
+
+def _with_reason(reason: str | None, extra: str) -> str:
+    return extra if reason is None else f"{reason},{extra}"
+
+
+class MmapVectorRetriever:
+    """``Retriever`` over a ``write_mmap_index`` directory.
+
+    Thread-safe: everything it holds is read-only after ``__init__``.
+    Each ``retrieve`` awaits the query embedding (cached and
+    micro-batched off-loop by default), then scores in a worker thread
+    (numpy releases the GIL in the matmul), so the event loop is never
+    blocked by a large partition.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        embed: Callable[[str, str], Awaitable[Sequence[float]]] = embed_query,
+        rerank: bool = False,
+    ) -> None:
+        """Open the index. Cost is independent of the row count.
+
+        Args:
+            directory: Output of ``write_mmap_index``.
+            embed: ``async (text, language) -> vector``. Defaults to
+                ``embeddings.embed_query`` (cached and micro-batched);
+                tests pass a local coroutine function.
+            rerank: BM25-rerank the cosine candidates when the index has
+                BM25 (see the module docstring for the latency cost).
+
+        Raises:
+            ValueError: Unsupported format, wrong dimension, or an
+                embedding model other than ``EMBEDDING_MODEL``.
+        """
+        started = time.perf_counter()
+        manifest = json.loads((directory / "manifest.json").read_text())
+        if manifest.get("format") != INDEX_FORMAT:
+            raise ValueError(f"unsupported index format {manifest.get('format')!r}")
+        if manifest["dim"] != EMBEDDING_DIM:
+            raise ValueError(f"index dim {manifest['dim']} != {EMBEDDING_DIM}")
+        if manifest["embedding_model"] != EMBEDDING_MODEL:
+            raise ValueError(
+                f"index embedded with {manifest['embedding_model']!r}, "
+                f"queries use {EMBEDDING_MODEL!r}"
+            )
+        self._embed = embed
+        self._rerank = rerank
+        self._dtype: Quantization = manifest["dtype"]
+        self._rows: int = manifest["rows"]
+        self._partitions: dict[_PartitionKey, tuple[int, int]] = {
+            (p["class_number"], p["subject"], p["language"]): (p["start"], p["stop"])
+            for p in manifest["partitions"]
+        }
+        self._vectors = np.load(directory / "vectors.npy", mmap_mode="r")
+        self._scales = (
+            np.load(directory / "scales.npy", mmap_mode="r")
+            if self._dtype == "int8" else None
+        )
+        self._offsets = np.load(directory / "offsets.npy", mmap_mode="r")
+        self._bm25 = (
+            Bm25Index(directory) if (directory / "bm25.json").exists() else None
+        )
+        self._chunks_file = (directory / "chunks.jsonl").open("rb")
+        self._chunks: mmap.mmap | None = (
+            mmap.mmap(self._chunks_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._rows else None
+        )
+        log.info(
+            "rag.mmap_index.opened",
+            directory=str(directory),
+            rows=self._rows,
+            partitions=len(self._partitions),
+            dtype=self._dtype,
+            bm25=self._bm25 is not None,
+            rerank=rerank,
+            open_ms=int((time.perf_counter() - started) * 1000),
+        )
+
+    def close(self) -> None:
+        if self._chunks is not None:
+            self._chunks.close()
+            self._chunks = None
+        self._chunks_file.close()
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    def _partition(self, query: RetrievalQuery) -> tuple[tuple[int, int] | None, str | None]:
+        exact = self._partitions.get((query.class_number, query.subject, query.language))
+        if exact is not None:
+            return exact, None
+        fallback = self._partitions.get(
+            (query.class_number, query.subject, _FALLBACK_LANGUAGE)
+        )
+        if fallback is not None:
+            return fallback, "lang_not_indexed"
+        return None, "partition_not_indexed"
+
+    def _scores(self, start: int, stop: int, query_vector: np.ndarray) -> np.ndarray:
+        scores = np.empty(stop - start, dtype=np.float32)
+        for block_start in range(start, stop, _BLOCK_ROWS):
+            block_stop = min(stop, block_start + _BLOCK_ROWS)
+            block = self._vectors[block_start:block_stop].astype(np.float32)
+            out = scores[block_start - start:block_stop - start]
+            np.matmul(block, query_vector, out=out)
+            if self._scales is not None:
+                out *= self._scales[block_start:block_stop]
+        return scores
+
+    def _chunk(self, row: int, score: float, vector: float, lexical: float) -> RetrievedChunk:
+        assert self._chunks is not None
+        start, stop = int(self._offsets[row]), int(self._offsets[row + 1])
+        meta = json.loads(self._chunks[start:stop])
+        meta.pop("sha256", None)
+        meta["chunk_text"] = meta.pop("text")
+        return RetrievedChunk(
+            **meta,
+            score=min(1.0, max(0.0, score)),
+            vector_score=vector,
+            bm25_score=lexical,
+        )
+
+    def _lexical_search(self, query: RetrievalQuery, start: int) -> list[RetrievedChunk]:
+        assert self._bm25 is not None
+        rows, lexical = self._bm25.search(start, query.query_text, query.top_k)
+        best = float(lexical[0]) if len(lexical) else 1.0
+        return [
+            self._chunk(int(row), float(bm25) / best, 0.0, float(bm25))
+            for row, bm25 in zip(rows, lexical, strict=True)
+        ]
+
+    def search(
+        self, query: RetrievalQuery, query_vector: Sequence[float] | None
+    ) -> SearchResult:
+        """Top-``query.top_k`` chunks of the query's partition.
+
+        Cosine order, or cosine top-``_RERANK_CANDIDATES`` BM25-reranked
+        when opened with ``rerank=True`` and the index has BM25.
+        ``query_vector=None`` ranks by BM25 alone. Synchronous;
+        ``retrieve`` runs it off the event loop.
+
+        Raises:
+            ValueError: Wrong vector shape, or no vector and no BM25.
+        """
+        bounds, fallback_reason = self._partition(query)
+        if bounds is None:
+            return SearchResult([], fallback_reason)
+        start, stop = bounds
+        if query_vector is None:
+            if self._bm25 is None:
+                raise ValueError("no query vector and the index has no BM25")
+            started = time.perf_counter()
+            chunks = self._lexical_search(query, start)
+            return SearchResult(
+                chunks,
+                _with_reason(fallback_reason, "embedding_unavailable"),
+                (time.perf_counter() - started) * 1000,
+            )
+
+        vector = np.asarray(query_vector, dtype=np.float32)
+        if vector.shape != (EMBEDDING_DIM,):
+            raise ValueError(f"query vector shape {vector.shape} != ({EMBEDDING_DIM},)")
+        norm = float(np.linalg.norm(vector))
+        if norm:
+            vector = vector / norm
+
+        scores = self._scores(start, stop, vector)
+        bm25 = self._bm25 if self._rerank else None
+        wanted = query.top_k if bm25 is None else max(query.top_k, _RERANK_CANDIDATES)
+        k = min(wanted, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        cosine = np.clip(scores[top], 0.0, 1.0)
+        lexical = np.zeros_like(cosine)
+        fused = cosine
+        rerank_ms = 0.0
+        if bm25 is not None:
+            started = time.perf_counter()
+            lexical = bm25.score(start, top + start, query.query_text)
+            fused = fuse(cosine, lexical)
+            order = np.argsort(-fused, kind="stable")[:query.top_k]
+            top, cosine, lexical, fused = top[order], cosine[order], lexical[order], fused[order]
+            rerank_ms = (time.perf_counter() - started) * 1000
+
+        chunks = [
+            self._chunk(start + int(row), float(f), float(c), float(b))
+            for row, f, c, b in zip(top, fused, cosine, lexical, strict=True)
+        ]
+        return SearchResult(chunks, fallback_reason, rerank_ms)
+
+    async def retrieve(self, query: RetrievalQuery) -> RetrievalContext:
+        """Implements the ``Retriever`` Protocol."""
+        started = time.perf_counter()
+
+        vector: Sequence[float] | None = None
+        if self._partition(query)[0] is None:
+            # Nothing to score: skip the embedding call too.
+            result = SearchResult([], "partition_not_indexed")
+        else:
+            try:
+                vector = await self._embed(query.query_text, query.language)
+            except Exception as exc:  # noqa: BLE001 — degrade to BM25 when we can
+                if self._bm25 is None:
+                    raise
+                log.warning("rag.embed_failed", error=str(exc), language=query.language)
+            result = await asyncio.to_thread(self.search, query, vector)
+        latency_ms = int((time.perf_counter() - started) * 1000)
+        log.info(
+            "rag.retrieve",
+            retriever="mmap",
+            class_number=query.class_number,
+            subject=query.subject,
+            language=query.language,
+            chunks=len(result.chunks),
+            fallback_reason=result.fallback_reason,
+            latency_ms=latency_ms,
+            rerank_ms=round(result.rerank_ms, 2),
+        )
+        return RetrievalContext(
+            chunks=result.chunks,
+            query_latency_ms=min(latency_ms, 10_000),
+            rerank_latency_ms=min(int(result.rerank_ms), 10_000),
+            embedding_model=EMBEDDING_MODEL,
+            fallback_reason=result.fallback_reason,
+        )
+
+
+__all__ = ["INDEX_FORMAT", "MmapVectorRetriever", "SearchResult", "write_mmap_index"]
@@ -6,7 +6,10 @@ a fake retriever without touching Vertex AI. The Protocol contract is
 narrow on purpose: one async method that takes a query and returns a
 context, no configuration mutation through the public surface.
 
-**Hard-filter contract.** Both implementations MUST apply
+``MmapVectorRetriever`` (``mmap_retriever.py``) serves the same
+contract from an in-process memory-mapped index.
+
+**Hard-filter contract.** Every implementation MUST apply
 ``class_number`` and ``subject`` as required Vector Search predicates,
 not as post-filters. A Class-5 Science request that retrieves a
 Class-9 Math chunk because the embedding similarity was high is a
@@ -56,7 +59,10 @@ class VectorSearchRetriever:
        top-20 by cosine.
     3. BM25 rerank in-process over those 20 chunks against
        ``query.query_text`` to surface exact-token matches that the
-       embedding may have missed.
+       embedding may have missed (``bm25.Bm25Index.score`` +
+       ``bm25.fuse``). ``MmapVectorRetriever`` runs the same rerank
+       only when opened with ``rerank=True``; here it is always on,
+       since the network round trip dwarfs its cost.
     4. Return top-``query.top_k`` from the reranked list.
     """
 
@@ -0,0 +1,206 @@
+"""Pluggable replay guard for the HMAC nonce check.
+
+`auth._verify_content_digest` rejects a `(timestamp, digest)` tuple it
+has already seen, but its `TTLCache` is per process: with N Cloud Run
+instances a captured request can be replayed up to N times (once per
+instance the load balancer happens to pick), and every replay is a
+full Gemini call.
+
+`auth._REPLAY_GUARD` stays the first check in every mode, and it is
+all the `memory` backend (the default; right for dev and
+single-instance deploys) has: `get_replay_guard()` returns None.
+
+With the `firestore` backend, a nonce the local cache has not seen is
+then claimed from `FirestoreReplayGuard`: one atomic insert-if-absent
+per request (`DocumentReference.create()` fails with `AlreadyExists`
+when the doc is there), shared by every instance. Same-instance
+replays never get this far. Docs carry `expireAt`, so the
+collection's Firestore TTL policy (see
+`scripts/apply-firestore-ttl.sh`) purges them once the skew window
+has passed.
+
+The guard keeps `ReplayGuardStats` counters (shared hits, misses,
+backend errors, shared-check latency), logged as structlog events
+and surfaced on `/readyz` so the cost of the shared check is visible.
+
+Failure policy: if the shared backend errors, the claim FAILS OPEN
+(the request proceeds, with the per-process check still applied) and
+`errors` is bumped. Failing closed would turn a Firestore blip into a
+401 on every authenticated route.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import structlog
+
+from .config import Settings, get_settings
+
+log = structlog.get_logger(__name__)
+
+# Matches `auth._REPLAY_GUARD`: one minute longer than the ±5-minute
+# timestamp skew window.
+DEFAULT_NONCE_TTL_SECONDS = 360
+
+
+@dataclass
+class ReplayGuardStats:
+    """Counters for one guard. Mutated only from the event loop."""
+
+    shared_hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    shared_checks: int = 0
+    shared_latency_ms_total: float = 0.0
+    shared_latency_ms_max: float = 0.0
+
+    def record_shared(self, latency_ms: float) -> None:
+        self.shared_checks += 1
+        self.shared_latency_ms_total += latency_ms
+        self.shared_latency_ms_max = max(self.shared_latency_ms_max, latency_ms)
+
+    def snapshot(self) -> dict[str, float | int]:
+        avg = (
+            self.shared_latency_ms_total / self.shared_checks
+            if self.shared_checks
+            else 0.0
+        )
+        return {
+            "sharedHits": self.shared_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "sharedChecks": self.shared_checks,
+            "sharedLatencyMsAvg": round(avg, 3),
+            "sharedLatencyMsMax": round(self.shared_latency_ms_max, 3),
+        }
+
+
+class ReplayGuard(ABC):
+    """Atomic check-and-record for request nonces."""
+
+    backend: str = ""
+
+    def __init__(self) -> None:
+        self.stats = ReplayGuardStats()
+
+    @abstractmethod
+    async def claim(self, nonce: str) -> bool:
+        """Record `nonce`. True if this is its first use, False on replay."""
+
+
+class FirestoreReplayGuard(ReplayGuard):
+    """Cross-instance nonce store on Firestore.
+
+    The blocking `create()` runs via `asyncio.to_thread`, same as
+    `SessionStore`.
+    """
+
+    backend = "firestore"
+
+    def __init__(
+        self,
+        client: Any | None = None,
+        *,
+        collection: str,
+        ttl_seconds: int = DEFAULT_NONCE_TTL_SECONDS,
+    ) -> None:
+        super().__init__()
+        if client is None:
+            from google.cloud import firestore  # noqa: PLC0415
+
+            settings = get_settings()
+            client = firestore.Client(
+                project=settings.gcp_project, database=settings.firestore_database
+            )
+        self._client = client
+        self._collection = collection
+        self._ttl = timedelta(seconds=ttl_seconds)
+
+    def _sync_create(self, nonce: str) -> bool:
+        from google.api_core.exceptions import AlreadyExists  # noqa: PLC0415
+
+        now = datetime.now(UTC)
+        try:
+            self._client.collection(self._collection).document(nonce).create(
+                {"createdAt": now, "expireAt": now + self._ttl}
+            )
+        except AlreadyExists:
+            return False
+        return True
+
+    async def claim(self, nonce: str) -> bool:
+        started = time.perf_counter()
+        try:
+            fresh = await asyncio.to_thread(self._sync_create, nonce)
+        except Exception as exc:  # noqa: BLE001 — fail open, see module docstring
+            self.stats.errors += 1
+            log.warning(
+                "replay_guard.shared_check_failed",
+                backend=self.backend,
+                error_type=type(exc).__name__,
+                error=str(exc)[:200],
+            )
+            return True
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.stats.record_shared(latency_ms)
+
+        if fresh:
+            self.stats.misses += 1
+        else:
+            self.stats.shared_hits += 1
+        log.debug(
+            "replay_guard.shared_check",
+            backend=self.backend,
+            fresh=fresh,
+            latency_ms=round(latency_ms, 3),
+        )
+        return fresh
+
+
+def build_replay_guard(settings: Settings) -> ReplayGuard | None:
+    """Construct the guard selected by `SAHAYAKAI_REPLAY_GUARD_BACKEND`;
+    None for `memory`, where `auth._REPLAY_GUARD` is the only check."""
+    if settings.replay_guard_backend == "firestore":
+        return FirestoreReplayGuard(collection=settings.replay_guard_collection)
+    return None
+
+
+# Process-scoped guard. Built lazily on first use so tests (and dev) never
+# touch Firestore unless the backend is explicitly configured.
+_guard: ReplayGuard | None = None
+_built = False
+
+
+def get_replay_guard() -> ReplayGuard | None:
+    global _guard, _built
+    if not _built:
+        _guard = build_replay_guard(get_settings())
+        _built = True
+        log.info(
+            "replay_guard.started",
+            backend=_guard.backend if _guard is not None else "memory",
+        )
+    return _guard
+
+
+def reset_replay_guard(guard: ReplayGuard | None = None) -> None:
+    """Swap (or drop, with no argument) the process guard. Tests only."""
+    global _guard, _built
+    _guard = guard
+    _built = guard is not None
+
+
+__all__ = [
+    "FirestoreReplayGuard",
+    "ReplayGuard",
+    "ReplayGuardStats",
+    "build_replay_guard",
+    "get_replay_guard",
+    "reset_replay_guard",
+]
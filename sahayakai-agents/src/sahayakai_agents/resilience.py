@@ -3,7 +3,9 @@
 Python port of `runResiliently` in sahayakai-main/src/ai/genkit.ts, tuned for
 telephony:
 
-- Key-pool failover across Gemini API keys.
+- Key-pool failover across Gemini API keys, each attempt on the
+  healthiest key not yet tried (`key_pool.KeyPool`: in-flight load,
+  latency, 429/401/403 cooldowns, optional RPM/TPM quotas).
 - Jittered exponential backoff.
 - **Total wait capped at `max_total_backoff_seconds`** (default 7s). Twilio
   webhook budget is ~15s; we must return — success or typed error — well
@@ -14,6 +16,9 @@ telephony:
   SDK's ~600s default. Forensic finding P0 #6.
 - Implicit-cache metric extraction carried forward from Phase 0 design
   (`extract_cache_metrics` mirrors the TypeScript helper).
+- Optional hedging (`hedge=True`, see hedging.py): an attempt slower
+  than the span's recent p95 gets a twin on the next key; the first
+  answer wins.
 - Fail-fast on 400 / safety-filter errors.
 - Typed `AIQuotaExhaustedError` on final exhaustion with `Retry-After` hint
   so Next.js can drop to the Genkit fallback.
@@ -31,10 +36,13 @@ import re
 import time
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
+from functools import partial
 from typing import Any
 
 import structlog
 
+from .hedging import get_hedger
+from .key_pool import get_key_pool
 from .shared.errors import (
     AIQuotaExhaustedError,
     AISafetyBlockError,
@@ -181,6 +189,7 @@ async def run_resiliently[T](  # noqa: PLR0912, PLR0915 — single-purpose retry
     span_name: str | None = None,
     max_total_backoff_seconds: float = 7.0,
     per_call_timeout_seconds: float | None = None,
+    hedge: bool = False,
 ) -> T:
     """Execute `fn(api_key)` with key failover and telephony-bounded backoff.
 
@@ -194,6 +203,10 @@ async def run_resiliently[T](  # noqa: PLR0912, PLR0915 — single-purpose retry
     forensic finding where a hung Gemini call could block until the SDK's
     ~600s default. When `None`, falls back to `max_total_backoff_seconds`
     so a misconfigured caller still gets some upper bound.
+
+    `hedge=True` lets each attempt race a twin on the next key once it
+    runs past the span's hedge delay (`hedging.Hedger`). It only takes
+    effect with `SAHAYAKAI_HEDGE_ENABLED` and more than one key.
     """
     if not key_pool:
         raise RuntimeError(
@@ -204,7 +217,6 @@ async def run_resiliently[T](  # noqa: PLR0912, PLR0915 — single-purpose retry
     deadline = time.monotonic() + max_total_backoff_seconds
     start = time.monotonic()
     pool_size = len(key_pool)
-    start_index = random.randrange(pool_size)
     max_attempts = max(3, min(pool_size, 5))
     last_error: Exception | None = None
     last_429 = False
@@ -219,15 +231,61 @@ async def run_resiliently[T](  # noqa: PLR0912, PLR0915 — single-purpose retry
         else max_total_backoff_seconds
     )
 
+    hedger = get_hedger() if hedge and pool_size > 1 else None
+    if hedger is not None and not hedger.enabled:
+        hedger = None
+
+    pool = get_key_pool()
+    # Keys this request already tried (including hedge twins); the next
+    # attempt prefers the healthiest key outside this set.
+    tried: list[str] = []
+
+    async def _tracked(key: str) -> T:
+        attempt_start = time.monotonic()
+        pool.begin(key)
+        try:
+            outcome = await fn(key)
+        except asyncio.CancelledError:
+            pool.end(key, latency_s=time.monotonic() - attempt_start, cancelled=True)
+            raise
+        except Exception as exc:
+            pool.end(
+                key,
+                latency_s=time.monotonic() - attempt_start,
+                status=classify_status(exc),
+                failed=True,
+            )
+            raise
+        usage = extract_cache_metrics(outcome)
+        pool.end(
+            key,
+            latency_s=time.monotonic() - attempt_start,
+            total_tokens=usage.total_tokens if usage else 0,
+        )
+        return outcome
+
     for i in range(max_attempts):
-        current_index = (start_index + i) % pool_size
-        current_key = key_pool[current_index]
+        current_key = pool.pick(key_pool, exclude=tried)
+        current_index = key_pool.index(current_key)
+        tried.append(current_key)
         attempt_started = time.monotonic()
 
         try:
-            result = await asyncio.wait_for(
-                fn(current_key), timeout=effective_timeout
-            )
+            if hedger is None:
+                result = await asyncio.wait_for(
+                    _tracked(current_key), timeout=effective_timeout
+                )
+            else:
+                hedge_key = pool.pick(key_pool, exclude=tried)
+                result, winner = await hedger.attempt(
+                    _tracked,
+                    (current_key, hedge_key),
+                    span_name=span_name or "unknown",
+                    timeout_s=effective_timeout,
+                    on_hedge=partial(tried.append, hedge_key),
+                )
+                if winner:
+                    current_index = key_pool.index(hedge_key)
         except TimeoutError as exc:
             # Per-call timeout: log distinct event, then treat as a
             # retryable failure (try next key) rather than a hard fail.
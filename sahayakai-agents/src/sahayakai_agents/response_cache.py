@@ -0,0 +1,505 @@
+"""Content-addressed cache for deterministic generator responses.
+
+Teachers in different schools ask for the same lesson plan / quiz /
+worksheet (same topic, grade, language, chapter) again and again, and
+every one of those requests used to be a full Gemini run. The
+generator routes now look their response up by a content address
+first:
+
+    sha256(route, sanitized request, prompt-template digest, model)
+
+- The request part is the SANITIZED prompt context (what
+  `prompt_safety.sanitize` lets through to the template), never the
+  raw payload, and never per-caller fields such as `userId`.
+- `prompt_version(<prompts subdir>)` digests every template file the
+  route renders, so editing anything under `prompts/` changes the key:
+  old entries simply stop matching and age out on their TTL. That is
+  the invalidation path for prompt changes; `ResponseCache.invalidate`
+  drops entries explicitly (e.g. after a model-behaviour regression).
+
+Tiers:
+
+- memory — an in-process `TTLCache` (LRU-bounded). Always on.
+- shared (optional, `SAHAYAKAI_RESPONSE_CACHE_BACKEND`):
+  - `DiskCacheTier` — one JSON file per entry; for single-instance /
+    dev deploys with a persistent volume.
+  - `FirestoreCacheTier` — one doc per entry under
+    `<collection>/<route>/cached_responses/<key>`, with `expireAt` for
+    the `cached_responses` TTL policy (`scripts/apply-firestore-ttl.sh`).
+    Shared by every instance.
+
+Single-flight: concurrent identical requests coalesce on one in-flight
+computation, so 20 teachers pressing "generate" on the same chapter at
+once cost one model run. Followers receive the leader's result (or
+its error). If the leader is cancelled (client went away), one of the
+followers takes over.
+
+Only responses the route marks cacheable are stored (e.g. a quiz that
+lost a variant is served but not cached). A request carrying
+`Cache-Control: no-cache` skips the lookup but still refreshes the
+entry. Shared-tier errors fail open: the request is served from the
+model and `errors` is bumped.
+
+Counters (`ResponseCacheStats`) are surfaced on `/readyz`; routes set
+`X-Cache: hit|miss` on the response.
+
+A hit is also marked in the body (`cacheHit: true`). Its per-call
+telemetry describes the request being served, not the run that
+produced the cached body: the route stamps its own `sidecarVersion` and
+`latencyMs`, and resets counters of model work (the lesson plan's
+`revisionsRun`, `modelCallsSaved` and `cacheHitRatio`), since none ran.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Literal
+
+import structlog
+from cachetools import TTLCache  # type: ignore[import-untyped]
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .config import Settings, get_settings
+
+log = structlog.get_logger(__name__)
+
+CacheStatus = Literal["hit", "miss"]
+
+_REPO_PROMPTS = Path(__file__).resolve().parents[2] / "prompts"
+
+
+@lru_cache(maxsize=64)
+def prompt_version(subdir: str) -> str:
+    """Digest of every template under `prompts/<subdir>`.
+
+    Resolved the same way the agents resolve their templates
+    (`SAHAYAKAI_PROMPTS_DIR` in prod, repo layout in dev). Cached for
+    the process lifetime, matching the agents' compiled-template
+    caches: a prompt change ships with a new revision.
+    """
+    env = os.environ.get("SAHAYAKAI_PROMPTS_DIR")
+    root = (Path(env) if env else _REPO_PROMPTS) / subdir
+    digest = hashlib.sha256()
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def response_cache_key(
+    route: str,
+    material: Mapping[str, Any],
+    *,
+    prompts: str,
+    model: str,
+) -> str:
+    """Canonical content address for one generator request."""
+    canonical = json.dumps(
+        {"route": route, "prompts": prompts, "model": model, "request": material},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def digest_bytes(data: str | bytes | None) -> str | None:
+    """Stand-in for large inputs (image data URIs) in key material."""
+    if data is None:
+        return None
+    raw = data.encode("utf-8") if isinstance(data, str) else data
+    return hashlib.sha256(raw).hexdigest()
+
+
+def wants_fresh(request: Request) -> bool:
+    """`Cache-Control: no-cache` from the caller skips the lookup."""
+    return "no-cache" in request.headers.get("cache-control", "").lower()
+
+
+def mark_cache(response: Response, status: CacheStatus) -> None:
+    response.headers["X-Cache"] = status
+
+
+@dataclass
+class ResponseCacheStats:
+    """Counters for one cache. Mutated only from the event loop."""
+
+    memory_hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    stores: int = 0
+    errors: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "memoryHits": self.memory_hits,
+            "sharedHits": self.shared_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stores": self.stores,
+            "errors": self.errors,
+        }
+
+
+class SharedCacheTier(ABC):
+    """Second-level store behind the in-process tier."""
+
+    backend: str = ""
+
+    @abstractmethod
+    async def get(self, route: str, key: str) -> dict[str, Any] | None:
+        """The stored value, or None when absent or expired."""
+
+    @abstractmethod
+    async def set(
+        self, route: str, key: str, value: dict[str, Any], ttl_seconds: int,
+    ) -> None: ...
+
+    @abstractmethod
+    async def invalidate(self, route: str) -> int:
+        """Drop every entry for `route`; returns how many were dropped."""
+
+
+class DiskCacheTier(SharedCacheTier):
+    """`<directory>/<route>/<key>.json`; blocking I/O via `to_thread`."""
+
+    backend = "disk"
+
+    def __init__(self, directory: str | Path) -> None:
+        self._root = Path(directory)
+
+    def _path(self, route: str, key: str) -> Path:
+        return self._root / route / f"{key}.json"
+
+    def _sync_get(self, route: str, key: str) -> dict[str, Any] | None:
+        path = self._path(route, key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        if entry["expireAt"] <= time.time():
+            path.unlink(missing_ok=True)
+            return None
+        value: dict[str, Any] = entry["value"]
+        return value
+
+    def _sync_set(
+        self, route: str, key: str, value: dict[str, Any], ttl_seconds: int,
+    ) -> None:
+        path = self._path(route, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"expireAt": time.time() + ttl_seconds, "value": value}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+
+    def _sync_invalidate(self, route: str) -> int:
+        dropped = 0
+        for path in (self._root / route).glob("*.json"):
+            path.unlink(missing_ok=True)
+            dropped += 1
+        return dropped
+
+    async def get(self, route: str, key: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._sync_get, route, key)
+
+    async def set(
+        self, route: str, key: str, value: dict[str, Any], ttl_seconds: int,
+    ) -> None:
+        await asyncio.to_thread(self._sync_set, route, key, value, ttl_seconds)
+
+    async def invalidate(self, route: str) -> int:
+        return await asyncio.to_thread(self._sync_invalidate, route)
+
+
+class FirestoreCacheTier(SharedCacheTier):
+    """Entries at `<collection>/<route>/cached_responses/<key>`.
+
+    Blocking SDK calls run via `asyncio.to_thread`, same as
+    `SessionStore`. Firestore's TTL sweep can lag by up to a day, so
+    `expireAt` is also checked on read.
+    """
+
+    backend = "firestore"
+
+    def __init__(self, client: Any | None = None, *, collection: str) -> None:
+        if client is None:
+            from google.cloud import firestore  # noqa: PLC0415
+
+            settings = get_settings()
+            client = firestore.Client(
+                project=settings.gcp_project, database=settings.firestore_database
+            )
+        self._client = client
+        self._collection = collection
+
+    def _entries(self, route: str) -> Any:
+        return (
+            self._client.collection(self._collection)
+            .document(route)
+            .collection("cached_responses")
+        )
+
+    def _sync_get(self, route: str, key: str) -> dict[str, Any] | None:
+        snap = self._entries(route).document(key).get()
+        if not snap.exists:
+            return None
+        doc = snap.to_dict() or {}
+        if doc["expireAt"] <= datetime.now(UTC):
+            return None
+        return json.loads(doc["value"])  # type: ignore[no-any-return]
+
+    def _sync_set(
+        self, route: str, key: str, value: dict[str, Any], ttl_seconds: int,
+    ) -> None:
+        now = datetime.now(UTC)
+        self._entries(route).document(key).set({
+            # Serialized: Firestore maps can't hold every JSON shape the
+            # responses use (e.g. nested arrays).
+            "value": json.dumps(value, ensure_ascii=False),
+            "createdAt": now,
+            "expireAt": datetime.fromtimestamp(now.timestamp() + ttl_seconds, UTC),
+        })
+
+    def _sync_invalidate(self, route: str) -> int:
+        dropped = 0
+        entries = self._entries(route)
+        for snap in entries.stream():
+            entries.document(snap.id).delete()
+            dropped += 1
+        return dropped
+
+    async def get(self, route: str, key: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._sync_get, route, key)
+
+    async def set(
+        self, route: str, key: str, value: dict[str, Any], ttl_seconds: int,
+    ) -> None:
+        await asyncio.to_thread(self._sync_set, route, key, value, ttl_seconds)
+
+    async def invalidate(self, route: str) -> int:
+        return await asyncio.to_thread(self._sync_invalidate, route)
+
+
+class ResponseCache:
+    """Two-tier response cache with single-flight coalescing."""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        max_entries: int = 256,
+        ttl_seconds: int = 86_400,
+        shared: SharedCacheTier | None = None,
+    ) -> None:
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self.stats = ResponseCacheStats()
+        self._memory: TTLCache[tuple[str, str], dict[str, Any]] = TTLCache(
+            maxsize=max_entries, ttl=ttl_seconds,
+        )
+        self._inflight: dict[str, asyncio.Future[dict[str, Any]]] = {}
+
+    @property
+    def backend(self) -> str:
+        return self.shared.backend if self.shared else "memory"
+
+    async def _lookup(self, route: str, key: str) -> dict[str, Any] | None:
+        value: dict[str, Any] | None = self._memory.get((route, key))
+        if value is not None:
+            self.stats.memory_hits += 1
+            return value
+        if self.shared is None:
+            return None
+        try:
+            value = await self.shared.get(route, key)
+        except Exception as exc:  # noqa: BLE001 — fail open, see module docstring
+            self.stats.errors += 1
+            log.warning(
+                "response_cache.shared_get_failed",
+                route=route,
+                error_type=type(exc).__name__,
+                error=str(exc)[:200],
+            )
+            return None
+        if value is not None:
+            self.stats.shared_hits += 1
+            self._memory[(route, key)] = value
+        return value
+
+    async def _store(self, route: str, key: str, value: dict[str, Any]) -> None:
+        self._memory[(route, key)] = value
+        self.stats.stores += 1
+        if self.shared is None:
+            return
+        try:
+            await self.shared.set(route, key, value, self.ttl_seconds)
+        except Exception as exc:  # noqa: BLE001 — fail open
+            self.stats.errors += 1
+            log.warning(
+                "response_cache.shared_set_failed",
+                route=route,
+                error_type=type(exc).__name__,
+                error=str(exc)[:200],
+            )
+
+    async def get_or_compute[M: BaseModel](
+        self,
+        key: str,
+        *,
+        route: str,
+        model: type[M],
+        compute: Callable[[], Awaitable[M]],
+        cacheable: Callable[[M], bool] | None = None,
+        fresh: bool = False,
+    ) -> tuple[M, CacheStatus]:
+        """Serve `key` from cache, or run `compute()` exactly once for
+        every concurrent caller and store the result.
+
+        Args:
+            key: `response_cache_key(...)` for the request.
+            route: Namespace for stats, logs and invalidation.
+            model: Response model the cached JSON is validated back into.
+            compute: The route's normal generation + guard.
+            cacheable: Predicate on a fresh result; False serves it
+                without storing it.
+            fresh: Skip the lookup (caller sent `no-cache`).
+        """
+        if not self.enabled:
+            return await compute(), "miss"
+
+        if not fresh:
+            hit = await self._lookup(route, key)
+            if hit is not None:
+                log.info("response_cache.hit", route=route, key=key[:12])
+                return model.model_validate(hit), "hit"
+
+        while (flight := self._inflight.get(key)) is not None:
+            self.stats.coalesced += 1
+            try:
+                value = await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if flight.cancelled() and not (current and current.cancelling()):
+                    # The leader's client went away; take over.
+                    continue
+                raise
+            log.info("response_cache.coalesced", route=route, key=key[:12])
+            return model.model_validate(value), "hit"
+
+        self.stats.misses += 1
+        flight = asyncio.get_running_loop().create_future()
+        # Followers may be zero; never leave an unretrieved exception.
+        flight.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = flight
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        value = result.model_dump(mode="json")
+        flight.set_result(value)
+        if cacheable is None or cacheable(result):
+            await self._store(route, key, value)
+        else:
+            log.info("response_cache.not_cacheable", route=route, key=key[:12])
+        return result, "miss"
+
+    async def invalidate(self, route: str | None = None) -> int:
+        """Drop entries for `route` (all routes when None) in both tiers.
+
+        The shared tier is namespaced per route, so a full flush there
+        needs each route named explicitly.
+        """
+        if route is None:
+            dropped = len(self._memory)
+            self._memory.clear()
+        else:
+            doomed = [k for k in self._memory if k[0] == route]
+            for k in doomed:
+                del self._memory[k]
+            dropped = len(doomed)
+            if self.shared is not None:
+                dropped += await self.shared.invalidate(route)
+        log.info("response_cache.invalidated", route=route, dropped=dropped)
+        return dropped
+
+
+def build_response_cache(settings: Settings) -> ResponseCache:
+    """Construct the cache selected by `SAHAYAKAI_RESPONSE_CACHE_*`."""
+    shared: SharedCacheTier | None = None
+    if settings.response_cache_backend == "disk":
+        shared = DiskCacheTier(settings.response_cache_dir)
+    elif settings.response_cache_backend == "firestore":
+        shared = FirestoreCacheTier(collection=settings.response_cache_collection)
+    return ResponseCache(
+        enabled=settings.response_cache_enabled,
+        max_entries=settings.response_cache_max_entries,
+        ttl_seconds=settings.response_cache_ttl_seconds,
+        shared=shared,
+    )
+
+
+# Process-scoped cache, built lazily so tests (and dev) never touch
+# Firestore unless the backend is explicitly configured.
+_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        _cache = build_response_cache(get_settings())
+        log.info(
+            "response_cache.started",
+            backend=_cache.backend,
+            enabled=_cache.enabled,
+        )
+    return _cache
+
+
+def reset_response_cache(cache: ResponseCache | None = None) -> None:
+    """Swap (or drop, with no argument) the process cache. Tests only."""
+    global _cache
+    _cache = cache
+
+
+__all__ = [
+    "CacheStatus",
+    "DiskCacheTier",
+    "FirestoreCacheTier",
+    "ResponseCache",
+    "ResponseCacheStats",
+    "SharedCacheTier",
+    "build_response_cache",
+    "digest_bytes",
+    "get_response_cache",
+    "mark_cache",
+    "prompt_version",
+    "reset_response_cache",
+    "response_cache_key",
+    "wants_fresh",
+]
@@ -27,18 +27,33 @@ Async wrapper (Round-2 P0-4 fix):
   effective concurrency to ~5-10 even with `containerConcurrency=20`.
 - All public methods are `async def` and dispatch the blocking work through
   `asyncio.to_thread`. The sync call bodies remain as helpers for testing.
+
+Cached async mode (`SAHAYAKAI_SESSION_STORE_MODE=async`):
+- `CachedSessionStore` talks to Firestore through `firestore.AsyncClient`
+  (no thread hop) and keeps each live call's transcript in-process.
+- `load_transcript` is one point read of the meta doc; the cached turns
+  are reused while the meta doc's `(lastTurnNumber, updatedAt)` still
+  matches what the cache was built from, so another instance's write
+  forces a reload instead of serving a stale transcript.
+- The router writes the parent + agent pair of a turn together at the
+  end of the turn (`append_turn_pair`): one transaction, same OCC rules
+  as two `append_turn` calls.
+- Per telephony turn that is 1 read + 1 transaction, down from a full
+  `turns` scan + 2 transactions (2 reads each).
 """
 from __future__ import annotations
 
 import asyncio
 from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from typing import Any, Protocol
 
 import structlog
+from cachetools import LRUCache  # type: ignore[import-untyped]
 from google.cloud import firestore  # type: ignore[import-untyped]
 
-from .config import get_settings
+from .config import Settings, get_settings
 from .shared.errors import SessionConflictError
 
 log = structlog.get_logger(__name__)
@@ -53,6 +68,105 @@ class TurnRecord:
     created_at: datetime
 
 
+def _last_turn(meta_snap: Any) -> int:
+    """`lastTurnNumber` from a meta-doc snapshot (0 for a new call)."""
+    if not meta_snap.exists:
+        return 0
+    return int((meta_snap.to_dict() or {}).get("lastTurnNumber") or 0)
+
+
+def _meta_version(meta_snap: Any) -> tuple[int, Any]:
+    """What a cached transcript is validated against.
+
+    `lastTurnNumber` alone misses an agent write from a thread-mode
+    instance (agent writes don't bump it); `updatedAt` changes on every
+    turn write in both modes.
+    """
+    if not meta_snap.exists:
+        return (0, None)
+    return (_last_turn(meta_snap), (meta_snap.to_dict() or {}).get("updatedAt"))
+
+
+def _check_turn_order(turn: TurnRecord, last: int) -> None:
+    """Role-aware OCC against the meta doc's `lastTurnNumber`.
+
+    Only the *parent* role advances the turn counter. The agent role
+    rides the same turn number as the parent it replies to, so for
+    `agent` we require strict equality with the in-flight turn (parent
+    already bumped `lastTurnNumber`). This rejects out-of-order Twilio
+    retries without rejecting the legitimate parent\u2192agent pair.
+    """
+    if turn.role == "parent":
+        if turn.turn_number <= last:
+            raise SessionConflictError(
+                f"Parent turn {turn.turn_number} is <= lastTurnNumber={last} "
+                f"on call {turn.call_sid} (out-of-order or replay)"
+            )
+    elif turn.role == "agent":
+        if turn.turn_number != last:
+            raise SessionConflictError(
+                f"Agent turn {turn.turn_number} does not match "
+                f"lastTurnNumber={last} on call {turn.call_sid} "
+                "(parent must be persisted first)"
+            )
+    else:
+        raise SessionConflictError(
+            f"Unknown role {turn.role!r} on call {turn.call_sid}"
+        )
+
+
+def _turn_from_snap(call_sid: str, snap: Any) -> TurnRecord | None:
+    """Turn doc snapshot \u2192 `TurnRecord`, or None for a malformed id.
+
+    Doc id is `{turn_number:04d}_{role}`; tolerate the legacy bare-number
+    format for any documents written before the composite-key migration.
+    """
+    data = snap.to_dict() or {}
+    head = snap.id.split("_", 1)[0]
+    try:
+        turn_number = int(head)
+    except ValueError:
+        log.warning("session_store.malformed_turn_id", call_sid=call_sid, id=snap.id)
+        return None
+    return TurnRecord(
+        call_sid=call_sid,
+        turn_number=turn_number,
+        role=str(data.get("role") or ""),
+        text=str(data.get("text") or ""),
+        created_at=data.get("createdAt") or datetime.now(UTC),
+    )
+
+
+def _spoken_order(turns: list[TurnRecord]) -> list[TurnRecord]:
+    """Order turns as spoken: by turn number, the parent before the agent.
+
+    Doc-id order (`__name__`) puts `0001_agent` before `0001_parent`, so
+    both store modes re-sort with this one rule.
+    """
+    return sorted(turns, key=lambda t: (t.turn_number, t.role != "parent"))
+
+
+def _turn_fields(turn: TurnRecord) -> dict[str, Any]:
+    return {"role": turn.role, "text": turn.text, "createdAt": turn.created_at}
+
+
+class TranscriptStore(Protocol):
+    """What the parent-call router needs from a session store. Both
+    `SessionStore` and `CachedSessionStore` implement it."""
+
+    async def append_turn(self, turn: TurnRecord) -> None: ...
+
+    async def append_turn_pair(self, parent: TurnRecord, agent: TurnRecord) -> None: ...
+
+    async def load_transcript(self, call_sid: str) -> list[TurnRecord]: ...
+
+    async def mark_ended(
+        self, call_sid: str, duration_seconds: float | None = None
+    ) -> None: ...
+
+    async def clear_for_test(self, call_sid: str) -> None: ...
+
+
 class SessionStore:
     """Async wrapper around the Firestore sync client.
 
@@ -102,43 +216,9 @@ class SessionStore:
                     f"Turn {turn.turn_number} ({turn.role}) on call "
                     f"{turn.call_sid} already written"
                 )
-            # OCC on metadata: only the *parent* role advances the turn
-            # counter. The agent role rides the same turn number as the
-            # parent it replies to, so for `agent` we require strict
-            # equality with the in-flight turn (parent already bumped
-            # `lastTurnNumber`). This rejects out-of-order Twilio retries
-            # without rejecting the legitimate parent\u2192agent pair.
             meta_snap = meta_ref.get(transaction=txn)
-            last = (
-                int((meta_snap.to_dict() or {}).get("lastTurnNumber") or 0)
-                if meta_snap.exists
-                else 0
-            )
-            if turn.role == "parent":
-                if turn.turn_number <= last:
-                    raise SessionConflictError(
-                        f"Parent turn {turn.turn_number} is <= lastTurnNumber={last} "
-                        f"on call {turn.call_sid} (out-of-order or replay)"
-                    )
-            elif turn.role == "agent":
-                if turn.turn_number != last:
-                    raise SessionConflictError(
-                        f"Agent turn {turn.turn_number} does not match "
-                        f"lastTurnNumber={last} on call {turn.call_sid} "
-                        "(parent must be persisted first)"
-                    )
-            else:
-                raise SessionConflictError(
-                    f"Unknown role {turn.role!r} on call {turn.call_sid}"
-                )
-            txn.set(
-                doc_ref,
-                {
-                    "role": turn.role,
-                    "text": turn.text,
-                    "createdAt": turn.created_at,
-                },
-            )
+            _check_turn_order(turn, _last_turn(meta_snap))
+            txn.set(doc_ref, _turn_fields(turn))
             # Bump the meta turn counter only on parent writes; agent
             # writes ride the same turn number.
             if turn.role == "parent":
@@ -166,40 +246,20 @@ class SessionStore:
         )
 
     def _sync_load_transcript(self, call_sid: str) -> list[TurnRecord]:
-        """Load all turns for a call, in `(turn_number, role)` lex order.
+        """Load all turns for a call, in spoken order (`_spoken_order`).
 
-        Doc IDs follow the `{turn_number:04d}_{role}` scheme. Lexicographic
-        ordering on Firestore's `__name__` puts `0001_agent` before
-        `0001_parent` (alphabetical on role), but the `role` is overwritten
-        by the actual turn data anyway. For load purposes the only thing
-        that matters is per-turn-number ordering across the conversation.
+        Doc IDs follow the `{turn_number:04d}_{role}` scheme, so the
+        `__name__` scan comes back grouped by turn number and is then
+        re-sorted to put each turn's parent line before the agent's.
         """
         turns_ref = self._call_doc(call_sid).collection("turns")
         snaps = turns_ref.order_by("__name__").stream()
         out: list[TurnRecord] = []
         for snap in snaps:
-            data = snap.to_dict() or {}
-            # Doc id is `{turn_number:04d}_{role}`; tolerate the legacy
-            # bare-number format for any documents written before the
-            # composite-key migration.
-            head = snap.id.split("_", 1)[0]
-            try:
-                turn_number = int(head)
-            except ValueError:
-                log.warning(
-                    "session_store.malformed_turn_id", call_sid=call_sid, id=snap.id
-                )
-                continue
-            out.append(
-                TurnRecord(
-                    call_sid=call_sid,
-                    turn_number=turn_number,
-                    role=str(data.get("role") or ""),
-                    text=str(data.get("text") or ""),
-                    created_at=data.get("createdAt") or datetime.now(UTC),
-                )
-            )
-        return out
+            record = _turn_from_snap(call_sid, snap)
+            if record is not None:
+                out.append(record)
+        return _spoken_order(out)
 
     def _sync_mark_ended(self, call_sid: str, duration_seconds: float | None = None) -> None:
         ttl_hours = get_settings().session_ttl_hours
@@ -223,6 +283,11 @@ class SessionStore:
     async def append_turn(self, turn: TurnRecord) -> None:
         await asyncio.to_thread(self._sync_append_turn, turn)
 
+    async def append_turn_pair(self, parent: TurnRecord, agent: TurnRecord) -> None:
+        """Persist a turn's parent utterance and agent reply, in that order."""
+        await self.append_turn(parent)
+        await self.append_turn(agent)
+
     async def load_transcript(self, call_sid: str) -> list[TurnRecord]:
         return await asyncio.to_thread(self._sync_load_transcript, call_sid)
 
@@ -235,6 +300,172 @@ class SessionStore:
         await asyncio.to_thread(self._sync_clear_for_test, call_sid)
 
 
+@dataclass
+class _CachedTranscript:
+    version: tuple[int, Any]
+    turns: list[TurnRecord] = field(default_factory=list)
+
+
+class CachedSessionStore:
+    """`SessionStore` on the Firestore async client, with a per-call
+    transcript cache and single-transaction turn-pair writes.
+
+    Same documents and OCC rules as the thread-mode store, so both modes
+    can serve the same calls during a rollout.
+    """
+
+    def __init__(
+        self,
+        client: firestore.AsyncClient | None = None,
+        *,
+        max_calls: int = 1_024,
+    ) -> None:
+        settings = get_settings()
+        self._client: firestore.AsyncClient = client or firestore.AsyncClient(
+            project=settings.gcp_project,
+            database=settings.firestore_database,
+        )
+        self._collection = settings.session_collection
+        # Live calls only: a call's entry is dropped when it ends, and the
+        # LRU bound covers calls that never send a final turn.
+        self._transcripts: LRUCache[str, _CachedTranscript] = LRUCache(maxsize=max_calls)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _call_doc(self, call_sid: str) -> firestore.AsyncDocumentReference:
+        return self._client.collection(self._collection).document(call_sid)
+
+    def _turn_doc(
+        self, call_sid: str, turn_number: int, role: str
+    ) -> firestore.AsyncDocumentReference:
+        """Same `{turn_number:04d}_{role}` doc ids as `SessionStore._turn_doc`."""
+        doc_id = f"{turn_number:04d}_{role}"
+        return self._call_doc(call_sid).collection("turns").document(doc_id)
+
+    async def load_transcript(self, call_sid: str) -> list[TurnRecord]:
+        meta_snap = await self._call_doc(call_sid).get()
+        version = _meta_version(meta_snap)
+        cached = self._transcripts.get(call_sid)
+        if cached is not None and cached.version == version:
+            self.cache_hits += 1
+            return list(cached.turns)
+
+        self.cache_misses += 1
+        turns_ref = self._call_doc(call_sid).collection("turns")
+        turns: list[TurnRecord] = []
+        async for snap in turns_ref.order_by("__name__").stream():
+            record = _turn_from_snap(call_sid, snap)
+            if record is not None:
+                turns.append(record)
+        # Spoken order, as in SessionStore and as appended pairs are cached.
+        turns = _spoken_order(turns)
+        # Tagged with the version read *before* the scan: a write landing
+        # in between only makes the next load miss, never serve stale.
+        self._transcripts[call_sid] = _CachedTranscript(version=version, turns=turns)
+        log.debug(
+            "session_store.transcript_loaded", call_sid=call_sid, turns=len(turns)
+        )
+        return list(turns)
+
+    async def _apply_turns(
+        self, txn: Any, turns: list[TurnRecord]
+    ) -> tuple[tuple[int, Any], tuple[int, Any]]:
+        """Transaction body: OCC-check and write `turns` (in order) plus
+        the meta doc. Returns the meta version before and after."""
+        call_sid = turns[0].call_sid
+        meta_ref = self._call_doc(call_sid)
+        meta_snap = await meta_ref.get(transaction=txn)
+        before = _meta_version(meta_snap)
+        last = before[0]
+        for turn in turns:
+            _check_turn_order(turn, last)
+            if turn.role == "parent":
+                last = turn.turn_number
+            # `create` fails the commit if the doc exists, same guarantee
+            # as the existence read in the thread-mode transaction.
+            txn.create(self._turn_doc(call_sid, turn.turn_number, turn.role), _turn_fields(turn))
+        updated_at = turns[-1].created_at
+        if last != before[0]:
+            txn.set(meta_ref, {"lastTurnNumber": last, "updatedAt": updated_at}, merge=True)
+        else:
+            txn.set(meta_ref, {"updatedAt": updated_at}, merge=True)
+        return before, (last, updated_at)
+
+    async def _run_turns_txn(
+        self, turns: list[TurnRecord]
+    ) -> tuple[tuple[int, Any], tuple[int, Any]]:
+        @firestore.async_transactional
+        async def _txn(txn: firestore.AsyncTransaction) -> tuple[tuple[int, Any], tuple[int, Any]]:
+            return await self._apply_turns(txn, turns)
+
+        return await _txn(self._client.transaction())
+
+    async def _write_turns(self, turns: list[TurnRecord]) -> None:
+        from google.api_core.exceptions import AlreadyExists  # noqa: PLC0415
+
+        call_sid = turns[0].call_sid
+        try:
+            before, after = await self._run_turns_txn(turns)
+        except AlreadyExists as exc:
+            self._transcripts.pop(call_sid, None)
+            raise SessionConflictError(
+                f"Turn {turns[0].turn_number} on call {call_sid} already written"
+            ) from exc
+        except SessionConflictError:
+            self._transcripts.pop(call_sid, None)
+            raise
+
+        cached = self._transcripts.get(call_sid)
+        if cached is not None:
+            if cached.version == before:
+                cached.turns.extend(turns)
+                cached.version = after
+            else:
+                # Someone else wrote since we cached — reload next turn
+                del self._transcripts[call_sid]
+        log.debug(
+            "session_store.turns_appended",
+            call_sid=call_sid,
+            turn_number=turns[-1].turn_number,
+            roles=[t.role for t in turns],
+        )
+
+    async def append_turn(self, turn: TurnRecord) -> None:
+        await self._write_turns([turn])
+
+    async def append_turn_pair(self, parent: TurnRecord, agent: TurnRecord) -> None:
+        """Both halves of a turn in one transaction: 1 read + 1 commit."""
+        await self._write_turns([parent, agent])
+
+    async def mark_ended(
+        self, call_sid: str, duration_seconds: float | None = None
+    ) -> None:
+        self._transcripts.pop(call_sid, None)
+        ttl_hours = get_settings().session_ttl_hours
+        expire_at = datetime.now(UTC) + timedelta(hours=ttl_hours)
+        await self._call_doc(call_sid).set(
+            {
+                "endedAt": datetime.now(UTC),
+                "expireAt": expire_at,
+                "durationSeconds": duration_seconds,
+            },
+            merge=True,
+        )
+
+    async def clear_for_test(self, call_sid: str) -> None:
+        self._transcripts.pop(call_sid, None)
+        async for snap in self._call_doc(call_sid).collection("turns").stream():
+            await snap.reference.delete()
+        await self._call_doc(call_sid).delete()
+
+
+def build_session_store(settings: Settings) -> TranscriptStore:
+    """Construct the store selected by `SAHAYAKAI_SESSION_STORE_MODE`."""
+    if settings.session_store_mode == "async":
+        return CachedSessionStore(max_calls=settings.session_cache_max_calls)
+    return SessionStore()
+
+
 def transcript_to_wire(turns: Iterable[TurnRecord]) -> list[dict[str, str]]:
     """Convert stored turns to the dict shape that the ADK agent consumes."""
     return [{"role": t.role, "text": t.text} for t in turns]
@@ -0,0 +1,258 @@
+"""Shared image pre-processing for multimodal Gemini calls.
+
+Teacher uploads are phone photos: 4-12 MB JPEGs at 3000-4000 px, often
+stored sideways with an EXIF orientation flag. Gemini downsamples
+anything that large before the model sees it, so the surplus only costs
+upload time, request memory and (via extra 768 px tiles) input tokens.
+`prepare_image` runs each upload through one pass:
+
+1. Decode once. JPEGs use libjpeg draft mode, which decodes straight
+   at 1/2, 1/4 or 1/8 scale, so a 12 MP photo is never fully expanded.
+2. Auto-orient from EXIF, so the model reads text the right way up.
+3. Downscale to `SAHAYAKAI_IMAGE_MAX_SIDE_PX` on the long side (1536 by
+   default: two Gemini tiles, still ~130 dpi across an A4 page, enough
+   for handwriting OCR).
+4. Re-encode as JPEG (`SAHAYAKAI_IMAGE_JPEG_QUALITY`).
+5. With `fingerprint=True`, fingerprint the page (a difference hash
+   plus an ink mask), so callers can spot the same page uploaded twice
+   (`is_duplicate`), even as a resized or recompressed copy. Only
+   multi-page callers need this; single-image routes skip the cost.
+
+Small images that need none of the above (already within the size
+limit, upright, and under `_REENCODE_MIN_BYTES`) pass through
+byte-for-byte. So do images Pillow cannot decode; the model or the
+router's own validation deals with those as before.
+
+Callers prepare once, before `run_resiliently`, so every attempt sends
+the same compact payload. Decoding is CPU-bound; async callers use
+`prepare_image_async`, which runs it in a worker thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+from dataclasses import dataclass
+
+import structlog
+from PIL import Image, ImageFilter, ImageOps
+
+from ..config import get_settings
+
+log = structlog.get_logger(__name__)
+
+# Below this size an upright, small-enough upload is sent untouched:
+# re-encoding would save little and can grow tiny PNGs.
+_REENCODE_MIN_BYTES = 256 * 1024
+
+# Duplicate matching. A false match drops a page from grading, so both
+# tests must pass:
+#
+# - Difference hash on a 17x16 grayscale thumbnail -> 256 bits. A
+#   resized, recompressed or re-exposed copy of the same photo lands
+#   within ~10 bits, but the hash mostly sees the paper: two ruled pages
+#   with a few different words can sit as close as 3 bits apart, so it
+#   only rules pairs out.
+# - Ink mask: pixels darker than `_INK_LEVEL` of the paper brightness on
+#   a 128x128 thumbnail (strokes are thickened first so thin pen lines
+#   survive the downscale). Nearly every ink pixel of each page must lie
+#   within one thumbnail pixel of ink on the other. A page with almost
+#   no ink can't be told apart from another, so it is never matched.
+#
+# A genuinely re-framed shot (a few percent crop) fails the ink test and
+# is NOT matched.
+_HASH_COLS, _HASH_ROWS = 17, 16
+DUPLICATE_MAX_DISTANCE = 12
+_INK_SIDE = 128
+_INK_LEVEL = 0.6
+# Paper brightness: the 90th percentile of the thumbnail.
+_PAPER_RANK = 0.9
+# Fewer ink pixels than this on either page: never a duplicate.
+_INK_MIN_PIXELS = 8
+# At most 1 in 100 ink pixels may fall outside the other page's halo.
+_INK_MAX_MISMATCH = 0.01
+
+_EXIF_ORIENTATION = 0x0112
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """An upload ready for the model."""
+
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    source_bytes: int
+    # Difference hash; None when not fingerprinted or undecodable.
+    phash: int | None
+    # Ink mask and the same mask grown by one pixel, as bitmaps over
+    # the `_INK_SIDE` square thumbnail; 0 when phash is None.
+    ink: int = 0
+    ink_halo: int = 0
+
+
+def _difference_hash(img: Image.Image) -> int:
+    small = img.convert("L").resize((_HASH_COLS, _HASH_ROWS), Image.Resampling.BILINEAR)
+    px = small.tobytes()
+    bits = 0
+    for row in range(_HASH_ROWS):
+        base = row * _HASH_COLS
+        for col in range(_HASH_COLS - 1):
+            bits = (bits << 1) | (px[base + col] > px[base + col + 1])
+    return bits
+
+
+def _ink_masks(img: Image.Image) -> tuple[int, int]:
+    side = _INK_SIDE
+    gray = (
+        img.convert("L")
+        .resize((4 * side, 4 * side), Image.Resampling.BOX)
+        .filter(ImageFilter.MinFilter(5))
+        .resize((side, side), Image.Resampling.BOX)
+    )
+    histogram = gray.histogram()
+    paper, seen = 255, 0
+    for level, count in enumerate(histogram):
+        seen += count
+        if seen >= _PAPER_RANK * side * side:
+            paper = level
+            break
+    cut = paper * _INK_LEVEL
+    ink = gray.point([255 if level < cut else 0 for level in range(256)])
+    halo = ink.filter(ImageFilter.MaxFilter(3))
+    return _bitmap(ink), _bitmap(halo)
+
+
+def _bitmap(mask: Image.Image) -> int:
+    return int.from_bytes(mask.convert("1", dither=Image.Dither.NONE).tobytes(), "big")
+
+
+def _fingerprint(img: Image.Image) -> tuple[int, int, int]:
+    """(difference hash, ink mask, ink halo) for `is_duplicate`."""
+    return (_difference_hash(img), *_ink_masks(img))
+
+
+def is_duplicate(a: PreparedImage, b: PreparedImage) -> bool:
+    """True when both images are copies of the same photo."""
+    if a.phash is None or b.phash is None:
+        return False
+    if (a.phash ^ b.phash).bit_count() > DUPLICATE_MAX_DISTANCE:
+        return False
+    inked = (a.ink.bit_count(), b.ink.bit_count())
+    if min(inked) < _INK_MIN_PIXELS:
+        return False
+    stray = (a.ink & ~b.ink_halo).bit_count() + (b.ink & ~a.ink_halo).bit_count()
+    return stray <= _INK_MAX_MISMATCH * sum(inked)
+
+
+def _target_size(size: tuple[int, int], max_side: int) -> tuple[int, int]:
+    w, h = size
+    scale = max_side / max(w, h)
+    if scale >= 1:
+        return w, h
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def prepare_image(
+    data: bytes,
+    mime_type: str,
+    *,
+    max_side: int | None = None,
+    quality: int | None = None,
+    fingerprint: bool = False,
+) -> PreparedImage:
+    """Decode, orient, downscale and re-encode one upload; with
+    `fingerprint`, also hash it for `is_duplicate`."""
+    settings = get_settings()
+    max_side = max_side or settings.image_max_side_px
+    quality = quality or settings.image_jpeg_quality
+    started = time.perf_counter()
+
+    try:
+        img = Image.open(io.BytesIO(data))
+        orientation = img.getexif().get(_EXIF_ORIENTATION, 1)
+        source_size = img.size
+        target = _target_size(source_size, max_side)
+        passthrough = (
+            target == source_size
+            and orientation == 1
+            and len(data) <= _REENCODE_MIN_BYTES
+        )
+        if img.format == "JPEG" and not passthrough:
+            # Decode at the smallest 1/2^n scale that still covers the
+            # target. Both sizes are in stored (pre-rotation) pixels.
+            img.draft("RGB", target)
+        img.load()
+    except Exception as exc:  # noqa: BLE001 — undecodable: send as-is
+        log.warning(
+            "image_pipeline.decode_failed",
+            mime_type=mime_type,
+            source_bytes=len(data),
+            error=str(exc)[:200],
+        )
+        return PreparedImage(
+            data=data, mime_type=mime_type, width=0, height=0,
+            source_bytes=len(data), phash=None,
+        )
+
+    if passthrough:
+        phash, ink, ink_halo = _fingerprint(img) if fingerprint else (None, 0, 0)
+        return PreparedImage(
+            data=data, mime_type=mime_type, width=source_size[0],
+            height=source_size[1], source_bytes=len(data),
+            phash=phash, ink=ink, ink_halo=ink_halo,
+        )
+
+    page: Image.Image = ImageOps.exif_transpose(img)
+    if page.mode not in ("RGB", "L"):
+        if "A" in page.getbands():
+            # Flatten transparency onto white, as the page would print
+            flat = Image.new("RGB", page.size, (255, 255, 255))
+            flat.paste(page, mask=page.getchannel("A"))
+            page = flat
+        else:
+            page = page.convert("RGB")
+    page.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+    out = io.BytesIO()
+    page.save(out, format="JPEG", quality=quality)
+    encoded = out.getvalue()
+    phash, ink, ink_halo = _fingerprint(page) if fingerprint else (None, 0, 0)
+    if len(encoded) >= len(data) and page.size == source_size and orientation == 1:
+        # Re-encoding didn't help; keep the original bytes
+        encoded, out_mime = data, mime_type
+    else:
+        out_mime = "image/jpeg"
+
+    log.debug(
+        "image_pipeline.prepared",
+        source_bytes=len(data),
+        bytes=len(encoded),
+        source_size=f"{source_size[0]}x{source_size[1]}",
+        size=f"{page.size[0]}x{page.size[1]}",
+        latency_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    return PreparedImage(
+        data=encoded, mime_type=out_mime, width=page.size[0],
+        height=page.size[1], source_bytes=len(data), phash=phash,
+        ink=ink, ink_halo=ink_halo,
+    )
+
+
+async def prepare_image_async(
+    data: bytes, mime_type: str, *, fingerprint: bool = False
+) -> PreparedImage:
+    """`prepare_image` in a worker thread, off the event loop."""
+    return await asyncio.to_thread(
+        prepare_image, data, mime_type, fingerprint=fingerprint
+    )
+
+
+__all__ = [
+    "DUPLICATE_MAX_DISTANCE",
+    "PreparedImage",
+    "is_duplicate",
+    "prepare_image",
+    "prepare_image_async",
+]
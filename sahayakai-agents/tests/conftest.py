@@ -28,6 +28,97 @@ def _reset_settings_cache() -> Iterator[None]:
     get_settings.cache_clear()
 
 
+@pytest.fixture(autouse=True)
+def _reset_prepared_runners() -> Iterator[None]:
+    """Drop cached ADK runners so per-test fakes never leak across cases."""
+    from sahayakai_agents._adk_prepared import clear_prepared_runners
+
+    clear_prepared_runners()
+    yield
+    clear_prepared_runners()
+
+
+@pytest.fixture(autouse=True)
+def _reset_id_token_cache() -> Iterator[None]:
+    """Tests reuse bearer strings like "fake-token" with different stubbed
+    claims; a verified-token cache hit would leak claims across cases."""
+    from sahayakai_agents.auth import _ID_TOKEN_CACHE
+
+    _ID_TOKEN_CACHE.clear()
+    yield
+    _ID_TOKEN_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_replay_guard() -> Iterator[None]:
+    """Each test builds its replay guard from its own settings."""
+    from sahayakai_agents.replay_guard import reset_replay_guard
+
+    reset_replay_guard()
+    yield
+    reset_replay_guard()
+
+
+@pytest.fixture(autouse=True)
+def _reset_response_cache() -> Iterator[None]:
+    """Identical requests in different tests must not hit each other's cache."""
+    from sahayakai_agents.response_cache import reset_response_cache
+
+    reset_response_cache()
+    yield
+    reset_response_cache()
+
+
+@pytest.fixture(autouse=True)
+def _reset_context_cache() -> Iterator[None]:
+    """Cache entries and usage counters are per test."""
+    from sahayakai_agents.context_cache import reset_context_cache
+
+    reset_context_cache()
+    yield
+    reset_context_cache()
+
+
+@pytest.fixture(autouse=True)
+def _reset_pass1_pool() -> Iterator[None]:
+    """Pass-1 limiter counters and the page client are per test."""
+    from sahayakai_agents.agents.assessment_scanner.pass1_pool import reset_pass1_pool
+
+    reset_pass1_pool()
+    yield
+    reset_pass1_pool()
+
+
+@pytest.fixture(autouse=True)
+def _reset_hedger() -> Iterator[None]:
+    """Hedge budget and per-span latency samples are per test."""
+    from sahayakai_agents.hedging import reset_hedger
+
+    reset_hedger()
+    yield
+    reset_hedger()
+
+
+@pytest.fixture(autouse=True)
+def _reset_key_pool() -> Iterator[None]:
+    """Key health (cooldowns, latency, quotas) is per test."""
+    from sahayakai_agents.key_pool import reset_key_pool
+
+    reset_key_pool()
+    yield
+    reset_key_pool()
+
+
+@pytest.fixture(autouse=True)
+def _reset_embedding_service() -> Iterator[None]:
+    """Each test gets a fresh RAG query-embedding cache."""
+    from sahayakai_agents.rag.embedding_service import reset_embedding_service
+
+    reset_embedding_service()
+    yield
+    reset_embedding_service()
+
+
 @pytest.fixture
 def test_api_key_pool() -> tuple[str, ...]:
     """Small key pool for resilience tests."""
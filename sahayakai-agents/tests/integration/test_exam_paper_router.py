@@ -29,6 +29,7 @@ from fastapi.testclient import TestClient
 
 from sahayakai_agents.agents.exam_paper import router as exam_paper_router_mod
 from sahayakai_agents.agents.exam_paper.schemas import ExamPaperCore
+from sahayakai_agents.config import get_settings
 from sahayakai_agents.main import app
 from sahayakai_agents.shared.errors import AgentError
 
@@ -59,6 +60,16 @@ class _QueueFake:
         return self.queue.pop(0)
 
 
+class _RateLimitedMidStream(Exception):
+    """Sentinel — stream half the good paper, then fail with a 429."""
+
+    status = 429
+
+    def __init__(self, text: str) -> None:
+        super().__init__("429 RESOURCE_EXHAUSTED")
+        self.text = text
+
+
 class _RaiseAgentError:
     """Sentinel — when the fake pops this, raise the configured AgentError."""
 
@@ -82,9 +93,16 @@ def fake_runner(monkeypatch: pytest.MonkeyPatch) -> _QueueFake:
     fake = _QueueFake()
 
     async def _fake_run_generator_via_runner(
-        *, prompt: str, api_key: str,
+        *, prompt: str, api_key: str, on_text: Any = None,
     ) -> ExamPaperCore:
         nxt = fake.pop()
+        if isinstance(nxt, _RateLimitedMidStream):
+            if on_text is not None:
+                on_text(nxt.text[: len(nxt.text) // 2])
+            raise nxt
+        if on_text is not None and isinstance(nxt, str):
+            for i in range(0, len(nxt), 11):
+                on_text(nxt[i : i + 11])
         if isinstance(nxt, _RaiseAgentError):
             raise AgentError(
                 code=nxt.code,
@@ -297,3 +315,69 @@ class TestExamPaperRouter:
         ]
         res = client.post("/v1/exam-paper/generate", json=_BASE_REQUEST)
         assert res.status_code == 502, res.text
+
+
+def _sse_events(body: str) -> list[tuple[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestExamPaperStream:
+    def test_questions_stream_before_validated(
+        self,
+        client: TestClient,
+        fake_runner: _QueueFake,
+    ) -> None:
+        good = _good_paper_json(max_marks=80)
+        fake_runner.queue = [good]
+        res = client.post("/v1/exam-paper/generate/stream", json=_BASE_REQUEST)
+        assert res.status_code == 200, res.text
+        events = _sse_events(res.text)
+        question_paths = [
+            tuple(data["path"])
+            for kind, data in events
+            if kind == "partial" and data["path"][-2:-1] == ["questions"]
+        ]
+        assert question_paths == [
+            ("sections", 0, "questions", 0),
+            ("sections", 0, "questions", 1),
+            ("sections", 1, "questions", 0),
+            ("sections", 1, "questions", 1),
+        ]
+        kind, validated = events[-1]
+        assert kind == "validated"
+        assert validated["sections"] == json.loads(good)["sections"]
+
+    def test_retry_sends_reset_then_replays(
+        self,
+        client: TestClient,
+        fake_runner: _QueueFake,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setenv("GOOGLE_GENAI_API_KEY", "key-a,key-b")
+        get_settings.cache_clear()
+        good = _good_paper_json(max_marks=80)
+        fake_runner.queue = [_RateLimitedMidStream(good), good]
+        res = client.post("/v1/exam-paper/generate/stream", json=_BASE_REQUEST)
+        kinds = [kind for kind, _ in _sse_events(res.text)]
+        assert "reset" in kinds
+        reset_at = kinds.index("reset")
+        assert "partial" in kinds[:reset_at]
+        assert "partial" in kinds[reset_at:]
+        assert kinds[-1] == "validated"
+
+    def test_marks_mismatch_is_an_error_frame(
+        self,
+        client: TestClient,
+        fake_runner: _QueueFake,
+    ) -> None:
+        bad = json.loads(_good_paper_json(max_marks=80))
+        bad["sections"][0]["questions"][0]["marks"] = 2
+        fake_runner.queue = [json.dumps(bad)]
+        res = client.post("/v1/exam-paper/generate/stream", json=_BASE_REQUEST)
+        kind, data = _sse_events(res.text)[-1]
+        assert kind == "error"
+        assert data["httpStatus"] == 502
@@ -37,6 +37,10 @@ Three scenarios:
 3. **Writer fails safety hard** — 1 writer + 1 evaluator. Response
    is 502 from the AgentError raised on hard-fail (per the
    "never amplify a failed plan" rule).
+
+Plus the deterministic pre-check (``pre_evaluator``): a structurally
+broken v1 goes to the reviser with no evaluator call
+(``modelCallsSaved=1``), and ``full`` mode passes a clean v1 locally.
 """
 from __future__ import annotations
 
@@ -174,11 +178,29 @@ def fake_genai(monkeypatch: pytest.MonkeyPatch) -> _QueueFake:
     ) -> _FakeResult:
         return _FakeResult(fake.pop())
 
+    async def _fake_stream_call(
+        *,
+        api_key: str,
+        model: str,
+        prompt: str,
+        response_schema: type,
+        on_text: Any,
+    ) -> _FakeResult:
+        text = fake.pop()
+        for i in range(0, len(text), 40):
+            on_text(text[i : i + 40])
+        return _FakeResult(text)
+
     monkeypatch.setattr(
         lesson_plan_agent_mod,
         "_call_gemini_structured",
         _fake_call,
     )
+    monkeypatch.setattr(
+        lesson_plan_agent_mod,
+        "_call_gemini_structured_stream",
+        _fake_stream_call,
+    )
     return fake
 
 
@@ -259,6 +281,17 @@ _GOOD_PLAN_JSON = json.dumps(
 )
 
 
+# No assessment and no Evaluate activity: two rubric axes fail the
+# deterministic pre-check.
+_BROKEN_PLAN_JSON = json.dumps(
+    {
+        **json.loads(_GOOD_PLAN_JSON),
+        "assessment": None,
+        "activities": json.loads(_GOOD_PLAN_JSON)["activities"][:4],
+    }
+)
+
+
 def _verdict_json(
     *,
     safety: bool,
@@ -320,6 +353,7 @@ class TestLessonPlanRouter:
         body = res.json()
         assert "Photosynthesis" in body["title"]
         assert body["revisionsRun"] == 0
+        assert body["modelCallsSaved"] == 0
         assert body["sidecarVersion"].startswith("phase-")
         assert body["rubric"]["safety"] is True
         # Queue should be drained.
@@ -397,6 +431,56 @@ class TestLessonPlanRouter:
         assert body["rubric"]["safety"] is True
         assert fake_genai.queue == []
 
+    def test_broken_v1_goes_straight_to_reviser(
+        self,
+        client: TestClient,
+        fake_genai: _QueueFake,
+    ) -> None:
+        """v1 has no assessment and no Evaluate phase: the pre-check
+        revises it locally, so there is no evaluator call on v1."""
+        fake_genai.queue = [
+            _BROKEN_PLAN_JSON,                # writer v1
+            _GOOD_PLAN_JSON,                  # reviser v2
+            _verdict_json(safety=True),       # evaluator v2
+        ]
+        res = client.post("/v1/lesson-plan/generate", json=_BASE_REQUEST)
+        assert res.status_code == 200, res.text
+        body = res.json()
+        assert body["revisionsRun"] == 1
+        assert body["modelCallsSaved"] == 1
+        assert body["assessment"] == json.loads(_GOOD_PLAN_JSON)["assessment"]
+        assert fake_genai.queue == []
+
+    def test_hard_fail_v2_after_local_revise_is_not_shipped(
+        self,
+        client: TestClient,
+        fake_genai: _QueueFake,
+    ) -> None:
+        """No model judged v1, so "never amplify" has nothing safe to
+        fall back to: a hard-failed v2 is a 502."""
+        fake_genai.queue = [
+            _BROKEN_PLAN_JSON,
+            _GOOD_PLAN_JSON,
+            _verdict_json(safety=False, fail_reasons=["Unsafe experiment"]),
+        ]
+        res = client.post("/v1/lesson-plan/generate", json=_BASE_REQUEST)
+        assert res.status_code == 502, res.text
+        assert fake_genai.queue == []
+
+    def test_full_pre_eval_passes_clean_v1_locally(
+        self,
+        client: TestClient,
+        fake_genai: _QueueFake,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setenv("SAHAYAKAI_LESSON_PLAN_PRE_EVAL", "full")
+        fake_genai.queue = [_GOOD_PLAN_JSON]  # writer only
+        res = client.post("/v1/lesson-plan/generate", json=_BASE_REQUEST)
+        assert res.status_code == 200, res.text
+        body = res.json()
+        assert (body["revisionsRun"], body["modelCallsSaved"]) == (0, 1)
+        assert body["rubric"]["rationale"].startswith("Deterministic pre-check")
+
     def test_writer_returns_malformed_json(
         self,
         client: TestClient,
@@ -406,3 +490,110 @@ class TestLessonPlanRouter:
         fake_genai.queue = ["not valid json"]
         res = client.post("/v1/lesson-plan/generate", json=_BASE_REQUEST)
         assert res.status_code == 502, res.text
+
+
+def _sse_events(body: str) -> list[tuple[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestLessonPlanStream:
+    def test_writer_v1_streams_then_validated(
+        self,
+        client: TestClient,
+        fake_genai: _QueueFake,
+    ) -> None:
+        fake_genai.queue = [_GOOD_PLAN_JSON, _verdict_json(safety=True)]
+        res = client.post("/v1/lesson-plan/generate/stream", json=_BASE_REQUEST)
+        assert res.status_code == 200, res.text
+        events = _sse_events(res.text)
+        plan = json.loads(_GOOD_PLAN_JSON)
+        activities = [
+            data["value"] for kind, data in events
+            if kind == "partial" and data["path"][0] == "activities"
+        ]
+        assert activities == plan["activities"]
+        kind, validated = events[-1]
+        assert kind == "validated"
+        assert validated["title"] == plan["title"]
+        assert validated["revisionsRun"] == 0
+        assert fake_genai.queue == []
+
+    def test_revised_plan_arrives_in_validated_frame(
+        self,
+        client: TestClient,
+        fake_genai: _QueueFake,
+    ) -> None:
+        v2 = json.loads(_GOOD_PLAN_JSON)
+        v2["title"] = "Revised Photosynthesis Lesson for Class Five Learners"
+        fake_genai.queue = [
+            _GOOD_PLAN_JSON,
+            _verdict_json(
+                safety=True, grade=0.7, objective=0.7, fail_reasons=["x", "y"],
+            ),
+            json.dumps(v2),
+            _verdict_json(safety=True),
+        ]
+        res = client.post("/v1/lesson-plan/generate/stream", json=_BASE_REQUEST)
+        events = _sse_events(res.text)
+        # Only the writer streams; the revision lands whole.
+        titles = [d["value"] for k, d in events if k == "partial" and d["path"] == ["title"]]
+        assert titles == [json.loads(_GOOD_PLAN_JSON)["title"]]
+        kind, validated = events[-1]
+        assert kind == "validated"
+        assert validated["title"] == v2["title"]
+        assert validated["revisionsRun"] == 1
+
+    def test_hard_fail_ends_with_error_frame(
+        self,
+        client: TestClient,
+        fake_genai: _QueueFake,
+    ) -> None:
+        fake_genai.queue = [_GOOD_PLAN_JSON, _verdict_json(safety=False)]
+        res = client.post("/v1/lesson-plan/generate/stream", json=_BASE_REQUEST)
+        kind, data = _sse_events(res.text)[-1]
+        assert kind == "error"
+        assert data["httpStatus"] == 502
+
+
+class TestLessonPlanResponseCache:
+    def test_identical_request_skips_the_loop(
+        self,
+        client: TestClient,
+        fake_genai: _QueueFake,
+    ) -> None:
+        fake_genai.queue = [_GOOD_PLAN_JSON, _verdict_json(safety=True)]
+        first = client.post("/v1/lesson-plan/generate", json=_BASE_REQUEST)
+        # userId is not part of the key; the queue is empty, so any
+        # model call would fail the test.
+        second = client.post(
+            "/v1/lesson-plan/generate",
+            json={**_BASE_REQUEST, "userId": "teacher-uid-2"},
+        )
+        assert first.headers["X-Cache"] == "miss"
+        assert second.status_code == 200, second.text
+        assert second.headers["X-Cache"] == "hit"
+        assert second.json()["title"] == first.json()["title"]
+        assert first.json()["cacheHit"] is False
+        hit = second.json()
+        # No model call ran for the hit, so its telemetry says so.
+        assert hit["cacheHit"] is True
+        assert (hit["revisionsRun"], hit["modelCallsSaved"]) == (0, 0)
+        assert hit["cacheHitRatio"] is None
+
+    def test_different_topic_misses(
+        self,
+        client: TestClient,
+        fake_genai: _QueueFake,
+    ) -> None:
+        fake_genai.queue = [_GOOD_PLAN_JSON, _verdict_json(safety=True)] * 2
+        client.post("/v1/lesson-plan/generate", json=_BASE_REQUEST)
+        res = client.post(
+            "/v1/lesson-plan/generate",
+            json={**_BASE_REQUEST, "topic": "Photosynthesis in desert plants"},
+        )
+        assert res.headers["X-Cache"] == "miss"
+        assert fake_genai.queue == []
@@ -20,7 +20,7 @@ from fastapi.testclient import TestClient
 from sahayakai_agents.agents.parent_call import router as router_module
 from sahayakai_agents.main import app
 
-from ..unit.fake_firestore import make_fake_session_store
+from ..unit.fake_firestore import make_fake_cached_session_store, make_fake_session_store
 
 pytestmark = pytest.mark.integration
 
@@ -267,3 +267,58 @@ class TestOCCConflict:
         # Twilio-style retry: same callSid + turnNumber.
         res2 = client.post("/v1/parent-call/reply", json=_base_request())
         assert res2.status_code == 409, res2.text
+
+
+class TestCachedSessionStore:
+    def test_turns_persist_as_pairs_and_reuse_cached_transcript(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _patch_gemini(
+            monkeypatch,
+            {
+                "reply": "Thank you for letting us know.",
+                "shouldEndCall": False,
+                "followUpQuestion": None,
+            },
+        )
+        store = make_fake_cached_session_store()
+        monkeypatch.setattr(router_module, "_get_session_store", lambda: store)
+        fake = store._client  # type: ignore[attr-defined]
+
+        for turn in (1, 2, 3):
+            req = _base_request()
+            req["turnNumber"] = turn
+            res = client.post("/v1/parent-call/reply", json=req)
+            assert res.status_code == 200, res.text
+
+        # One scan on the first turn, then the meta doc validates the cache.
+        assert fake.scans == 1
+        assert fake.commits == 3
+        turns = [p[-1] for p in fake.docs if p[-2] == "turns"]
+        assert len(turns) == 6
+
+    def test_failed_turn_leaves_nothing_so_retry_succeeds(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        store = make_fake_cached_session_store()
+        monkeypatch.setattr(router_module, "_get_session_store", lambda: store)
+        _patch_gemini(
+            monkeypatch,
+            {
+                "reply": "Hello. I am an AI assistant from Arav's school. All is well.",
+                "shouldEndCall": False,
+                "followUpQuestion": None,
+            },
+        )
+        assert client.post("/v1/parent-call/reply", json=_base_request()).status_code == 502
+
+        _patch_gemini(
+            monkeypatch,
+            {
+                "reply": "Thank you for letting us know.",
+                "shouldEndCall": False,
+                "followUpQuestion": None,
+            },
+        )
+        res = client.post("/v1/parent-call/reply", json=_base_request())
+        assert res.status_code == 200, res.text
@@ -11,8 +11,9 @@ shim breaks that.
 New strategy — patch at ONE surgical point:
 
     `_run_quiz_via_runner` in `agents.quiz.router` is monkey-patched
-    to pop one entry off a shared queue PER DIFFICULTY (3 entries
-    per request) and return a `{difficulty: QuizGeneratorCore | None}`
+    to pop one entry off a shared queue PER DISPATCHED DIFFICULTY (3
+    entries on the first attempt, one per retried variant after that)
+    and return a `{difficulty: QuizGeneratorCore | _VariantFailure}`
     dict that the router consumes exactly as if ADK had written
     session state.
 
@@ -33,6 +34,9 @@ Test scenarios:
 3. **All 3 fail** — 502 (matches the Genkit `Promise.allSettled` 0-success path).
 4. **Invalid imageDataUri** — 400 from request-level validation
    (never reaches the Runner).
+5. **Per-variant retry** — a variant that failed with a retryable
+   status is re-dispatched alone, on another key; kept variants are
+   not regenerated.
 """
 from __future__ import annotations
 
@@ -65,6 +69,7 @@ class _QueueFake:
 
     def __init__(self) -> None:
         self.queue: list[str] = []
+        self.calls: list[tuple[str, tuple[QuizDifficulty, ...]]] = []
 
     def pop(self) -> str:
         if not self.queue:
@@ -74,6 +79,9 @@ class _QueueFake:
         return self.queue.pop(0)
 
 
+_RATE_LIMITED = "<429>"
+
+
 # ── Fixture: monkey-patch `_run_quiz_via_runner` ─────────────────────────
 
 
@@ -81,17 +89,19 @@ class _QueueFake:
 def fake_runner(monkeypatch: pytest.MonkeyPatch) -> _QueueFake:
     """Patch the ADK-Runner-based quiz dispatch.
 
-    The replacement consumes 3 queue entries (one per variant). Each
-    entry is either:
+    The replacement consumes one queue entry per dispatched variant.
+    Each entry is either:
       - A JSON string that parses as `QuizGeneratorCore` → the
         corresponding slot in the returned dict gets the parsed model.
-      - Anything else → the slot gets `None` (matching the wrapper's
-        `_VariantWrapper` exception-swallowing behaviour).
+      - `_RATE_LIMITED` → a retryable 429 failure for that slot.
+      - Anything else → a non-retryable failure (matching the
+        `_VariantWrapper` exception-swallowing behaviour on malformed
+        JSON).
 
-    Order: easy, medium, hard. Tests must queue in that order.
+    Order: easy, medium, hard, restricted to the dispatched
+    difficulties. Tests must queue in that order.
     """
     fake = _QueueFake()
-    difficulties: tuple[QuizDifficulty, ...] = ("easy", "medium", "hard")
 
     async def _fake_runner(
         *,
@@ -99,18 +109,27 @@ def fake_runner(monkeypatch: pytest.MonkeyPatch) -> _QueueFake:
         image_bytes: bytes | None,
         image_mime: str | None,
         base_context: dict[str, Any],
-    ) -> dict[QuizDifficulty, QuizGeneratorCore | None]:
-        results: dict[QuizDifficulty, QuizGeneratorCore | None] = {}
+        difficulties: tuple[QuizDifficulty, ...],
+    ) -> dict[QuizDifficulty, Any]:
+        fake.calls.append((api_key, difficulties))
+        results: dict[QuizDifficulty, Any] = {}
         for difficulty in difficulties:
             text = fake.pop()
+            if text == _RATE_LIMITED:
+                results[difficulty] = quiz_router_mod._VariantFailure(
+                    error_type="ClientError", status=429,
+                )
+                continue
             try:
                 results[difficulty] = QuizGeneratorCore.model_validate_json(
                     text,
                 )
             except Exception:
                 # Mirrors `_VariantWrapper`'s exception-swallowing path:
-                # a malformed JSON variant becomes a None slot.
-                results[difficulty] = None
+                # a malformed JSON variant becomes a failed slot.
+                results[difficulty] = quiz_router_mod._VariantFailure(
+                    error_type="ValidationError",
+                )
         return results
 
     monkeypatch.setattr(
@@ -234,3 +253,119 @@ class TestQuizRouter:
         bad = {**_BASE_REQUEST, "imageDataUri": "garbage" * 5}
         res = client.post("/v1/quiz/generate", json=bad)
         assert res.status_code == 400, res.text
+
+
+class TestQuizPerVariantRetry:
+    @pytest.fixture(autouse=True)
+    def two_keys(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        from sahayakai_agents.config import get_settings  # noqa: PLC0415
+
+        monkeypatch.setenv("GOOGLE_GENAI_API_KEY", "key-a,key-b")
+        get_settings.cache_clear()
+
+    def test_only_the_rate_limited_variant_is_redispatched(
+        self,
+        client: TestClient,
+        fake_runner: _QueueFake,
+    ) -> None:
+        fake_runner.queue = [
+            _good_variant_json("easy"),
+            _RATE_LIMITED,
+            _good_variant_json("hard"),
+            _good_variant_json("medium"),  # the retry
+        ]
+        res = client.post("/v1/quiz/generate", json=_BASE_REQUEST)
+        assert res.status_code == 200, res.text
+        assert res.json()["variantsGenerated"] == 3
+
+        (first_key, first), (retry_key, retry) = fake_runner.calls
+        assert first == ("easy", "medium", "hard")
+        assert retry == ("medium",)
+        assert retry_key != first_key
+
+    def test_non_retryable_failure_is_not_redispatched(
+        self,
+        client: TestClient,
+        fake_runner: _QueueFake,
+    ) -> None:
+        fake_runner.queue = [
+            _good_variant_json("easy"),
+            "not valid json",
+            _good_variant_json("hard"),
+        ]
+        res = client.post("/v1/quiz/generate", json=_BASE_REQUEST)
+        assert res.status_code == 200, res.text
+        assert res.json()["medium"] is None
+        assert len(fake_runner.calls) == 1
+
+    def test_exhausted_retries_keep_the_variants_already_generated(
+        self,
+        client: TestClient,
+        fake_runner: _QueueFake,
+    ) -> None:
+        # 1 full attempt + 2 retries of `hard` (run_resiliently makes
+        # at least 3 attempts), every retry rate-limited.
+        fake_runner.queue = [
+            _good_variant_json("easy"),
+            _good_variant_json("medium"),
+            _RATE_LIMITED,
+            _RATE_LIMITED,
+            _RATE_LIMITED,
+        ]
+        res = client.post("/v1/quiz/generate", json=_BASE_REQUEST)
+        assert res.status_code == 200, res.text
+        body = res.json()
+        assert body["variantsGenerated"] == 2
+        assert body["hard"] is None
+        assert [d for _, d in fake_runner.calls] == [
+            ("easy", "medium", "hard"), ("hard",), ("hard",),
+        ]
+
+    def test_all_rate_limited_surfaces_quota_error(
+        self,
+        client: TestClient,
+        fake_runner: _QueueFake,
+    ) -> None:
+        fake_runner.queue = [_RATE_LIMITED] * 9
+        res = client.post("/v1/quiz/generate", json=_BASE_REQUEST)
+        assert res.status_code == 503, res.text
+        assert all(d == ("easy", "medium", "hard") for _, d in fake_runner.calls)
+
+
+class TestQuizResponseCache:
+    def test_identical_request_is_served_from_cache(
+        self,
+        client: TestClient,
+        fake_runner: _QueueFake,
+    ) -> None:
+        fake_runner.queue = [
+            _good_variant_json(d) for d in ("easy", "medium", "hard")
+        ]
+        first = client.post("/v1/quiz/generate", json=_BASE_REQUEST)
+        second = client.post(
+            "/v1/quiz/generate",
+            json={**_BASE_REQUEST, "userId": "teacher-uid-2"},
+        )
+        assert first.headers["X-Cache"] == "miss"
+        assert second.headers["X-Cache"] == "hit", second.text
+        assert second.json()["variantsGenerated"] == 3
+        assert (first.json()["cacheHit"], second.json()["cacheHit"]) == (False, True)
+        assert len(fake_runner.calls) == 1
+
+    def test_partial_result_is_served_but_not_cached(
+        self,
+        client: TestClient,
+        fake_runner: _QueueFake,
+    ) -> None:
+        fake_runner.queue = [
+            _good_variant_json("easy"),
+            "not valid json",
+            _good_variant_json("hard"),
+            *(_good_variant_json(d) for d in ("easy", "medium", "hard")),
+        ]
+        assert client.post(
+            "/v1/quiz/generate", json=_BASE_REQUEST,
+        ).json()["variantsGenerated"] == 2
+        res = client.post("/v1/quiz/generate", json=_BASE_REQUEST)
+        assert res.headers["X-Cache"] == "miss"
+        assert res.json()["variantsGenerated"] == 3
@@ -55,13 +55,16 @@ def fake_pipeline(monkeypatch: pytest.MonkeyPatch) -> _QueueFake:
     fake = _QueueFake()
 
     async def _fake_run_pipeline_via_runner(
-        *, prompt: str, api_key: str,
+        *, prompt: str, api_key: str, on_text: Any = None,
     ) -> TeacherTrainingCore:
         fake.calls.append({
             "prompt_len": len(prompt),
             "api_key": api_key,
         })
         text = fake.pop()
+        if on_text is not None:
+            for i in range(0, len(text), 9):
+                on_text(text[i : i + 9])
         try:
             return TeacherTrainingCore.model_validate_json(text)
         except Exception as exc:
@@ -158,3 +161,45 @@ class TestTeacherTrainingRouter:
             "/v1/teacher-training/advise", json=_BASE_REQUEST,
         )
         assert res.status_code == 502, res.text
+
+
+def _sse_events(body: str) -> list[tuple[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestTeacherTrainingStream:
+    def test_advice_streams_then_validated(
+        self,
+        client: TestClient,
+        fake_pipeline: _QueueFake,
+    ) -> None:
+        fake_pipeline.queue = [_good_response_json()]
+        res = client.post("/v1/teacher-training/advise/stream", json=_BASE_REQUEST)
+        assert res.status_code == 200, res.text
+        paths = [
+            tuple(data["path"])
+            for kind, data in _sse_events(res.text)
+            if kind == "partial"
+        ]
+        assert paths == [
+            ("introduction",), ("advice", 0), ("advice", 1), ("conclusion",),
+        ]
+        assert _sse_events(res.text)[-1][0] == "validated"
+
+    def test_forbidden_phrase_in_fragment_aborts_before_it_is_sent(
+        self,
+        client: TestClient,
+        fake_pipeline: _QueueFake,
+    ) -> None:
+        bad = json.loads(_good_response_json())
+        bad["advice"][1]["explanation"] = "I am an AI assistant, trust me."
+        fake_pipeline.queue = [json.dumps(bad)]
+        res = client.post("/v1/teacher-training/advise/stream", json=_BASE_REQUEST)
+        events = _sse_events(res.text)
+        assert [kind for kind, _ in events] == ["partial", "partial", "error"]
+        assert "I am an AI" not in res.text.split("event: error")[0]
+        assert events[-1][1]["httpStatus"] == 502
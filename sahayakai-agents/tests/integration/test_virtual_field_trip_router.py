@@ -73,9 +73,12 @@ def fake_pipeline(monkeypatch: pytest.MonkeyPatch) -> _QueueFake:
     fake = _QueueFake()
 
     async def _fake_run_pipeline_via_runner(
-        *, prompt: str, api_key: str,
+        *, prompt: str, api_key: str, on_text: Any = None,
     ) -> VirtualFieldTripCore:
         nxt = fake.pop()
+        if on_text is not None and isinstance(nxt, str):
+            for i in range(0, len(nxt), 5):
+                on_text(nxt[i : i + 5])
         if isinstance(nxt, _RaiseAgentError):
             raise AgentError(
                 code=nxt.code,
@@ -178,3 +181,32 @@ class TestVirtualFieldTripRouter:
         fake_pipeline.queue = ["not valid json"]
         res = client.post("/v1/virtual-field-trip/plan", json=_BASE_REQUEST)
         assert res.status_code == 502, res.text
+
+
+def _sse_events(body: str) -> list[tuple[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestVirtualFieldTripStream:
+    def test_stops_stream_in_order_then_validated(
+        self,
+        client: TestClient,
+        fake_pipeline: _QueueFake,
+    ) -> None:
+        good = _good_response_json()
+        fake_pipeline.queue = [good]
+        res = client.post(
+            "/v1/virtual-field-trip/plan/stream", json=_BASE_REQUEST,
+        )
+        assert res.status_code == 200, res.text
+        events = _sse_events(res.text)
+        stops = [data["value"] for kind, data in events if kind == "partial"
+                 and data["path"][0] == "stops"]
+        assert stops == json.loads(good)["stops"]
+        kind, validated = events[-1]
+        assert kind == "validated"
+        assert validated["stops"] == stops
@@ -86,6 +86,7 @@ def fake_pipeline(monkeypatch: pytest.MonkeyPatch) -> _QueueFake:
         image_bytes: bytes,
         image_mime: str,
         api_key: str,
+        on_text: Any = None,
     ) -> WorksheetCore:
         # Record the call so tests can assert image bytes flowed
         # through. The router-side data URI decoder is what makes
@@ -96,6 +97,10 @@ def fake_pipeline(monkeypatch: pytest.MonkeyPatch) -> _QueueFake:
             "image_mime": image_mime,
         })
         nxt = fake.pop()
+        if on_text is not None and isinstance(nxt, str):
+            # Stream the canned JSON in small, arbitrary-boundary chunks.
+            for i in range(0, len(nxt), 7):
+                on_text(nxt[i : i + 7])
         if isinstance(nxt, _RaiseAgentError):
             raise AgentError(
                 code=nxt.code,
@@ -227,3 +232,113 @@ class TestWorksheetRouter:
         fake_pipeline.queue = ["not valid json"]
         res = client.post("/v1/worksheet/generate", json=_BASE_REQUEST)
         assert res.status_code == 502, res.text
+
+
+def _sse_events(body: str) -> list[tuple[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestWorksheetStream:
+    def test_streams_partials_then_validated(
+        self,
+        client: TestClient,
+        fake_pipeline: _QueueFake,
+    ) -> None:
+        fake_pipeline.queue = [_good_response_json()]
+        res = client.post("/v1/worksheet/generate/stream", json=_BASE_REQUEST)
+        assert res.status_code == 200, res.text
+        assert res.headers["content-type"].startswith("text/event-stream")
+        events = _sse_events(res.text)
+        kinds = [kind for kind, _ in events]
+        assert kinds[-1] == "validated"
+        partial_paths = [tuple(data["path"]) for kind, data in events if kind == "partial"]
+        assert partial_paths[0] == ("title",)
+        assert ("activities", 0) in partial_paths
+        assert ("activities", 1) in partial_paths
+        assert ("answerKey", 1) in partial_paths
+        validated = events[-1][1]
+        assert len(validated["activities"]) == 2
+        assert validated["sidecarVersion"].startswith("phase-")
+
+    def test_guard_failure_ends_with_error_frame(
+        self,
+        client: TestClient,
+        fake_pipeline: _QueueFake,
+    ) -> None:
+        bad = json.loads(_good_response_json())
+        bad["answerKey"][0]["activityIndex"] = 99
+        fake_pipeline.queue = [json.dumps(bad)]
+        res = client.post("/v1/worksheet/generate/stream", json=_BASE_REQUEST)
+        kind, data = _sse_events(res.text)[-1]
+        assert kind == "error"
+        assert data["httpStatus"] == 502
+        assert data["error"]["code"] == "INTERNAL"
+
+    def test_invalid_input_is_an_error_frame(
+        self,
+        client: TestClient,
+        fake_pipeline: _QueueFake,
+    ) -> None:
+        bad = {**_BASE_REQUEST, "imageDataUri": "garbage" * 5}
+        res = client.post("/v1/worksheet/generate/stream", json=bad)
+        [(kind, data)] = _sse_events(res.text)
+        assert kind == "error"
+        assert data["httpStatus"] == 400
+        assert data["error"]["code"] == "INVALID_INPUT"
+        assert fake_pipeline.calls == []
+
+
+class TestWorksheetResponseCache:
+    def test_identical_request_is_served_from_cache(
+        self,
+        client: TestClient,
+        fake_pipeline: _QueueFake,
+    ) -> None:
+        fake_pipeline.queue = [_good_response_json()]
+        first = client.post("/v1/worksheet/generate", json=_BASE_REQUEST)
+        # Another teacher, same page and prompt: no second pipeline run.
+        second = client.post(
+            "/v1/worksheet/generate",
+            json={**_BASE_REQUEST, "userId": "teacher-uid-2"},
+        )
+        assert first.headers["X-Cache"] == "miss"
+        assert second.headers["X-Cache"] == "hit", second.text
+        assert second.json()["title"] == first.json()["title"]
+        assert (first.json()["cacheHit"], second.json()["cacheHit"]) == (False, True)
+        assert len(fake_pipeline.calls) == 1
+
+    def test_different_image_or_no_cache_header_misses(
+        self,
+        client: TestClient,
+        fake_pipeline: _QueueFake,
+    ) -> None:
+        fake_pipeline.queue = [_good_response_json()] * 3
+        client.post("/v1/worksheet/generate", json=_BASE_REQUEST)
+        other_uri = "data:image/png;base64," + base64.b64encode(
+            _TINY_PNG_BYTES + b"\0",
+        ).decode("ascii")
+        other_image = {**_BASE_REQUEST, "imageDataUri": other_uri}
+        assert client.post(
+            "/v1/worksheet/generate", json=other_image,
+        ).headers["X-Cache"] == "miss"
+        assert client.post(
+            "/v1/worksheet/generate",
+            json=_BASE_REQUEST,
+            headers={"Cache-Control": "no-cache"},
+        ).headers["X-Cache"] == "miss"
+        assert len(fake_pipeline.calls) == 3
+
+    def test_failed_generation_is_not_cached(
+        self,
+        client: TestClient,
+        fake_pipeline: _QueueFake,
+    ) -> None:
+        fake_pipeline.queue = ["not valid json", _good_response_json()]
+        assert client.post("/v1/worksheet/generate", json=_BASE_REQUEST).status_code == 502
+        res = client.post("/v1/worksheet/generate", json=_BASE_REQUEST)
+        assert res.status_code == 200
+        assert res.headers["X-Cache"] == "miss"
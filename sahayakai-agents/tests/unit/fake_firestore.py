@@ -1,7 +1,8 @@
 """In-memory Firestore fake shared between unit and integration tests.
 
 Mirrors the subset of the google-cloud-firestore sync API that
-`SessionStore` uses: `collection().document().set()`, `.get()`,
+`SessionStore` and `FirestoreReplayGuard` use:
+`collection().document().set()`, `.create()`, `.get()`,
 `.collection()`, `.stream()`, `.order_by()`, plus a `Transaction`
 stand-in.
 
@@ -13,14 +14,19 @@ Also exports `make_fake_session_store()` which returns a real
 `_sync_append_turn` has been replaced with a version that walks the fake
 directly (because `firestore.transactional` is a real decorator that
 expects the real SDK).
+
+`make_fake_cached_session_store()` does the same for `CachedSessionStore`
+over `FakeAsyncStore`, the async-client flavour of the fake. There the
+transaction body (`_apply_turns`) is shared with production; only the
+`firestore.async_transactional` wrapper is bypassed.
 """
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from dataclasses import dataclass, field
 from typing import Any
 
-from sahayakai_agents.session_store import SessionStore, TurnRecord
+from sahayakai_agents.session_store import CachedSessionStore, SessionStore, TurnRecord
 from sahayakai_agents.shared.errors import SessionConflictError
 
 
@@ -62,6 +68,14 @@ class FakeDocRef:
         else:
             self.store.put(self.path, dict(data))
 
+    def create(self, data: dict[str, Any]) -> None:
+        """Insert-if-absent, like the real `create()` (AlreadyExists on clash)."""
+        from google.api_core.exceptions import AlreadyExists
+
+        if self.store.get(self.path) is not None:
+            raise AlreadyExists(f"Document already exists: {'/'.join(self.path)}")
+        self.store.put(self.path, dict(data))
+
     def delete(self) -> None:
         self.store.delete(self.path)
 
@@ -98,7 +112,10 @@ class FakeTxn:
     """
 
     def set(self, ref: FakeDocRef, data: dict[str, Any], merge: bool = False) -> None:
-        ref.set(data, merge=merge)
+        FakeDocRef.set(ref, data, merge=merge)
+
+    def create(self, ref: FakeDocRef, data: dict[str, Any]) -> None:
+        FakeDocRef.create(ref, data)
 
 
 @dataclass
@@ -123,6 +140,83 @@ class FakeStore:
         self.docs.pop(path, None)
 
 
+@dataclass
+class FakeAsyncDocRef(FakeDocRef):
+    """Stand-in for `firestore.AsyncDocumentReference`."""
+
+    async def get(self, transaction: FakeTxn | None = None) -> FakeSnap:  # type: ignore[override]
+        self.store.reads += 1  # type: ignore[attr-defined]
+        return FakeDocRef.get(self, transaction)
+
+    async def set(self, data: dict[str, Any], merge: bool = False) -> None:  # type: ignore[override]
+        FakeDocRef.set(self, data, merge=merge)
+
+    async def delete(self) -> None:  # type: ignore[override]
+        FakeDocRef.delete(self)
+
+    def collection(self, name: str) -> FakeAsyncCollection:  # type: ignore[override]
+        return FakeAsyncCollection(self.store, self.path + (name,))
+
+
+@dataclass
+class FakeAsyncSnap(FakeSnap):
+    reference: FakeAsyncDocRef | None = None
+
+
+@dataclass
+class FakeAsyncCollection(FakeCollection):
+    """Stand-in for `firestore.AsyncCollectionReference`."""
+
+    def document(self, doc_id: str) -> FakeAsyncDocRef:
+        return FakeAsyncDocRef(self.store, self.path + (doc_id,))
+
+    def order_by(self, _field: str) -> FakeAsyncCollection:
+        return self
+
+    async def stream(self) -> AsyncIterator[FakeAsyncSnap]:  # type: ignore[override]
+        self.store.scans += 1  # type: ignore[attr-defined]
+        for snap in list(FakeCollection.stream(self)):
+            yield FakeAsyncSnap(
+                _data=snap._data, id=snap.id, reference=self.document(snap.id)
+            )
+
+
+@dataclass
+class FakeAsyncStore(FakeStore):
+    """Stand-in for `firestore.AsyncClient`; counts reads, scans, commits."""
+
+    reads: int = 0
+    scans: int = 0
+    commits: int = 0
+
+    def collection(self, name: str) -> FakeAsyncCollection:
+        return FakeAsyncCollection(self, (name,))
+
+
+def make_fake_cached_session_store(max_calls: int = 16) -> CachedSessionStore:
+    """Build a `CachedSessionStore` backed by `FakeAsyncStore`.
+
+    Writes inside a fake transaction apply immediately, so the body
+    validates on a snapshot copy and restores it on failure — the
+    all-or-nothing commit the real transaction gives.
+    """
+    fake = FakeAsyncStore()
+    store = CachedSessionStore(client=fake, max_calls=max_calls)  # type: ignore[arg-type]
+
+    async def _run(turns: list[TurnRecord]) -> Any:
+        saved = {k: dict(v) for k, v in fake.docs.items()}
+        try:
+            result = await store._apply_turns(fake.transaction(), turns)
+        except Exception:
+            fake.docs = saved
+            raise
+        fake.commits += 1
+        return result
+
+    store._run_turns_txn = _run  # type: ignore[method-assign]
+    return store
+
+
 def make_fake_session_store() -> SessionStore:
     """Build a `SessionStore` backed by `FakeStore`.
 
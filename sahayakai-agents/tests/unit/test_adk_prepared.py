@@ -0,0 +1,189 @@
+"""Prepared ADK runner cache tests.
+
+Pins the contract the ADK routers rely on: the keyed agent graph +
+Runner are built once per `(template, api_key)`, each request runs in
+its own session, and that session is dropped as soon as the run ends —
+even when the run raises.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from sahayakai_agents import _adk_prepared
+from sahayakai_agents._adk_prepared import clear_prepared_runners, prepare_runner
+
+pytestmark = pytest.mark.unit
+
+
+class _Session:
+    def __init__(self, state: dict[str, Any] | None) -> None:
+        self.state = dict(state or {})
+
+
+class _FakeSessionService:
+    def __init__(self) -> None:
+        self.sessions: dict[str, _Session] = {}
+
+    async def create_session(
+        self, *, app_name: str, user_id: str, session_id: str, state: Any = None
+    ) -> None:
+        self.sessions[session_id] = _Session(state)
+
+    async def get_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> _Session | None:
+        return self.sessions.get(session_id)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        self.sessions.pop(session_id, None)
+
+
+class _FakeRunner:
+    built = 0
+
+    def __init__(self, *, agent: Any, app_name: str) -> None:
+        type(self).built += 1
+        self.agent = agent
+        self.app_name = app_name
+        self.session_service = _FakeSessionService()
+
+    async def run_async(self, *, user_id: str, session_id: str, new_message: Any):
+        session = self.session_service.sessions[session_id]
+        session.state["echo"] = new_message
+        yield "event"
+
+
+@pytest.fixture
+def fake_runner(monkeypatch: pytest.MonkeyPatch) -> type[_FakeRunner]:
+    import google.adk.runners as adk_runners  # noqa: PLC0415
+
+    _FakeRunner.built = 0
+    monkeypatch.setattr(adk_runners, "InMemoryRunner", _FakeRunner)
+    return _FakeRunner
+
+
+class TestPrepareRunner:
+    def test_same_template_and_key_is_built_once(
+        self, fake_runner: type[_FakeRunner]
+    ) -> None:
+        template = object()
+        pins: list[str] = []
+
+        def pin(key: str) -> str:
+            pins.append(key)
+            return f"agent-{key}"
+
+        first = prepare_runner(app_name="app", template=template, api_key="k1", pin=pin)
+        second = prepare_runner(app_name="app", template=template, api_key="k1", pin=pin)
+
+        assert first is second
+        assert pins == ["k1"]
+        assert fake_runner.built == 1
+        assert first.runner.agent == "agent-k1"
+
+    def test_each_key_gets_its_own_runner(self, fake_runner: type[_FakeRunner]) -> None:
+        template = object()
+        a = prepare_runner(app_name="app", template=template, api_key="k1", pin=str)
+        b = prepare_runner(app_name="app", template=template, api_key="k2", pin=str)
+        assert a is not b
+        assert fake_runner.built == 2
+
+    def test_rebuilt_template_gets_a_fresh_runner(
+        self, fake_runner: type[_FakeRunner]
+    ) -> None:
+        a = prepare_runner(app_name="app", template=object(), api_key="k1", pin=str)
+        b = prepare_runner(app_name="app", template=object(), api_key="k1", pin=str)
+        assert a is not b
+
+    def test_cache_is_bounded(
+        self, fake_runner: type[_FakeRunner], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(_adk_prepared, "_MAX_PREPARED", 2)
+        template = object()
+        for key in ("k1", "k2", "k3"):
+            prepare_runner(app_name="app", template=template, api_key=key, pin=str)
+        assert len(_adk_prepared._prepared) == 2
+
+    def test_clear_drops_everything(self, fake_runner: type[_FakeRunner]) -> None:
+        prepare_runner(app_name="app", template=object(), api_key="k1", pin=str)
+        clear_prepared_runners()
+        assert not _adk_prepared._prepared
+
+
+class TestSessions:
+    async def test_session_is_seeded_and_dropped_after_run(
+        self, fake_runner: type[_FakeRunner]
+    ) -> None:
+        prepared = prepare_runner(app_name="app", template=object(), api_key="k", pin=str)
+        sessions = prepared.runner.session_service.sessions
+
+        async with prepared.session(user_id="u", prefix="t", state={"seed": 1}) as ref:
+            assert ref.session_id.startswith("t-")
+            events = [e async for e in prepared.run(ref, "hello")]
+            state = await prepared.state(ref)
+
+        assert events == ["event"]
+        assert state == {"seed": 1, "echo": "hello"}
+        assert sessions == {}
+
+    async def test_session_is_dropped_when_the_run_raises(
+        self, fake_runner: type[_FakeRunner]
+    ) -> None:
+        prepared = prepare_runner(app_name="app", template=object(), api_key="k", pin=str)
+
+        with pytest.raises(RuntimeError):
+            async with prepared.session(user_id="u", prefix="t"):
+                raise RuntimeError("model call failed")
+
+        assert prepared.runner.session_service.sessions == {}
+
+    async def test_concurrent_sessions_are_isolated(
+        self, fake_runner: type[_FakeRunner]
+    ) -> None:
+        prepared = prepare_runner(app_name="app", template=object(), api_key="k", pin=str)
+
+        async with (
+            prepared.session(user_id="u", prefix="t", state={"n": 1}) as a,
+            prepared.session(user_id="u", prefix="t", state={"n": 2}) as b,
+        ):
+            assert a.session_id != b.session_id
+            assert (await prepared.state(a)) == {"n": 1}
+            assert (await prepared.state(b)) == {"n": 2}
+
+
+class TestRouterWiring:
+    def test_quiz_reuses_one_parallel_agent_per_key(self) -> None:
+        from sahayakai_agents.agents.quiz import router as quiz_router  # noqa: PLC0415
+
+        first = quiz_router._prepared_runner("test-key-1")
+        assert quiz_router._prepared_runner("test-key-1") is first
+        assert quiz_router._prepared_runner("test-key-2") is not first
+
+    def test_quiz_variant_prompts_ride_in_session_state(self) -> None:
+        from sahayakai_agents.agents.quiz import router as quiz_router  # noqa: PLC0415
+        from sahayakai_agents.agents.quiz.agent import (  # noqa: PLC0415
+            variant_prompt_state_key,
+        )
+
+        state = quiz_router._render_variant_prompts({
+            "topic": "Photosynthesis",
+            "numQuestions": 5,
+            "questionTypes": ["multiple_choice"],
+            "gradeLevel": "Class 6",
+            "language": "English",
+            "bloomsTaxonomyLevels": [],
+        })
+        assert set(state) == {
+            variant_prompt_state_key(d) for d in ("easy", "medium", "hard")
+        }
+        assert all("Photosynthesis" in prompt for prompt in state.values())
+
+    def test_vidya_reuses_one_runner_per_key(self) -> None:
+        from sahayakai_agents.agents.vidya import router as vidya_router  # noqa: PLC0415
+
+        first = vidya_router._prepared_runner("test-key-1")
+        assert vidya_router._prepared_runner("test-key-1") is first
@@ -0,0 +1,179 @@
+"""Unit tests for assessment-scanner Pass 1 orchestration.
+
+Covers the shared Pass-1 resources and `_run_pass1`:
+- per-request and process-wide caps on concurrent model calls,
+- a page fetch failure cancels the rest of the scan (HTTP 422 path),
+- failed extractions become unreadable placeholders,
+- a page uploaded twice is extracted once and flagged,
+- the incrementally assembled `extractedPages` blob is byte-identical
+  to serialising the finished page list in one go.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import io
+import json
+import random
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from PIL import Image
+
+from sahayakai_agents.agents.assessment_scanner import router as sut
+from sahayakai_agents.agents.assessment_scanner.pass1_pool import (
+    close_page_client,
+    get_page_client,
+    get_pass1_limiter,
+)
+from sahayakai_agents.agents.assessment_scanner.schemas import AssessmentScannerRequest
+from sahayakai_agents.config import get_settings
+from sahayakai_agents.shared.errors import AssessmentPageUnreadableError
+
+pytestmark = pytest.mark.unit
+
+_PNG = "data:image/png;base64," + base64.b64encode(b"\x89PNG fake page").decode()
+
+
+def _photo(seed: int) -> str:
+    """A small decodable page photo as a data URI."""
+    rng = random.Random(seed)
+    img = Image.frombytes("L", (64, 48), bytes(rng.randrange(256) for _ in range(64 * 48)))
+    out = io.BytesIO()
+    img.resize((640, 480)).save(out, format="JPEG")
+    return "data:image/jpeg;base64," + base64.b64encode(out.getvalue()).decode()
+
+
+def _request(pages: list[str]) -> AssessmentScannerRequest:
+    return AssessmentScannerRequest.model_validate({
+        "userId": "teacher-1",
+        "assessmentId": "123e4567-e89b-12d3-a456-426614174000",
+        "pageUrls": pages,
+        "subject": "Science",
+        "gradeLevel": "Class 7",
+        "language": "en",
+    })
+
+
+class _StubGemini:
+    """Records concurrent Pass-1 calls; each returns a handwritten page."""
+
+    def __init__(self, delay_s: float = 0.02, fail_pages: set[int] | None = None) -> None:
+        self.delay_s = delay_s
+        self.fail_pages = fail_pages or set()
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, *, contents: Any, **_kwargs: Any) -> Any:
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay_s)
+        finally:
+            self.in_flight -= 1
+        prompt = contents.parts[1].text
+        index = next(i for i in range(20) if f"page {i} of" in prompt)
+        if index in self.fail_pages:
+            return SimpleNamespace(text="not json", candidates=[])
+        page = sut._unreadable_page(index).model_copy(
+            update={"pageType": "answer_only", "handwritingConfidence": 0.9}
+        )
+        return SimpleNamespace(text=page.model_dump_json(), candidates=[])
+
+
+@pytest.fixture
+def stub(monkeypatch: pytest.MonkeyPatch) -> _StubGemini:
+    gemini = _StubGemini()
+    monkeypatch.setattr(sut, "_call_gemini_structured", gemini)
+    return gemini
+
+
+class TestExtractedPagesJson:
+    @pytest.mark.parametrize("count", [0, 1, 3])
+    def test_matches_single_dump(self, count: int) -> None:
+        pages = [sut._unreadable_page(i) for i in range(count)]
+        expected = json.dumps([p.model_dump(mode="json") for p in pages], indent=2)
+        assert sut._extracted_pages_json([sut._page_json(p) for p in pages]) == expected
+
+
+class TestRunPass1:
+    async def test_per_request_cap(
+        self, stub: _StubGemini, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("SAHAYAKAI_ASSESSMENT_PASS1_PER_REQUEST_CONCURRENCY", "3")
+        get_settings.cache_clear()
+        pages, blob, _ = await sut._run_pass1(_request([_PNG] * 10), ("k1",), get_settings())
+        assert [p.pageIndex for p in pages] == list(range(10))
+        assert stub.calls == 10
+        assert stub.peak == 3
+        assert json.loads(blob)[9]["pageIndex"] == 9
+
+    async def test_process_wide_cap_spans_requests(
+        self, stub: _StubGemini, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("SAHAYAKAI_ASSESSMENT_PASS1_CONCURRENCY", "4")
+        get_settings.cache_clear()
+        settings = get_settings()
+        await asyncio.gather(*(
+            sut._run_pass1(_request([_PNG] * 5), ("k1",), settings) for _ in range(3)
+        ))
+        assert stub.calls == 15
+        assert stub.peak == 4
+        assert get_pass1_limiter().peak == 4
+
+    async def test_fetch_failure_cancels_scan(self, stub: _StubGemini) -> None:
+        stub.delay_s = 0.5
+        urls = [_PNG] * 6
+        urls[3] = "data:image/png;base64,!!not-base64!!"
+        with pytest.raises(AssessmentPageUnreadableError) as ei:
+            await asyncio.wait_for(
+                sut._run_pass1(_request(urls), ("k1",), get_settings()), timeout=0.3
+            )
+        assert "4" in str(ei.value)
+        assert stub.in_flight == 0
+
+    async def test_bad_extraction_becomes_placeholder(self, stub: _StubGemini) -> None:
+        stub.fail_pages = {1}
+        pages, _, _ = await sut._run_pass1(_request([_PNG] * 3), ("k1",), get_settings())
+        assert [p.pageType for p in pages] == ["answer_only", "unreadable", "answer_only"]
+
+    async def test_duplicate_page_extracted_once(self, stub: _StubGemini) -> None:
+        urls = [_photo(1), _photo(2), _photo(1)]
+        pages, blob, duplicates = await sut._run_pass1(_request(urls), ("k1",), get_settings())
+        assert stub.calls == 2
+        assert duplicates == {2: 0}
+        assert [p.pageIndex for p in pages] == [0, 1, 2]
+        assert pages[2].questions == []
+        assert json.loads(blob)[2]["pageIndex"] == 2
+        warnings = sut._image_quality_warnings(pages, duplicates)
+        assert warnings == ["Page 3: looks like a repeat of page 1 -- graded once."]
+
+    async def test_lowest_index_copy_is_the_original(
+        self, stub: _StubGemini, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fetch = sut._fetch_page_bytes
+
+        async def slow_first_page(url: str, page_index: int) -> tuple[str, bytes]:
+            if page_index == 0:
+                await asyncio.sleep(0.1)
+            return await fetch(url, page_index)
+
+        monkeypatch.setattr(sut, "_fetch_page_bytes", slow_first_page)
+        urls = [_photo(1), _photo(1), _photo(2), _photo(1)]
+        pages, _, duplicates = await sut._run_pass1(_request(urls), ("k1",), get_settings())
+        assert stub.calls == 2
+        assert duplicates == {1: 0, 3: 0}
+        assert pages[0].questions == pages[1].questions == []
+
+
+class TestPageClient:
+    async def test_shared_within_loop_and_rebuilt_after_close(self) -> None:
+        client = get_page_client()
+        assert get_page_client() is client
+        await close_page_client()
+        assert client.is_closed
+        assert get_page_client() is not client
+        await close_page_client()
@@ -181,3 +181,176 @@ class TestAuthenticateRequest:
 
         with pytest.raises(AuthorizationError):
             await auth_module.authenticate_request(request)
+
+
+class TestVerifiedTokenCache:
+    """`_verify_id_token_cached` — one verification per token lifetime."""
+
+    async def test_second_call_is_served_from_cache(
+        self, prod_env: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calls: list[str] = []
+
+        def _stub(token: str, _request: Any, audience: str | None = None) -> dict[str, Any]:
+            calls.append(token)
+            return _valid_claims()
+
+        monkeypatch.setattr(auth_module.google_id_token, "verify_oauth2_token", _stub)
+        first = await auth_module._verify_id_token_cached("tok", AUDIENCE)
+        second = await auth_module._verify_id_token_cached("tok", AUDIENCE)
+        assert first == second
+        assert calls == ["tok"]
+
+    async def test_concurrent_misses_share_one_verification(
+        self, prod_env: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import asyncio  # noqa: PLC0415
+
+        calls: list[str] = []
+
+        def _stub(token: str, _request: Any, audience: str | None = None) -> dict[str, Any]:
+            calls.append(token)
+            time.sleep(0.05)
+            return _valid_claims()
+
+        monkeypatch.setattr(auth_module.google_id_token, "verify_oauth2_token", _stub)
+        results = await asyncio.gather(
+            *(auth_module._verify_id_token_cached("tok", AUDIENCE) for _ in range(20))
+        )
+        assert calls == ["tok"]
+        assert all(r["email"] == ALLOWED_INVOKER for r in results)
+        assert len({id(r) for r in results}) == 20  # each caller owns its dict
+
+    async def test_callers_cannot_mutate_the_cached_claims(
+        self, prod_env: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            auth_module.google_id_token, "verify_oauth2_token", _stub_verify(_valid_claims())
+        )
+        first = await auth_module._verify_id_token_cached("tok", AUDIENCE)
+        first["_verified_at"] = 1
+        second = await auth_module._verify_id_token_cached("tok", AUDIENCE)
+        assert "_verified_at" not in second
+
+    async def test_audience_is_part_of_the_key(
+        self, prod_env: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calls: list[str | None] = []
+
+        def _stub(_token: str, _request: Any, audience: str | None = None) -> dict[str, Any]:
+            calls.append(audience)
+            return _valid_claims()
+
+        monkeypatch.setattr(auth_module.google_id_token, "verify_oauth2_token", _stub)
+        await auth_module._verify_id_token_cached("tok", AUDIENCE)
+        await auth_module._verify_id_token_cached("tok", "https://other.run.app")
+        assert calls == [AUDIENCE, "https://other.run.app"]
+
+    async def test_entry_expires_with_the_token(
+        self, prod_env: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calls: list[str] = []
+
+        def _stub(token: str, _request: Any, audience: str | None = None) -> dict[str, Any]:
+            calls.append(token)
+            # Inside the verifier's 30s grace window, already past `exp`.
+            return _valid_claims(exp=int(time.time()) - 1)
+
+        monkeypatch.setattr(auth_module.google_id_token, "verify_oauth2_token", _stub)
+        await auth_module._verify_id_token_cached("tok", AUDIENCE)
+        await auth_module._verify_id_token_cached("tok", AUDIENCE)
+        assert calls == ["tok", "tok"]
+
+    async def test_failures_are_not_cached(
+        self, prod_env: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            auth_module.google_id_token,
+            "verify_oauth2_token",
+            _stub_verify(ValueError("Invalid signature")),
+        )
+        with pytest.raises(AuthenticationError):
+            await auth_module._verify_id_token_cached("tok", AUDIENCE)
+        assert len(auth_module._ID_TOKEN_CACHE) == 0
+
+    async def test_verification_runs_off_the_event_loop(
+        self, prod_env: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import threading  # noqa: PLC0415
+
+        seen: list[threading.Thread] = []
+
+        def _stub(_token: str, _request: Any, audience: str | None = None) -> dict[str, Any]:
+            seen.append(threading.current_thread())
+            return _valid_claims()
+
+        monkeypatch.setattr(auth_module.google_id_token, "verify_oauth2_token", _stub)
+        await auth_module._verify_id_token_cached("tok", AUDIENCE)
+        assert seen and seen[0] is not threading.main_thread()
+
+
+class _FakeCertsResponse:
+    def __init__(self, status: int = 200, cache_control: str | None = None) -> None:
+        self.status = status
+        self.headers = {"Cache-Control": cache_control} if cache_control else {}
+        self.data = b"{}"
+
+
+class TestCachedCertsRequest:
+    """`_CachedCertsRequest` — Google certs cached for their max-age."""
+
+    def _transport(
+        self, cache_control: str | None, status: int = 200
+    ) -> tuple[Any, list[str], list[float]]:
+        fetched: list[str] = []
+        now = [1000.0]
+
+        def _inner(url: str, **_: Any) -> _FakeCertsResponse:
+            fetched.append(url)
+            return _FakeCertsResponse(status, cache_control)
+
+        transport = auth_module._CachedCertsRequest(_inner, clock=lambda: now[0])
+        return transport, fetched, now
+
+    def test_caches_for_max_age(self) -> None:
+        transport, fetched, now = self._transport("public, max-age=100, must-revalidate")
+        first = transport("https://certs")
+        now[0] += 50
+        assert transport("https://certs") is first
+        assert fetched == ["https://certs"]
+        now[0] += 51
+        transport("https://certs")
+        assert len(fetched) == 2
+
+    def test_without_max_age_nothing_is_cached(self) -> None:
+        transport, fetched, _ = self._transport("no-cache")
+        transport("https://certs")
+        transport("https://certs")
+        assert len(fetched) == 2
+
+    def test_errors_are_not_cached(self) -> None:
+        transport, fetched, _ = self._transport("max-age=100", status=500)
+        transport("https://certs")
+        transport("https://certs")
+        assert len(fetched) == 2
+
+    def test_refreshes_in_background_near_expiry(self) -> None:
+        import threading  # noqa: PLC0415
+
+        transport, fetched, now = self._transport("max-age=100")
+        first = transport("https://certs")
+        now[0] += 90  # past the 80% refresh point, before expiry
+        assert transport("https://certs") is first  # stale-while-refresh
+        for thread in threading.enumerate():
+            if thread.name == "auth-certs-refresh":
+                thread.join(timeout=5)
+        assert len(fetched) == 2
+        assert transport("https://certs") is not first
+
+    def test_concurrent_cold_fetches_download_once(self) -> None:
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+        transport, fetched, _ = self._transport("max-age=100")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: transport("https://certs"), range(32)))
+        assert fetched == ["https://certs"]
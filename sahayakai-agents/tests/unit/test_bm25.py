@@ -0,0 +1,107 @@
+"""BM25 engine (rag/bm25.py).
+
+- the tokenizer keeps Indic words whole (matras, virama, nukta) and
+  splits on dandas / punctuation,
+- IDF is per partition and scores only ever cover the asked partition,
+- rerank scoring of candidate rows matches BM25-only search,
+- `fuse` leaves the cosine alone when nothing matches lexically.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sahayakai_agents.rag.bm25 import Bm25Index, fuse, tokenize, write_bm25_index
+
+pytestmark = pytest.mark.unit
+
+
+class TestTokenize:
+    @pytest.mark.parametrize(
+        ("text", "tokens"),
+        [
+            ("पौधे अपना भोजन स्वयं बनाते हैं।", ["पौधे", "अपना", "भोजन", "स्वयं", "बनाते", "हैं"]),
+            ("प्रकाश-संश्लेषण॥क्लोरोफिल", ["प्रकाश", "संश्लेषण", "क्लोरोफिल"]),
+            ("தாவரங்கள் உணவு", ["தாவரங்கள்", "உணவு"]),
+            ("ప్రకాశ సంశ్లేషణ", ["ప్రకాశ", "సంశ్లేషణ"]),
+            ("ক্লোরোফিল, পাতা", ["ক্লোরোফিল", "পাতা"]),
+            ("സസ്യങ്ങൾ", ["സസ്യങ്ങൾ"]),
+            ("Photo-Synthesis of H2O, ८ and 9", ["photo", "synthesis", "of", "h2o", "८", "and", "9"]),
+        ],
+    )
+    def test_words_stay_whole(self, text: str, tokens: list[str]) -> None:
+        assert tokenize(text) == tokens
+
+    def test_nukta_and_joiners_normalized(self) -> None:
+        precomposed = "\u0958लम"  # क़ as one code point
+        combining = "क\u093cलम"  # क + nukta
+        assert tokenize(precomposed) == tokenize(combining)
+        assert tokenize("क्\u200dष") == tokenize("क्ष")
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> Bm25Index:
+    texts = [
+        # Partition at rows 0-3.
+        "पौधे प्रकाश संश्लेषण से भोजन बनाते हैं",
+        "पौधे पानी लेते हैं",
+        "पौधे हरे होते हैं",
+        "जानवर भोजन खाते हैं",
+        # Partition at rows 4-5: "पौधे" is rare here.
+        "पौधे",
+        "नदी बहती है",
+    ]
+    write_bm25_index(tmp_path, texts, [(0, 4), (4, 6)])
+    return Bm25Index(tmp_path)
+
+
+class TestBm25Index:
+    def test_rare_term_outweighs_common(self, index: Bm25Index) -> None:
+        scores = index.score(0, np.arange(4), "पौधे संश्लेषण")
+        assert scores.argmax() == 0
+        assert scores[3] == 0.0
+        assert scores[1] == pytest.approx(scores[2])
+
+    def test_idf_is_per_partition(self, index: Bm25Index) -> None:
+        common = index.score(0, np.array([1]), "पौधे")[0]
+        rare = index.score(4, np.array([4]), "पौधे")[0]
+        assert rare > common
+
+    def test_search_matches_score_and_stays_in_partition(self, index: Bm25Index) -> None:
+        rows, scores = index.search(0, "भोजन पौधे", top_k=10)
+        assert set(rows.tolist()) <= {0, 1, 2, 3}
+        assert rows[0] == 0
+        np.testing.assert_allclose(scores, index.score(0, rows, "भोजन पौधे"), rtol=1e-5)
+        assert list(scores) == sorted(scores, reverse=True)
+
+    def test_no_match(self, index: Bm25Index) -> None:
+        rows, _ = index.search(4, "भोजन", top_k=5)
+        assert len(rows) == 0
+        assert index.search(99, "पौधे", top_k=5)[0].size == 0
+
+    def test_tokenless_partition(self, tmp_path: Path) -> None:
+        write_bm25_index(tmp_path, ["।।", "पौधे"], [(0, 1), (1, 2)])
+        bm25 = Bm25Index(tmp_path)
+        assert bm25.search(0, "पौधे", top_k=5)[0].size == 0
+        assert bm25.search(1, "पौधे", top_k=5)[0].tolist() == [1]
+
+    def test_lookup_across_fence_blocks(self, tmp_path: Path) -> None:
+        words = [f"w{i}" for i in range(3000)]
+        write_bm25_index(tmp_path, [" ".join(words[:1500]), " ".join(words[1500:])], [(0, 2)])
+        bm25 = Bm25Index(tmp_path)
+        for i in range(0, 3000, 7):
+            assert bm25.search(0, words[i], top_k=2)[0].tolist() == [i // 1500]
+        assert bm25.search(0, "w3000", top_k=2)[0].size == 0
+
+
+class TestFuse:
+    def test_no_lexical_match_keeps_cosine(self) -> None:
+        cosine = np.array([0.9, 0.5], dtype=np.float32)
+        np.testing.assert_array_equal(fuse(cosine, np.zeros(2, dtype=np.float32)), cosine)
+
+    def test_lexical_match_reorders_close_candidates(self) -> None:
+        fused = fuse(np.array([0.80, 0.78]), np.array([0.0, 3.0]))
+        assert fused[1] > fused[0]
+        assert fused.max() <= 1.0
@@ -0,0 +1,319 @@
+"""Explicit context caching: template split, cache lifecycle, fallbacks.
+
+The Gemini client is a fake exposing `aio.caches.create/update` and
+`aio.models.generate_content`.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from types import SimpleNamespace
+from typing import Any
+
+import google.genai
+import pytest
+from google.genai import types as genai_types
+
+from sahayakai_agents import context_cache
+from sahayakai_agents.agents.assessment_scanner.agent import render_pass2_prompt_split
+from sahayakai_agents.agents.lesson_plan.agent import (
+    render_evaluator_prompt,
+    render_evaluator_prompt_split,
+)
+from sahayakai_agents.agents.vidya.prompts import (
+    render_orchestrator_prompt,
+    render_orchestrator_prompt_split,
+)
+from sahayakai_agents.context_cache import (
+    ContextCacheManager,
+    SplitPrompt,
+    adk_context_cache_callbacks,
+    get_context_cache,
+    is_stale_cache_error,
+    reset_context_cache,
+    split_template,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def _real_genai_types(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Some integration tests leave a fake `google.genai` in
+    `sys.modules`; the manager imports `types` lazily."""
+    monkeypatch.setitem(sys.modules, "google.genai", google.genai)
+    monkeypatch.setitem(sys.modules, "google.genai.types", genai_types)
+
+
+class _ApiError(Exception):
+    def __init__(self, status: int, message: str = "boom") -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class _FakeClient:
+    def __init__(self, *, create_error: Exception | None = None) -> None:
+        self.create_error = create_error
+        self.created: list[dict[str, Any]] = []
+        self.updated: list[str] = []
+        self.generated: list[dict[str, Any]] = []
+        self.stale_names: set[str] = set()
+        self.aio = SimpleNamespace(
+            caches=SimpleNamespace(create=self._create, update=self._update),
+            models=SimpleNamespace(generate_content=self._generate),
+        )
+
+    async def _create(self, *, model: str, config: Any) -> Any:
+        await asyncio.sleep(0.01)
+        if self.create_error is not None:
+            raise self.create_error
+        self.created.append({"model": model, "config": config})
+        return SimpleNamespace(name=f"cachedContents/{len(self.created)}")
+
+    async def _update(self, *, name: str, config: Any) -> Any:
+        self.updated.append(name)
+        return SimpleNamespace(name=name)
+
+    async def _generate(self, *, model: str, contents: Any, config: Any) -> Any:
+        self.generated.append({"contents": contents, "config": config})
+        name = config.cached_content
+        if name in self.stale_names:
+            raise _ApiError(403, f"CachedContent not found (or permission denied): {name}")
+        return SimpleNamespace(
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=1000,
+                candidates_token_count=10,
+                cached_content_token_count=900 if name else 0,
+            )
+        )
+
+
+_PROMPT = SplitPrompt(agent="test.agent", prefix="RULES " * 500, suffix="the request")
+
+
+async def _resolve(manager: ContextCacheManager, client: _FakeClient, **kw: Any) -> str | None:
+    return await manager.resolve(
+        client, api_key=kw.pop("api_key", "k1"), model="gemini-x",
+        prefix=_PROMPT.prefix, agent="test.agent", **kw,
+    )
+
+
+class TestSplitTemplate:
+    def test_split_at_marker(self) -> None:
+        assert split_template("static\n{{! cache-boundary }}\n{{x}}") == ("static\n", "{{x}}")
+
+    def test_no_marker_is_all_suffix(self) -> None:
+        assert split_template("{{x}}") == ("", "{{x}}")
+
+    def test_lesson_plan_evaluator_prefix_is_static(self) -> None:
+        ctx = {"request": '{"topic": "Fractions"}', "plan": '{"title": "T"}'}
+        split = render_evaluator_prompt_split(ctx)
+        other = render_evaluator_prompt_split(
+            {"request": '{"topic": "Photosynthesis"}', "plan": '{"title": "U"}'}
+        )
+        assert split.prefix and split.prefix == other.prefix
+        assert split.text == render_evaluator_prompt(ctx)
+        assert "Fractions" in split.suffix
+
+    def test_pass2_prefix_does_not_depend_on_the_student(self) -> None:
+        base = {
+            "subject": "Mathematics",
+            "gradeLevel": "Class 6",
+            "language": "English",
+            "extractedPages": "[]",
+            "subjectRubric": "MATHS RUBRIC",
+            "confidenceGuidance": "BE SURE",
+        }
+        a = render_pass2_prompt_split({**base, "language": "Hindi", "gradeLevel": "Class 9"})
+        b = render_pass2_prompt_split(base)
+        assert a.prefix == b.prefix
+        assert "MATHS RUBRIC" in a.prefix
+        assert "Hindi" in a.suffix
+        assert "Class 9" in a.suffix
+
+    def test_vidya_prefix_is_request_independent(self) -> None:
+        from sahayakai_agents.agents.vidya.prompts import ALLOWED_FLOWS
+        from sahayakai_agents.agents.vidya.registry import render_capability_index
+
+        def ctx(message: str) -> dict[str, Any]:
+            return {
+                "message": message,
+                "chatHistory": [],
+                "currentScreenContext": {"path": "/", "uiState": None},
+                "teacherProfile": {},
+                "allowedFlows": ALLOWED_FLOWS,
+                "capabilityIndex": render_capability_index(),
+            }
+
+        a = render_orchestrator_prompt_split(ctx("make a quiz"))
+        b = render_orchestrator_prompt_split(ctx("lesson plan on soil"))
+        assert a.prefix == b.prefix
+        assert a.text == render_orchestrator_prompt(ctx("make a quiz"))
+        assert "make a quiz" in a.suffix
+
+
+class TestContextCacheManager:
+    async def test_creates_once_then_reuses(self) -> None:
+        manager, client = ContextCacheManager(), _FakeClient()
+        assert await _resolve(manager, client) == "cachedContents/1"
+        assert await _resolve(manager, client) == "cachedContents/1"
+        assert len(client.created) == 1
+        config = client.created[0]["config"]
+        assert config.ttl == "3600s"
+        assert config.contents[0].parts[0].text == _PROMPT.prefix
+
+    async def test_entries_are_per_key_and_per_system_instruction(self) -> None:
+        manager, client = ContextCacheManager(), _FakeClient()
+        await _resolve(manager, client)
+        await _resolve(manager, client, api_key="k2")
+        await _resolve(manager, client, system_instruction="be terse")
+        assert len(client.created) == 3
+
+    async def test_concurrent_first_use_creates_once(self) -> None:
+        manager, client = ContextCacheManager(), _FakeClient()
+        names = await asyncio.gather(*(_resolve(manager, client) for _ in range(10)))
+        assert set(names) == {"cachedContents/1"}
+        assert len(client.created) == 1
+
+    async def test_refreshes_inside_the_margin(self) -> None:
+        manager = ContextCacheManager(ttl_seconds=100, refresh_margin_seconds=200)
+        client = _FakeClient()
+        await _resolve(manager, client)
+        assert await _resolve(manager, client) == "cachedContents/1"
+        assert client.updated == ["cachedContents/1"]
+        assert manager.stats.refreshes == 1
+        assert len(client.created) == 1
+
+    async def test_400_marks_prefix_unsupported(self) -> None:
+        manager = ContextCacheManager()
+        client = _FakeClient(create_error=_ApiError(400, "content too small"))
+        assert await _resolve(manager, client) is None
+        assert await _resolve(manager, client, api_key="k2") is None
+        assert manager.stats.create_failures == 1
+
+    async def test_transient_failure_backs_off(self) -> None:
+        manager = ContextCacheManager(retry_after_seconds=0)
+        client = _FakeClient(create_error=_ApiError(503))
+        assert await _resolve(manager, client) is None
+        client.create_error = None
+        assert await _resolve(manager, client) == "cachedContents/1"
+
+        backed_off = ContextCacheManager(retry_after_seconds=600)
+        failing = _FakeClient(create_error=_ApiError(429))
+        await _resolve(backed_off, failing)
+        failing.create_error = None
+        assert await _resolve(backed_off, failing) is None
+        assert backed_off.stats.create_failures == 1
+
+    async def test_disabled_or_empty_prefix_skips(self) -> None:
+        client = _FakeClient()
+        assert await _resolve(ContextCacheManager(enabled=False), client) is None
+        assert await ContextCacheManager().resolve(
+            client, api_key="k", model="m", prefix="", agent="a",
+        ) is None
+        assert client.created == []
+
+
+class TestGenerate:
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> _FakeClient:
+        client = _FakeClient()
+        monkeypatch.setattr(context_cache, "get_genai_client", lambda key: client)
+        return client
+
+    async def _generate(self, manager: ContextCacheManager) -> Any:
+        return await manager.generate(
+            api_key="k1", model="gemini-x", prompt=_PROMPT,
+            config=genai_types.GenerateContentConfig(temperature=0.1),
+        )
+
+    async def test_sends_suffix_against_the_cache(self, client: _FakeClient) -> None:
+        manager = ContextCacheManager()
+        await self._generate(manager)
+        call = client.generated[0]
+        assert call["contents"] == "the request"
+        assert call["config"].cached_content == "cachedContents/1"
+        assert call["config"].temperature == 0.1
+        usage = manager.snapshot()["agents"]["test.agent"]
+        assert usage == {
+            "calls": 1, "explicit": 1, "inputTokens": 1000,
+            "cachedTokens": 900, "cacheHitRatio": 0.9,
+        }
+
+    async def test_falls_back_to_the_full_prompt(self, client: _FakeClient) -> None:
+        client.create_error = _ApiError(400)
+        manager = ContextCacheManager()
+        await self._generate(manager)
+        call = client.generated[0]
+        assert call["contents"] == _PROMPT.text
+        assert call["config"].cached_content is None
+
+    async def test_stale_cache_is_forgotten_and_reissued(self, client: _FakeClient) -> None:
+        manager = ContextCacheManager()
+        client.stale_names.add("cachedContents/1")
+        await self._generate(manager)
+        assert [c["contents"] for c in client.generated] == ["the request", _PROMPT.text]
+        assert manager.stats.stale == 1
+        assert len(manager) == 0
+        await self._generate(manager)
+        assert client.generated[-1]["config"].cached_content == "cachedContents/2"
+
+    async def test_other_errors_propagate(self, client: _FakeClient) -> None:
+        manager = ContextCacheManager()
+
+        async def _boom(**kwargs: Any) -> Any:
+            raise _ApiError(503, "overloaded")
+
+        client.aio.models.generate_content = _boom
+        with pytest.raises(_ApiError):
+            await self._generate(manager)
+
+
+class TestAdkCallbacks:
+    @pytest.fixture(autouse=True)
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> _FakeClient:
+        client = _FakeClient()
+        monkeypatch.setattr(context_cache, "get_genai_client", lambda key: client)
+        return client
+
+    def _request(self, parts: list[str]) -> Any:
+        from google.adk.models.llm_request import LlmRequest
+
+        return LlmRequest(
+            model="gemini-x",
+            contents=[
+                genai_types.Content(
+                    role="user", parts=[genai_types.Part(text=p) for p in parts],
+                )
+            ],
+            config=genai_types.GenerateContentConfig(system_instruction="You are an agent."),
+        )
+
+    async def test_moves_prefix_and_system_instruction_into_the_cache(
+        self, client: _FakeClient
+    ) -> None:
+        before, _ = adk_context_cache_callbacks("k1", agent="vidya.orchestrator")
+        request = self._request([_PROMPT.prefix, "the request"])
+        assert await before(None, request) is None
+        assert [p.text for p in request.contents[-1].parts] == ["the request"]
+        assert request.config.system_instruction is None
+        assert request.config.cached_content == "cachedContents/1"
+        assert client.created[0]["config"].system_instruction == "You are an agent."
+
+    async def test_single_part_message_is_untouched(self, client: _FakeClient) -> None:
+        before, _ = adk_context_cache_callbacks("k1", agent="vidya.orchestrator")
+        request = self._request(["whole prompt"])
+        await before(None, request)
+        assert request.config.cached_content is None
+        assert client.created == []
+
+    async def test_error_callback_forgets_stale_entries(self) -> None:
+        reset_context_cache(ContextCacheManager())
+        before, on_error = adk_context_cache_callbacks("k1", agent="vidya.orchestrator")
+        request = self._request([_PROMPT.prefix, "the request"])
+        await before(None, request)
+        error = _ApiError(403, "CachedContent not found")
+        assert is_stale_cache_error(error)
+        await on_error(None, request, error)
+        assert len(get_context_cache()) == 0
+        assert not is_stale_cache_error(_ApiError(503, "overloaded"))
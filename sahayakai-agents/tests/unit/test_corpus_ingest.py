@@ -0,0 +1,254 @@
+"""NCERT corpus ingestion (rag/corpus_ingest.py + rag/chunk_store.py).
+
+- dehyphenation joins English column-end wraps, keeps Indic compounds,
+- chunks respect the pinned token window, overlap, and paragraphs,
+- the chunk store round-trips Indic text and only serves complete PDFs,
+- the pipeline skips ingested PDFs by SHA-256, resumes a crashed run
+  at the failed batch, and gives the same store with a process pool.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sahayakai_agents.rag.chunk_store import ChunkStore
+from sahayakai_agents.rag.corpus_ingest import (
+    CHUNK_OVERLAP_TOKENS,
+    CHUNK_SIZE_TOKENS,
+    ManifestEntry,
+    chunk_text,
+    chunks_from_pages,
+    dehyphenate,
+    embed_and_store,
+    estimate_tokens,
+    extract_pages,
+    ingest_corpus,
+    load_manifest,
+)
+from sahayakai_agents.rag.embeddings import EMBEDDING_DIM, HashEmbedder
+from sahayakai_agents.rag.mmap_retriever import MmapVectorRetriever, write_mmap_index
+from sahayakai_agents.rag.schemas import RetrievalQuery
+
+pytestmark = pytest.mark.unit
+
+_ENTRY = ManifestEntry(
+    file="hesc107.txt",
+    subject="science",
+    class_number=7,
+    chapter_number=1,
+    chapter_title="पौधों में पोषण",
+    language="hi",
+    source_url="https://ncert.nic.in/textbook/pdf/hesc107.pdf",
+    edition="2024-25",
+)
+
+
+def fake_extract(path: Path) -> list[str]:
+    """Stand-in for pdfplumber: pages of a text file split on form feeds.
+
+    Top-level so worker processes can unpickle it.
+    """
+    if path.name.startswith("corrupt"):
+        raise ValueError("not a PDF")
+    return path.read_text().split("\f")
+
+
+def _paragraph(i: int, words: int = 40) -> str:
+    return " ".join(f"पौधे{i}-{w}" for w in range(words)) + "।"
+
+
+def _chapter(pages: int, paragraphs: int) -> str:
+    return "\f".join(
+        "\n\n".join(_paragraph(p * paragraphs + i) for i in range(paragraphs))
+        for p in range(pages)
+    )
+
+
+class TestChunking:
+    def test_dehyphenate(self) -> None:
+        text = "Plants make food by photo-\nsynthesis in the\nleaves.\n\nClass-\nVII प्रकाश-\nसंश्लेषण"
+        assert dehyphenate(text) == (
+            "Plants make food by photosynthesis in the leaves.\n\nClass-VII प्रकाश-संश्लेषण"
+        )
+
+    def test_chunks_fit_window_and_overlap(self) -> None:
+        text = "\n\n".join(_paragraph(i) for i in range(60))
+        chunks = chunk_text(text)
+        assert len(chunks) > 3
+        assert all(estimate_tokens(c) <= CHUNK_SIZE_TOKENS for c in chunks)
+        for before, after in zip(chunks, chunks[1:], strict=False):
+            shared = after.split("\n\n")[0]
+            assert before.endswith(shared)
+            assert estimate_tokens(shared) <= CHUNK_OVERLAP_TOKENS
+        # Every paragraph survives whole in some chunk.
+        for i in range(60):
+            assert any(_paragraph(i) in c.split("\n\n") for c in chunks)
+
+    def test_long_paragraph_split_at_sentences(self) -> None:
+        sentence = " ".join(["पौधे भोजन बनाते हैं"] * 30) + "।"
+        chunks = chunk_text(" ".join([sentence] * 12))
+        assert len(chunks) > 1
+        assert all(estimate_tokens(c) <= CHUNK_SIZE_TOKENS for c in chunks)
+        assert all(c.endswith("।") for c in chunks)
+
+    def test_page_ranges_follow_paragraphs_across_pages(self) -> None:
+        pages = ["Roots take up water\nfrom the soil", "and minerals.\n\nLeaves make food."]
+        [chunk] = chunks_from_pages(pages, _ENTRY, "a" * 64)
+        assert chunk.text == "Roots take up water from the soil and minerals.\n\nLeaves make food."
+        assert (chunk.page_start, chunk.page_end) == (1, 2)
+        assert chunk.chapter_title == _ENTRY.chapter_title
+
+    def test_empty_text(self) -> None:
+        assert chunk_text("  \n\n ") == []
+
+
+class TestChunkStore:
+    def test_round_trip_only_complete(self, tmp_path: Path) -> None:
+        chunks = chunks_from_pages([_chapter(2, 20)], _ENTRY, "b" * 64)
+        store = ChunkStore(tmp_path)
+        assert embed_and_store(chunks, store, HashEmbedder(), batch_size=4) == len(chunks)
+        assert store.read()[0] == []
+        store.mark_complete("b" * 64, file=_ENTRY.file, batches=-(-len(chunks) // 4),
+                            chunks=len(chunks))
+
+        read, vectors = ChunkStore(tmp_path).read()
+        assert read == chunks
+        assert vectors.shape == (len(chunks), EMBEDDING_DIM)
+        assert vectors.dtype == np.float32
+
+    def test_rejects_misshapen_embeddings(self, tmp_path: Path) -> None:
+        chunk = chunks_from_pages(["पौधे।"], _ENTRY, "c" * 64)
+        with pytest.raises(ValueError, match="shape"):
+            ChunkStore(tmp_path).write("c" * 64, 0, chunk, np.zeros((1, 3)))
+
+
+class _CrashingEmbedder(HashEmbedder):
+    def __init__(self, fail_on_call: int) -> None:
+        super().__init__()
+        self.fail_on_call = fail_on_call
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        if self.calls + 1 == self.fail_on_call:
+            raise RuntimeError("embedding endpoint unavailable")
+        return super().embed(texts)
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> tuple[list[ManifestEntry], Path]:
+    pdfs = tmp_path / "pdfs"
+    pdfs.mkdir()
+    entries = []
+    for chapter in range(1, 4):
+        name = f"hesc1{chapter:02d}.txt"
+        (pdfs / name).write_text(_chapter(3, 8 * chapter + chapter))
+        entries.append(ManifestEntry(**{
+            **_ENTRY.__dict__, "file": name, "chapter_number": chapter,
+        }))
+    manifest = tmp_path / "ncert_manifest.json"
+    manifest.write_text(json.dumps({"pdfs": [e.__dict__ for e in entries]}))
+    return load_manifest(manifest), pdfs
+
+
+class TestIngestCorpus:
+    def test_ingest_then_skip(
+        self, tmp_path: Path, corpus: tuple[list[ManifestEntry], Path]
+    ) -> None:
+        entries, pdfs = corpus
+        store = ChunkStore(tmp_path / "store")
+        stats = ingest_corpus(entries, pdfs, store, HashEmbedder(), workers=1,
+                              extractor=fake_extract, batch_size=4)
+        assert (stats.pdfs, stats.skipped, stats.pages) == (3, 0, 9)
+        assert stats.chunks == len(store.read()[0]) > 3
+        rates = stats.throughput()
+        assert rates["extract"]["pages_per_s"] > 0 and rates["embed"]["chunks_per_s"] > 0
+
+        embedder = HashEmbedder()
+        again = ingest_corpus(entries, pdfs, ChunkStore(tmp_path / "store"), embedder,
+                              workers=1, extractor=fake_extract, batch_size=4)
+        assert (again.pdfs, again.skipped, embedder.calls) == (0, 3, 0)
+
+    def test_crash_resumes_at_failed_batch(
+        self, tmp_path: Path, corpus: tuple[list[ManifestEntry], Path]
+    ) -> None:
+        entries, pdfs = corpus
+        reference = ChunkStore(tmp_path / "reference")
+        clean = ingest_corpus(entries, pdfs, reference, HashEmbedder(), workers=1,
+                              extractor=fake_extract, batch_size=4)
+
+        store = ChunkStore(tmp_path / "store")
+        with pytest.raises(RuntimeError, match="unavailable"):
+            ingest_corpus(entries, pdfs, store, _CrashingEmbedder(fail_on_call=4),
+                          workers=1, extractor=fake_extract, batch_size=4)
+
+        embedder = HashEmbedder()
+        resumed = ingest_corpus(entries, pdfs, ChunkStore(tmp_path / "store"), embedder,
+                                workers=1, extractor=fake_extract, batch_size=4)
+        # Chapter 1 (two batches) finished; chapter 2 crashed after its
+        # first batch. None of those three batches is embedded again.
+        assert (resumed.skipped, resumed.batches_resumed) == (1, 1)
+        assert embedder.calls == clean.batches - 3
+        chunks, vectors = ChunkStore(tmp_path / "store").read()
+        expected_chunks, expected_vectors = reference.read()
+        assert chunks == expected_chunks
+        np.testing.assert_array_equal(vectors, expected_vectors)
+
+    def test_process_pool_matches_inline(
+        self, tmp_path: Path, corpus: tuple[list[ManifestEntry], Path]
+    ) -> None:
+        entries, pdfs = corpus
+        (pdfs / "corrupt.txt").write_text("x")
+        entries = [*entries, ManifestEntry(**{**_ENTRY.__dict__, "file": "corrupt.txt"})]
+        inline = ChunkStore(tmp_path / "inline")
+        ingest_corpus(entries, pdfs, inline, HashEmbedder(), workers=1, extractor=fake_extract)
+        pooled = ChunkStore(tmp_path / "pooled")
+        stats = ingest_corpus(entries, pdfs, pooled, HashEmbedder(), workers=2,
+                              extractor=fake_extract)
+        assert (stats.pdfs, stats.failed) == (3, 1)
+        assert pooled.read()[0] == inline.read()[0]
+
+    def test_store_feeds_mmap_index(
+        self, tmp_path: Path, corpus: tuple[list[ManifestEntry], Path]
+    ) -> None:
+        entries, pdfs = corpus
+        store = ChunkStore(tmp_path / "store")
+        embedder = HashEmbedder()
+        ingest_corpus(entries, pdfs, store, embedder, workers=1, extractor=fake_extract)
+        chunks, vectors = store.read()
+        write_mmap_index(tmp_path / "index", chunks, vectors, dtype="float16")
+        retriever = MmapVectorRetriever(tmp_path / "index")
+        query = RetrievalQuery(query_text="पौधे", language="hi", class_number=7,
+                               subject="science", chapter_number=None, top_k=1)
+        [hit] = retriever.search(query, np.asarray(vectors[5])).chunks
+        assert hit.chunk_text == chunks[5].text
+        retriever.close()
+
+
+def test_extract_pages_with_pdfplumber(tmp_path: Path) -> None:
+    pytest.importorskip("pdfplumber")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 300 144] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    stream = b"BT /F1 12 Tf 20 100 Td (Plants make their own food.) Tj ET"
+    objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref,
+    )
+    path = tmp_path / "hesc101.pdf"
+    path.write_bytes(bytes(pdf))
+    assert extract_pages(path) == ["Plants make their own food."]
@@ -0,0 +1,176 @@
+"""RAG query embedding service (rag/embedding_service.py).
+
+- repeated and differently-spelled queries hit the LRU / disk cache,
+- concurrent misses coalesce into one batch request (and split at
+  `batch_max`), identical ones into one text,
+- a failed batch fails its callers and caches nothing,
+- the blocking backend never stalls the event loop,
+- hit ratio and batch-size histogram are on the snapshot.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sahayakai_agents.config import get_settings
+from sahayakai_agents.rag.embedding_service import (
+    DiskEmbeddingTier,
+    EmbeddingService,
+    get_embedding_service,
+    normalize_query,
+)
+from sahayakai_agents.rag.embeddings import EMBEDDING_DIM, HashEmbedder, embed_query
+
+pytestmark = pytest.mark.unit
+
+
+class _Recorder(HashEmbedder):
+    """Hash vectors, recording every batch; optionally slow or failing."""
+
+    def __init__(self, *, delay_s: float = 0.0, fail: bool = False) -> None:
+        super().__init__()
+        self.batches: list[list[str]] = []
+        self.delay_s = delay_s
+        self.fail = fail
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        time.sleep(self.delay_s)
+        if self.fail:
+            raise RuntimeError("503 embedding backend unavailable")
+        return super().embed(texts)
+
+
+def _service(backend: HashEmbedder, **kwargs: object) -> EmbeddingService:
+    return EmbeddingService(backend, batch_window_ms=5, **kwargs)  # type: ignore[arg-type]
+
+
+def test_normalize_query() -> None:
+    assert normalize_query("  Photosynthesis\n in  PLANTS ") == "Photosynthesis in PLANTS"
+    # क़ precomposed vs क + nukta.
+    assert normalize_query("\u0958लम") == normalize_query("क\u093cलम")
+
+
+class TestCache:
+    async def test_repeat_is_a_memory_hit(self) -> None:
+        backend = _Recorder()
+        service = _service(backend)
+        first = await service.embed("Photosynthesis class 7", "en")
+        again = await service.embed(" Photosynthesis\n  class 7", "en")
+        assert first == again
+        assert len(first) == EMBEDDING_DIM
+        assert backend.batches == [["Photosynthesis class 7"]]
+        snap = service.snapshot()
+        assert (snap["memoryHits"], snap["misses"], snap["hitRatio"]) == (1, 1, 0.5)
+
+    async def test_query_case_is_embedded_as_written(self) -> None:
+        # Corpus chunks are embedded as written; so is the query.
+        backend = _Recorder()
+        service = _service(backend)
+        await service.embed("NCERT Class 7 Science", "en")
+        await service.embed("ncert class 7 science", "en")
+        assert backend.batches == [["NCERT Class 7 Science"], ["ncert class 7 science"]]
+
+    async def test_lru_evicts(self) -> None:
+        backend = _Recorder()
+        service = _service(backend, max_entries=2)
+        for text in ("a", "b", "c", "a"):
+            await service.embed(text, "en")
+        assert [b[0] for b in backend.batches] == ["a", "b", "c", "a"]
+
+    async def test_disk_tier_survives_restart(self, tmp_path: Path) -> None:
+        await _service(_Recorder(), disk=DiskEmbeddingTier(tmp_path)).embed("पौधे", "hi")
+        backend = _Recorder()
+        service = _service(backend, disk=DiskEmbeddingTier(tmp_path))
+        vector = await service.embed("पौधे", "hi")
+        assert backend.batches == []
+        assert service.stats.disk_hits == 1
+        np.testing.assert_allclose(vector, HashEmbedder().embed(["पौधे"])[0], atol=1e-7)
+
+    async def test_corrupt_disk_entry_fails_open(self, tmp_path: Path) -> None:
+        service = _service(_Recorder(), disk=DiskEmbeddingTier(tmp_path))
+        await service.embed("x", "en")
+        for path in tmp_path.rglob("*.npy"):
+            path.write_bytes(b"not numpy")
+        fresh = _service(_Recorder(), disk=DiskEmbeddingTier(tmp_path))
+        assert len(await fresh.embed("x", "en")) == EMBEDDING_DIM
+        assert (fresh.stats.errors, fresh.stats.misses) == (1, 1)
+
+
+class TestBatching:
+    async def test_concurrent_misses_share_one_request(self) -> None:
+        backend = _Recorder()
+        service = _service(backend)
+        vectors = await asyncio.gather(*(service.embed(f"q{i}", "en") for i in range(10)))
+        assert len(backend.batches) == 1
+        assert sorted(backend.batches[0]) == sorted(f"q{i}" for i in range(10))
+        np.testing.assert_allclose(vectors[3], HashEmbedder().embed(["q3"])[0], atol=1e-7)
+        assert service.snapshot()["batchSizeHistogram"]["16"] == 1
+
+    async def test_full_batch_goes_out_early(self) -> None:
+        backend = _Recorder()
+        service = EmbeddingService(backend, batch_window_ms=10_000, batch_max=16)
+        await asyncio.wait_for(
+            asyncio.gather(*(service.embed(f"q{i}", "en") for i in range(32))), timeout=2
+        )
+        assert [len(b) for b in backend.batches] == [16, 16]
+        assert service.snapshot()["meanBatchSize"] == 16.0
+
+    async def test_identical_queries_coalesce(self) -> None:
+        backend = _Recorder(delay_s=0.05)
+        service = _service(backend)
+        vectors = await asyncio.gather(*(service.embed("same", "en") for _ in range(5)))
+        assert backend.batches == [["same"]]
+        assert all(v == vectors[0] for v in vectors)
+        assert service.stats.coalesced == 4
+
+    async def test_cancelled_leader_does_not_strand_followers(self) -> None:
+        service = _service(_Recorder(delay_s=0.05))
+        leader = asyncio.create_task(service.embed("same", "en"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(service.embed("same", "en"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert len(await follower) == EMBEDDING_DIM
+
+    async def test_failed_batch_fails_callers_and_is_not_cached(self) -> None:
+        backend = _Recorder(fail=True)
+        service = _service(backend)
+        results = await asyncio.gather(
+            service.embed("a", "en"), service.embed("b", "en"), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert service.stats.errors == 1
+        backend.fail = False
+        assert len(await service.embed("a", "en")) == EMBEDDING_DIM
+        assert len(backend.batches) == 2
+
+    async def test_backend_runs_off_the_event_loop(self) -> None:
+        service = _service(_Recorder(delay_s=0.2))
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        await service.embed("slow", "en")
+        ticker.cancel()
+        # 0.2s of blocking backend; a blocked loop would tick ~0 times.
+        assert ticks >= 5
+
+
+async def test_embed_query_uses_process_service(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SAHAYAKAI_EMBEDDING_BACKEND", "hash")
+    get_settings.cache_clear()
+    first = await embed_query("Nutrition in Plants", "en")
+    assert np.allclose(first, await embed_query("Nutrition  in\nPlants", "en"))
+    snap = get_embedding_service().snapshot()
+    assert (snap["backend"], snap["memoryHits"], snap["entries"]) == ("HashEmbedder", 1, 1)
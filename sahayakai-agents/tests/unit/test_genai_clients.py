@@ -0,0 +1,106 @@
+"""Pooled google-genai client registry tests.
+
+Pins the contract routers rely on: one long-lived client per key while
+the lifespan is running, a shared keep-alive transport underneath, and
+the legacy per-call construction when no registry is active (which is
+what the integration-test `google.genai.Client` fakes depend on).
+"""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+
+from sahayakai_agents import genai_clients
+from sahayakai_agents.config import get_settings
+from sahayakai_agents.genai_clients import (
+    GenaiClientRegistry,
+    close_genai_clients,
+    get_genai_client,
+    start_genai_clients,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def registry() -> AsyncIterator[GenaiClientRegistry]:
+    started = start_genai_clients(get_settings())
+    yield started
+    await close_genai_clients()
+
+
+class TestRegistry:
+    async def test_start_warms_every_live_and_shadow_key(
+        self, registry: GenaiClientRegistry
+    ) -> None:
+        # conftest pool: 2 live keys + 1 shadow key.
+        assert len(registry) == 3
+
+    async def test_same_key_returns_same_client(
+        self, registry: GenaiClientRegistry
+    ) -> None:
+        assert get_genai_client("test-key-1") is get_genai_client("test-key-1")
+
+    async def test_different_keys_get_different_clients(
+        self, registry: GenaiClientRegistry
+    ) -> None:
+        assert get_genai_client("test-key-1") is not get_genai_client("test-key-2")
+
+    async def test_headers_are_part_of_the_cache_key(
+        self, registry: GenaiClientRegistry
+    ) -> None:
+        plain = get_genai_client("test-key-1")
+        tagged = get_genai_client("test-key-1", headers={"x-goog-api-client": "adk"})
+        assert plain is not tagged
+        assert tagged is get_genai_client(
+            "test-key-1", headers={"x-goog-api-client": "adk"}
+        )
+
+    async def test_clients_share_one_pooled_transport(
+        self, registry: GenaiClientRegistry
+    ) -> None:
+        a = get_genai_client("test-key-1")._api_client._async_httpx_client
+        b = get_genai_client("test-key-2")._api_client._async_httpx_client
+        assert a is b
+        assert a is registry._transport
+
+    async def test_start_is_idempotent(self, registry: GenaiClientRegistry) -> None:
+        assert start_genai_clients(get_settings()) is registry
+
+
+class TestLifecycle:
+    async def test_close_releases_transport_and_falls_back(self) -> None:
+        registry = start_genai_clients(get_settings())
+        pooled = get_genai_client("test-key-1")
+        await close_genai_clients()
+
+        assert registry.closed
+        assert genai_clients._registry is None
+        fresh = get_genai_client("test-key-1")
+        assert fresh is not pooled
+        assert fresh is not get_genai_client("test-key-1")
+
+    async def test_close_without_start_is_a_noop(self) -> None:
+        await close_genai_clients()
+        assert genai_clients._registry is None
+
+    async def test_closed_registry_refuses_lookups(self) -> None:
+        registry = GenaiClientRegistry()
+        await registry.aclose()
+        with pytest.raises(RuntimeError):
+            registry.get("test-key-1")
+
+
+class TestAdkKeyedGemini:
+    async def test_keyed_gemini_uses_pooled_client(
+        self, registry: GenaiClientRegistry
+    ) -> None:
+        from sahayakai_agents._adk_keyed_gemini import build_keyed_gemini
+
+        first = build_keyed_gemini(model_name="gemini-2.5-flash", api_key="test-key-1")
+        second = build_keyed_gemini(model_name="gemini-2.5-flash", api_key="test-key-1")
+        assert first.api_client is second.api_client
+        assert (
+            first.api_client._api_client._async_httpx_client is registry._transport
+        )
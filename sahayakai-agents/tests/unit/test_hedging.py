@@ -0,0 +1,153 @@
+"""Hedged attempts across the key pool (hedging.py + run_resiliently).
+
+- a slow primary is raced by a twin on the next key; first answer wins
+  and the loser is cancelled,
+- fast or fast-failing primaries never hedge,
+- the process-wide budget caps extra calls,
+- the delay tracks the span's latency percentile once warmed up,
+- `run_resiliently(hedge=True)` only hedges when enabled.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from sahayakai_agents.config import get_settings
+from sahayakai_agents.hedging import Hedger, get_hedger
+from sahayakai_agents.resilience import run_resiliently
+
+pytestmark = pytest.mark.unit
+
+
+def _hedger(monkeypatch: pytest.MonkeyPatch, **env: str) -> Hedger:
+    defaults = {"SAHAYAKAI_HEDGE_ENABLED": "true", "SAHAYAKAI_HEDGE_DELAY_MS": "50"}
+    for name, value in {**defaults, **env}.items():
+        monkeypatch.setenv(name, value)
+    get_settings.cache_clear()
+    return Hedger(get_settings())
+
+
+class _Model:
+    """Per-key latency / failure; records calls and cancellations."""
+
+    def __init__(self, latency: dict[str, float], fail: set[str] | None = None) -> None:
+        self.latency = latency
+        self.fail = fail or set()
+        self.calls: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def __call__(self, key: str) -> str:
+        self.calls.append(key)
+        try:
+            await asyncio.sleep(self.latency.get(key, 0.0))
+        except asyncio.CancelledError:
+            self.cancelled.append(key)
+            raise
+        if key in self.fail:
+            raise RuntimeError("500 Internal Server Error")
+        return f"answer-from-{key}"
+
+
+class TestHedgerAttempt:
+    async def test_slow_primary_is_hedged(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        hedger = _hedger(monkeypatch)
+        model = _Model({"k1": 1.0, "k2": 0.01})
+        result, winner = await hedger.attempt(
+            model, ("k1", "k2"), span_name="s", timeout_s=2.0
+        )
+        assert (result, winner) == ("answer-from-k2", 1)
+        assert model.cancelled == ["k1"]
+        snap = hedger.snapshot()["spans"]["s"]
+        assert (snap["hedgesFired"], snap["hedgesWon"]) == (1, 1)
+
+    async def test_fast_primary_not_hedged(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        hedger = _hedger(monkeypatch)
+        model = _Model({"k1": 0.0})
+        assert await hedger.attempt(model, ("k1", "k2"), span_name="s", timeout_s=2.0) == (
+            "answer-from-k1", 0,
+        )
+        assert model.calls == ["k1"]
+
+    async def test_fast_failure_raises_without_hedge(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        hedger = _hedger(monkeypatch)
+        model = _Model({}, fail={"k1"})
+        with pytest.raises(RuntimeError):
+            await hedger.attempt(model, ("k1", "k2"), span_name="s", timeout_s=2.0)
+        assert model.calls == ["k1"]
+
+    async def test_primary_wins_after_hedge_fails(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        hedger = _hedger(monkeypatch)
+        model = _Model({"k1": 0.15, "k2": 0.0}, fail={"k2"})
+        result, winner = await hedger.attempt(
+            model, ("k1", "k2"), span_name="s", timeout_s=2.0
+        )
+        assert (result, winner) == ("answer-from-k1", 0)
+
+    async def test_timeout_cancels_both(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        hedger = _hedger(monkeypatch)
+        model = _Model({"k1": 5.0, "k2": 5.0})
+        with pytest.raises(TimeoutError):
+            await hedger.attempt(model, ("k1", "k2"), span_name="s", timeout_s=0.2)
+        assert sorted(model.cancelled) == ["k1", "k2"]
+
+    async def test_budget_caps_hedges(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        hedger = _hedger(monkeypatch, SAHAYAKAI_HEDGE_BUDGET_PERCENT="0")
+        model = _Model({"k1": 0.08, "k2": 0.0})
+        for _ in range(8):
+            await hedger.attempt(model, ("k1", "k2"), span_name="s", timeout_s=2.0)
+        snap = hedger.snapshot()["spans"]["s"]
+        # Only the initial burst is spendable with a zero budget.
+        assert snap["hedgesFired"] == 5
+        assert snap["budgetDenied"] == 3
+
+    async def test_delay_tracks_percentile(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        hedger = _hedger(monkeypatch, SAHAYAKAI_HEDGE_DELAY_MS="3000")
+        assert hedger.delay_for("s") == 3.0
+        model = _Model({"k1": 0.0})
+        for _ in range(20):
+            await hedger.attempt(model, ("k1", "k2"), span_name="s", timeout_s=2.0)
+        # Warmed up on near-instant calls -> clamped to the floor.
+        assert hedger.delay_for("s") == pytest.approx(0.1)
+
+
+class TestRunResilientlyHedge:
+    async def test_hedged_when_enabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        _hedger(monkeypatch)
+        model = _Model({"k1": 1.0, "k2": 0.0})
+        monkeypatch.setattr("random.random", lambda: 0.0)
+        result = await run_resiliently(
+            model, ("k1", "k2", "k3"), span_name="s",
+            per_call_timeout_seconds=2.0, hedge=True,
+        )
+        assert result == "answer-from-k2"
+        assert model.calls == ["k1", "k2"]
+        assert model.cancelled == ["k1"]
+        assert get_hedger().snapshot()["spans"]["s"]["hedgesFired"] == 1
+
+    async def test_next_attempt_skips_hedged_key(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _hedger(monkeypatch)
+        model = _Model({"k1": 5.0, "k2": 5.0, "k3": 0.0})
+        monkeypatch.setattr("random.random", lambda: 0.0)
+        result = await run_resiliently(
+            model, ("k1", "k2", "k3"), span_name="s",
+            per_call_timeout_seconds=0.2, hedge=True,
+        )
+        assert result == "answer-from-k3"
+        assert model.calls == ["k1", "k2", "k3"]
+
+    async def test_not_hedged_when_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        _hedger(monkeypatch, SAHAYAKAI_HEDGE_ENABLED="false")
+        model = _Model({"k1": 0.15})
+        monkeypatch.setattr("random.random", lambda: 0.0)
+        result = await run_resiliently(
+            model, ("k1", "k2"), span_name="s", per_call_timeout_seconds=2.0, hedge=True,
+        )
+        assert result == "answer-from-k1"
+        assert model.calls == ["k1"]
@@ -0,0 +1,156 @@
+"""Unit tests for shared.image_pipeline.
+
+- large photos are downscaled to the long-side cap and re-encoded,
+- EXIF orientation is applied before the model sees the page,
+- small and undecodable uploads pass through byte-for-byte,
+- a re-uploaded copy of a page is flagged as a duplicate; different
+  pages are not, even ruled pages with only a few words on them.
+"""
+from __future__ import annotations
+
+import io
+import random
+
+import pytest
+from PIL import Image, ImageDraw
+
+from sahayakai_agents.shared.image_pipeline import (
+    is_duplicate,
+    prepare_image,
+    prepare_image_async,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _page(seed: int, size: tuple[int, int] = (1800, 2400)) -> Image.Image:
+    """A ruled page of random 'handwriting' strokes."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", size, (240, 238, 230))
+    draw = ImageDraw.Draw(img)
+    for row in range(size[1] // 90 - 1):
+        y, x = 60 + row * 90, 60
+        while x < size[0] - 160:
+            width = rng.randint(30, 160)
+            draw.rectangle([x, y, x + width, y + 30], fill=(30, 30, 60))
+            x += width + rng.randint(20, 60)
+    return img
+
+
+def _sparse_page(seed: int, words: int, size: tuple[int, int] = (1800, 2400)) -> Image.Image:
+    """A ruled exercise-book page with a few handwritten 'words'."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", size, (240, 238, 230))
+    draw = ImageDraw.Draw(img)
+    for y in range(150, size[1] - 60, 90):
+        draw.line([(0, y), (size[0], y)], fill=(150, 170, 210), width=4)
+    draw.line([(200, 0), (200, size[1])], fill=(210, 120, 120), width=4)
+    for _ in range(words):
+        x, base = rng.randint(240, 1400), 140 + rng.randrange(20) * 90
+        stroke = [(x + i * 6, base - rng.randint(0, 45)) for i in range(rng.randint(10, 50))]
+        draw.line(stroke, fill=(20, 40, 140), width=3)
+    return img
+
+
+def _jpeg(img: Image.Image, *, quality: int = 92, orientation: int | None = None) -> bytes:
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[0x0112] = orientation
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=quality, exif=exif)
+    return out.getvalue()
+
+
+class TestPrepareImage:
+    def test_downscales_large_photo(self) -> None:
+        data = _jpeg(_page(1))
+        image = prepare_image(data, "image/jpeg", max_side=1000)
+        assert (image.width, image.height) == (750, 1000)
+        assert image.mime_type == "image/jpeg"
+        assert len(image.data) < len(data)
+        assert image.source_bytes == len(data)
+        assert Image.open(io.BytesIO(image.data)).size == (750, 1000)
+
+    def test_applies_exif_orientation(self) -> None:
+        # Stored landscape, tagged "rotate 90 CW" -> portrait page.
+        data = _jpeg(_page(2, size=(2400, 1800)), orientation=6)
+        image = prepare_image(data, "image/jpeg", max_side=1000)
+        assert (image.width, image.height) == (750, 1000)
+
+    def test_flattens_transparent_png(self) -> None:
+        img = _page(3).convert("RGBA")
+        out = io.BytesIO()
+        img.save(out, format="PNG")
+        image = prepare_image(out.getvalue(), "image/png", max_side=800)
+        assert image.mime_type == "image/jpeg"
+        assert Image.open(io.BytesIO(image.data)).mode == "RGB"
+
+    def test_small_image_passes_through(self) -> None:
+        data = _jpeg(_page(4, size=(400, 300)))
+        image = prepare_image(data, "image/jpeg", fingerprint=True)
+        assert image.data == data
+        assert image.mime_type == "image/jpeg"
+        assert image.phash is not None
+
+    def test_fingerprint_is_opt_in(self) -> None:
+        for data in (_jpeg(_page(4, size=(400, 300))), _jpeg(_page(1))):
+            image = prepare_image(data, "image/jpeg")
+            assert (image.phash, image.ink, image.ink_halo) == (None, 0, 0)
+
+    def test_undecodable_bytes_pass_through(self) -> None:
+        image = prepare_image(b"\x89PNG not really", "image/png", fingerprint=True)
+        assert image.data == b"\x89PNG not really"
+        assert image.mime_type == "image/png"
+        assert image.phash is None
+
+    async def test_async_wrapper(self) -> None:
+        image = await prepare_image_async(_jpeg(_page(5)), "image/jpeg")
+        assert max(image.width, image.height) <= 1536
+
+
+def _recopy(original: Image.Image) -> bytes:
+    """The same photo cropped by 5 px, resized, brightened and recompressed."""
+    copy = (
+        original.crop((5, 5, original.width - 5, original.height - 5))
+        .resize((1200, 1600))
+        .point(lambda v: min(255, v + 8))
+    )
+    return _jpeg(copy, quality=60)
+
+
+class TestDuplicates:
+    def test_recompressed_copy_is_duplicate(self) -> None:
+        original = _page(6)
+        a = prepare_image(_jpeg(original), "image/jpeg", fingerprint=True)
+        b = prepare_image(_recopy(original), "image/jpeg", fingerprint=True)
+        assert is_duplicate(a, b)
+
+    def test_recompressed_sparse_copy_is_duplicate(self) -> None:
+        original = _sparse_page(7, words=2)
+        a = prepare_image(_jpeg(original), "image/jpeg", fingerprint=True)
+        b = prepare_image(_recopy(original), "image/jpeg", fingerprint=True)
+        assert is_duplicate(a, b)
+
+    def test_sparse_ruled_pages_are_not(self) -> None:
+        # Same ruling, a few different words: the difference hashes of
+        # these pairs are only 3-22 bits apart.
+        for seed in range(8):
+            words = 1 + seed % 4
+            a = prepare_image(_jpeg(_sparse_page(200 + seed, words)), "image/jpeg", fingerprint=True)
+            b = prepare_image(_jpeg(_sparse_page(300 + seed, words)), "image/jpeg", fingerprint=True)
+            assert not is_duplicate(a, b)
+
+    def test_blank_pages_are_not(self) -> None:
+        a = prepare_image(_jpeg(_sparse_page(1, words=0)), "image/jpeg", fingerprint=True)
+        b = prepare_image(_jpeg(_sparse_page(2, words=0)), "image/jpeg", fingerprint=True)
+        assert not is_duplicate(a, b)
+
+    def test_different_pages_are_not(self) -> None:
+        images = [prepare_image(_jpeg(_page(seed)), "image/jpeg", fingerprint=True) for seed in range(10, 16)]
+        for i, a in enumerate(images):
+            for b in images[i + 1:]:
+                assert not is_duplicate(a, b)
+
+    def test_undecodable_never_duplicate(self) -> None:
+        junk = prepare_image(b"junk", "image/png", fingerprint=True)
+        assert not is_duplicate(junk, junk)
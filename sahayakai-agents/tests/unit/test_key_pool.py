@@ -0,0 +1,152 @@
+"""Health-aware key scheduling (key_pool.py + run_resiliently).
+
+- 429 / 401 / 403 put a key in cooldown and later requests avoid it,
+- in-flight load, latency EWMA and RPM quota steer the pick,
+- scheduling never blocks when every key is unhealthy,
+- `/readyz` state never carries the raw key.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from sahayakai_agents.config import get_settings
+from sahayakai_agents.key_pool import KeyPool, get_key_pool, key_id
+from sahayakai_agents.resilience import run_resiliently
+
+pytestmark = pytest.mark.unit
+
+_KEYS = ("k1", "k2", "k3")
+
+
+def _pool(monkeypatch: pytest.MonkeyPatch, **env: str) -> KeyPool:
+    monkeypatch.setenv("GOOGLE_GENAI_API_KEY", ",".join(_KEYS))
+    monkeypatch.setenv("GOOGLE_GENAI_SHADOW_API_KEY", "")
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    get_settings.cache_clear()
+    # Deterministic tie-break: first key in pool order.
+    monkeypatch.setattr("random.random", lambda: 0.0)
+    return KeyPool(get_settings())
+
+
+class TestPick:
+    def test_fresh_pool_ties_break_randomly(self) -> None:
+        pool = KeyPool(get_settings())
+        assert {pool.pick(_KEYS) for _ in range(200)} == set(_KEYS)
+
+    def test_throttled_key_cools_down(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pool = _pool(monkeypatch)
+        pool.begin("k1")
+        pool.end("k1", latency_s=0.2, status=429, failed=True)
+        assert pool.pick(_KEYS) == "k2"
+        snap = {k["keyId"]: k for k in pool.snapshot()["keys"]}[key_id("k1")]
+        assert snap["throttled"] == 1
+        assert 0 < snap["cooldownRemainingS"] <= 1.0
+
+    def test_consecutive_throttles_double_cooldown(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        pool = _pool(monkeypatch)
+        for _ in range(3):
+            pool.begin("k1")
+            pool.end("k1", latency_s=0.1, status=429, failed=True)
+        snap = {k["keyId"]: k for k in pool.snapshot()["keys"]}[key_id("k1")]
+        assert 3.0 < snap["cooldownRemainingS"] <= 4.0
+
+    def test_auth_failure_benches_key(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pool = _pool(monkeypatch)
+        pool.begin("k1")
+        pool.end("k1", latency_s=0.1, status=403, failed=True)
+        snap = {k["keyId"]: k for k in pool.snapshot()["keys"]}[key_id("k1")]
+        assert snap["authFailures"] == 1
+        assert snap["cooldownRemainingS"] > 60
+
+    def test_prefers_least_loaded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pool = _pool(monkeypatch)
+        pool.begin("k1")
+        pool.begin("k2")
+        assert pool.pick(_KEYS) == "k3"
+
+    def test_prefers_faster_key(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pool = _pool(monkeypatch)
+        for key, latency in (("k1", 3.0), ("k2", 0.5), ("k3", 1.5)):
+            pool.begin(key)
+            pool.end(key, latency_s=latency)
+        assert pool.pick(_KEYS) == "k2"
+
+    def test_excluded_keys_skipped_until_exhausted(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        pool = _pool(monkeypatch)
+        assert pool.pick(_KEYS, exclude={"k1", "k2"}) == "k3"
+        assert pool.pick(_KEYS, exclude=set(_KEYS)) == "k1"
+
+    def test_rpm_bucket(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pool = _pool(monkeypatch, SAHAYAKAI_GENAI_KEY_RPM="2")
+        for _ in range(2):
+            pool.begin("k1")
+            pool.end("k1", latency_s=0.1)
+        # k1 is fastest-on-record but out of requests for this minute.
+        pool.begin("k2")
+        pool.end("k2", latency_s=2.0)
+        pool.begin("k3")
+        pool.end("k3", latency_s=2.0)
+        assert pool.pick(_KEYS) == "k2"
+
+    def test_never_blocks_when_all_cooling(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pool = _pool(monkeypatch)
+        for key in _KEYS:
+            pool.begin(key)
+            pool.end(key, latency_s=0.1, status=429, failed=True)
+        assert pool.pick(_KEYS) in _KEYS
+
+    def test_snapshot_hides_keys(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pool = _pool(monkeypatch)
+        snap = pool.snapshot()
+        assert [k["keyId"] for k in snap["keys"]] == [key_id(k) for k in _KEYS]
+        assert "k1" not in str(snap)
+
+
+class TestRunResilientlyScheduling:
+    async def test_concurrent_requests_avoid_throttled_key(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _pool(monkeypatch)
+        calls: list[str] = []
+
+        async def fn(key: str) -> str:
+            calls.append(key)
+            if key == "k1":
+                err = Exception("429 RESOURCE_EXHAUSTED")
+                err.status = 429  # type: ignore[attr-defined]
+                raise err
+            await asyncio.sleep(0.01)
+            return key
+
+        first = await run_resiliently(fn, _KEYS, span_name="t", max_total_backoff_seconds=2)
+        assert calls == ["k1", "k2"] and first == "k2"
+        calls.clear()
+        # Later requests skip the cooling key entirely.
+        results = await asyncio.gather(*(
+            run_resiliently(fn, _KEYS, span_name="t") for _ in range(4)
+        ))
+        assert "k1" not in calls
+        assert set(results) == {"k2", "k3"}
+
+    async def test_in_flight_released_on_timeout(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _pool(monkeypatch)
+
+        async def fn(key: str) -> str:
+            if key == "k1":
+                await asyncio.sleep(5)
+            return key
+
+        result = await run_resiliently(
+            fn, _KEYS, span_name="t", per_call_timeout_seconds=0.05
+        )
+        assert result == "k2"
+        assert all(k["inFlight"] == 0 for k in get_key_pool().snapshot()["keys"])
@@ -133,6 +133,9 @@ class _StubCtx:
 
 class _StubSettings:
     max_total_backoff_seconds = 7.0
+    # These tests pin the gate on MODEL verdicts; `_good_plan_dict` is
+    # structurally thin and the pre-check would decide it locally.
+    lesson_plan_pre_eval = "off"
 
 
 def _base_request_dict() -> dict[str, Any]:
@@ -0,0 +1,146 @@
+"""Deterministic lesson-plan pre-check (agents/lesson_plan/pre_evaluator.py).
+
+- a complete plan defers to the model, or passes locally in `full` mode,
+- two or three failed rubric axes revise locally, with the failed
+  checks as fail reasons and `classify_verdict` agreeing,
+- one failed axis (gate says pass), four or more (gate says hard_fail)
+  and any failure on v2 defer to the model,
+- durations parse across units, ranges and scripts.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from sahayakai_agents.agents.lesson_plan.agent import classify_verdict
+from sahayakai_agents.agents.lesson_plan.pre_evaluator import (
+    PreEvalMode,
+    PreEvaluation,
+    parse_minutes,
+    pre_evaluate,
+)
+from sahayakai_agents.agents.lesson_plan.schemas import LessonPlanCore, LessonPlanRequest
+
+pytestmark = pytest.mark.unit
+
+_PHASES = ("Engage", "Explore", "Explain", "Elaborate", "Evaluate")
+_DESCRIPTION = (
+    "Students work in pairs with fresh leaves and a magnifying glass, sketch "
+    "the veins and compare the upper and lower surfaces before sharing what "
+    "they noticed about colour, texture and shape with the whole class."
+)
+
+
+def _plan(**overrides: Any) -> LessonPlanCore:
+    fields: dict[str, Any] = {
+        "title": "Photosynthesis for Class 5",
+        "duration": "45 minutes",
+        "objectives": ["Explain how green plants make food using sunlight."],
+        "activities": [
+            {"phase": phase, "name": f"{phase} activity",
+             "description": _DESCRIPTION, "duration": "9 min"}
+            for phase in _PHASES
+        ],
+        "assessment": "Five-question exit quiz on inputs and outputs.",
+        "language": "en",
+    }
+    return LessonPlanCore.model_validate({**fields, **overrides})
+
+
+def _request(language: str = "en") -> LessonPlanRequest:
+    return LessonPlanRequest(topic="Photosynthesis", language=language, userId="t-1")
+
+
+def _run(
+    plan: LessonPlanCore,
+    *,
+    mode: PreEvalMode = "revise",
+    v2: bool = False,
+    language: str = "en",
+) -> PreEvaluation:
+    return pre_evaluate(plan, _request(language), mode=mode, scoring_v2=v2)
+
+
+class TestDecisions:
+    def test_complete_plan_defers(self) -> None:
+        result = _run(_plan())
+        assert (result.decision, result.failed, result.verdict) == ("defer", (), None)
+
+    def test_complete_plan_passes_in_full_mode(self) -> None:
+        result = _run(_plan(), mode="full")
+        assert result.decision == "pass"
+        assert result.verdict is not None
+        assert classify_verdict(result.verdict) == "pass"
+        assert result.verdict.fail_reasons == []
+
+    def test_full_mode_needs_tight_timing(self) -> None:
+        # 5 x 10 = 50 minutes of a 45-minute lesson: fine, but not tight.
+        activities = [a.model_dump() | {"duration": "10 minutes"} for a in _plan().activities]
+        assert _run(_plan(activities=activities), mode="full").decision == "defer"
+        unparsable = [a.model_dump() | {"duration": "a while"} for a in _plan().activities]
+        assert _run(_plan(activities=unparsable), mode="full").decision == "defer"
+
+    def test_off_never_decides(self) -> None:
+        assert _run(_plan(assessment=None, activities=[]), mode="off").decision == "defer"
+
+    def test_structural_failures_revise_locally(self) -> None:
+        activities = [a for a in _plan().activities if a.phase != "Evaluate"]
+        result = _run(_plan(assessment="  ", activities=activities))
+        assert result.decision == "revise"
+        assert result.failed == ("assessment", "phases")
+        verdict = result.verdict
+        assert verdict is not None
+        assert classify_verdict(verdict) == "revise"
+        assert verdict.safety is True
+        assert verdict.scores.objective_assessment_match == 0.0
+        assert verdict.scores.scaffolding_present == 0.0
+        assert verdict.fail_reasons[1] == (
+            "Activities do not cover the 5E phases: missing Evaluate."
+        )
+
+    def test_timing_and_script_failures(self) -> None:
+        activities = [a.model_dump() | {"duration": "1 hour"} for a in _plan().activities]
+        result = _run(_plan(activities=activities), language="hi")
+        assert result.decision == "revise"
+        assert result.failed == ("timing", "script")
+        assert "add up to 300 minutes" in result.verdict.fail_reasons[0]  # type: ignore[union-attr]
+
+    def test_one_failed_axis_defers(self) -> None:
+        # Missing objectives and assessment both lower the same axis;
+        # 6 of 7 still pass, which the gate calls a pass.
+        result = _run(_plan(objectives=[], assessment=None))
+        assert (result.decision, result.failed) == ("defer", ("objectives", "assessment"))
+
+    def test_hard_fail_territory_defers(self) -> None:
+        stub = _plan(
+            assessment=None,
+            duration="45 minutes",
+            activities=[{"phase": "Engage", "name": "Riddle", "description": "Ask.",
+                         "duration": "2 hours"}],
+        )
+        result = _run(stub)
+        assert result.failed == ("assessment", "phases", "timing", "length")
+        assert result.decision == "defer"
+
+    def test_v2_is_never_revised_locally(self) -> None:
+        result = _run(_plan(assessment=None, activities=[]), v2=True)
+        assert result.decision == "defer"
+        assert result.verdict is None
+
+
+@pytest.mark.parametrize(
+    ("text", "minutes"),
+    [
+        ("45 minutes", 45),
+        ("1 hour 30 min", 90),
+        ("1h30m", 90),
+        ("5-7 min", 6),
+        ("१० मिनट", 10),
+        ("1 घंटा", 60),
+        ("about ten minutes", None),
+        (None, None),
+    ],
+)
+def test_parse_minutes(text: str | None, minutes: float | None) -> None:
+    assert parse_minutes(text) == minutes
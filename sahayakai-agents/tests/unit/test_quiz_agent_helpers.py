@@ -147,24 +147,47 @@ def test_build_variant_agent_shape() -> None:
 # ---- variant wrapper eats exceptions --------------------------------
 
 
+def _scheduled_ctx(*difficulties: str) -> Any:
+    """Minimal InvocationContext stand-in: a session whose state seeds
+    prompts for `difficulties` (i.e. those variants are scheduled)."""
+    from types import SimpleNamespace  # noqa: PLC0415
+
+    state = {sut.variant_prompt_state_key(d): f"prompt {d}" for d in difficulties}
+    return SimpleNamespace(
+        session=SimpleNamespace(state=state),
+        invocation_id="inv-1",
+        branch="quiz_variants_parallel",
+    )
+
+
 @pytest.mark.asyncio
 async def test_variant_wrapper_eats_inner_exception() -> None:
     """ParallelAgent runs sub-agents under TaskGroup — any raise would
-    cancel siblings. The wrapper must catch and exit cleanly."""
+    cancel siblings. The wrapper must catch and exit cleanly, emitting
+    only the failure record the router's retry scheduling reads."""
+
+    class _RateLimited(RuntimeError):
+        status_code = 429
 
     class _RaisingInner:
         name = "quiz_variant_easy"
         sub_agents: list[Any] = []
 
         async def run_async(self, ctx: Any):  # noqa: ANN001
-            raise RuntimeError("boom")
+            raise _RateLimited("boom")
             yield  # pragma: no cover
 
     wrapper = sut.build_variant_wrapper("easy", inner_override=_RaisingInner())
     events = []
-    async for ev in wrapper._run_async_impl(ctx=None):  # type: ignore[arg-type]
+    async for ev in wrapper._run_async_impl(ctx=_scheduled_ctx("easy")):
         events.append(ev)
-    assert events == []  # wrapper yielded nothing on error
+    (event,) = events
+    assert event.content is None
+    assert event.actions.state_delta == {
+        sut.variant_error_state_key("easy"): {
+            "errorType": "_RateLimited", "status": 429,
+        },
+    }
 
 
 @pytest.mark.asyncio
@@ -182,6 +205,28 @@ async def test_variant_wrapper_passes_through_events() -> None:
         "medium", inner_override=_Inner(),
     )
     events = []
-    async for ev in wrapper._run_async_impl(ctx=None):  # type: ignore[arg-type]
+    async for ev in wrapper._run_async_impl(ctx=_scheduled_ctx("medium")):
         events.append(ev)
     assert events == [sentinel]
+
+
+@pytest.mark.asyncio
+async def test_variant_wrapper_skips_unscheduled_variant() -> None:
+    """A retry seeds only the failed difficulties; the rest must not
+    call the model again."""
+
+    class _Inner:
+        name = "quiz_variant_hard"
+        sub_agents: list[Any] = []
+        ran = False
+
+        async def run_async(self, ctx: Any):  # noqa: ANN001
+            type(self).ran = True
+            yield object()
+
+    wrapper = sut.build_variant_wrapper("hard", inner_override=_Inner())
+    events = [
+        ev async for ev in wrapper._run_async_impl(ctx=_scheduled_ctx("easy"))
+    ]
+    assert events == []
+    assert _Inner.ran is False
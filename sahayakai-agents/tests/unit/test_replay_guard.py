@@ -0,0 +1,170 @@
+"""Replay-guard backends + the shared check in `authenticate_request`.
+
+`FirestoreReplayGuard` runs against the in-memory Firestore fake; two
+guards sharing one fake stand in for two Cloud Run instances.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import time
+from typing import Any
+
+import pytest
+
+from sahayakai_agents import auth as auth_module
+from sahayakai_agents.config import get_settings
+from sahayakai_agents.replay_guard import (
+    FirestoreReplayGuard,
+    build_replay_guard,
+    get_replay_guard,
+    reset_replay_guard,
+)
+from sahayakai_agents.shared.errors import ReplayDetectedError
+
+from .fake_firestore import FakeStore
+
+pytestmark = pytest.mark.unit
+
+
+class _BrokenStore:
+    def collection(self, _name: str) -> Any:
+        raise RuntimeError("firestore unavailable")
+
+
+class TestFirestoreReplayGuard:
+    async def test_replay_on_another_instance_is_rejected(self) -> None:
+        store = FakeStore()
+        instance_a = FirestoreReplayGuard(store, collection="nonces")
+        instance_b = FirestoreReplayGuard(store, collection="nonces")
+
+        assert await instance_a.claim("n1") is True
+        assert await instance_b.claim("n1") is False
+        assert instance_b.stats.shared_hits == 1
+
+    async def test_nonce_doc_carries_expire_at_for_ttl_policy(self) -> None:
+        store = FakeStore()
+        guard = FirestoreReplayGuard(store, collection="nonces", ttl_seconds=360)
+        await guard.claim("n1")
+        doc = store.get(("nonces", "n1"))
+        assert doc is not None
+        assert (doc["expireAt"] - doc["createdAt"]).total_seconds() == 360
+
+    async def test_backend_error_fails_open_and_is_counted(self) -> None:
+        guard = FirestoreReplayGuard(_BrokenStore(), collection="nonces")
+        assert await guard.claim("n1") is True
+        assert guard.stats.errors == 1
+        assert guard.stats.shared_checks == 1
+
+    async def test_latency_counters(self) -> None:
+        guard = FirestoreReplayGuard(FakeStore(), collection="nonces")
+        for nonce in ("n1", "n2", "n3"):
+            await guard.claim(nonce)
+        snap = guard.stats.snapshot()
+        assert snap["sharedChecks"] == 3
+        assert snap["misses"] == 3
+        assert snap["sharedLatencyMsMax"] >= snap["sharedLatencyMsAvg"] >= 0
+
+
+class TestBuildReplayGuard:
+    def test_memory_backend_has_no_shared_guard(self) -> None:
+        assert build_replay_guard(get_settings()) is None
+
+    def test_firestore_backend(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("SAHAYAKAI_REPLAY_GUARD_BACKEND", "firestore")
+        monkeypatch.setenv("SAHAYAKAI_REPLAY_GUARD_COLLECTION", "custom_nonces")
+        get_settings.cache_clear()
+
+        built: list[dict[str, Any]] = []
+
+        def _fake_init(self: FirestoreReplayGuard, client: Any = None, **kwargs: Any) -> None:
+            built.append(kwargs)
+
+        monkeypatch.setattr(FirestoreReplayGuard, "__init__", _fake_init)
+        guard = build_replay_guard(get_settings())
+        assert isinstance(guard, FirestoreReplayGuard)
+        assert built == [{"collection": "custom_nonces"}]
+
+
+def _signed_request(body: bytes, timestamp: str) -> Any:
+    from starlette.requests import Request  # noqa: PLC0415
+
+    key = get_settings().request_signing_key.get_secret_value().encode()
+    digest = base64.b64encode(
+        hmac.new(key, timestamp.encode() + b":" + body, hashlib.sha256).digest()
+    ).decode()
+
+    async def _receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/v1/vidya/orchestrate",
+            "headers": [
+                (b"authorization", b"Bearer fake-token"),
+                (b"x-content-digest", f"sha256={digest}".encode()),
+                (b"x-request-timestamp", timestamp.encode()),
+            ],
+        },
+        _receive,
+    )
+
+
+class TestAuthenticateRequestSharedCheck:
+    @pytest.fixture
+    def prod_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        invoker = "svc-next@sahayakai-b4248.iam.gserviceaccount.com"
+        monkeypatch.setenv("SAHAYAKAI_AGENTS_ENV", "production")
+        monkeypatch.setenv("SAHAYAKAI_AGENTS_AUDIENCE", "https://aud.run.app")
+        monkeypatch.setenv("SAHAYAKAI_AGENTS_ALLOWED_INVOKERS", invoker)
+        monkeypatch.setenv("SAHAYAKAI_REQUEST_SIGNING_KEY", "k" * 64)
+        monkeypatch.setenv("SAHAYAKAI_REQUIRE_APP_CHECK", "false")
+        monkeypatch.setenv("GOOGLE_GENAI_SHADOW_API_KEY", "shadow-only")
+        get_settings.cache_clear()
+        monkeypatch.setattr(
+            auth_module.google_id_token,
+            "verify_oauth2_token",
+            lambda *_a, **_kw: {
+                "iss": "https://accounts.google.com",
+                "email": invoker,
+                "exp": int(time.time()) + 300,
+            },
+        )
+        auth_module._REPLAY_GUARD.clear()
+
+    async def test_replay_seen_by_another_instance_is_rejected(
+        self, prod_env: None
+    ) -> None:
+        store = FakeStore()
+        body, ts = b'{"q":"hi"}', str(int(time.time() * 1000))
+
+        # "Instance A" serves the original request.
+        reset_replay_guard(FirestoreReplayGuard(store, collection="nonces"))
+        await auth_module.authenticate_request(_signed_request(body, ts))
+
+        # "Instance B": fresh process-local cache, same Firestore.
+        auth_module._REPLAY_GUARD.clear()
+        reset_replay_guard(FirestoreReplayGuard(store, collection="nonces"))
+        with pytest.raises(ReplayDetectedError):
+            await auth_module.authenticate_request(_signed_request(body, ts))
+
+    async def test_same_instance_replay_skips_the_round_trip(
+        self, prod_env: None
+    ) -> None:
+        guard = FirestoreReplayGuard(FakeStore(), collection="nonces")
+        reset_replay_guard(guard)
+        ts = str(int(time.time() * 1000))
+        await auth_module.authenticate_request(_signed_request(b"{}", ts))
+        with pytest.raises(ReplayDetectedError):
+            await auth_module.authenticate_request(_signed_request(b"{}", ts))
+        assert guard.stats.shared_checks == 1
+
+    async def test_default_is_the_local_check_only(self, prod_env: None) -> None:
+        ts = str(int(time.time() * 1000))
+        await auth_module.authenticate_request(_signed_request(b"{}", ts))
+        assert get_replay_guard() is None
+        with pytest.raises(ReplayDetectedError):
+            await auth_module.authenticate_request(_signed_request(b"{}", ts))
@@ -0,0 +1,213 @@
+"""Response cache: tiers, single-flight coalescing, keys.
+
+`FirestoreCacheTier` runs against the in-memory Firestore fake.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from sahayakai_agents.config import get_settings
+from sahayakai_agents.response_cache import (
+    DiskCacheTier,
+    FirestoreCacheTier,
+    ResponseCache,
+    build_response_cache,
+    prompt_version,
+    response_cache_key,
+)
+from sahayakai_agents.shared.errors import AgentError
+
+from .fake_firestore import FakeStore
+
+pytestmark = pytest.mark.unit
+
+
+class _Out(BaseModel):
+    text: str
+    n: int = 0
+
+
+class _Counter:
+    def __init__(self, *, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self) -> _Out:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return _Out(text="plan", n=self.calls)
+
+
+async def _get(cache: ResponseCache, compute: Any, **kwargs: Any) -> tuple[_Out, str]:
+    return await cache.get_or_compute(
+        "k1", route="quiz", model=_Out, compute=compute, **kwargs
+    )
+
+
+class TestResponseCache:
+    async def test_second_call_is_a_memory_hit(self) -> None:
+        cache, compute = ResponseCache(), _Counter()
+        assert await _get(cache, compute) == (_Out(text="plan", n=1), "miss")
+        assert await _get(cache, compute) == (_Out(text="plan", n=1), "hit")
+        assert compute.calls == 1
+        assert cache.stats.memory_hits == 1
+        assert cache.stats.stores == 1
+
+    async def test_concurrent_identical_requests_compute_once(self) -> None:
+        cache, compute = ResponseCache(), _Counter(delay=0.05)
+        results = await asyncio.gather(*(_get(cache, compute) for _ in range(20)))
+        assert compute.calls == 1
+        assert all(r == _Out(text="plan", n=1) for r, _ in results)
+        assert [s for _, s in results].count("miss") == 1
+        assert cache.stats.coalesced == 19
+
+    async def test_leader_error_reaches_followers_and_is_not_cached(self) -> None:
+        cache = ResponseCache()
+        calls = 0
+
+        async def _boom() -> _Out:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            raise AgentError(code="INTERNAL", message="nope", http_status=502)
+
+        results = await asyncio.gather(
+            *(_get(cache, _boom) for _ in range(3)), return_exceptions=True
+        )
+        assert calls == 1
+        assert all(isinstance(r, AgentError) for r in results)
+        assert await _get(cache, _Counter()) == (_Out(text="plan", n=1), "miss")
+
+    async def test_cancelled_leader_hands_over_to_a_follower(self) -> None:
+        cache, compute = ResponseCache(), _Counter(delay=0.05)
+        leader = asyncio.create_task(_get(cache, compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(_get(cache, compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == (_Out(text="plan", n=2), "miss")
+
+    async def test_uncacheable_result_is_served_but_not_stored(self) -> None:
+        cache, compute = ResponseCache(), _Counter()
+        await _get(cache, compute, cacheable=lambda r: False)
+        _, status = await _get(cache, compute, cacheable=lambda r: False)
+        assert status == "miss"
+        assert compute.calls == 2
+        assert cache.stats.stores == 0
+
+    async def test_fresh_skips_lookup_but_refreshes_entry(self) -> None:
+        cache, compute = ResponseCache(), _Counter()
+        await _get(cache, compute)
+        assert await _get(cache, compute, fresh=True) == (_Out(text="plan", n=2), "miss")
+        assert await _get(cache, compute) == (_Out(text="plan", n=2), "hit")
+
+    async def test_disabled_always_computes(self) -> None:
+        cache, compute = ResponseCache(enabled=False), _Counter()
+        await _get(cache, compute)
+        await _get(cache, compute)
+        assert compute.calls == 2
+
+    async def test_invalidate_route(self) -> None:
+        cache, compute = ResponseCache(), _Counter()
+        await _get(cache, compute)
+        assert await cache.invalidate("worksheet") == 0
+        assert await cache.invalidate("quiz") == 1
+        assert (await _get(cache, compute))[1] == "miss"
+
+
+class _BrokenTier(DiskCacheTier):
+    async def get(self, route: str, key: str) -> dict[str, Any] | None:
+        raise RuntimeError("disk gone")
+
+    async def set(self, route: str, key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+        raise RuntimeError("disk gone")
+
+
+class TestSharedTiers:
+    async def test_disk_tier_is_shared_between_instances(self, tmp_path: Path) -> None:
+        compute = _Counter()
+        first = ResponseCache(shared=DiskCacheTier(tmp_path))
+        second = ResponseCache(shared=DiskCacheTier(tmp_path))
+        await _get(first, compute)
+        assert await _get(second, compute) == (_Out(text="plan", n=1), "hit")
+        assert second.stats.shared_hits == 1
+        assert await second.invalidate("quiz") == 2  # memory + disk
+        assert not list((tmp_path / "quiz").glob("*.json"))
+
+    async def test_disk_tier_expires(self, tmp_path: Path) -> None:
+        tier = DiskCacheTier(tmp_path)
+        await tier.set("quiz", "k", {"text": "x"}, ttl_seconds=-1)
+        assert await tier.get("quiz", "k") is None
+
+    async def test_firestore_tier_round_trip(self) -> None:
+        store = FakeStore()
+        compute = _Counter()
+        first = ResponseCache(shared=FirestoreCacheTier(store, collection="rc"))
+        second = ResponseCache(shared=FirestoreCacheTier(store, collection="rc"))
+        await _get(first, compute)
+        doc = store.get(("rc", "quiz", "cached_responses", "k1"))
+        assert doc is not None
+        assert (doc["expireAt"] - doc["createdAt"]).total_seconds() == pytest.approx(86_400)
+        assert await _get(second, compute) == (_Out(text="plan", n=1), "hit")
+
+    async def test_firestore_tier_checks_expiry_on_read(self) -> None:
+        store = FakeStore()
+        past = datetime.now(UTC) - timedelta(seconds=1)
+        store.put(
+            ("rc", "quiz", "cached_responses", "k1"),
+            {"value": '{"text": "stale"}', "createdAt": past, "expireAt": past},
+        )
+        tier = FirestoreCacheTier(store, collection="rc")
+        assert await tier.get("quiz", "k1") is None
+
+    async def test_shared_errors_fail_open(self, tmp_path: Path) -> None:
+        cache, compute = ResponseCache(shared=_BrokenTier(tmp_path)), _Counter()
+        assert (await _get(cache, compute))[1] == "miss"
+        assert cache.stats.errors == 2  # the lookup and the store
+
+
+class TestKeys:
+    def test_key_ignores_dict_order_and_tracks_inputs(self) -> None:
+        a = response_cache_key("quiz", {"a": 1, "b": "क"}, prompts="p", model="m")
+        b = response_cache_key("quiz", {"b": "क", "a": 1}, prompts="p", model="m")
+        assert a == b
+        assert a != response_cache_key("quiz", {"a": 1, "b": "क"}, prompts="p2", model="m")
+        assert a != response_cache_key("quiz", {"a": 1, "b": "क"}, prompts="p", model="m2")
+        assert a != response_cache_key("worksheet", {"a": 1, "b": "क"}, prompts="p", model="m")
+
+    def test_prompt_version_follows_template_edits(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "quiz").mkdir()
+        template = tmp_path / "quiz" / "generator.handlebars"
+        template.write_text("v1")
+        monkeypatch.setenv("SAHAYAKAI_PROMPTS_DIR", str(tmp_path))
+        prompt_version.cache_clear()
+        before = prompt_version("quiz")
+        template.write_text("v2")
+        prompt_version.cache_clear()
+        assert prompt_version("quiz") != before
+        prompt_version.cache_clear()
+
+    def test_repo_prompts_resolve(self) -> None:
+        prompt_version.cache_clear()
+        assert prompt_version("lesson-plan") != prompt_version("quiz")
+
+
+class TestBuildResponseCache:
+    def test_defaults_to_memory(self) -> None:
+        cache = build_response_cache(get_settings())
+        assert cache.backend == "memory"
+        assert cache.enabled is True
+
+    def test_disk_backend(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("SAHAYAKAI_RESPONSE_CACHE_BACKEND", "disk")
+        monkeypatch.setenv("SAHAYAKAI_RESPONSE_CACHE_DIR", str(tmp_path))
+        get_settings.cache_clear()
+        assert build_response_cache(get_settings()).backend == "disk"
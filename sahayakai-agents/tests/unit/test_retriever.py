@@ -1,16 +1,30 @@
-"""Placeholder tests for the retriever Protocol + VectorSearchRetriever.
+"""Tests for the retriever Protocol implementations.
 
-The whole file is skip-marked until Phase 4.3 lands the retrieval
-implementation. The file still imports cleanly today so CI's collect
-step does not break, and the skip reason makes the gate explicit.
+``VectorSearchRetriever`` is skip-marked until Phase 4.3 lands the
+Vertex wiring. ``MmapVectorRetriever`` runs against a small index built
+in ``tmp_path``:
+
+- hard filter: a closer vector in another partition is never returned,
+- top-k order by cosine, for both int8 and float16 quantization,
+- English fallback (``lang_not_indexed``) and unindexed partitions,
+- BM25 rerank of the cosine candidates (opt-in), and BM25-only
+  retrieval when the query embedding fails.
 
 Phase 4 §4.6. Plan: ``.claude/plans/phase-4-rag-ncert.md``.
 """
 from __future__ import annotations
 
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
 import pytest
 
+from sahayakai_agents.rag.corpus_ingest import Chunk
+from sahayakai_agents.rag.embeddings import EMBEDDING_DIM
+from sahayakai_agents.rag.mmap_retriever import MmapVectorRetriever, write_mmap_index
 from sahayakai_agents.rag.retriever import Retriever, VectorSearchRetriever
+from sahayakai_agents.rag.schemas import RetrievalQuery
 
 pytestmark = pytest.mark.unit
 
@@ -29,3 +43,175 @@ def test_vector_search_retriever_honours_hard_filter() -> None:
     # TODO Phase 4.3: drive `retriever.retrieve(...)` with a fake
     # Vector Search backend and assert the hard-filter contract.
     assert retriever is not None
+
+
+def _chunk(class_number: int, subject: str, language: str, text: str) -> Chunk:
+    return Chunk(
+        text=text,
+        subject=subject,
+        class_number=class_number,
+        chapter_number=1,
+        chapter_title="Food: Where Does It Come From?",
+        language=language,
+        source_url="https://ncert.nic.in/textbook/pdf/fesc101.pdf",
+        page_start=1,
+        page_end=2,
+        edition="2024-25",
+        sha256="0" * 64,
+    )
+
+
+def _axis(i: int, *, tilt: float = 0.0) -> np.ndarray:
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    vector[i] = 1.0
+    vector[i + 1] = tilt
+    return vector
+
+
+async def _embed_axis0(_text: str, _lang: str) -> np.ndarray:
+    return _axis(0)
+
+
+def _query(**overrides: object) -> RetrievalQuery:
+    fields: dict[str, object] = {
+        "query_text": "plants as food",
+        "language": "en",
+        "class_number": 5,
+        "subject": "science",
+        "chapter_number": None,
+        "top_k": 2,
+    }
+    return RetrievalQuery(**{**fields, **overrides})
+
+
+@pytest.fixture(params=["int8", "float16"])
+def mmap_retriever(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> Iterator[MmapVectorRetriever]:
+    # Interleaved on purpose: the writer must group rows by partition.
+    rows = [
+        (_chunk(9, "mathematics", "en", "exact match, wrong class"), _axis(0)),
+        (_chunk(5, "science", "en", "close"), _axis(0, tilt=0.3)),
+        (_chunk(5, "science", "hi", "hindi close"), _axis(0, tilt=0.1)),
+        (_chunk(5, "science", "en", "far"), _axis(10)),
+        (_chunk(5, "science", "en", "closest"), _axis(0, tilt=0.1)),
+    ]
+    write_mmap_index(
+        tmp_path,
+        [chunk for chunk, _ in rows],
+        np.stack([vector for _, vector in rows]),
+        dtype=request.param,
+    )
+    retriever = MmapVectorRetriever(tmp_path, embed=_embed_axis0)
+    yield retriever
+    retriever.close()
+
+
+class TestMmapVectorRetriever:
+    def test_is_a_retriever(self, mmap_retriever: MmapVectorRetriever) -> None:
+        assert isinstance(mmap_retriever, Retriever)
+        assert mmap_retriever.rows == 5
+
+    async def test_hard_filter_and_order(self, mmap_retriever: MmapVectorRetriever) -> None:
+        context = await mmap_retriever.retrieve(_query())
+        assert [c.chunk_text for c in context.chunks] == ["closest", "close"]
+        assert all(
+            (c.class_number, c.subject, c.language) == (5, "science", "en")
+            for c in context.chunks
+        )
+        assert context.fallback_reason is None
+        top = context.chunks[0]
+        assert top.vector_score == pytest.approx(1 / np.hypot(1, 0.1), abs=0.01)
+        assert top.score == top.vector_score
+        assert top.bm25_score == 0.0
+
+    async def test_top_k_capped_by_partition(
+        self, mmap_retriever: MmapVectorRetriever
+    ) -> None:
+        context = await mmap_retriever.retrieve(_query(top_k=20))
+        assert [c.chunk_text for c in context.chunks] == ["closest", "close", "far"]
+        assert context.chunks[-1].vector_score == 0.0
+
+    async def test_language_partition(self, mmap_retriever: MmapVectorRetriever) -> None:
+        context = await mmap_retriever.retrieve(_query(language="hi"))
+        assert [c.chunk_text for c in context.chunks] == ["hindi close"]
+        assert context.fallback_reason is None
+
+    async def test_unindexed_language_falls_back_to_english(
+        self, mmap_retriever: MmapVectorRetriever
+    ) -> None:
+        context = await mmap_retriever.retrieve(_query(language="ta"))
+        assert [c.language for c in context.chunks] == ["en", "en"]
+        assert context.fallback_reason == "lang_not_indexed"
+
+    async def test_unindexed_partition_returns_nothing(self, tmp_path: Path) -> None:
+        write_mmap_index(
+            tmp_path, [_chunk(5, "science", "en", "x")], _axis(0)[None, :]
+        )
+
+        async def embed(_text: str, _lang: str) -> np.ndarray:
+            raise AssertionError("no partition -> no embedding call")
+
+        retriever = MmapVectorRetriever(tmp_path, embed=embed)
+        context = await retriever.retrieve(_query(subject="history"))
+        assert context.chunks == []
+        assert context.fallback_reason == "partition_not_indexed"
+        retriever.close()
+
+    def test_rejects_other_embedding_model(self, tmp_path: Path) -> None:
+        write_mmap_index(
+            tmp_path, [_chunk(5, "science", "en", "x")], _axis(0)[None, :],
+            embedding_model="text-embedding-004",
+        )
+        with pytest.raises(ValueError, match="text-embedding-004"):
+            MmapVectorRetriever(tmp_path)
+
+    @staticmethod
+    def _write_rerank_index(directory: Path) -> None:
+        rows = [
+            (_chunk(5, "science", "hi", "पौधे हरे होते हैं"), _axis(0, tilt=0.05)),
+            (_chunk(5, "science", "hi", "प्रकाश संश्लेषण से पौधे भोजन बनाते हैं"),
+             _axis(0, tilt=0.1)),
+        ]
+        write_mmap_index(
+            directory, [c for c, _ in rows], np.stack([v for _, v in rows])
+        )
+
+    async def test_bm25_rerank_promotes_exact_tokens(self, tmp_path: Path) -> None:
+        self._write_rerank_index(tmp_path)
+        retriever = MmapVectorRetriever(tmp_path, embed=_embed_axis0, rerank=True)
+        context = await retriever.retrieve(
+            _query(query_text="प्रकाश संश्लेषण क्या है", language="hi")
+        )
+        retriever.close()
+        top, second = context.chunks
+        assert top.chunk_text.startswith("प्रकाश")
+        assert top.vector_score < second.vector_score
+        assert top.bm25_score > 0 and second.bm25_score == 0
+        assert top.score > second.score
+
+    async def test_rerank_is_opt_in(self, tmp_path: Path) -> None:
+        self._write_rerank_index(tmp_path)
+        retriever = MmapVectorRetriever(tmp_path, embed=_embed_axis0)
+        context = await retriever.retrieve(
+            _query(query_text="प्रकाश संश्लेषण क्या है", language="hi")
+        )
+        retriever.close()
+        assert context.chunks[0].chunk_text.startswith("पौधे")
+        assert [c.bm25_score for c in context.chunks] == [0.0, 0.0]
+        assert context.rerank_latency_ms == 0
+
+    async def test_bm25_only_when_embedding_fails(
+        self, mmap_retriever: MmapVectorRetriever, tmp_path: Path
+    ) -> None:
+        async def embed(_text: str, _lang: str) -> np.ndarray:
+            raise NotImplementedError("Vertex embedding not wired")
+
+        # Same index as the fixture's, opened without a working embedder.
+        retriever = MmapVectorRetriever(tmp_path, embed=embed)
+        context = await retriever.retrieve(_query(query_text="closest", language="ta"))
+        retriever.close()
+        assert [c.chunk_text for c in context.chunks] == ["closest"]
+        assert context.chunks[0].vector_score == 0.0
+        assert context.chunks[0].score == 1.0
+        assert context.fallback_reason == "lang_not_indexed,embedding_unavailable"
@@ -7,6 +7,8 @@ Review trace:
 - P0 #10 composite-key turn writes: duplicate turn number → 409.
 - Round-2 P0-4 async wrapper wires sync primitives through `asyncio.to_thread`.
 - Round-2 P0-5 TTL field is `expireAt`, computed as `now + ttl_hours`.
+- Cached async mode: transcript cache validated by the meta doc, turn
+  pairs written in one transaction under the same OCC rules.
 """
 from __future__ import annotations
 
@@ -14,10 +16,17 @@ from datetime import UTC, datetime
 
 import pytest
 
-from sahayakai_agents.session_store import TurnRecord, transcript_to_wire
+from sahayakai_agents.config import Settings
+from sahayakai_agents.session_store import (
+    CachedSessionStore,
+    SessionStore,
+    TurnRecord,
+    build_session_store,
+    transcript_to_wire,
+)
 from sahayakai_agents.shared.errors import SessionConflictError
 
-from .fake_firestore import make_fake_session_store
+from .fake_firestore import make_fake_cached_session_store, make_fake_session_store
 
 pytestmark = pytest.mark.unit
 
@@ -105,6 +114,113 @@ class TestAppendTurn:
             store._sync_append_turn(_record("CAxxx", 1, "system", "?"))  # type: ignore[attr-defined]
 
 
+class TestCachedSessionStore:
+    async def test_pair_write_is_one_read_and_one_commit(self) -> None:
+        store = make_fake_cached_session_store()
+        fake = store._client  # type: ignore[attr-defined]
+        await store.append_turn_pair(
+            _record("CAxxx", 1, "parent", "Namaste"), _record("CAxxx", 1, "agent", "Ji")
+        )
+        assert (fake.reads, fake.commits) == (1, 1)
+        leaves = sorted(p[-1] for p in fake.docs if p[-2] == "turns")
+        assert leaves == ["0001_agent", "0001_parent"]
+        meta = fake.docs[("agent_sessions", "CAxxx")]
+        assert meta["lastTurnNumber"] == 1
+
+    async def test_transcript_served_from_cache_after_first_load(self) -> None:
+        store = make_fake_cached_session_store()
+        fake = store._client  # type: ignore[attr-defined]
+        assert await store.load_transcript("CAxxx") == []
+        for n in range(1, 4):
+            await store.append_turn_pair(
+                _record("CAxxx", n, "parent", f"p{n}"), _record("CAxxx", n, "agent", f"a{n}")
+            )
+            turns = await store.load_transcript("CAxxx")
+            assert [t.text for t in turns][-2:] == [f"p{n}", f"a{n}"]
+        assert fake.scans == 1
+        assert store.cache_hits == 3
+
+    async def test_write_from_another_instance_forces_reload(self) -> None:
+        store = make_fake_cached_session_store()
+        fake = store._client  # type: ignore[attr-defined]
+        await store.load_transcript("CAxxx")
+        await store.append_turn_pair(
+            _record("CAxxx", 1, "parent", "p1"), _record("CAxxx", 1, "agent", "a1")
+        )
+        other = make_fake_cached_session_store()
+        other._client = fake  # type: ignore[attr-defined]
+        await other.append_turn_pair(
+            _record("CAxxx", 2, "parent", "p2"), _record("CAxxx", 2, "agent", "a2")
+        )
+        turns = await store.load_transcript("CAxxx")
+        assert [t.text for t in turns] == ["p1", "a1", "p2", "a2"]
+        assert fake.scans == 2
+
+    async def test_replayed_turn_raises_conflict_and_writes_nothing(self) -> None:
+        store = make_fake_cached_session_store()
+        fake = store._client  # type: ignore[attr-defined]
+        pair = (_record("CAxxx", 1, "parent", "p"), _record("CAxxx", 1, "agent", "a"))
+        await store.append_turn_pair(*pair)
+        before = dict(fake.docs)
+        with pytest.raises(SessionConflictError):
+            await store.append_turn_pair(*pair)
+        assert fake.docs == before
+
+    async def test_mismatched_pair_raises_conflict(self) -> None:
+        store = make_fake_cached_session_store()
+        with pytest.raises(SessionConflictError):
+            await store.append_turn_pair(
+                _record("CAxxx", 1, "parent", "p"), _record("CAxxx", 2, "agent", "a")
+            )
+
+    async def test_mark_ended_drops_cached_transcript(self) -> None:
+        store = make_fake_cached_session_store()
+        await store.load_transcript("CAxxx")
+        await store.mark_ended("CAxxx", 12.5)
+        assert "CAxxx" not in store._transcripts  # type: ignore[attr-defined]
+        meta = store._client.docs[("agent_sessions", "CAxxx")]  # type: ignore[attr-defined]
+        assert meta["durationSeconds"] == 12.5
+
+
+class TestTranscriptOrder:
+    """Both store modes serve the same calls during the rollout, so they
+    must return a transcript in the same order: as spoken."""
+
+    _SPOKEN = ["p1", "a1", "p2", "a2"]
+
+    async def test_thread_mode_is_in_spoken_order(self) -> None:
+        store = make_fake_session_store()
+        for n in (1, 2):
+            store._sync_append_turn(_record("CAxxx", n, "parent", f"p{n}"))  # type: ignore[attr-defined]
+            store._sync_append_turn(_record("CAxxx", n, "agent", f"a{n}"))  # type: ignore[attr-defined]
+        turns = await store.load_transcript("CAxxx")
+        assert [t.text for t in turns] == self._SPOKEN
+
+    async def test_async_mode_is_in_spoken_order(self) -> None:
+        store = make_fake_cached_session_store()
+        for n in (1, 2):
+            await store.append_turn_pair(
+                _record("CAxxx", n, "parent", f"p{n}"), _record("CAxxx", n, "agent", f"a{n}")
+            )
+        # Another instance loads from the scan, not the append cache.
+        cold = make_fake_cached_session_store()
+        cold._client = store._client  # type: ignore[attr-defined]
+        assert [t.text for t in await cold.load_transcript("CAxxx")] == self._SPOKEN
+        assert [t.text for t in await store.load_transcript("CAxxx")] == self._SPOKEN
+
+
+class TestBuildSessionStore:
+    def test_mode_selects_store(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(SessionStore, "__init__", lambda self: None)
+        monkeypatch.setattr(
+            CachedSessionStore, "__init__", lambda self, max_calls: None
+        )
+        thread = build_session_store(Settings(SAHAYAKAI_SESSION_STORE_MODE="thread"))
+        cached = build_session_store(Settings(SAHAYAKAI_SESSION_STORE_MODE="async"))
+        assert type(thread) is SessionStore
+        assert isinstance(cached, CachedSessionStore)
+
+
 class TestTranscriptToWire:
     def test_shape(self) -> None:
         turns = [
@@ -0,0 +1,211 @@
+"""SSE streaming helpers: the incremental JSON scanner and the driver."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from sahayakai_agents._streaming import (
+    JsonSubtreeScanner,
+    StreamSink,
+    current_stream_sink,
+    stream_structured,
+)
+from sahayakai_agents.shared.errors import AgentError
+
+pytestmark = pytest.mark.unit
+
+
+_DOC = {
+    "title": "Fractions: \"halves\" & {quarters} [part 1]",
+    "sections": [
+        {
+            "name": "A",
+            "questions": [
+                {"text": "What is 1/2 + 1/4?", "marks": 2, "ok": True},
+                {"text": "Escape \\ and क", "marks": 3.5, "ok": None},
+            ],
+        },
+        {"name": "B", "questions": [{"text": "[]{}", "marks": 1, "ok": False}]},
+    ],
+    "tags": ["a", "b"],
+}
+_WATCH = ("title", "sections[*].name", "sections[*].questions[*]", "tags[*]")
+
+
+def _expected() -> list[tuple[str, tuple[Any, ...], Any]]:
+    return [
+        ("title", ("title",), _DOC["title"]),
+        ("sections[*].name", ("sections", 0, "name"), "A"),
+        *(
+            ("sections[*].questions[*]", ("sections", 0, "questions", i), q)
+            for i, q in enumerate(_DOC["sections"][0]["questions"])
+        ),
+        ("sections[*].name", ("sections", 1, "name"), "B"),
+        (
+            "sections[*].questions[*]",
+            ("sections", 1, "questions", 0),
+            _DOC["sections"][1]["questions"][0],
+        ),
+        ("tags[*]", ("tags", 0), "a"),
+        ("tags[*]", ("tags", 1), "b"),
+    ]
+
+
+class TestJsonSubtreeScanner:
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_whole_document(self, indent: int | None) -> None:
+        scanner = JsonSubtreeScanner(_WATCH)
+        assert scanner.feed(json.dumps(_DOC, indent=indent)) == _expected()
+
+    @pytest.mark.parametrize("ensure_ascii", [True, False])
+    def test_char_by_char_matches_whole(self, ensure_ascii: bool) -> None:
+        scanner = JsonSubtreeScanner(_WATCH)
+        seen = []
+        for ch in json.dumps(_DOC, ensure_ascii=ensure_ascii):
+            seen.extend(scanner.feed(ch))
+        assert seen == _expected()
+
+    def test_values_are_reported_as_soon_as_they_close(self) -> None:
+        scanner = JsonSubtreeScanner(["items[*]"])
+        assert scanner.feed('{"items": [{"a": 1}, {"a"') == [
+            ("items[*]", ("items", 0), {"a": 1}),
+        ]
+        assert scanner.feed(": 2}") == [("items[*]", ("items", 1), {"a": 2})]
+
+    def test_trailing_scalar_waits_for_its_delimiter(self) -> None:
+        scanner = JsonSubtreeScanner(["n[*]"])
+        assert scanner.feed('{"n": [12') == []
+        assert scanner.feed("3]}") == [("n[*]", ("n", 0), 123)]
+
+    def test_leading_noise_is_skipped_and_reset_restarts(self) -> None:
+        scanner = JsonSubtreeScanner(["title"])
+        assert scanner.feed('```json\n{"title": "x"}\n```') == [
+            ("title", ("title",), "x"),
+        ]
+        scanner.reset()
+        assert scanner.feed('{"title": "y"}') == [("title", ("title",), "y")]
+
+
+class _Item(BaseModel):
+    text: str
+
+
+def _frames(raw: list[str]) -> list[tuple[str, Any]]:
+    out = []
+    for frame in raw:
+        event_line, data_line = frame.strip().split("\n")
+        out.append((event_line.removeprefix("event: "), json.loads(data_line[6:])))
+    return out
+
+
+class _Done(BaseModel):
+    count: int
+
+
+async def _collect(**kwargs: Any) -> list[tuple[str, Any]]:
+    return _frames([
+        frame async for frame in stream_structured(
+            route="test",
+            started=time.perf_counter(),
+            finalize=lambda core: _Done(count=len(core["items"])),
+            watch={"items[*]": _Item},
+            **kwargs,
+        )
+    ])
+
+
+class TestStreamStructured:
+    async def test_partials_then_validated(self) -> None:
+        async def _generate(sink: StreamSink) -> dict[str, Any]:
+            sink.begin_attempt()
+            text = json.dumps({"items": [{"text": "one"}, {"bad": 1}, {"text": "two"}]})
+            for i in range(0, len(text), 3):
+                sink.write(text[i : i + 3])
+                await asyncio.sleep(0)
+            return json.loads(text)
+
+        frames = await _collect(generate=_generate)
+        # The schema-invalid item is skipped, not forwarded.
+        assert frames == [
+            ("partial", {"path": ["items", 0], "value": {"text": "one"}}),
+            ("partial", {"path": ["items", 2], "value": {"text": "two"}}),
+            ("validated", {"count": 3}),
+        ]
+
+    async def test_retry_emits_reset(self) -> None:
+        async def _generate(sink: StreamSink) -> dict[str, Any]:
+            sink.begin_attempt()
+            sink.write('{"items": [{"text": "first try"},')
+            sink.begin_attempt()
+            sink.write('{"items": [{"text": "second"}]}')
+            return {"items": [{"text": "second"}]}
+
+        frames = await _collect(generate=_generate)
+        assert [kind for kind, _ in frames] == [
+            "partial", "reset", "partial", "validated",
+        ]
+        assert frames[1][1] == {"attempt": 2}
+
+    async def test_guard_failure_aborts_and_cancels(self) -> None:
+        cancelled = asyncio.Event()
+
+        async def _generate(sink: StreamSink) -> dict[str, Any]:
+            sink.begin_attempt()
+            sink.write('{"items": [{"text": "fine"}, {"text": "I am an AI"}')
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {}
+
+        frames = await _collect(generate=_generate)
+        assert [kind for kind, _ in frames] == ["partial", "error"]
+        assert frames[1][1]["httpStatus"] == 502
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+    async def test_guard_failure_can_just_suppress(self) -> None:
+        async def _generate(sink: StreamSink) -> dict[str, Any]:
+            sink.begin_attempt()
+            sink.write('{"items": [{"text": "I am an AI"}, {"text": "later"}]}')
+            return {"items": [{"text": "revised"}]}
+
+        frames = await _collect(generate=_generate, abort_on_guard_failure=False)
+        assert frames == [("validated", {"count": 1})]
+
+    async def test_agent_error_becomes_error_frame(self) -> None:
+        async def _generate(sink: StreamSink) -> dict[str, Any]:
+            raise AgentError(
+                code="AI_QUOTA_EXHAUSTED",
+                message="slow down",
+                http_status=503,
+                retry_after_seconds=5,
+            )
+
+        assert await _collect(generate=_generate) == [(
+            "error",
+            {
+                "error": {
+                    "code": "AI_QUOTA_EXHAUSTED",
+                    "message": "slow down",
+                    "retryAfterSeconds": 5,
+                },
+                "httpStatus": 503,
+            },
+        )]
+
+    async def test_sink_is_visible_to_the_generation_task_only(self) -> None:
+        seen: list[StreamSink | None] = []
+
+        async def _generate(sink: StreamSink) -> dict[str, Any]:
+            seen.append(current_stream_sink.get())
+            return {"items": []}
+
+        await _collect(generate=_generate)
+        assert seen[0] is not None
+        assert current_stream_sink.get() is None
@@ -209,6 +209,9 @@ class TestSoftEmptyTranscription:
             async def create_session(self, **_: object) -> None:
                 return None
 
+            async def delete_session(self, **_: object) -> None:
+                return None
+
         class _FakeRunner:
             def __init__(self, **_: object) -> None:
                 self.session_service = _FakeSessionService()
@@ -266,6 +269,9 @@ class TestSoftEmptyTranscription:
                     async def create_session(self, **_: object) -> None:
                         return None
 
+                    async def delete_session(self, **_: object) -> None:
+                        return None
+
                 self.session_service = _S()
 
             async def run_async(self, **_: object):
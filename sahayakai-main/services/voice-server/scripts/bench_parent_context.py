@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Benchmark: parent-context lookup at call start.
+
+Builds a synthetic call store (default 100k parents, 1M transcript
+turns, with insights, concerns and follow-ups) and times the lookup
+bot.create_bot does while the call connects, for random parents:
+
+  legacy    The five-query render against the old single-column
+            parent_phone indexes (the pre-snapshot call-start path).
+  render    The same five queries with the covering indexes — what each
+            write now pays to refresh a snapshot.
+  snapshot  build_parent_context: one primary-key lookup on
+            parent_context_snapshot.
+
+Usage (from services/voice-server):
+
+  python scripts/bench_parent_context.py                      # 100k / 1M
+  python scripts/bench_parent_context.py --parents 10000 --turns 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.call_store import CallStore  # noqa: E402
+
+_SENTIMENTS = ["cooperative", "concerned", "grateful", "upset", "indifferent"]
+_QUALITY = ["productive", "brief", "difficult"]
+_CATEGORIES = ["fees", "health", "academics", "behavior", "logistics", "family"]
+_SEVERITY = ["low", "medium", "high", "critical"]
+_PRIORITY = ["low", "medium", "high", "urgent"]
+_APPROACHES = ["empathy", "practical_suggestion", "reassurance", "listening"]
+
+_LEGACY_INDEXES = """
+DROP INDEX IF EXISTS idx_calls_parent_recent;
+DROP INDEX IF EXISTS idx_concerns_parent_open;
+DROP INDEX IF EXISTS idx_followups_parent_pending;
+CREATE INDEX idx_calls_parent     ON calls(parent_phone);
+CREATE INDEX idx_concerns_parent  ON parent_concerns(parent_phone);
+CREATE INDEX idx_followups_parent ON follow_ups(parent_phone);
+"""
+
+
+def _populate(store: CallStore, parents: int, turns: int, turns_per_call: int) -> None:
+    conn = store._conn
+    rng = random.Random(7)
+    now = "2026-01-15T10:00:00+00:00"
+    calls = max(turns // turns_per_call, parents)
+
+    conn.executemany(
+        """INSERT INTO parents (phone, name, total_calls, calls_answered,
+           calls_productive, dominant_sentiment, communication_style,
+           created_at, updated_at) VALUES (?, ?, 0, 0, 0, ?, ?, ?, ?)""",
+        ((f"+91{9000000000 + p}", f"Parent {p}", rng.choice(_SENTIMENTS),
+          "cooperative", now, now) for p in range(parents)),
+    )
+    conn.executemany(
+        """INSERT INTO students (id, parent_phone, name, class_name, school_name,
+           created_at, updated_at) VALUES (?, ?, ?, 'Class 5', 'School', ?, ?)""",
+        ((f"s{p}", f"+91{9000000000 + p}", f"Student {p}", now, now)
+         for p in range(parents)),
+    )
+
+    def call_rows():
+        for c in range(calls):
+            p = c % parents
+            day = 1 + c // parents
+            yield (f"o{c}", f"+91{9000000000 + p}", f"s{p}", f"Student {p}",
+                   "consecutive absences", "completed", turns_per_call,
+                   f"2026-01-{day:02d}T10:00:00+00:00", now)
+
+    conn.executemany(
+        """INSERT INTO calls (outreach_id, parent_phone, student_id, student_name,
+           reason, call_status, turn_count, created_at, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        call_rows(),
+    )
+    conn.executemany(
+        """INSERT INTO transcript_turns (outreach_id, turn_number, role, text,
+           word_count, created_at) VALUES (?, ?, ?, ?, 6, ?)""",
+        ((f"o{t // turns_per_call}", t % turns_per_call,
+          "agent" if t % 2 == 0 else "parent", "नमस्ते जी, मैं स्कूल से बोल रहा हूँ", now)
+         for t in range(calls * turns_per_call)),
+    )
+    conn.executemany(
+        """INSERT INTO call_insights (outreach_id, parent_sentiment, call_quality,
+           parent_response, effective_approach, generated_at)
+           VALUES (?, ?, ?, 'Parent agreed to send the child tomorrow.', ?, ?)""",
+        ((f"o{c}", rng.choice(_SENTIMENTS), rng.choice(_QUALITY),
+          rng.choice(_APPROACHES), now) for c in range(calls)),
+    )
+    conn.executemany(
+        """INSERT INTO parent_concerns (parent_phone, concern_text, category,
+           severity, status, raised_in_call, times_raised, last_raised_at,
+           created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        ((f"+91{9000000000 + c % parents}", "Child unwell this week",
+          rng.choice(_CATEGORIES), rng.choice(_SEVERITY),
+          rng.choice(["raised", "recurring", "resolved"]), f"o{c}",
+          rng.randint(1, 3), now, now, now) for c in range(calls)),
+    )
+    conn.executemany(
+        """INSERT INTO follow_ups (outreach_id, parent_phone, description,
+           priority, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        ((f"o{c}", f"+91{9000000000 + c % parents}", "Check attendance next week",
+          rng.choice(_PRIORITY), rng.choice(["pending", "done"]), now, now)
+         for c in range(calls)),
+    )
+    conn.execute(
+        """UPDATE parents SET
+           total_calls = (SELECT COUNT(*) FROM calls WHERE calls.parent_phone = parents.phone),
+           calls_productive = total_calls / 2"""
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+
+
+def _time(fn, phones: list[str]) -> list[float]:
+    samples = []
+    for phone in phones:
+        started = time.perf_counter()
+        fn(phone)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]  # noqa: E731
+    print(
+        f"  {label:<9} p50={p(0.50):8.1f}µs  p95={p(0.95):8.1f}µs  "
+        f"p99={p(0.99):8.1f}µs  mean={statistics.fmean(samples):8.1f}µs"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--parents", type=int, default=100_000)
+    parser.add_argument("--turns", type=int, default=1_000_000)
+    parser.add_argument("--turns-per-call", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=5_000)
+    parser.add_argument("--db", help="Reuse/keep this database file")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "bench_calls.db")
+    fresh = not os.path.exists(db_path)
+    store = CallStore(db_path)
+
+    if fresh:
+        print(f"Populating {db_path}: {args.parents:,} parents, {args.turns:,} turns …")
+        started = time.perf_counter()
+        _populate(store, args.parents, args.turns, args.turns_per_call)
+        print(f"  populated in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        phones = [r[0] for r in store._conn.execute("SELECT phone FROM parents")]
+        for phone in phones:
+            store._refresh_parent_context(phone)
+        store._conn.commit()
+        elapsed = time.perf_counter() - started
+        print(f"  rendered {len(phones):,} snapshots in {elapsed:.1f}s "
+              f"({elapsed / len(phones) * 1e6:.0f}µs each)")
+
+    phones = [r[0] for r in store._conn.execute("SELECT phone FROM parents")]
+    sample = random.Random(11).choices(phones, k=args.lookups)
+
+    print(f"\nCall-start lookup, {args.lookups:,} random parents:")
+    render = _time(store._render_parent_context, sample)
+    snapshot = _time(store.build_parent_context, sample)
+
+    # Old index layout on a copy, so a kept --db stays on the current schema
+    legacy_path = db_path + ".legacy"
+    store._conn.execute("VACUUM INTO ?", (legacy_path,))
+    legacy = CallStore(legacy_path, readonly=True)
+    legacy._conn.execute("PRAGMA query_only=OFF")
+    legacy._conn.executescript(_LEGACY_INDEXES + "ANALYZE;")
+    legacy_samples = _time(legacy._render_parent_context, sample)
+    legacy.close()
+    os.remove(legacy_path)
+
+    _report("legacy", legacy_samples)
+    _report("render", render)
+    _report("snapshot", snapshot)
+    speedup = statistics.median(legacy_samples) / statistics.median(snapshot)
+    print(f"\n  snapshot vs legacy (p50): {speedup:.0f}x faster")
+
+    assert store.build_parent_context(sample[0]) == store._render_parent_context(sample[0])
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
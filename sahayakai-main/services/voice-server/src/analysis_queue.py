@@ -0,0 +1,237 @@
+"""
+Post-call analysis queue — durable, rate-limited, off the call path.
+
+Completed calls are written to the analysis_jobs table in the CallStore
+SQLite file (same transaction log as everything else), so a restart
+resumes where it stopped instead of losing the analysis.
+
+A small pool of async workers drains the table:
+  • at most ANALYSIS_WORKERS model requests in flight
+  • a token bucket caps requests at ANALYSIS_RATE_PER_MIN
+  • failures are retried with exponential backoff + jitter, up to
+    ANALYSIS_MAX_ATTEMPTS, then the job is marked failed
+  • when ANALYSIS_BATCH_BACKLOG or more jobs are waiting, short
+    first-attempt transcripts are analyzed several per request
+
+Workers only await I/O (the model call and the CallStore writer thread),
+so they never compete with live call pipelines for the event loop.
+"""
+
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+
+from src.call_analyzer import AnalysisError, run_analysis, run_batch_analysis
+from src.call_store import AsyncCallStore
+
+_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", "2"))
+_RATE_PER_MIN = float(os.environ.get("ANALYSIS_RATE_PER_MIN", "30"))
+_MAX_ATTEMPTS = int(os.environ.get("ANALYSIS_MAX_ATTEMPTS", "5"))
+# Backlog size at which short transcripts start sharing a request
+_BATCH_BACKLOG = int(os.environ.get("ANALYSIS_BATCH_BACKLOG", "8"))
+_BATCH_SIZE = int(os.environ.get("ANALYSIS_BATCH_SIZE", "4"))
+_BATCH_MAX_TURNS = int(os.environ.get("ANALYSIS_BATCH_MAX_TURNS", "12"))
+
+_RETRY_BASE_S = 30.0
+_RETRY_MAX_S = 15 * 60.0
+# Idle workers re-check the table this often (picks up retries coming due)
+_POLL_INTERVAL_S = 5.0
+
+
+class _RateLimiter:
+    """Token bucket shared by all workers: `rate_per_min` requests, bursts of `burst`."""
+
+    def __init__(self, rate_per_min: float, burst: int):
+        self._rate = rate_per_min / 60.0
+        self._capacity = float(max(burst, 1))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+def _retry_delay(attempts: int) -> float:
+    """Exponential backoff with full jitter: 30s, 60s, 120s … capped at 15 min."""
+    ceiling = min(_RETRY_MAX_S, _RETRY_BASE_S * 2 ** (attempts - 1))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class AnalysisQueue:
+    """Bounded worker pool over the durable analysis_jobs table."""
+
+    def __init__(
+        self,
+        store: AsyncCallStore,
+        *,
+        api_key: str | None = None,
+        workers: int = _WORKERS,
+        rate_per_min: float = _RATE_PER_MIN,
+        max_attempts: int = _MAX_ATTEMPTS,
+        batch_backlog: int = _BATCH_BACKLOG,
+        batch_size: int = _BATCH_SIZE,
+        batch_max_turns: int = _BATCH_MAX_TURNS,
+    ):
+        self._store = store
+        self._api_key = api_key
+        self._workers = max(workers, 1)
+        self._limiter = _RateLimiter(rate_per_min, burst=self._workers)
+        self._max_attempts = max_attempts
+        self._claim_policy = {
+            "batch_size": max(batch_size, 1),
+            "backlog_threshold": batch_backlog,
+            "max_batch_turns": batch_max_turns,
+        }
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+        # Counters since process start
+        self.analyzed = 0
+        self.batched_requests = 0
+        self.retries = 0
+        self.failed = 0
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Requeue jobs a previous process left running, then start the workers."""
+        orphaned = await self._store.requeue_running_analysis_jobs()
+        if orphaned:
+            logger.info(f"Analysis queue: resumed {orphaned} interrupted jobs")
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"analysis-worker-{i}")
+            for i in range(self._workers)
+        ]
+        self._wake.set()
+        logger.info(f"Analysis queue started — {self._workers} workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers. Jobs mid-flight stay 'running' and resume on next start."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self, outreach_id: str, call_context: dict) -> bool:
+        """Queue a completed call for analysis. False if it was already queued."""
+        queued = await self._store.enqueue_analysis(outreach_id, call_context)
+        if queued:
+            logger.debug(f"Analysis queued: {outreach_id}")
+            self._wake.set()
+        return queued
+
+    async def stats(self) -> dict:
+        return {
+            "workers": self._workers,
+            "jobs": await self._store.get_analysis_queue_stats(),
+            "analyzed": self.analyzed,
+            "batched_requests": self.batched_requests,
+            "retries": self.retries,
+            "failed": self.failed,
+        }
+
+    # ── Workers ──────────────────────────────────────────────────────────────
+
+    async def _worker(self, index: int) -> None:
+        while not self._stopping:
+            try:
+                jobs = await self._store.claim_analysis_jobs(**self._claim_policy)
+            except Exception as e:
+                logger.error(f"Analysis worker {index}: claim failed: {e}")
+                jobs = []
+
+            if not jobs:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=_POLL_INTERVAL_S)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # More work may be waiting — let an idle sibling pick it up
+            self._wake.set()
+            await self._limiter.acquire()
+            if len(jobs) == 1:
+                await self._run_single(jobs[0])
+            else:
+                await self._run_batch(jobs)
+
+    async def _run_single(self, job: dict) -> None:
+        outreach_id = job["outreach_id"]
+        try:
+            insights = await run_analysis(
+                job["call_context"], job["transcript"], api_key=self._api_key,
+            )
+        except AnalysisError as e:
+            await self._fail(job, str(e))
+            return
+        except Exception as e:
+            await self._fail(job, f"unexpected: {e}")
+            return
+        await self._finish(outreach_id, insights)
+
+    async def _run_batch(self, jobs: list[dict]) -> None:
+        self.batched_requests += 1
+        calls = [(j["outreach_id"], j["call_context"], j["transcript"]) for j in jobs]
+        try:
+            results = await run_batch_analysis(calls, api_key=self._api_key)
+        except Exception as e:
+            # Whole request failed — each job retries on its own
+            for job in jobs:
+                await self._fail(job, f"batch: {e}")
+            return
+        for job in jobs:
+            insights = results.get(job["outreach_id"])
+            if insights is None:
+                await self._fail(job, "missing from batch response")
+            else:
+                await self._finish(job["outreach_id"], insights)
+
+    async def _finish(self, outreach_id: str, insights: dict | None) -> None:
+        try:
+            await self._store.finish_analysis_job(outreach_id, insights)
+        except Exception as e:
+            logger.error(f"Analysis save failed for {outreach_id}: {e}")
+            return
+        if insights:
+            self.analyzed += 1
+
+    async def _fail(self, job: dict, error: str) -> None:
+        outreach_id, attempts = job["outreach_id"], job["attempts"]
+        if attempts >= self._max_attempts:
+            retry_at = None
+            self.failed += 1
+            logger.error(
+                f"Analysis gave up on {outreach_id} after {attempts} attempts: {error}"
+            )
+        else:
+            delay = _retry_delay(attempts)
+            retry_at = (
+                datetime.now(timezone.utc) + timedelta(seconds=delay)
+            ).isoformat()
+            self.retries += 1
+            logger.warning(
+                f"Analysis attempt {attempts} failed for {outreach_id} "
+                f"(retry in {delay:.0f}s): {error}"
+            )
+        try:
+            await self._store.fail_analysis_job(outreach_id, error, retry_at)
+        except Exception as e:
+            logger.error(f"Analysis failure not recorded for {outreach_id}: {e}")
@@ -0,0 +1,300 @@
+"""
+Backend sync engine — drains completed calls from the local CallStore to
+the SahayakAI backend (Firestore behind POST /api/attendance/call-sync).
+
+Live calls already push their transcript turn by turn (persistence.py),
+and a call whose final live sync succeeded is marked synced on the spot.
+This catches everything that didn't land: calls made while the backend
+was down, or whose final sync failed. Each round:
+
+  1. one joined query pulls a batch of unsynced calls + transcripts
+  2. one request pushes the batch (the backend commits it as Firestore
+     batched writes, ≤500 ops each)
+  3. one transaction marks the batch synced (or parks rejected calls)
+
+Full batches are followed immediately by the next, so a node that was
+offline for an hour drains in a few requests. Batch size adapts (AIMD):
+it grows while requests stay under BACKEND_SYNC_TARGET_MS, shrinks when
+they get slow, and halves on errors, when the engine also backs off.
+Only one batch is ever in flight.
+
+Turns carry their seq (0-based position), and the backend merges by seq:
+turns it already holds from the live sync are kept, only missing ones
+are added, and a call the live sync already finished is left alone.
+
+SyncTarget has two implementations: HttpSyncTarget for the backend and
+LocalSyncTarget, an in-memory stand-in for local runs and checks.
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Protocol
+
+from loguru import logger
+
+from src.call_store import AsyncCallStore
+from src.persistence import http_client
+
+_INTERVAL_S = float(os.environ.get("BACKEND_SYNC_INTERVAL_S", "30"))
+_MIN_BATCH = 10
+# Firestore's per-batch write limit; the backend rejects larger requests
+_MAX_BATCH = min(int(os.environ.get("BACKEND_SYNC_MAX_BATCH", "500")), 500)
+_INITIAL_BATCH = 50
+_TARGET_LATENCY_S = int(os.environ.get("BACKEND_SYNC_TARGET_MS", "2000")) / 1000
+_MAX_BACKOFF_S = 300.0
+
+
+class SyncError(Exception):
+    """The whole batch failed (network, 5xx) — nothing was marked, retry later."""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Targets
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _to_payload(call: dict) -> dict:
+    """Local call row → the backend's ParentOutreach fields."""
+    payload: dict = {
+        "outreachId": call["outreach_id"],
+        "callStatus": call.get("call_status") or "completed",
+        "transcript": [
+            {"seq": t["seq"], "role": t["role"], "text": t["text"]}
+            for t in call.get("transcript", [])
+        ],
+    }
+    if call.get("call_sid"):
+        payload["callSid"] = call["call_sid"]
+    if call.get("call_duration_s") is not None:
+        payload["callDurationSeconds"] = call["call_duration_s"]
+    return payload
+
+
+class SyncTarget(Protocol):
+    """Where batches go. push() returns {outreach_id: error or None};
+    it raises SyncError when the batch as a whole failed."""
+
+    async def push(self, calls: list[dict]) -> dict[str, str | None]: ...
+
+
+class HttpSyncTarget:
+    """POST /api/attendance/call-sync over the pooled backend client."""
+
+    def __init__(self, api_url: str, internal_key: str, *, timeout_s: float = 30.0):
+        self._url = f"{api_url}/api/attendance/call-sync"
+        self._internal_key = internal_key
+        self._timeout_s = timeout_s
+
+    async def push(self, calls: list[dict]) -> dict[str, str | None]:
+        try:
+            resp = await http_client().post(
+                self._url,
+                json={"calls": [_to_payload(c) for c in calls]},
+                headers={"x-internal-key": self._internal_key},
+                timeout=self._timeout_s,
+            )
+        except Exception as e:
+            raise SyncError(f"request failed: {e}") from e
+        if resp.status_code != 200:
+            raise SyncError(f"{resp.status_code} {resp.text[:200]}")
+
+        results: dict[str, str | None] = {}
+        for r in resp.json().get("results", []):
+            status = r.get("status")
+            results[r.get("outreachId", "")] = None if status == "synced" else status
+        # Anything the backend didn't mention stays unsynced for the next round
+        return {
+            c["outreach_id"]: results[c["outreach_id"]]
+            for c in calls if c["outreach_id"] in results
+        }
+
+
+class LocalSyncTarget:
+    """In-memory stand-in for the backend.
+
+    docs:        outreach_id → stored payload; transcripts merge by seq
+                 like the backend's
+    known_ids:   if set, other ids are answered with "not_found"
+    latency_s:   simulated request time
+    fail_next:   number of upcoming pushes that raise SyncError
+    """
+
+    def __init__(self, *, known_ids: set[str] | None = None, latency_s: float = 0.0):
+        self.docs: dict[str, dict] = {}
+        self.known_ids = known_ids
+        self.latency_s = latency_s
+        self.fail_next = 0
+        self.requests = 0
+
+    async def push(self, calls: list[dict]) -> dict[str, str | None]:
+        self.requests += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            raise SyncError("simulated backend failure")
+        results: dict[str, str | None] = {}
+        for call in calls:
+            payload = _to_payload(call)
+            if self.known_ids is not None and payload["outreachId"] not in self.known_ids:
+                results[payload["outreachId"]] = "not_found"
+                continue
+            stored = self.docs.get(payload["outreachId"])
+            if stored is not None:
+                have = {t["seq"] for t in stored["transcript"]}
+                payload["transcript"] = sorted(
+                    stored["transcript"]
+                    + [t for t in payload["transcript"] if t["seq"] not in have],
+                    key=lambda t: t["seq"],
+                )
+            self.docs[payload["outreachId"]] = payload
+            results[payload["outreachId"]] = None
+        return results
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Engine
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class AdaptiveBatchSize:
+    """AIMD batch sizing from observed request latency and errors."""
+
+    def __init__(
+        self,
+        *,
+        initial: int = _INITIAL_BATCH,
+        minimum: int = _MIN_BATCH,
+        maximum: int = _MAX_BATCH,
+        target_latency_s: float = _TARGET_LATENCY_S,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.size = min(self.maximum, max(self.minimum, initial))
+        self._target = target_latency_s
+        self.error_rate = 0.0        # EWMA over requests
+
+    def on_success(self, latency_s: float) -> None:
+        self.error_rate *= 0.8
+        if latency_s <= self._target:
+            self.size = min(self.maximum, self.size + max(self.minimum, self.size // 2))
+        else:
+            self.size = max(self.minimum, int(self.size * 0.75))
+
+    def on_error(self) -> None:
+        self.error_rate = self.error_rate * 0.8 + 0.2
+        self.size = max(self.minimum, self.size // 2)
+
+
+class BackendSync:
+    """Background drain of unsynced calls, one adaptive batch at a time."""
+
+    def __init__(
+        self,
+        store: AsyncCallStore,
+        target: SyncTarget,
+        *,
+        interval_s: float = _INTERVAL_S,
+        batch: AdaptiveBatchSize | None = None,
+    ):
+        self._store = store
+        self._target = target
+        self._interval_s = interval_s
+        self.batch = batch or AdaptiveBatchSize()
+        self._consecutive_errors = 0
+        self._task: asyncio.Task | None = None
+        # Counters since process start
+        self.synced = 0
+        self.rejected = 0
+        self.requests = 0
+        self.errors = 0
+        self.last_latency_ms = 0
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="backend-sync")
+        logger.info(f"Backend sync started — every {self._interval_s:.0f}s")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "batch_size": self.batch.size,
+            "error_rate": round(self.batch.error_rate, 3),
+            "synced": self.synced,
+            "rejected": self.rejected,
+            "requests": self.requests,
+            "errors": self.errors,
+            "last_latency_ms": self.last_latency_ms,
+        }
+
+    # ── Drain ────────────────────────────────────────────────────────────────
+
+    async def drain(self) -> int:
+        """Push batches until the backlog is empty or a request fails.
+        Returns the number of calls synced."""
+        total = 0
+        while True:
+            limit = self.batch.size
+            calls = await self._store.get_unsynced_calls(limit=limit)
+            if not calls:
+                return total
+
+            self.requests += 1
+            started = time.monotonic()
+            try:
+                results = await self._target.push(calls)
+            except SyncError as e:
+                self.errors += 1
+                self._consecutive_errors += 1
+                self.batch.on_error()
+                logger.warning(
+                    f"Backend sync failed ({len(calls)} calls, "
+                    f"next batch {self.batch.size}): {e}"
+                )
+                raise
+            latency_s = time.monotonic() - started
+            self.last_latency_ms = int(latency_s * 1000)
+            self._consecutive_errors = 0
+            self.batch.on_success(latency_s)
+
+            synced = [oid for oid, error in results.items() if error is None]
+            rejected = {oid: error for oid, error in results.items() if error is not None}
+            if synced:
+                await self._store.mark_synced_many(synced)
+            if rejected:
+                await self._store.mark_sync_failed_many(rejected)
+                logger.warning(f"Backend rejected {len(rejected)} calls: {rejected}")
+            self.synced += len(synced)
+            self.rejected += len(rejected)
+            total += len(synced)
+            logger.debug(
+                f"Backend sync: {len(synced)} synced in {self.last_latency_ms}ms, "
+                f"next batch {self.batch.size}"
+            )
+
+            if len(calls) < limit or not results:
+                return total  # backlog drained (or backend answered nothing)
+
+    async def _run(self) -> None:
+        while True:
+            delay = self._interval_s
+            try:
+                drained = await self.drain()
+                if drained:
+                    logger.info(f"Backend sync: drained {drained} calls")
+            except SyncError:
+                # Back off: 2x per consecutive failure, with jitter
+                ceiling = min(_MAX_BACKOFF_S, self._interval_s * 2 ** self._consecutive_errors)
+                delay = random.uniform(ceiling / 2, ceiling)
+            except Exception as e:
+                logger.error(f"Backend sync error: {e}")
+            await asyncio.sleep(delay)
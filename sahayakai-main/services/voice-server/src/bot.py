@@ -15,6 +15,7 @@ Key features:
 """
 
 import asyncio
+import time
 
 from loguru import logger
 from pipecat.frames.frames import TTSSpeakFrame
@@ -25,9 +26,6 @@ from pipecat.transports.websocket.fastapi import (
     FastAPIWebsocketParams,
 )
 from pipecat.serializers.twilio import TwilioFrameSerializer
-from pipecat.audio.vad.silero import SileroVADAnalyzer
-from pipecat.audio.vad.vad_analyzer import VADParams
-from pipecat.audio.filters.rnnoise_filter import RNNoiseFilter
 
 # Universal LLM context (replaces deprecated GoogleLLMContext)
 from pipecat.processors.aggregators.llm_context import LLMContext
@@ -49,9 +47,11 @@ from src.call_manager import CallManager
 from src.conversation_state import PhaseInstructor
 from src.stt_filter import STTConfidenceFilter
 from src.prompts.agent_reply import build_system_instruction, get_greetings
-from src.persistence import sync_transcript
-from src.call_store import CallStore
-from src.call_analyzer import analyze_call
+from src.persistence import TranscriptSync
+from src.call_store import AsyncCallStore
+from src.analysis_queue import AnalysisQueue
+from src.warm_pool import CallResources, build_call_resources
+from src.latency import GreetingLatencyProbe, greeting_latency
 
 # Twilio Media Streams language code mapping
 TWILIO_LANG_MAP = {
@@ -106,7 +106,10 @@ async def create_bot(
     websocket,
     stream_sid: str,
     call_sid: str = "",
-    call_store: CallStore | None = None,
+    call_store: AsyncCallStore | None = None,
+    analysis_queue: AnalysisQueue | None = None,
+    resources: CallResources | None = None,
+    stream_started_at: float | None = None,
 ) -> PipelineTask:
     """Create the streaming Pipecat pipeline for a parent call.
 
@@ -119,10 +122,20 @@ async def create_bot(
         → tts (Sarvam WebSocket streaming, sentence-level aggregation)
         → transport.output()
         → context_aggregator.assistant() (captures agent responses)
+
+    `resources` (VAD + RNNoise) normally comes pre-built from the warm
+    pool; without it they're built here, off the event loop.
+    `stream_started_at` (time.monotonic() at Twilio's start event) enables
+    the stream start → greeting audio measurement.
     """
     parent_language = call_context.get("parentLanguage", "Hindi")
     lang_code = TWILIO_LANG_MAP.get(parent_language, "en-IN")
     outreach_id = call_context.get("id", "")
+    if stream_started_at is None:
+        stream_started_at = time.monotonic()
+    if resources is None:
+        resources = await asyncio.to_thread(build_call_resources)
+        resources.warm = False
 
     logger.info(
         f"Creating streaming bot for outreach {outreach_id}, "
@@ -165,16 +178,10 @@ async def create_bot(
             serializer=serializer,
             audio_in_enabled=True,
             audio_in_sample_rate=16000,
-            audio_in_filter=RNNoiseFilter(),  # Denoise phone audio — reduces echo/background noise
+            audio_in_filter=resources.audio_filter,  # RNNoise — see warm_pool.py
             audio_out_enabled=True,
             audio_out_sample_rate=16000,
-            vad_analyzer=SileroVADAnalyzer(
-                params=VADParams(
-                    min_volume=0.6,  # Filter phone echo (echo is lower amplitude)
-                    start_secs=0.3,  # 300ms sustained speech to trigger (filters echo bursts)
-                    stop_secs=0.5,  # 0.5s silence → end of turn
-                ),
-            ),
+            vad_analyzer=resources.vad_analyzer,  # Silero, phone-tuned params — see warm_pool.py
         ),
     )
 
@@ -187,15 +194,15 @@ async def create_bot(
         ),
     )
 
-    # ── Save call to local store ──
+    # ── Save call to local store (queued — returns without touching disk) ──
     if call_store:
-        call_store.create_call(outreach_id, call_context)
+        await call_store.create_call(outreach_id, call_context)
 
     # ── Build system instruction with parent history ──
     parent_history = None
     if call_store:
         parent_phone = call_context.get("parentPhone", "")
-        parent_history = call_store.build_parent_context(parent_phone)
+        parent_history = await call_store.build_parent_context(parent_phone)
         if parent_history:
             logger.info(f"Parent history injected for {parent_phone}")
 
@@ -233,18 +240,28 @@ async def create_bot(
     )
 
     # ── Transcript sync callback (non-blocking) ──
+    # Both sinks are incremental: the local store appends only new turns,
+    # the backend gets coalesced deltas over a pooled connection.
+    transcript_sync = TranscriptSync(
+        api_url=config.sahayakai_api_url,
+        internal_key=config.sahayakai_internal_key,
+        outreach_id=outreach_id,
+    )
+
+    stored_turns = 0  # transcript entries already handed to the local store
+
     async def _sync_turn(transcript: list[dict], turn_number: int):
-        # Save to local store (always works)
+        nonlocal stored_turns
+        # Save only the new entries to the local store (queued; the writer
+        # thread batches commits)
         if call_store:
-            call_store.update_transcript(outreach_id, transcript, turn_number)
+            first, upto = stored_turns, len(transcript)
+            await call_store.append_turns(
+                outreach_id, transcript[first:upto], first, turn_number,
+            )
+            stored_turns = max(stored_turns, upto)
         # Also try backend sync (may fail if backend is down)
-        await sync_transcript(
-            api_url=config.sahayakai_api_url,
-            internal_key=config.sahayakai_internal_key,
-            outreach_id=outreach_id,
-            transcript=transcript,
-            turn_count=turn_number,
-        )
+        transcript_sync.push(transcript, turn_number)
 
     # ── Phase Instructor: injects turn-specific instructions before LLM ──
     phase_instructor = PhaseInstructor(call_context=call_context)
@@ -283,6 +300,21 @@ async def create_bot(
     # ── STT Quality Filter: drop garbled/empty transcriptions ──
     stt_filter = STTConfidenceFilter()
 
+    # ── Greeting latency: stream start → first audio frame to Twilio ──
+    call_metrics: dict = {}
+
+    def _on_first_audio(latency_ms: int):
+        call_metrics["greeting_latency_ms"] = latency_ms
+        greeting_latency.record(latency_ms, warm=resources.warm)
+        logger.info(
+            f"Greeting latency {outreach_id}: {latency_ms}ms "
+            f"({'warm' if resources.warm else 'cold'} resources)"
+        )
+
+    latency_probe = GreetingLatencyProbe(
+        stream_started_at=stream_started_at, on_first_audio=_on_first_audio,
+    )
+
     pipeline = Pipeline(
         [
             transport.input(),
@@ -293,6 +325,7 @@ async def create_bot(
             llm,
             call_manager,
             tts,
+            latency_probe,             # Measures time to first greeting audio
             transport.output(),
         ]
     )
@@ -327,54 +360,28 @@ async def create_bot(
 
     @transport.event_handler("on_client_disconnected")
     async def on_disconnected(transport_instance, websocket):
-        """Persist final transcript and run post-call analysis."""
-        transcript = call_manager.transcript
+        """Persist final transcript and queue post-call analysis."""
+        transcript = call_manager.finish_transcript()
         turns = call_manager.turn_number
         logger.info(f"Call ended. Turns: {turns}, Transcript: {len(transcript)} entries")
 
-        # Save to local store
+        # Save to local store (waits for the commit, off the event loop)
         if call_store:
-            call_store.complete_call(
+            await call_store.complete_call(
                 outreach_id, transcript, turns,
                 call_status="completed",
             )
-
-        # Try backend sync
-        await sync_transcript(
-            api_url=config.sahayakai_api_url,
-            internal_key=config.sahayakai_internal_key,
-            outreach_id=outreach_id,
-            transcript=transcript,
-            turn_count=turns,
-            call_status="completed",
-        )
-
-        # Run post-call analysis (async, non-blocking)
-        if call_store and transcript:
-            try:
-                insights = await analyze_call(
-                    call_context, transcript, api_key=config.google_api_key,
-                )
-                if insights:
-                    call_store.save_insights(outreach_id, insights)
-                    parent_phone = call_context.get("parentPhone", "")
-                    # Save structured concerns
-                    if parent_phone and insights.get("concerns"):
-                        call_store.record_concerns(
-                            outreach_id, parent_phone, insights["concerns"],
-                        )
-                    # Save follow-up tasks
-                    if insights.get("followUps"):
-                        call_store.create_follow_ups(
-                            outreach_id, parent_phone, insights["followUps"],
-                        )
-                    logger.info(
-                        f"Post-call analysis saved for {outreach_id}: "
-                        f"sentiment={insights.get('parentSentiment')}, "
-                        f"concerns={len(insights.get('concerns', []))}, "
-                        f"followUps={len(insights.get('followUps', []))}"
-                    )
-            except Exception as e:
-                logger.error(f"Post-call analysis failed: {e}")
+            if call_metrics:
+                await call_store.save_metrics(outreach_id, call_metrics)
+
+        # Try backend sync — remaining turns + terminal status. Once the
+        # backend has the whole call, BackendSync has nothing left to push.
+        if await transcript_sync.finish(transcript, turns, call_status="completed"):
+            if call_store:
+                await call_store.mark_synced(outreach_id)
+
+        # Queue post-call analysis — a worker pool picks it up off the call path
+        if analysis_queue and transcript:
+            await analysis_queue.enqueue(outreach_id, call_context)
 
     return task
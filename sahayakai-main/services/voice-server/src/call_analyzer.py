@@ -12,6 +12,10 @@ Uses Gemini to analyze the conversation and extract:
 
 Runs asynchronously after call ends — doesn't block the call pipeline.
 Output feeds into call_store.py tables: call_insights, parent_concerns, follow_ups.
+
+analysis_queue.py drives this from a durable job queue: it uses the
+raising variants (run_analysis / run_batch_analysis) so failures are
+retried, and batches short calls into one request when backlogged.
 """
 
 import json
@@ -68,6 +72,98 @@ Respond ONLY with a JSON object (no markdown, no code fences):
   ]
 }}"""
 
+_BATCH_PROMPT = """Analyze each of these {count} parent-teacher phone call transcripts independently. In each, the teacher called the parent about a student.
+
+{calls}
+
+Respond ONLY with a JSON array (no markdown, no code fences) holding one object per call, in the same order. Each object has "callId" (copied from the call header) plus exactly the fields of this schema:
+{schema}"""
+
+# Schema block of _ANALYSIS_PROMPT — reused by the batch prompt
+_SCHEMA = _ANALYSIS_PROMPT[_ANALYSIS_PROMPT.index("{{\n"):].replace("{{", "{").replace("}}", "}")
+
+_MODEL = "gemini-2.0-flash"
+
+_clients: dict[str, "genai.Client"] = {}
+
+
+class AnalysisError(Exception):
+    """Model call failed or returned unusable output — worth retrying."""
+
+
+def _client(key: str) -> "genai.Client":
+    """One client per API key, shared by all analyses (keeps connections warm)."""
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = genai.Client(api_key=key)
+    return client
+
+
+def _format_transcript(transcript: list[dict]) -> str:
+    transcript_lines = []
+    for turn in transcript:
+        role = "Teacher" if turn.get("role") == "agent" else "Parent"
+        transcript_lines.append(f"{role}: {turn.get('text', '')}")
+    return "\n".join(transcript_lines)
+
+
+def _context_fields(call_context: dict) -> dict:
+    return {
+        "student_name": call_context.get("studentName", "student"),
+        "class_name": call_context.get("className", ""),
+        "reason": call_context.get("reason", ""),
+        "teacher_name": call_context.get("teacherName", "Teacher"),
+        "school_name": call_context.get("schoolName", "School"),
+        "parent_language": call_context.get("parentLanguage", "Hindi"),
+    }
+
+
+def _resolve_key(api_key: str | None) -> str | None:
+    """API key to use, or None (with a warning) when analysis can't run."""
+    if not _HAS_GENAI:
+        logger.warning("Skipping call analysis — google-genai not installed")
+        return None
+    key = api_key or os.environ.get("GOOGLE_GENAI_API_KEY", "")
+    if not key:
+        logger.warning("Skipping call analysis — no API key")
+        return None
+    return key
+
+
+async def _generate_json(key: str, prompt: str, max_output_tokens: int):
+    try:
+        response = await _client(key).aio.models.generate_content(
+            model=_MODEL,
+            contents=prompt,
+            config=genai.types.GenerateContentConfig(
+                temperature=0.1,
+                max_output_tokens=max_output_tokens,
+            ),
+        )
+        text = (response.text or "").strip()
+    except Exception as e:
+        raise AnalysisError(f"model call failed: {e}") from e
+
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    text = text.strip()
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise AnalysisError(f"JSON parse error: {e}") from e
+
+
+def _log_insights(insights: dict) -> None:
+    logger.info(
+        f"Call analysis complete — sentiment={insights.get('parentSentiment')}, "
+        f"quality={insights.get('callQuality')}, "
+        f"concerns={len(insights.get('concerns', []))}, "
+        f"followUps={len(insights.get('followUps', []))}"
+    )
+
 
 async def analyze_call(
     call_context: dict,
@@ -78,66 +174,77 @@ async def analyze_call(
 
     Returns dict with keys matching call_insights + concerns + followUps.
     """
-    if not _HAS_GENAI:
-        logger.warning("Skipping call analysis — google-genai not installed")
+    try:
+        return await run_analysis(call_context, transcript, api_key=api_key)
+    except AnalysisError as e:
+        logger.error(f"Call analysis error: {e}")
         return None
 
+
+async def run_analysis(
+    call_context: dict,
+    transcript: list[dict],
+    api_key: str | None = None,
+) -> dict | None:
+    """Like analyze_call, but raises AnalysisError instead of returning None
+    on model/parse failures. None still means "nothing to analyze"."""
     if not transcript or len(transcript) < 2:
         logger.debug("Skipping analysis — transcript too short")
         return None
 
-    key = api_key or os.environ.get("GOOGLE_GENAI_API_KEY", "")
+    key = _resolve_key(api_key)
     if not key:
-        logger.warning("Skipping call analysis — no API key")
         return None
 
-    # Format transcript
-    transcript_lines = []
-    for turn in transcript:
-        role = "Teacher" if turn.get("role") == "agent" else "Parent"
-        transcript_lines.append(f"{role}: {turn.get('text', '')}")
-    transcript_text = "\n".join(transcript_lines)
-
     prompt = _ANALYSIS_PROMPT.format(
-        student_name=call_context.get("studentName", "student"),
-        class_name=call_context.get("className", ""),
-        reason=call_context.get("reason", ""),
-        teacher_name=call_context.get("teacherName", "Teacher"),
-        school_name=call_context.get("schoolName", "School"),
-        parent_language=call_context.get("parentLanguage", "Hindi"),
-        transcript_text=transcript_text,
+        **_context_fields(call_context),
+        transcript_text=_format_transcript(transcript),
     )
+    insights = await _generate_json(key, prompt, max_output_tokens=800)
+    if not isinstance(insights, dict):
+        raise AnalysisError("analysis is not a JSON object")
+    _log_insights(insights)
+    return insights
 
-    try:
-        client = genai.Client(api_key=key)
-        response = await client.aio.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt,
-            config=genai.types.GenerateContentConfig(
-                temperature=0.1,
-                max_output_tokens=800,
-            ),
-        )
 
-        text = response.text.strip()
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
-
-        insights = json.loads(text)
-        logger.info(
-            f"Call analysis complete — sentiment={insights.get('parentSentiment')}, "
-            f"quality={insights.get('callQuality')}, "
-            f"concerns={len(insights.get('concerns', []))}, "
-            f"followUps={len(insights.get('followUps', []))}"
-        )
-        return insights
+async def run_batch_analysis(
+    calls: list[tuple[str, dict, list[dict]]],
+    api_key: str | None = None,
+) -> dict[str, dict]:
+    """Analyze several calls in one model request.
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Call analysis JSON parse error: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Call analysis error: {e}")
-        return None
+    calls: [(outreach_id, call_context, transcript), ...]
+    Returns {outreach_id: insights}. Calls the model left out or answered
+    with a malformed object are missing from the result. Raises
+    AnalysisError if the request fails or the reply isn't a JSON array.
+    """
+    key = _resolve_key(api_key)
+    if not key:
+        return {}
+
+    blocks = []
+    for outreach_id, call_context, transcript in calls:
+        f = _context_fields(call_context)
+        blocks.append(
+            f"=== Call {outreach_id} ===\n"
+            f"- Student: {f['student_name']}, {f['class_name']}\n"
+            f"- Reason for call: {f['reason']}\n"
+            f"- Teacher: {f['teacher_name']}, {f['school_name']}\n"
+            f"- Parent's language: {f['parent_language']}\n"
+            f"Transcript:\n{_format_transcript(transcript)}"
+        )
+    prompt = _BATCH_PROMPT.format(
+        count=len(calls), calls="\n\n".join(blocks), schema=_SCHEMA,
+    )
+    result = await _generate_json(key, prompt, max_output_tokens=800 * len(calls))
+    if not isinstance(result, list):
+        raise AnalysisError("batch analysis is not a JSON array")
+
+    wanted = {outreach_id for outreach_id, _, _ in calls}
+    by_id: dict[str, dict] = {}
+    for item in result:
+        if isinstance(item, dict) and item.get("callId") in wanted:
+            insights = {k: v for k, v in item.items() if k != "callId"}
+            _log_insights(insights)
+            by_id[item["callId"]] = insights
+    return by_id
@@ -58,6 +58,37 @@ def _first_sentence(text: str) -> str:
     return result
 
 
+def _transcript_entry(msg) -> dict | None:
+    """One universal LLMContext message → a transcript entry, or None.
+
+    Universal context uses OpenAI-style dicts:
+      {"role": "user"/"assistant", "content": "..."}
+    """
+    try:
+        if not isinstance(msg, dict):
+            return None
+        role_raw = msg.get("role", "")
+        if role_raw == "user":
+            role = "parent"
+        elif role_raw in ("assistant", "model"):
+            role = "agent"
+        else:
+            return None
+
+        content = msg.get("content", "")
+        text = content if isinstance(content, str) else str(content)
+
+        # Skip phase instruction messages (injected by PhaseInstructor)
+        if text.startswith(PHASE_INSTRUCTION_PREFIX):
+            return None
+
+        if text and text.strip():
+            return {"role": role, "text": text.strip()}
+    except Exception as e:
+        logger.warning(f"Error extracting message: {e}")
+    return None
+
+
 class CallManager(FrameProcessor):
     """Manages call lifecycle: turn counting, transcript persistence, call ending.
 
@@ -92,6 +123,10 @@ class CallManager(FrameProcessor):
         self._collecting = False
         self._sentence_complete = False  # True after first sentence end detected
         self._ai_reveal_detected = False  # True if LLM tries to reveal AI identity
+        self._turns: list[dict] = []  # transcript built so far (append-only)
+        self._scanned = 0  # context messages already accounted for in _turns
+        # Messages seeded before the call starts (the greeting) open the transcript
+        self._fold_context()
 
     @property
     def turn_number(self) -> int:
@@ -99,38 +134,50 @@ class CallManager(FrameProcessor):
 
     @property
     def transcript(self) -> list[dict]:
-        """Extract transcript from universal LLMContext messages.
+        """The call transcript so far, as [{"role": "agent"/"parent", "text"}].
 
-        Universal context uses OpenAI-style dicts:
-          {"role": "user"/"assistant", "content": "..."}
+        Updated as response frames pass through (see _record_turn), so
+        reading it is free. The returned list is append-only and owned by
+        the CallManager — callers must not mutate it.
         """
-        transcript = []
-        for msg in self._context.get_messages():
-            try:
-                if not isinstance(msg, dict):
-                    continue
-                role_raw = msg.get("role", "")
-                if role_raw == "user":
-                    role = "parent"
-                elif role_raw in ("assistant", "model"):
-                    role = "agent"
-                else:
-                    continue
-
-                content = msg.get("content", "")
-                text = content if isinstance(content, str) else str(content)
-
-                # Skip phase instruction messages (injected by PhaseInstructor)
-                if text.startswith(PHASE_INSTRUCTION_PREFIX):
-                    continue
-
-                if text and text.strip():
-                    transcript.append({"role": role, "text": text.strip()})
-            except Exception as e:
-                logger.warning(f"Error extracting message: {e}")
-                continue
-
-        return transcript
+        return self._turns
+
+    def turns_since(self, n: int) -> list[dict]:
+        """Transcript entries from position n on (the delta a sink hasn't stored)."""
+        return self._turns[n:]
+
+    def finish_transcript(self) -> list[dict]:
+        """The final transcript at call end, including anything the parent
+        said after the last agent reply."""
+        self._fold_context()
+        return self._turns
+
+    def _fold_context(self) -> None:
+        """Append the context messages added since the last turn that
+        _record_turn didn't write itself: the parent's turns committed by
+        the user aggregator, and anything seeded before the call (the
+        greeting). Phase guidance is skipped."""
+        messages = self._context.get_messages()
+        if len(messages) < self._scanned:
+            # Context was rewritten (shorter than what we've seen) — rebuild
+            logger.warning("LLM context shrank — rebuilding transcript")
+            self._turns = [e for e in map(_transcript_entry, messages) if e is not None]
+            self._scanned = len(messages)
+            return
+        for msg in messages[self._scanned:]:
+            entry = _transcript_entry(msg)
+            if entry is not None:
+                self._turns.append(entry)
+        self._scanned = len(messages)
+
+    def _record_turn(self, reply: str) -> None:
+        """Close a turn: fold in the parent's side, then add the agent's
+        reply to both the LLM context and the transcript."""
+        self._fold_context()
+        self._context.add_message({"role": "assistant", "content": reply})
+        self._scanned += 1
+        if reply.strip():
+            self._turns.append({"role": "agent", "text": reply.strip()})
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
@@ -204,19 +251,17 @@ class CallManager(FrameProcessor):
                     # Also need to push this replacement to TTS
                     from pipecat.frames.frames import TTSSpeakFrame
                     await self.push_frame(TTSSpeakFrame(text=truncated), direction)
-                    self._context.add_message(
-                        {"role": "assistant", "content": truncated}
-                    )
+                    self._record_turn(truncated)
                     await self.push_frame(frame, direction)
                     return
 
                 logger.info(
                     f"Turn {self._turn_number}: {truncated[:80]}"
                 )
-                # Add TRUNCATED model response to LLM context
-                self._context.add_message(
-                    {"role": "assistant", "content": truncated}
-                )
+                # Add TRUNCATED model response to LLM context and transcript
+                self._record_turn(truncated)
+            else:
+                self._fold_context()
 
             # Fire transcript sync (non-blocking)
             if self._on_turn_complete:
@@ -19,17 +19,30 @@ Entity model:
   parent_concerns  ← lifecycle-tracked concerns across calls
   follow_ups       ← actionable follow-up tasks from calls
   call_metrics     ← pipeline quality data (latency, noise, STT quality)
+  analysis_jobs    ← durable queue of post-call analyses (see analysis_queue.py)
+  parent_context_snapshot ← pre-rendered parent history for call start
 
 Migration path: SQLite now → Postgres or Firestore later.
 Schema uses TEXT dates (ISO 8601), TEXT enums, INTEGER booleans.
+
+Live calls use AsyncCallStore: writes go to one writer thread that
+batches them into a commit every CALL_STORE_FLUSH_MS (or immediately at
+call end), reads run on a small pool of read-only connections. The
+event loop driving the audio pipeline never waits on SQLite or fsync.
 """
 
+import asyncio
 import json
 import os
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 from loguru import logger
 
@@ -40,7 +53,15 @@ _DEFAULT_DB_PATH = os.environ.get(
 )
 
 # ── Schema version — bump on breaking changes ──
-_SCHEMA_VERSION = 2
+_SCHEMA_VERSION = 4
+
+# ── AsyncCallStore tuning ──
+# Max time a write waits for its batch to commit (call-end writes commit at once)
+_FLUSH_INTERVAL_S = int(os.environ.get("CALL_STORE_FLUSH_MS", "200")) / 1000
+_MAX_BATCH = int(os.environ.get("CALL_STORE_MAX_BATCH", "200"))
+# Bounded write queue — a full queue makes writers wait (backpressure)
+_QUEUE_SIZE = int(os.environ.get("CALL_STORE_QUEUE_SIZE", "2000"))
+_READ_POOL_SIZE = int(os.environ.get("CALL_STORE_READERS", "2"))
 
 
 def _now_iso() -> str:
@@ -246,7 +267,7 @@ CREATE TABLE IF NOT EXISTS call_metrics (
     outreach_id             TEXT PRIMARY KEY REFERENCES calls(outreach_id),
 
     -- Latency
-    greeting_latency_ms     INTEGER,    -- time from connect to first audio out
+    greeting_latency_ms     INTEGER,    -- Twilio stream start → first greeting audio out
     avg_response_latency_ms INTEGER,    -- average time from parent stop speaking to agent audio
     max_response_latency_ms INTEGER,
 
@@ -268,6 +289,34 @@ CREATE TABLE IF NOT EXISTS call_metrics (
     created_at              TEXT NOT NULL
 );
 
+-- ── analysis_jobs ───────────────────────────────────────────────────────────
+-- Durable post-call analysis queue. Survives restarts: a job left 'running'
+-- by a crash is put back to 'pending' on startup.
+-- Workflow: pending → running → done, or back to pending (retry) → failed.
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    outreach_id     TEXT PRIMARY KEY REFERENCES calls(outreach_id),
+    call_context    TEXT NOT NULL,           -- JSON: context the analysis prompt needs
+    status          TEXT DEFAULT 'pending',  -- pending/running/done/failed
+    attempts        INTEGER DEFAULT 0,
+    next_attempt_at TEXT NOT NULL,           -- not claimed before this (retry backoff)
+    last_error      TEXT,
+    created_at      TEXT NOT NULL,
+    updated_at      TEXT NOT NULL
+);
+
+-- ── parent_context_snapshot ─────────────────────────────────────────────────
+-- The "PARENT HISTORY" block injected into the system prompt, rendered
+-- ahead of time. Re-rendered inside the same transaction as every write
+-- that changes it (complete_call, save_insights, record_concerns,
+-- create_follow_ups), so call setup is one primary-key lookup.
+-- context_text NULL = parent known, nothing worth injecting.
+-- No row = never rendered (pre-v4 data) — build_parent_context renders live.
+CREATE TABLE IF NOT EXISTS parent_context_snapshot (
+    parent_phone  TEXT PRIMARY KEY,          -- = parents.phone
+    context_text  TEXT,
+    updated_at    TEXT NOT NULL
+) WITHOUT ROWID;
+
 -- ═══════════════════════════════════════════════════════════════════════════
 -- Indexes
 -- ═══════════════════════════════════════════════════════════════════════════
@@ -281,7 +330,9 @@ CREATE INDEX IF NOT EXISTS idx_students_parent    ON students(parent_phone);
 CREATE INDEX IF NOT EXISTS idx_students_school    ON students(school_name);
 
 -- Call queries
-CREATE INDEX IF NOT EXISTS idx_calls_parent       ON calls(parent_phone);
+-- Covering for the parent-context render: last call + insight joins by parent
+DROP INDEX IF EXISTS idx_calls_parent;
+CREATE INDEX IF NOT EXISTS idx_calls_parent_recent ON calls(parent_phone, created_at, outreach_id, reason);
 CREATE INDEX IF NOT EXISTS idx_calls_student       ON calls(student_id);
 CREATE INDEX IF NOT EXISTS idx_calls_status        ON calls(call_status);
 CREATE INDEX IF NOT EXISTS idx_calls_reason        ON calls(reason_category);
@@ -292,9 +343,13 @@ CREATE INDEX IF NOT EXISTS idx_calls_unsynced      ON calls(synced_to_backend)
 -- Transcript queries
 CREATE INDEX IF NOT EXISTS idx_turns_call          ON transcript_turns(outreach_id);
 CREATE INDEX IF NOT EXISTS idx_turns_role           ON transcript_turns(outreach_id, role);
+CREATE INDEX IF NOT EXISTS idx_turns_seq            ON transcript_turns(outreach_id, turn_number);
 
 -- Concern lifecycle
-CREATE INDEX IF NOT EXISTS idx_concerns_parent     ON parent_concerns(parent_phone);
+-- Covering for the parent-context render (open concerns, by severity)
+DROP INDEX IF EXISTS idx_concerns_parent;
+CREATE INDEX IF NOT EXISTS idx_concerns_parent_open ON parent_concerns(
+    parent_phone, status, severity, times_raised, category, concern_text);
 CREATE INDEX IF NOT EXISTS idx_concerns_status      ON parent_concerns(status)
                                                     WHERE status != 'resolved';
 CREATE INDEX IF NOT EXISTS idx_concerns_category    ON parent_concerns(category);
@@ -302,8 +357,15 @@ CREATE INDEX IF NOT EXISTS idx_concerns_category    ON parent_concerns(category)
 -- Follow-up workflow
 CREATE INDEX IF NOT EXISTS idx_followups_status     ON follow_ups(status)
                                                     WHERE status = 'pending';
-CREATE INDEX IF NOT EXISTS idx_followups_parent     ON follow_ups(parent_phone);
+-- Covering for the parent-context render (pending follow-ups, by priority)
+DROP INDEX IF EXISTS idx_followups_parent;
+CREATE INDEX IF NOT EXISTS idx_followups_parent_pending ON follow_ups(
+    parent_phone, status, priority, description);
 CREATE INDEX IF NOT EXISTS idx_followups_owner       ON follow_ups(owner, status);
+
+-- Analysis queue
+CREATE INDEX IF NOT EXISTS idx_analysis_due         ON analysis_jobs(next_attempt_at)
+                                                    WHERE status = 'pending';
 """
 
 
@@ -323,11 +385,39 @@ class CallStore:
       context = store.build_parent_context(phone)   # for next call
     """
 
-    def __init__(self, db_path: str = _DEFAULT_DB_PATH):
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    def __init__(
+        self,
+        db_path: str = _DEFAULT_DB_PATH,
+        *,
+        autocommit: bool = True,
+        readonly: bool = False,
+    ):
+        """Open the store.
+
+        autocommit=False: every method leaves its writes uncommitted and
+          the owner manages transactions (AsyncCallStore's writer thread
+          batches many calls into one commit).
+        readonly=True: a read-only handle onto an existing database
+          (AsyncCallStore's read pool). Skips schema setup.
+        """
         self._db_path = db_path
-        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._autocommit = autocommit
+        # Parents whose context snapshot is stale — re-rendered on _commit()
+        self._dirty_parents: set[str] = set()
+        # Inside _transaction(): nested write methods' _commit() defers to it
+        self._in_transaction = False
+        if not readonly:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            # Manual transaction control for batched writers
+            isolation_level="" if autocommit else None,
+        )
         self._conn.row_factory = sqlite3.Row
+        if readonly:
+            self._conn.execute("PRAGMA query_only=ON")
+            return
         self._conn.execute("PRAGMA journal_mode=WAL")
         self._conn.execute("PRAGMA foreign_keys=ON")
         self._init_schema()
@@ -339,13 +429,49 @@ class CallStore:
         row = self._conn.execute(
             "SELECT version FROM schema_version ORDER BY version DESC LIMIT 1"
         ).fetchone()
-        if not row:
+        # New tables are additive (CREATE IF NOT EXISTS) — just record the bump
+        if not row or row[0] < _SCHEMA_VERSION:
             self._conn.execute(
                 "INSERT INTO schema_version (version, migrated_at) VALUES (?, ?)",
                 (_SCHEMA_VERSION, _now_iso()),
             )
         self._conn.commit()
 
+    def _commit(self) -> None:
+        """End of a write method: refresh touched parents' context
+        snapshots (same transaction), then commit if autocommitting and
+        not inside _transaction()."""
+        while self._dirty_parents:
+            self._refresh_parent_context(self._dirty_parents.pop())
+        if self._autocommit and not self._in_transaction:
+            self._conn.commit()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Run a multi-statement write as one explicit transaction, committed
+        (with the parent snapshot refresh) on exit and rolled back on error.
+
+        Write methods called inside it commit with it, not on their own.
+        Without autocommit the owner's transaction already covers the write
+        (AsyncCallStore runs each job in a SAVEPOINT), so only the closing
+        _commit() runs here.
+        """
+        if not self._autocommit or self._in_transaction:
+            yield
+            self._commit()
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._in_transaction = True
+        try:
+            yield
+            self._in_transaction = False
+            self._commit()
+        except BaseException:
+            self._in_transaction = False
+            self._conn.rollback()
+            self._dirty_parents.clear()
+            raise
+
     # ── Parents ──────────────────────────────────────────────────────────────
 
     def _ensure_parent(self, phone: str, call_context: dict) -> None:
@@ -435,7 +561,7 @@ class CallStore:
                 now, now, now,
             ),
         )
-        self._conn.commit()
+        self._commit()
         logger.debug(f"Call record created: {outreach_id}")
 
     def add_turn(
@@ -459,7 +585,7 @@ class CallStore:
             "UPDATE calls SET turn_count = ?, updated_at = ? WHERE outreach_id = ?",
             (turn_number, now, outreach_id),
         )
-        self._conn.commit()
+        self._commit()
 
     def update_transcript(
         self,
@@ -467,27 +593,88 @@ class CallStore:
         transcript: list[dict],
         turn_count: int,
     ) -> None:
-        """Bulk upsert transcript turns from a list. Used during live call sync."""
-        now = _now_iso()
-        # Delete existing turns and re-insert (simpler than diffing)
-        self._conn.execute(
-            "DELETE FROM transcript_turns WHERE outreach_id = ?", (outreach_id,)
-        )
-        for i, turn in enumerate(transcript):
-            text = turn.get("text", "")
+        """Persist the live transcript. Used during live call sync.
+
+        Append-only by seq (a turn's 0-based position, stored as
+        turn_number): turns already stored are skipped, so a per-turn sync
+        writes one or two rows instead of the whole call. Only if a stored
+        turn lies past the end of the transcript (context rewritten) are
+        the turns replaced.
+        """
+        with self._transaction():
+            self._write_transcript(outreach_id, transcript, turn_count)
+
+    def _write_transcript(
+        self, outreach_id: str, transcript: list[dict], turn_count: int,
+    ) -> None:
+        last = self._conn.execute(
+            "SELECT MAX(turn_number) FROM transcript_turns WHERE outreach_id = ?",
+            (outreach_id,),
+        ).fetchone()[0]
+        if last is not None and last >= len(transcript):
             self._conn.execute(
-                """INSERT INTO transcript_turns
-                   (outreach_id, turn_number, role, text, word_count, timestamp, created_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (outreach_id, i, turn.get("role", "agent"), text,
-                 len(text.split()) if text else 0,
-                 turn.get("timestamp", now), now),
+                "DELETE FROM transcript_turns WHERE outreach_id = ?", (outreach_id,)
+            )
+            stored: set[int] = set()
+        else:
+            stored = self._stored_seqs(outreach_id, 0, len(transcript) - 1)
+        self._insert_turns(outreach_id, transcript, 0, turn_count, stored)
+
+    def append_turns(
+        self,
+        outreach_id: str,
+        turns: list[dict],
+        first_index: int,
+        turn_count: int,
+    ) -> None:
+        """Append transcript turns; turns[i] has seq first_index + i.
+
+        Idempotent and order-independent: seqs already stored are skipped,
+        so a retried delta never duplicates rows and a late delta fills
+        its own positions instead of shifting the turns after it.
+        """
+        with self._transaction():
+            self._insert_turns(
+                outreach_id, turns, first_index, turn_count,
+                self._stored_seqs(outreach_id, first_index, first_index + len(turns) - 1),
+            )
+
+    def _stored_seqs(self, outreach_id: str, first: int, last: int) -> set[int]:
+        """Seqs in [first, last] the call already holds — an index range
+        scan over just the incoming turns, not the whole call."""
+        return {
+            r[0] for r in self._conn.execute(
+                """SELECT turn_number FROM transcript_turns
+                   WHERE outreach_id = ? AND turn_number BETWEEN ? AND ?""",
+                (outreach_id, first, last),
             )
+        }
+
+    def _insert_turns(
+        self,
+        outreach_id: str,
+        turns: list[dict],
+        first_index: int,
+        turn_count: int,
+        stored: set[int],
+    ) -> None:
+        now = _now_iso()
+        self._conn.executemany(
+            """INSERT INTO transcript_turns
+               (outreach_id, turn_number, role, text, word_count, timestamp, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (outreach_id, seq, turn.get("role", "agent"),
+                 turn.get("text", ""), len(turn.get("text", "").split()),
+                 turn.get("timestamp", now), now)
+                for seq, turn in enumerate(turns, first_index)
+                if seq not in stored
+            ],
+        )
         self._conn.execute(
             "UPDATE calls SET turn_count = ?, updated_at = ? WHERE outreach_id = ?",
             (turn_count, now, outreach_id),
         )
-        self._conn.commit()
 
     def complete_call(
         self,
@@ -498,11 +685,28 @@ class CallStore:
         call_duration_s: int | None = None,
         call_sid: str | None = None,
     ) -> None:
-        """Mark call as completed with final transcript."""
+        """Mark call as completed with final transcript — one transaction,
+        so a crash never leaves a completed call without its last turns."""
+        with self._transaction():
+            self._complete_call(
+                outreach_id, transcript, turn_count,
+                call_status, call_duration_s, call_sid,
+            )
+        logger.info(f"Call completed: {outreach_id} — {turn_count} turns, status={call_status}")
+
+    def _complete_call(
+        self,
+        outreach_id: str,
+        transcript: list[dict],
+        turn_count: int,
+        call_status: str,
+        call_duration_s: int | None,
+        call_sid: str | None,
+    ) -> None:
         now = _now_iso()
 
-        # Upsert transcript turns
-        self.update_transcript(outreach_id, transcript, turn_count)
+        # Store any turns the live sync hasn't written yet
+        self._write_transcript(outreach_id, transcript, turn_count)
 
         # Update call record
         params: list[Any] = [call_status, now, now]
@@ -532,6 +736,7 @@ class CallStore:
                    WHERE phone = ?""",
                 (call_status, now, now, phone),
             )
+            self._dirty_parents.add(phone)
 
         # Update student outreach count
         student_id = self._conn.execute(
@@ -548,9 +753,6 @@ class CallStore:
                 (outreach_id, now, now, student_id[0]),
             )
 
-        self._conn.commit()
-        logger.info(f"Call completed: {outreach_id} — {turn_count} turns, status={call_status}")
-
     def get_call(self, outreach_id: str) -> dict | None:
         """Get a single call record with its transcript turns."""
         row = self._conn.execute(
@@ -643,8 +845,9 @@ class CallStore:
                    WHERE phone = ?""",
                 (sentiment, dominant, style, productive, now, phone),
             )
+            self._dirty_parents.add(phone)
 
-        self._conn.commit()
+        self._commit()
         logger.info(f"Insights saved: {outreach_id} — sentiment={insights.get('parentSentiment')}")
 
     # ── Parent Concerns ──────────────────────────────────────────────────────
@@ -703,7 +906,8 @@ class CallStore:
                      outreach_id, now, now, now),
                 )
 
-        self._conn.commit()
+        self._dirty_parents.add(parent_phone)
+        self._commit()
 
     # ── Follow-ups ───────────────────────────────────────────────────────────
 
@@ -735,7 +939,9 @@ class CallStore:
                  fu.get("description", ""), fu.get("owner", "teacher"),
                  fu.get("priority", "medium"), now, now),
             )
-        self._conn.commit()
+        if parent_phone:
+            self._dirty_parents.add(parent_phone)
+        self._commit()
 
     # ── Call Metrics ─────────────────────────────────────────────────────────
 
@@ -767,24 +973,165 @@ class CallStore:
                 _now_iso(),
             ),
         )
-        self._conn.commit()
+        self._commit()
+
+    # ── Analysis Queue ───────────────────────────────────────────────────────
+
+    def enqueue_analysis(self, outreach_id: str, call_context: dict) -> bool:
+        """Queue post-call analysis. Returns False if the call is already queued."""
+        now = _now_iso()
+        cur = self._conn.execute(
+            """INSERT OR IGNORE INTO analysis_jobs
+               (outreach_id, call_context, next_attempt_at, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            (outreach_id, json.dumps(call_context, ensure_ascii=False), now, now, now),
+        )
+        self._commit()
+        return cur.rowcount > 0
+
+    def claim_analysis_jobs(
+        self,
+        *,
+        batch_size: int = 1,
+        backlog_threshold: int = 0,
+        max_batch_turns: int = 0,
+    ) -> list[dict]:
+        """Claim due jobs (pending → running) with their transcripts.
+
+        Claims one job, or — when at least backlog_threshold jobs are due —
+        up to batch_size first-attempt jobs whose transcripts have at most
+        max_batch_turns turns, for one shared analysis call. Retries are
+        always claimed alone.
+        """
+        now = _now_iso()
+        rows = self._conn.execute(
+            """SELECT j.outreach_id, j.call_context, j.attempts,
+                      (SELECT COUNT(*) FROM transcript_turns t
+                       WHERE t.outreach_id = j.outreach_id) AS turns
+               FROM analysis_jobs j
+               WHERE j.status = 'pending' AND j.next_attempt_at <= ?
+               ORDER BY j.next_attempt_at
+               LIMIT ?""",
+            (now, max(backlog_threshold, batch_size, 1)),
+        ).fetchall()
+        if not rows:
+            return []
+
+        def batchable(r: sqlite3.Row) -> bool:
+            return r["attempts"] == 0 and r["turns"] <= max_batch_turns
+
+        picked = [rows[0]]
+        if len(rows) >= max(backlog_threshold, 2) and batchable(rows[0]):
+            picked += [r for r in rows[1:] if batchable(r)][: batch_size - 1]
+
+        jobs = []
+        for r in picked:
+            self._conn.execute(
+                """UPDATE analysis_jobs SET status = 'running',
+                   attempts = attempts + 1, updated_at = ? WHERE outreach_id = ?""",
+                (now, r["outreach_id"]),
+            )
+            turns = self._conn.execute(
+                """SELECT role, text FROM transcript_turns
+                   WHERE outreach_id = ? ORDER BY turn_number""",
+                (r["outreach_id"],),
+            ).fetchall()
+            jobs.append({
+                "outreach_id": r["outreach_id"],
+                "call_context": json.loads(r["call_context"]),
+                "attempts": r["attempts"] + 1,
+                "transcript": [dict(t) for t in turns],
+            })
+        self._commit()
+        return jobs
+
+    def finish_analysis_job(self, outreach_id: str, insights: dict | None) -> None:
+        """Store the analysis result and close the job — one transaction."""
+        with self._transaction():
+            if insights:
+                parent_phone = json.loads(
+                    self._conn.execute(
+                        "SELECT call_context FROM analysis_jobs WHERE outreach_id = ?",
+                        (outreach_id,),
+                    ).fetchone()[0]
+                ).get("parentPhone", "")
+                self.save_insights(outreach_id, insights)
+                if parent_phone and insights.get("concerns"):
+                    self.record_concerns(outreach_id, parent_phone, insights["concerns"])
+                if insights.get("followUps"):
+                    self.create_follow_ups(outreach_id, parent_phone, insights["followUps"])
+            self._conn.execute(
+                """UPDATE analysis_jobs SET status = 'done', last_error = NULL,
+                   updated_at = ? WHERE outreach_id = ?""",
+                (_now_iso(), outreach_id),
+            )
+
+    def fail_analysis_job(
+        self, outreach_id: str, error: str, retry_at: str | None,
+    ) -> None:
+        """Record a failed attempt: back to pending at retry_at, or failed for good."""
+        self._conn.execute(
+            """UPDATE analysis_jobs SET status = ?, last_error = ?,
+               next_attempt_at = COALESCE(?, next_attempt_at), updated_at = ?
+               WHERE outreach_id = ?""",
+            ("pending" if retry_at else "failed", error[:500], retry_at,
+             _now_iso(), outreach_id),
+        )
+        self._commit()
+
+    def requeue_running_analysis_jobs(self) -> int:
+        """Put jobs orphaned by a crash/restart back in the queue."""
+        cur = self._conn.execute(
+            "UPDATE analysis_jobs SET status = 'pending', updated_at = ? WHERE status = 'running'",
+            (_now_iso(),),
+        )
+        self._commit()
+        return cur.rowcount
+
+    def get_analysis_queue_stats(self) -> dict:
+        rows = self._conn.execute(
+            "SELECT status, COUNT(*) FROM analysis_jobs GROUP BY status"
+        ).fetchall()
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+        counts.update({r[0]: r[1] for r in rows})
+        return counts
 
     # ── Parent Intelligence (for LLM context) ────────────────────────────────
 
     def build_parent_context(self, parent_phone: str) -> str | None:
-        """Build a text summary of parent history for LLM system prompt injection.
+        """Parent history text for LLM system prompt injection.
 
-        Queries across normalized tables to build a rich picture:
+        One primary-key lookup on parent_context_snapshot. Parents with no
+        snapshot row yet (history written before schema v4) are rendered
+        live instead.
+
+        Returns None for first-time parents (no history).
+        """
+        if not parent_phone:
+            return None
+        row = self._conn.execute(
+            "SELECT context_text FROM parent_context_snapshot WHERE parent_phone = ?",
+            (parent_phone,),
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        return self._render_parent_context(parent_phone)
+
+    def _refresh_parent_context(self, parent_phone: str) -> None:
+        self._conn.execute(
+            """INSERT OR REPLACE INTO parent_context_snapshot
+               (parent_phone, context_text, updated_at) VALUES (?, ?, ?)""",
+            (parent_phone, self._render_parent_context(parent_phone), _now_iso()),
+        )
+
+    def _render_parent_context(self, parent_phone: str) -> str | None:
+        """Build a text summary of parent history from the normalized tables:
           - Call history and sentiment trends
           - Open concerns
           - Communication style
           - What approaches worked before
           - Pending follow-ups
-
-        Returns None for first-time parents (no history).
         """
-        if not parent_phone:
-            return None
 
         parent = self._conn.execute(
             "SELECT * FROM parents WHERE phone = ?", (parent_phone,)
@@ -871,41 +1218,68 @@ class CallStore:
     # ── Sync tracking ────────────────────────────────────────────────────────
 
     def get_unsynced_calls(self, limit: int = 50) -> list[dict]:
-        """Get completed calls not yet synced to backend, with insights."""
+        """Get completed calls not yet synced to backend, with insights and
+        transcript — one joined query for the whole batch."""
         rows = self._conn.execute(
-            """SELECT c.*, ci.parent_sentiment, ci.call_quality, ci.parent_response,
-                      ci.action_items
-               FROM calls c
-               LEFT JOIN call_insights ci ON c.outreach_id = ci.outreach_id
-               WHERE c.synced_to_backend = 0 AND c.call_status = 'completed'
-               ORDER BY c.created_at
-               LIMIT ?""",
+            """WITH batch AS (
+                   SELECT outreach_id FROM calls
+                   WHERE synced_to_backend = 0 AND call_status = 'completed'
+                   ORDER BY created_at
+                   LIMIT ?
+               )
+               SELECT c.*, ci.parent_sentiment, ci.call_quality, ci.parent_response,
+                      ci.action_items,
+                      t.turn_number AS turn_seq, t.role AS turn_role, t.text AS turn_text,
+                      t.word_count AS turn_word_count, t.timestamp AS turn_timestamp
+               FROM batch b
+               JOIN calls c ON c.outreach_id = b.outreach_id
+               LEFT JOIN call_insights ci ON ci.outreach_id = c.outreach_id
+               LEFT JOIN transcript_turns t ON t.outreach_id = c.outreach_id
+               ORDER BY c.created_at, c.outreach_id, t.turn_number""",
             (limit,),
         ).fetchall()
-        result = []
+        result: list[dict] = []
         for r in rows:
             d = dict(r)
-            # Attach transcript
-            call = self.get_call(d["outreach_id"])
-            if call:
-                d["transcript"] = call["transcript"]
-            result.append(d)
+            turn = {
+                "seq": d.pop("turn_seq"),
+                "role": d.pop("turn_role"),
+                "text": d.pop("turn_text"),
+                "word_count": d.pop("turn_word_count"),
+                "timestamp": d.pop("turn_timestamp"),
+            }
+            if not result or result[-1]["outreach_id"] != d["outreach_id"]:
+                d["transcript"] = []
+                result.append(d)
+            if turn["role"] is not None:
+                result[-1]["transcript"].append(turn)
         return result
 
     def mark_synced(self, outreach_id: str) -> None:
-        self._conn.execute(
-            "UPDATE calls SET synced_to_backend = 1, updated_at = ? WHERE outreach_id = ?",
-            (_now_iso(), outreach_id),
+        self.mark_synced_many([outreach_id])
+
+    def mark_synced_many(self, outreach_ids: list[str]) -> None:
+        """Mark a pushed batch as synced — one transaction."""
+        now = _now_iso()
+        self._conn.executemany(
+            """UPDATE calls SET synced_to_backend = 1, sync_error = NULL,
+               last_sync_attempt = ?, updated_at = ? WHERE outreach_id = ?""",
+            [(now, now, outreach_id) for outreach_id in outreach_ids],
         )
-        self._conn.commit()
+        self._commit()
 
     def mark_sync_failed(self, outreach_id: str, error: str) -> None:
-        self._conn.execute(
+        self.mark_sync_failed_many({outreach_id: error})
+
+    def mark_sync_failed_many(self, errors: dict[str, str]) -> None:
+        """Park calls the backend rejected (synced_to_backend = 2) — one transaction."""
+        now = _now_iso()
+        self._conn.executemany(
             """UPDATE calls SET synced_to_backend = 2, sync_error = ?,
                last_sync_attempt = ?, updated_at = ? WHERE outreach_id = ?""",
-            (error, _now_iso(), _now_iso(), outreach_id),
+            [(error, now, now, outreach_id) for outreach_id, error in errors.items()],
         )
-        self._conn.commit()
+        self._commit()
 
     # ── Stats ────────────────────────────────────────────────────────────────
 
@@ -994,6 +1368,369 @@ class CallStore:
         self._conn.close()
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# AsyncCallStore — non-blocking front end for live calls
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class _WriteJob:
+    fn: Callable[[CallStore], Any]
+    flush: bool                          # commit right after this job
+    loop: asyncio.AbstractEventLoop | None
+    future: asyncio.Future | None        # resolved after commit, if awaited
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+_STOP = object()
+
+
+@dataclass
+class WriterStats:
+    """Writer-thread counters, surfaced on /health."""
+
+    enqueued: int = 0
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    max_batch: int = 0
+    max_queue_depth: int = 0
+    backpressure_waits: int = 0
+    last_commit_ms: float = 0.0
+    max_commit_ms: float = 0.0
+    max_lag_ms: float = 0.0              # enqueue → committed
+
+    def snapshot(self, queue_depth: int) -> dict:
+        return {
+            "queue_depth": queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch": round(self.written / self.batches, 1) if self.batches else 0,
+            "max_batch": self.max_batch,
+            "backpressure_waits": self.backpressure_waits,
+            "last_commit_ms": round(self.last_commit_ms, 1),
+            "max_commit_ms": round(self.max_commit_ms, 1),
+            "max_lag_ms": round(self.max_lag_ms, 1),
+        }
+
+
+def _settle(future: asyncio.Future, error: BaseException | None, result: Any) -> None:
+    if future.done():  # caller gave up (cancelled)
+        return
+    if error is None:
+        future.set_result(result)
+    else:
+        future.set_exception(error)
+
+
+class AsyncCallStore:
+    """Async CallStore for use from the Pipecat event loop.
+
+    Writes are queued to a dedicated writer thread that owns the only
+    write connection. It drains the queue into batches and commits each
+    batch once — after CALL_STORE_FLUSH_MS, after CALL_STORE_MAX_BATCH
+    jobs, or right away when a job asks for it (call end). Each job runs
+    in its own SAVEPOINT, so one bad write never loses its batch-mates.
+
+    In-call writes (create_call, add_turn, update_transcript, append_turns,
+    save_metrics) return once queued. Call-end and post-call writes wait
+    for their commit, so reads issued after them see the data.
+
+    Reads run in worker threads on a pool of read-only connections (WAL
+    lets them proceed while the writer commits).
+
+    Usage:
+      store = AsyncCallStore()                          # init at server start
+      await store.create_call(outreach_id, context)     # queued
+      await store.complete_call(outreach_id, ...)       # committed on return
+      context = await store.build_parent_context(phone)
+      await store.close()                               # drain + stop writer
+    """
+
+    def __init__(
+        self,
+        db_path: str = _DEFAULT_DB_PATH,
+        *,
+        flush_interval_s: float = _FLUSH_INTERVAL_S,
+        max_batch: int = _MAX_BATCH,
+        queue_size: int = _QUEUE_SIZE,
+        read_pool_size: int = _READ_POOL_SIZE,
+    ):
+        # Writer first: it creates the file and schema the readers open
+        self._writer = CallStore(db_path, autocommit=False)
+        self._readers: queue.Queue[CallStore] = queue.Queue()
+        for _ in range(max(1, read_pool_size)):
+            self._readers.put(CallStore(db_path, readonly=True))
+        self._read_pool_size = max(1, read_pool_size)
+        self._flush_interval_s = flush_interval_s
+        self._max_batch = max(1, max_batch)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.stats = WriterStats()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run_writer, name="call-store-writer", daemon=True,
+        )
+        self._thread.start()
+
+    # ── Write path ───────────────────────────────────────────────────────────
+
+    async def _submit(self, fn: Callable[[CallStore], Any], *, wait: bool = False) -> Any:
+        """Queue a write. wait=True: commit it immediately and return fn's
+        result once committed."""
+        if self._closed:
+            raise RuntimeError("AsyncCallStore is closed")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future() if wait else None
+        job = _WriteJob(fn=fn, flush=wait, loop=loop, future=future)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            # Backpressure: the disk can't keep up. Wait for room off-loop.
+            self.stats.backpressure_waits += 1
+            logger.warning(f"Call store write queue full ({self._queue.maxsize}) — waiting")
+            await asyncio.to_thread(self._queue.put, job)
+        self.stats.enqueued += 1
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self._queue.qsize())
+        if future is not None:
+            return await future
+        return None
+
+    def _run_writer(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self._flush_interval_s
+            while len(batch) < self._max_batch and not batch[-1].flush:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stopping = True
+                    break
+                batch.append(nxt)
+            self._write_batch(batch)
+        self._writer.close()
+
+    def _write_batch(self, batch: list[_WriteJob]) -> None:
+        conn = self._writer._conn
+        errors: list[BaseException | None] = []
+        results: list[Any] = []
+        started = time.monotonic()
+        try:
+            conn.execute("BEGIN")
+            for job in batch:
+                conn.execute("SAVEPOINT job")
+                try:
+                    results.append(job.fn(self._writer))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job")
+                    errors.append(e)
+                    results.append(None)
+                    logger.error(f"Call store write failed: {e}")
+                else:
+                    errors.append(None)
+                conn.execute("RELEASE job")
+            conn.execute("COMMIT")
+        except Exception as e:
+            # Commit itself failed (disk full, I/O error) — the whole batch is lost
+            logger.error(f"Call store batch commit failed ({len(batch)} writes): {e}")
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            errors = [e] * len(batch)
+            results = [None] * len(batch)
+
+        done = time.monotonic()
+        commit_ms = (done - started) * 1000
+        self.stats.batches += 1
+        self.stats.max_batch = max(self.stats.max_batch, len(batch))
+        self.stats.last_commit_ms = commit_ms
+        self.stats.max_commit_ms = max(self.stats.max_commit_ms, commit_ms)
+        for job, error, result in zip(batch, errors, results):
+            if error is None:
+                self.stats.written += 1
+            else:
+                self.stats.failed += 1
+            self.stats.max_lag_ms = max(self.stats.max_lag_ms, (done - job.enqueued_at) * 1000)
+            if job.future is not None and job.loop is not None and not job.loop.is_closed():
+                job.loop.call_soon_threadsafe(_settle, job.future, error, result)
+
+    async def flush(self) -> None:
+        """Wait until every write queued so far is committed."""
+        await self._submit(lambda store: None, wait=True)
+
+    async def create_call(self, outreach_id: str, call_context: dict) -> None:
+        ctx = dict(call_context)
+        await self._submit(lambda s: s.create_call(outreach_id, ctx))
+
+    async def add_turn(
+        self,
+        outreach_id: str,
+        turn_number: int,
+        role: str,
+        text: str,
+        language_detected: str | None = None,
+    ) -> None:
+        await self._submit(
+            lambda s: s.add_turn(outreach_id, turn_number, role, text, language_detected)
+        )
+
+    async def update_transcript(
+        self, outreach_id: str, transcript: list[dict], turn_count: int,
+    ) -> None:
+        turns = list(transcript)
+        await self._submit(lambda s: s.update_transcript(outreach_id, turns, turn_count))
+
+    async def append_turns(
+        self, outreach_id: str, turns: list[dict], first_index: int, turn_count: int,
+    ) -> None:
+        delta = list(turns)
+        await self._submit(lambda s: s.append_turns(outreach_id, delta, first_index, turn_count))
+
+    async def complete_call(
+        self,
+        outreach_id: str,
+        transcript: list[dict],
+        turn_count: int,
+        call_status: str = "completed",
+        call_duration_s: int | None = None,
+        call_sid: str | None = None,
+    ) -> None:
+        turns = list(transcript)
+        await self._submit(
+            lambda s: s.complete_call(
+                outreach_id, turns, turn_count,
+                call_status=call_status,
+                call_duration_s=call_duration_s,
+                call_sid=call_sid,
+            ),
+            wait=True,
+        )
+
+    async def save_insights(self, outreach_id: str, insights: dict) -> None:
+        await self._submit(lambda s: s.save_insights(outreach_id, insights), wait=True)
+
+    async def record_concerns(
+        self, outreach_id: str, parent_phone: str, concerns: list[dict],
+    ) -> None:
+        await self._submit(
+            lambda s: s.record_concerns(outreach_id, parent_phone, concerns), wait=True,
+        )
+
+    async def create_follow_ups(
+        self, outreach_id: str, parent_phone: str, follow_ups: list[dict],
+    ) -> None:
+        await self._submit(
+            lambda s: s.create_follow_ups(outreach_id, parent_phone, follow_ups), wait=True,
+        )
+
+    async def save_metrics(self, outreach_id: str, metrics: dict) -> None:
+        data = dict(metrics)
+        await self._submit(lambda s: s.save_metrics(outreach_id, data))
+
+    async def mark_synced(self, outreach_id: str) -> None:
+        await self._submit(lambda s: s.mark_synced(outreach_id), wait=True)
+
+    async def mark_sync_failed(self, outreach_id: str, error: str) -> None:
+        await self._submit(lambda s: s.mark_sync_failed(outreach_id, error), wait=True)
+
+    async def mark_synced_many(self, outreach_ids: list[str]) -> None:
+        ids = list(outreach_ids)
+        await self._submit(lambda s: s.mark_synced_many(ids), wait=True)
+
+    async def mark_sync_failed_many(self, errors: dict[str, str]) -> None:
+        data = dict(errors)
+        await self._submit(lambda s: s.mark_sync_failed_many(data), wait=True)
+
+    async def enqueue_analysis(self, outreach_id: str, call_context: dict) -> bool:
+        ctx = dict(call_context)
+        return await self._submit(lambda s: s.enqueue_analysis(outreach_id, ctx), wait=True)
+
+    async def claim_analysis_jobs(self, **policy: int) -> list[dict]:
+        return await self._submit(lambda s: s.claim_analysis_jobs(**policy), wait=True)
+
+    async def finish_analysis_job(self, outreach_id: str, insights: dict | None) -> None:
+        await self._submit(lambda s: s.finish_analysis_job(outreach_id, insights), wait=True)
+
+    async def fail_analysis_job(
+        self, outreach_id: str, error: str, retry_at: str | None,
+    ) -> None:
+        await self._submit(
+            lambda s: s.fail_analysis_job(outreach_id, error, retry_at), wait=True,
+        )
+
+    async def requeue_running_analysis_jobs(self) -> int:
+        return await self._submit(lambda s: s.requeue_running_analysis_jobs(), wait=True)
+
+    # ── Read path ────────────────────────────────────────────────────────────
+
+    def _with_reader(self, fn: Callable[[CallStore], Any]) -> Any:
+        reader = self._readers.get()
+        try:
+            return fn(reader)
+        finally:
+            self._readers.put(reader)
+
+    async def _read(self, fn: Callable[[CallStore], Any]) -> Any:
+        return await asyncio.to_thread(self._with_reader, fn)
+
+    async def get_call(self, outreach_id: str) -> dict | None:
+        return await self._read(lambda s: s.get_call(outreach_id))
+
+    async def has_insights(self, outreach_id: str) -> bool:
+        return await self._read(lambda s: s.has_insights(outreach_id))
+
+    async def build_parent_context(self, parent_phone: str) -> str | None:
+        return await self._read(lambda s: s.build_parent_context(parent_phone))
+
+    async def get_unsynced_calls(self, limit: int = 50) -> list[dict]:
+        return await self._read(lambda s: s.get_unsynced_calls(limit))
+
+    async def get_parent_history(self, parent_phone: str) -> dict | None:
+        return await self._read(lambda s: s.get_parent_history(parent_phone))
+
+    async def get_sentiment_distribution(self) -> dict:
+        return await self._read(lambda s: s.get_sentiment_distribution())
+
+    async def get_concern_summary(self) -> list[dict]:
+        return await self._read(lambda s: s.get_concern_summary())
+
+    async def get_analysis_queue_stats(self) -> dict:
+        return await self._read(lambda s: s.get_analysis_queue_stats())
+
+    async def get_stats(self) -> dict:
+        """DB counts plus writer queue / batch / backpressure metrics."""
+        stats = await self._read(lambda s: s.get_stats())
+        stats["writer"] = self.stats.snapshot(self._queue.qsize())
+        stats["read_pool_size"] = self._read_pool_size
+        return stats
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    def _shutdown(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+        for _ in range(self._read_pool_size):
+            self._readers.get().close()
+
+    async def close(self) -> None:
+        """Commit everything queued, stop the writer, close connections."""
+        if self._closed:
+            return
+        self._closed = True
+        await asyncio.to_thread(self._shutdown)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Helpers
 # ═══════════════════════════════════════════════════════════════════════════════
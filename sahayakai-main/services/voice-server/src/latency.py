@@ -0,0 +1,79 @@
+"""
+Greeting latency — Twilio stream start → first greeting audio out.
+
+This is the dead air a parent hears after picking up. Measured per call
+by GreetingLatencyProbe (sits just before transport.output()) from the
+monotonic time main.py saw Twilio's 'start' event to the first TTS audio
+frame leaving for Twilio. Saved as call_metrics.greeting_latency_ms and
+summarized over recent calls on GET /health.
+"""
+
+import time
+from collections import deque
+from typing import Callable
+
+from pipecat.frames.frames import Frame, TTSAudioRawFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+# Recent calls kept for the /health percentiles
+_WINDOW = 200
+
+
+class LatencyWindow:
+    """Rolling window of recent greeting latencies, split by warm/cold resources."""
+
+    def __init__(self, size: int = _WINDOW):
+        self._samples: deque[tuple[int, bool]] = deque(maxlen=size)
+
+    def record(self, latency_ms: int, *, warm: bool) -> None:
+        self._samples.append((latency_ms, warm))
+
+    def snapshot(self) -> dict:
+        values = sorted(ms for ms, _ in self._samples)
+        if not values:
+            return {"calls": 0}
+
+        def pct(p: float) -> int:
+            return values[min(len(values) - 1, int(p * len(values)))]
+
+        return {
+            "calls": len(values),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": values[-1],
+            "cold_starts": sum(1 for _, warm in self._samples if not warm),
+        }
+
+
+# Process-wide — every call records here
+greeting_latency = LatencyWindow()
+
+
+class GreetingLatencyProbe(FrameProcessor):
+    """Reports the time to the first TTS audio frame, once per call.
+
+    Pipeline position: tts → GreetingLatencyProbe → transport.output()
+    All frames pass through untouched.
+    """
+
+    def __init__(
+        self,
+        *,
+        stream_started_at: float,
+        on_first_audio: Callable[[int], None],
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._stream_started_at = stream_started_at
+        self._on_first_audio = on_first_audio
+        self._reported = False
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if not self._reported and isinstance(frame, TTSAudioRawFrame):
+            self._reported = True
+            latency_ms = int((time.monotonic() - self._stream_started_at) * 1000)
+            self._on_first_audio(latency_ms)
+
+        await self.push_frame(frame, direction)
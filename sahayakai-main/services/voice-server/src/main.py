@@ -11,6 +11,8 @@ Endpoints:
 
 import asyncio
 import json
+import time
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -19,13 +21,48 @@ from pipecat.pipeline.task import PipelineTaskParams
 
 from src.config import load_config
 from src.bot import create_bot
-from src.persistence import fetch_call_context
-from src.call_store import CallStore
-from src.call_analyzer import analyze_call
+from src.persistence import close_http_client, fetch_call_context
+from src.call_store import AsyncCallStore
+from src.analysis_queue import AnalysisQueue
+from src.warm_pool import WarmPool
+from src.backend_sync import BackendSync, HttpSyncTarget
+from src.latency import greeting_latency
 
-app = FastAPI(title="SahayakAI Voice Server", version="0.1.0")
 config = load_config()
-call_store = CallStore()  # SQLite — initialized once, shared across calls
+# SQLite behind a writer thread + read pool — initialized once, shared across calls
+call_store = AsyncCallStore()
+# Durable post-call analysis — jobs live in the call store, workers run in-process
+analysis_queue = AnalysisQueue(call_store, api_key=config.google_api_key)
+# Pre-built VAD/RNNoise sets — new calls don't wait on model loading
+warm_pool = WarmPool()
+# Drains calls the live transcript sync didn't deliver (e.g. backend outage)
+backend_sync = (
+    BackendSync(
+        call_store,
+        HttpSyncTarget(config.sahayakai_api_url, config.sahayakai_internal_key),
+    )
+    if config.sahayakai_api_url and config.sahayakai_internal_key
+    else None
+)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    await warm_pool.start()
+    await analysis_queue.start()
+    if backend_sync:
+        await backend_sync.start()
+    yield
+    if backend_sync:
+        await backend_sync.stop()
+    await analysis_queue.stop()
+    await warm_pool.stop()
+    # Commit queued writes before the process exits
+    await call_store.close()
+    await close_http_client()
+
+
+app = FastAPI(title="SahayakAI Voice Server", version="0.1.0", lifespan=_lifespan)
 
 # ── Test scenarios for local testing ──
 # Use outreachId=__test__001, __test__002, etc. in TwiML
@@ -94,7 +131,11 @@ async def health():
             "llm": "gemini" if config.google_api_key else "not_configured",
             "tts": "sarvam" if config.sarvam_api_key else "not_configured",
         },
-        "call_store": call_store.get_stats(),
+        "call_store": await call_store.get_stats(),
+        "analysis_queue": await analysis_queue.stats(),
+        "warm_pool": warm_pool.stats(),
+        "greeting_latency": greeting_latency.snapshot(),
+        "backend_sync": backend_sync.stats() if backend_sync else "not_configured",
     }
 
 
@@ -121,6 +162,7 @@ async def handle_call(websocket: WebSocket):
     try:
         # Read Twilio's initial events to extract streamSid, callSid and outreachId
         stream_sid, call_sid, outreach_id = await _wait_for_twilio_start(websocket)
+        stream_started_at = time.monotonic()  # greeting latency is measured from here
 
         if not stream_sid:
             logger.error("Failed to get streamSid from Twilio")
@@ -134,20 +176,29 @@ async def handle_call(websocket: WebSocket):
 
         logger.info(f"Twilio stream: sid={stream_sid}, callSid={call_sid}, outreachId={outreach_id}")
 
-        # Fetch call context from SahayakAI backend
-        # __test__ prefix → hardcoded context for live testing
-        if outreach_id.startswith("__test__"):
-            call_context = _TEST_SCENARIOS.get(
-                outreach_id,
-                _TEST_SCENARIOS["__test__001"],  # default fallback
-            )
-            logger.info(f"Using test scenario: {outreach_id} — {call_context.get('reason', '?')}")
-        else:
-            call_context = await fetch_call_context(
-                api_url=config.sahayakai_api_url,
-                internal_key=config.sahayakai_internal_key,
-                outreach_id=outreach_id,
-            )
+        # Check out warm VAD/RNNoise resources while the call context loads
+        checkout = asyncio.create_task(warm_pool.checkout())
+
+        try:
+            # Fetch call context from SahayakAI backend
+            # __test__ prefix → hardcoded context for live testing
+            if outreach_id.startswith("__test__"):
+                call_context = _TEST_SCENARIOS.get(
+                    outreach_id,
+                    _TEST_SCENARIOS["__test__001"],  # default fallback
+                )
+                logger.info(f"Using test scenario: {outreach_id} — {call_context.get('reason', '?')}")
+            else:
+                call_context = await fetch_call_context(
+                    api_url=config.sahayakai_api_url,
+                    internal_key=config.sahayakai_internal_key,
+                    outreach_id=outreach_id,
+                )
+        finally:
+            # No context (or the fetch raised) — the call won't use the resources
+            if not call_context and not checkout.done():
+                checkout.cancel()
+                await asyncio.gather(checkout, return_exceptions=True)
 
         if not call_context:
             logger.error(f"Could not fetch context for outreach {outreach_id}")
@@ -155,9 +206,14 @@ async def handle_call(websocket: WebSocket):
             return
 
         call_context["id"] = outreach_id
+        resources = await checkout
 
         # Create and run the Pipecat pipeline
-        task = await create_bot(config, call_context, websocket, stream_sid, call_sid=call_sid, call_store=call_store)
+        task = await create_bot(
+            config, call_context, websocket, stream_sid,
+            call_sid=call_sid, call_store=call_store, analysis_queue=analysis_queue,
+            resources=resources, stream_started_at=stream_started_at,
+        )
 
         logger.info(f"Bot pipeline started for outreach {outreach_id}")
         run_params = PipelineTaskParams(loop=asyncio.get_running_loop())
@@ -165,21 +221,21 @@ async def handle_call(websocket: WebSocket):
 
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
-        # Fallback: run post-call analysis if disconnect handler didn't fire
-        await _post_call_cleanup(outreach_id, call_context, config)
+        # Fallback: queue post-call analysis if disconnect handler didn't fire
+        await _post_call_cleanup(outreach_id, call_context)
     except Exception as e:
         logger.error(f"Bot pipeline error: {e}")
-        await _post_call_cleanup(outreach_id, call_context, config)
+        await _post_call_cleanup(outreach_id, call_context)
         try:
             await websocket.close(code=1011, reason="Internal error")
         except Exception:
             pass
 
 
-async def _post_call_cleanup(outreach_id: str, call_context: dict, cfg):
-    """Fallback post-call analysis when disconnect handler doesn't fire."""
+async def _post_call_cleanup(outreach_id: str, call_context: dict):
+    """Fallback: queue post-call analysis when disconnect handler doesn't fire."""
     try:
-        call = call_store.get_call(outreach_id)
+        call = await call_store.get_call(outreach_id)
         if not call or call.get("call_status") != "completed":
             return  # Already handled or not a real call
 
@@ -188,22 +244,12 @@ async def _post_call_cleanup(outreach_id: str, call_context: dict, cfg):
             return
 
         # Check if insights already exist
-        if call_store.has_insights(outreach_id):
+        if await call_store.has_insights(outreach_id):
             return  # Already analyzed
 
-        logger.info(f"Running fallback post-call analysis for {outreach_id}")
-        insights = await analyze_call(call_context, transcript, api_key=cfg.google_api_key)
-        if insights:
-            call_store.save_insights(outreach_id, insights)
-            parent_phone = call_context.get("parentPhone", "")
-            if parent_phone and insights.get("concerns"):
-                call_store.record_concerns(outreach_id, parent_phone, insights["concerns"])
-            if insights.get("followUps"):
-                call_store.create_follow_ups(outreach_id, parent_phone, insights["followUps"])
-            logger.info(
-                f"Fallback analysis complete: {outreach_id} — "
-                f"sentiment={insights.get('parentSentiment')}"
-            )
+        # No-op if the disconnect handler already queued it
+        if await analysis_queue.enqueue(outreach_id, call_context):
+            logger.info(f"Queued fallback post-call analysis for {outreach_id}")
     except Exception as e:
         logger.error(f"Fallback post-call cleanup error: {e}")
 
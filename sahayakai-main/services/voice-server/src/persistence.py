@@ -3,11 +3,42 @@ Transcript persistence — syncs call transcript to SahayakAI backend.
 
 Calls POST /api/attendance/transcript-sync on the Next.js server
 after each conversation turn and on call completion.
+
+Live calls use TranscriptSync, which sends only the turns the backend
+hasn't acknowledged yet (a delta with a per-call sequence number the
+server uses to merge idempotently), coalesces turns that complete in
+quick succession into one request, and reuses one keep-alive HTTP
+client for every call.
 """
 
+import asyncio
+
 import httpx
 from loguru import logger
 
+# Turns completing within this window go out in one request
+_COALESCE_S = 0.3
+
+_client: httpx.AsyncClient | None = None
+
+
+def http_client() -> httpx.AsyncClient:
+    """Process-wide pooled client — keeps the TLS connection to the backend warm."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def sync_transcript(
     api_url: str,
@@ -17,7 +48,7 @@ async def sync_transcript(
     turn_count: int,
     call_status: str | None = None,
 ):
-    """Push transcript update to the SahayakAI backend."""
+    """Push the full transcript to the SahayakAI backend."""
     if not api_url or not internal_key:
         logger.warning("Transcript sync skipped — API URL or key not configured")
         return
@@ -31,12 +62,11 @@ async def sync_transcript(
         body["callStatus"] = call_status
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                f"{api_url}/api/attendance/transcript-sync",
-                json=body,
-                headers={"x-internal-key": internal_key},
-            )
+        resp = await http_client().post(
+            f"{api_url}/api/attendance/transcript-sync",
+            json=body,
+            headers={"x-internal-key": internal_key},
+        )
 
         if resp.status_code == 200:
             logger.debug(f"Transcript synced: turn {turn_count}")
@@ -47,6 +77,127 @@ async def sync_transcript(
         logger.error(f"Transcript sync error: {e}")
 
 
+class TranscriptSync:
+    """Incremental transcript sync for one call.
+
+    push() records the latest transcript and returns at once; a single
+    background sender per call posts what the backend hasn't acknowledged:
+
+      {outreachId, turns, fromTurn, seq, turnCount, callStatus?}
+
+    `seq` increases with every request, so the server can drop a retried
+    or reordered delta. A failed request leaves the acknowledged position
+    where it was and the next push resends from there. If the server
+    reports a gap (409), the full transcript is sent instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_url: str,
+        internal_key: str,
+        outreach_id: str,
+        coalesce_s: float = _COALESCE_S,
+    ):
+        self._api_url = api_url
+        self._internal_key = internal_key
+        self._outreach_id = outreach_id
+        self._coalesce_s = coalesce_s
+        self._transcript: list[dict] = []
+        self._turn_count = 0
+        self._acked = 0              # turns the backend has stored
+        self._seq = 0
+        self._full_resync = False
+        self._sender: asyncio.Task | None = None
+        self.requests = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._api_url and self._internal_key)
+
+    def push(self, transcript: list[dict], turn_count: int) -> None:
+        """Record the latest transcript; a background task sends the delta."""
+        self._transcript = transcript
+        self._turn_count = turn_count
+        if not self.enabled:
+            return
+        if self._sender is None or self._sender.done():
+            self._sender = asyncio.create_task(self._drain())
+
+    async def finish(
+        self, transcript: list[dict], turn_count: int, call_status: str,
+    ) -> bool:
+        """Send the remaining turns plus the terminal status; waits for the
+        backend. True once it has the complete call, which the caller can
+        then mark synced locally."""
+        self._transcript = transcript
+        self._turn_count = turn_count
+        if not self.enabled:
+            logger.warning("Transcript sync skipped — API URL or key not configured")
+            return False
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except (asyncio.CancelledError, Exception):
+                pass
+        return await self._send(call_status=call_status)
+
+    async def _drain(self) -> None:
+        # Let turns that finish close together share a request
+        await asyncio.sleep(self._coalesce_s)
+        while self._acked < len(self._transcript):
+            if not await self._send():
+                return  # next push retries from the acked position
+
+    async def _send(self, call_status: str | None = None) -> bool:
+        # The transcript may keep growing while the request is in flight;
+        # only what's sliced here counts as acked
+        transcript = self._transcript
+        upto = len(transcript)
+        self._seq += 1
+        body: dict = {
+            "outreachId": self._outreach_id,
+            "seq": self._seq,
+            "turnCount": self._turn_count,
+        }
+        if self._full_resync:
+            body["transcript"] = transcript[:upto]
+        else:
+            body["fromTurn"] = self._acked
+            body["turns"] = transcript[self._acked:upto]
+        if call_status:
+            body["callStatus"] = call_status
+
+        self.requests += 1
+        try:
+            resp = await http_client().post(
+                f"{self._api_url}/api/attendance/transcript-sync",
+                json=body,
+                headers={"x-internal-key": self._internal_key},
+            )
+        except Exception as e:
+            logger.error(f"Transcript sync error: {e}")
+            return False
+
+        if resp.status_code == 200:
+            self._acked = upto
+            self._full_resync = False
+            logger.debug(
+                f"Transcript synced: {self._outreach_id} seq={self._seq} "
+                f"turns={upto}"
+            )
+            return True
+        if resp.status_code == 409:
+            # Backend is missing earlier turns — resend everything
+            logger.warning(f"Transcript sync gap for {self._outreach_id} — full resync")
+            self._full_resync = True
+            self._acked = 0
+            return call_status is None or await self._send(call_status=call_status)
+        logger.error(f"Transcript sync failed: {resp.status_code} {resp.text[:200]}")
+        return False
+
+
 async def fetch_call_context(
     api_url: str,
     internal_key: str,
@@ -58,12 +209,11 @@ async def fetch_call_context(
     authenticated via x-internal-key, returns full call context).
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                f"{api_url}/api/attendance/call-context",
-                params={"outreachId": outreach_id},
-                headers={"x-internal-key": internal_key},
-            )
+        resp = await http_client().get(
+            f"{api_url}/api/attendance/call-context",
+            params={"outreachId": outreach_id},
+            headers={"x-internal-key": internal_key},
+        )
 
         if resp.status_code == 200:
             return resp.json()
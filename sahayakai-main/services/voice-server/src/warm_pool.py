@@ -0,0 +1,169 @@
+"""
+Warm pool of per-call audio resources.
+
+Every call needs its own Silero VAD analyzer (ONNX model session + VAD
+state) and RNNoise filter. Building them loads model weights, which used
+to happen inside create_bot while the parent listened to dead air.
+
+The pool keeps a few fully built sets ready. Checkout is a list pop; a
+background task builds replacements in a worker thread so model loading
+never runs on the event loop. Sets are single-use (VAD/denoise state is
+per call) — nothing is returned to the pool.
+
+Pool size follows the recent call rate: it aims to hold as many sets as
+calls started in the last WARM_POOL_WINDOW_S seconds, clamped to
+[WARM_POOL_MIN, WARM_POOL_MAX], so a school-hour burst finds sets ready
+while a quiet night holds only the minimum.
+
+Sarvam STT/TTS sockets are not pooled: Pipecat opens them when the
+pipeline starts, bound to that pipeline, so they can't be pre-opened and
+handed over.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from loguru import logger
+from pipecat.audio.filters.rnnoise_filter import RNNoiseFilter
+from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADParams
+
+_MIN_SIZE = int(os.environ.get("WARM_POOL_MIN", "2"))
+_MAX_SIZE = int(os.environ.get("WARM_POOL_MAX", "8"))
+_RATE_WINDOW_S = float(os.environ.get("WARM_POOL_WINDOW_S", "60"))
+
+# Idle pools re-check their target this often (lets a post-burst pool shrink)
+_RECHECK_S = 10.0
+
+
+@dataclass
+class CallResources:
+    """Audio-input resources for one call, ready to attach to the transport."""
+    vad_analyzer: SileroVADAnalyzer
+    audio_filter: RNNoiseFilter
+    warm: bool = True          # False if built on demand at checkout
+    build_ms: int = 0
+
+
+def build_call_resources() -> CallResources:
+    """Build one resource set. Blocking (loads model weights) — run in a thread."""
+    started = time.monotonic()
+    vad = SileroVADAnalyzer(
+        params=VADParams(
+            min_volume=0.6,  # Filter phone echo (echo is lower amplitude)
+            start_secs=0.3,  # 300ms sustained speech to trigger (filters echo bursts)
+            stop_secs=0.5,  # 0.5s silence → end of turn
+        ),
+    )
+    audio_filter = RNNoiseFilter()  # Denoise phone audio — reduces echo/background noise
+    return CallResources(
+        vad_analyzer=vad,
+        audio_filter=audio_filter,
+        build_ms=int((time.monotonic() - started) * 1000),
+    )
+
+
+class WarmPool:
+    """Pre-built CallResources, sized by recent call rate."""
+
+    def __init__(
+        self,
+        *,
+        min_size: int = _MIN_SIZE,
+        max_size: int = _MAX_SIZE,
+        window_s: float = _RATE_WINDOW_S,
+    ):
+        self._min = max(min_size, 0)
+        self._max = max(max_size, self._min)
+        self._window_s = window_s
+        self._ready: deque[CallResources] = deque()
+        self._checkouts: deque[float] = deque()   # monotonic checkout times
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        # Counters since process start
+        self.hits = 0
+        self.misses = 0
+        self.built = 0
+        self.build_errors = 0
+        self.last_build_ms = 0
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._refill(), name="warm-pool-refill")
+        logger.info(f"Warm pool started — target {self.target_size()} sets")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._ready.clear()
+
+    # ── Checkout ─────────────────────────────────────────────────────────────
+
+    async def checkout(self) -> CallResources:
+        """A ready resource set, or one built now (off-loop) if the pool is empty."""
+        self._checkouts.append(time.monotonic())
+        self._wake.set()
+        if self._ready:
+            self.hits += 1
+            return self._ready.popleft()
+
+        self.misses += 1
+        logger.warning("Warm pool empty — building call resources on demand")
+        resources = await asyncio.to_thread(build_call_resources)
+        resources.warm = False
+        return resources
+
+    def target_size(self) -> int:
+        """Calls started within the rate window, clamped to [min, max]."""
+        cutoff = time.monotonic() - self._window_s
+        while self._checkouts and self._checkouts[0] < cutoff:
+            self._checkouts.popleft()
+        return min(self._max, max(self._min, len(self._checkouts)))
+
+    def stats(self) -> dict:
+        return {
+            "ready": len(self._ready),
+            "target": self.target_size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "built": self.built,
+            "build_errors": self.build_errors,
+            "last_build_ms": self.last_build_ms,
+        }
+
+    # ── Refill ───────────────────────────────────────────────────────────────
+
+    async def _refill(self) -> None:
+        while True:
+            target = self.target_size()
+            # Shrink lazily after a burst — drop surplus sets
+            while len(self._ready) > target:
+                self._ready.pop()
+
+            if len(self._ready) < target:
+                try:
+                    resources = await asyncio.to_thread(build_call_resources)
+                except Exception as e:
+                    self.build_errors += 1
+                    logger.error(f"Warm pool build failed: {e}")
+                    await asyncio.sleep(_RECHECK_S)
+                    continue
+                self._ready.append(resources)
+                self.built += 1
+                self.last_build_ms = resources.build_ms
+                continue
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=_RECHECK_S)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,82 @@
+"""CallManager transcript (src/call_manager.py).
+
+- the greeting seeded into the context is transcript entry 0,
+- each turn adds the parent's message and the truncated agent reply,
+  with phase guidance left out,
+- a parent utterance after the last reply is picked up at call end.
+"""
+
+import asyncio
+
+from pipecat.frames.frames import (
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+
+from src.call_manager import CallManager
+from src.conversation_state import PHASE_INSTRUCTION_PREFIX
+
+GREETING = "नमस्ते जी, मैं आरव की कक्षा अध्यापिका बोल रही हूँ।"
+
+
+class _Context:
+    """The slice of LLMContext CallManager uses."""
+
+    def __init__(self, messages: list[dict]):
+        self.messages = messages
+
+    def get_messages(self) -> list[dict]:
+        return self.messages
+
+    def add_message(self, message: dict) -> None:
+        self.messages.append(message)
+
+
+def _manager() -> tuple[CallManager, _Context]:
+    context = _Context([{"role": "assistant", "content": GREETING}])
+    return CallManager(context=context, call_context={}), context
+
+
+async def _turn(manager: CallManager, context: _Context, said: str, reply: str) -> None:
+    context.add_message({"role": "user", "content": said})
+    context.add_message({"role": "user", "content": f"{PHASE_INSTRUCTION_PREFIX}: explore]"})
+    for frame in (
+        LLMFullResponseStartFrame(),
+        LLMTextFrame(text=reply),
+        LLMFullResponseEndFrame(),
+    ):
+        await manager.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+
+def test_greeting_is_the_first_entry() -> None:
+    manager, _ = _manager()
+    assert manager.transcript == [{"role": "agent", "text": GREETING}]
+
+
+def test_turns_follow_the_greeting() -> None:
+    manager, context = _manager()
+
+    async def run() -> None:
+        await _turn(manager, context, "हाँ जी बोलिए", "आरव तीन दिन से स्कूल नहीं आया। क्या सब ठीक है?")
+        await _turn(manager, context, "उसे बुखार था", "ओह, अब वह कैसा है?")
+
+    asyncio.run(run())
+    assert manager.transcript == [
+        {"role": "agent", "text": GREETING},
+        {"role": "parent", "text": "हाँ जी बोलिए"},
+        {"role": "agent", "text": "आरव तीन दिन से स्कूल नहीं आया।"},
+        {"role": "parent", "text": "उसे बुखार था"},
+        {"role": "agent", "text": "ओह, अब वह कैसा है?"},
+    ]
+    assert manager.turns_since(3) == manager.transcript[3:]
+
+
+def test_trailing_parent_turn_is_kept_at_call_end() -> None:
+    manager, context = _manager()
+    asyncio.run(_turn(manager, context, "हाँ जी", "आरव के बारे में बात करनी थी।"))
+    context.add_message({"role": "user", "content": "ठीक है, धन्यवाद"})
+    transcript = manager.finish_transcript()
+    assert transcript[0] == {"role": "agent", "text": GREETING}
+    assert transcript[-1] == {"role": "parent", "text": "ठीक है, धन्यवाद"}
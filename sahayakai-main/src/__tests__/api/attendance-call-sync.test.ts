@@ -0,0 +1,169 @@
+/**
+ * POST /api/attendance/call-sync — bulk push from the voice server's
+ * local store.
+ *
+ * Covers:
+ * - Existence is checked with one getAll(); missing records come back as
+ *   not_found without failing the rest.
+ * - Updates are committed in batches of at most 500 writes.
+ * - turnCount is derived from the transcript, as in transcript-sync.
+ * - Transcripts merge by seq; a call the live sync already finished is
+ *   acknowledged without a write.
+ * - Written calls that end up completed get a summary through the same
+ *   claim lock as transcript-sync.
+ */
+
+const INTERNAL_KEY = 'test-internal-key-1234567890';
+process.env.VOICE_PIPELINE_INTERNAL_KEY = INTERNAL_KEY;
+
+// In-memory fake parent_outreach collection
+let docs: Record<string, Record<string, any>> = {};
+let getAllCalls = 0;
+const commits: number[] = [];
+let summarised: string[] = [];
+
+jest.mock('@/ai/flows/parent-call-agent', () => ({
+    generateCallSummary: jest.fn(async (input: { callSid: string }) => {
+        summarised.push(input.callSid);
+        return { callQuality: 'good', parentSentiment: 'positive' };
+    }),
+}));
+
+jest.mock('@/lib/firebase-admin', () => ({
+    getDb: async () => ({
+        collection: () => ({
+            doc: (id: string) => ({
+                id,
+                update: async (u: Record<string, any>) => { Object.assign(docs[id], u); },
+            }),
+        }),
+        runTransaction: async (fn: (tx: any) => Promise<any>) => fn({
+            get: async (ref: { id: string }) => ({ exists: ref.id in docs, data: () => ({ ...docs[ref.id] }) }),
+            update: (ref: { id: string }, u: Record<string, any>) => { Object.assign(docs[ref.id], u); },
+        }),
+        getAll: async (...refs: { id: string }[]) => {
+            getAllCalls++;
+            return refs.map(r => ({ id: r.id, exists: r.id in docs, data: () => docs[r.id] }));
+        },
+        batch: () => {
+            const ops: [string, Record<string, any>][] = [];
+            return {
+                update: (ref: { id: string }, u: Record<string, any>) => { ops.push([ref.id, u]); },
+                commit: async () => {
+                    commits.push(ops.length);
+                    ops.forEach(([id, u]) => Object.assign(docs[id], u));
+                },
+            };
+        },
+    }),
+}));
+
+function makeRequest(body: any, key = INTERNAL_KEY) {
+    const headers = new Map<string, string>([['x-internal-key', key]]);
+    return {
+        json: async () => body,
+        headers: { get: (k: string) => headers.get(k) ?? null },
+    } as unknown as Request;
+}
+
+const transcript = [
+    { seq: 0, role: 'agent', text: 'hi' },
+    { seq: 1, role: 'parent', text: 'hello' },
+];
+
+describe('POST /api/attendance/call-sync', () => {
+    let POST: (req: Request) => Promise<Response>;
+
+    beforeAll(async () => {
+        const mod = await import('@/app/api/attendance/call-sync/route');
+        POST = mod.POST as any;
+    });
+
+    beforeEach(() => {
+        docs = {};
+        getAllCalls = 0;
+        commits.length = 0;
+        summarised = [];
+    });
+
+    it('rejects a wrong internal key', async () => {
+        const res = await POST(makeRequest({ calls: [] }, 'wrong-key-wrong-key-wrong-k'));
+        expect(res.status).toBe(401);
+    });
+
+    it('updates existing records and reports missing ones', async () => {
+        docs['o1'] = { callStatus: 'in-progress' };
+        const res = await POST(makeRequest({
+            calls: [
+                { outreachId: 'o1', transcript, callStatus: 'completed', callSid: 'CA1' },
+                { outreachId: 'missing', transcript },
+            ],
+        }));
+        expect(res.status).toBe(200);
+        const { results } = await res.json();
+        expect(results).toEqual([
+            { outreachId: 'o1', status: 'synced' },
+            { outreachId: 'missing', status: 'not_found' },
+        ]);
+        expect(getAllCalls).toBe(1);
+        expect(docs['o1']).toMatchObject({ callStatus: 'completed', callSid: 'CA1', turnCount: 2 });
+        expect(docs['o1'].transcript).toEqual([
+            { role: 'agent', text: 'hi' },
+            { role: 'parent', text: 'hello' },
+        ]);
+    });
+
+    it('keeps turns the live sync stored and adds only missing seqs', async () => {
+        const live = { role: 'agent', text: 'hi', timestamp: '2026-01-01T00:00:00Z' };
+        docs['o1'] = { callStatus: 'in-progress', transcript: [live] };
+        const res = await POST(makeRequest({
+            calls: [{ outreachId: 'o1', transcript: [transcript[1], transcript[0]], callStatus: 'completed' }],
+        }));
+        expect(res.status).toBe(200);
+        expect(docs['o1'].transcript).toEqual([live, { role: 'parent', text: 'hello' }]);
+        expect(docs['o1'].turnCount).toBe(2);
+    });
+
+    it('acknowledges a call the live sync already finished without writing', async () => {
+        const stored = [{ role: 'agent', text: 'hi' }, { role: 'parent', text: 'hello' }];
+        docs['o1'] = { callStatus: 'completed', transcript: stored, transcriptSeq: 4 };
+        const res = await POST(makeRequest({ calls: [{ outreachId: 'o1', transcript }] }));
+        const { results } = await res.json();
+        expect(results).toEqual([{ outreachId: 'o1', status: 'synced' }]);
+        expect(commits).toEqual([]);
+        expect(docs['o1'].transcript).toBe(stored);
+    });
+
+    it('commits in batches of at most 500 writes', async () => {
+        const calls = Array.from({ length: 500 }, (_, i) => ({ outreachId: `o${i}`, transcript }));
+        calls.forEach(c => { docs[c.outreachId] = {}; });
+        const res = await POST(makeRequest({ calls }));
+        expect(res.status).toBe(200);
+        expect(commits).toEqual([500]);
+
+        const tooMany = Array.from({ length: 501 }, (_, i) => ({ outreachId: `x${i}`, transcript }));
+        expect((await POST(makeRequest({ calls: tooMany }))).status).toBe(413);
+    });
+
+    it('generates a summary for completed calls it writes', async () => {
+        docs['o1'] = { callStatus: 'in-progress', callSid: 'CA1' };
+        docs['o2'] = { callStatus: 'in-progress', callSid: 'CA2' };
+        docs['o3'] = { callStatus: 'completed', callSid: 'CA3', transcript: [transcript[0]] };
+        await POST(makeRequest({
+            calls: [
+                { outreachId: 'o1', transcript, callStatus: 'completed' },
+                { outreachId: 'o2', transcript: [transcript[0]], callStatus: 'completed' },
+                { outreachId: 'o3', transcript },
+            ],
+        }));
+        await new Promise(resolve => setImmediate(resolve));
+        // o2 has a single turn — nothing to summarise
+        expect(summarised.sort()).toEqual(['CA1', 'CA3']);
+        expect(docs['o1']).toMatchObject({ _summaryGenerating: false, callSummary: { callQuality: 'good' } });
+    });
+
+    it('rejects calls without a transcript', async () => {
+        const res = await POST(makeRequest({ calls: [{ outreachId: 'o1' }] }));
+        expect(res.status).toBe(400);
+    });
+});
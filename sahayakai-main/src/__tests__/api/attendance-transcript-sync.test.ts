@@ -5,6 +5,7 @@
  * - F9-002: concurrent terminal syncs must result in only one LLM summary
  *   generation. Lock is claimed via Firestore transaction.
  * - F9-007: server overrides client-supplied turnCount with transcript.length.
+ * - Delta sync: turns merged from `fromTurn`, stale `seq` ignored, gaps → 409.
  */
 
 // Make crypto.timingSafeEqual work with stable inputs by stubbing a fixed key.
@@ -151,4 +152,50 @@ describe('POST /api/attendance/transcript-sync — F9 fixes', () => {
 
         expect(llmCallCount).toBe(1);
     });
+
+    describe('delta sync', () => {
+        const turn = (i: number) => ({ role: i % 2 ? 'parent' : 'agent', text: `t${i}` });
+
+        it('merges turns from fromTurn and tracks seq', async () => {
+            outreachDoc.transcript = [turn(0), turn(1)];
+            const res = await POST(makeRequest({
+                outreachId: 'outreach-1',
+                fromTurn: 2,
+                turns: [turn(2), turn(3)],
+                seq: 1,
+                turnCount: 2,
+            }));
+            expect(res.status).toBe(200);
+            expect(outreachDoc.transcript).toEqual([turn(0), turn(1), turn(2), turn(3)]);
+            expect(outreachDoc.turnCount).toBe(4);
+            expect(outreachDoc.transcriptSeq).toBe(1);
+        });
+
+        it('ignores a retried delta with an old seq', async () => {
+            outreachDoc.transcript = [turn(0), turn(1), turn(2)];
+            outreachDoc.transcriptSeq = 5;
+            const res = await POST(makeRequest({
+                outreachId: 'outreach-1',
+                fromTurn: 1,
+                turns: [{ role: 'parent', text: 'stale' }],
+                seq: 4,
+                turnCount: 2,
+            }));
+            expect(res.status).toBe(200);
+            expect(outreachDoc.transcript).toEqual([turn(0), turn(1), turn(2)]);
+        });
+
+        it('rejects a delta that starts past the stored transcript', async () => {
+            outreachDoc.transcript = [turn(0)];
+            const res = await POST(makeRequest({
+                outreachId: 'outreach-1',
+                fromTurn: 3,
+                turns: [turn(3)],
+                seq: 1,
+                turnCount: 4,
+            }));
+            expect(res.status).toBe(409);
+            expect(outreachDoc.transcript).toEqual([turn(0)]);
+        });
+    });
 });
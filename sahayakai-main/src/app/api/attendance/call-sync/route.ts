@@ -0,0 +1,168 @@
+/**
+ * Internal API: Bulk Call Sync
+ *
+ * Called by the voice server's sync engine to push completed calls from
+ * its local store — typically the backlog a voice node built up while
+ * the backend was unreachable. Live calls keep using transcript-sync.
+ *
+ * Auth: X-Internal-Key header (service-to-service, not user auth)
+ *
+ * POST /api/attendance/call-sync
+ * Body:     { calls: [{ outreachId, transcript: [{ seq, role, text }], callStatus?, callSid?, callDurationSeconds? }] }
+ * Response: { results: [{ outreachId, status: 'synced' | 'not_found' }] }
+ *
+ * One getAll() round trip reads the outreach records, then the updates go
+ * out as batched writes of up to 500 ops (Firestore's per-batch limit). A
+ * missing record is reported per call instead of failing the batch.
+ *
+ * Transcripts merge by seq (a turn's 0-based position): turns the record
+ * already holds — typically from the live transcript-sync — are kept and
+ * only the missing ones are added. A call the live sync already finished
+ * (terminal status, nothing missing) is acknowledged without a write.
+ * Retries are safe either way.
+ *
+ * Written calls that end up completed with more than one turn get their
+ * post-call summary the same way transcript-sync does (shared claim lock).
+ */
+
+import { NextRequest, NextResponse } from 'next/server';
+import { getDb } from '@/lib/firebase-admin';
+import { timingSafeEqual } from 'crypto';
+import type { TranscriptTurn } from '@/types/attendance';
+import { logger } from '@/lib/logger';
+import { claimAndGenerateCallSummary } from '@/lib/parent-call-summary';
+
+// Firestore caps a write batch at 500 operations; one call = one update.
+const BATCH_LIMIT = 500;
+// Largest request the voice server may send (it adapts below this).
+const MAX_CALLS = 500;
+
+function safeCompare(a: string, b: string): boolean {
+    if (a.length !== b.length) return false;
+    return timingSafeEqual(Buffer.from(a), Buffer.from(b));
+}
+
+interface SyncedTurn extends Omit<TranscriptTurn, 'timestamp'> {
+    seq?: number;
+    timestamp?: string;
+}
+
+interface SyncedCall {
+    outreachId: string;
+    transcript: SyncedTurn[];
+    callStatus?: 'completed' | 'failed';
+    callSid?: string;
+    callDurationSeconds?: number;
+}
+
+/** Stored turns plus the incoming turns at positions the record lacks. */
+function mergeBySeq(stored: TranscriptTurn[], incoming: SyncedTurn[]): TranscriptTurn[] {
+    const merged: (TranscriptTurn | undefined)[] = [...stored];
+    incoming.forEach((turn, i) => {
+        const { seq = i, ...fields } = turn;
+        if (merged[seq] === undefined) merged[seq] = fields as TranscriptTurn;
+    });
+    return merged.filter((t): t is TranscriptTurn => t !== undefined);
+}
+
+export async function POST(req: NextRequest) {
+    const internalKey = process.env.VOICE_PIPELINE_INTERNAL_KEY;
+    if (!internalKey) {
+        return NextResponse.json({ error: 'Pipeline not configured' }, { status: 503 });
+    }
+
+    const providedKey = req.headers.get('x-internal-key') || '';
+    if (!safeCompare(providedKey, internalKey)) {
+        return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+
+    try {
+        const body: { calls?: SyncedCall[] } = await req.json();
+        const calls = body.calls;
+        if (!Array.isArray(calls) || calls.some(c => !c?.outreachId || !Array.isArray(c.transcript))) {
+            return NextResponse.json({ error: 'Expected calls[] with outreachId and transcript' }, { status: 400 });
+        }
+        if (calls.length > MAX_CALLS) {
+            return NextResponse.json({ error: `At most ${MAX_CALLS} calls per request` }, { status: 413 });
+        }
+        if (calls.length === 0) {
+            return NextResponse.json({ results: [] });
+        }
+
+        const db = await getDb();
+        const collection = db.collection('parent_outreach');
+        const refs = calls.map(c => collection.doc(c.outreachId));
+        const snaps = await db.getAll(...refs);
+
+        const now = new Date().toISOString();
+        const results: { outreachId: string; status: 'synced' | 'not_found' }[] = [];
+        const writes: {
+            ref: (typeof refs)[number];
+            update: Record<string, unknown>;
+            data: FirebaseFirestore.DocumentData;
+            transcript: TranscriptTurn[];
+        }[] = [];
+
+        let alreadyFinal = 0;
+        calls.forEach((call, i) => {
+            if (!snaps[i].exists) {
+                results.push({ outreachId: call.outreachId, status: 'not_found' });
+                return;
+            }
+            const data = snaps[i].data() ?? {};
+            const stored: TranscriptTurn[] = data.transcript ?? [];
+            const transcript = mergeBySeq(stored, call.transcript);
+            const isTerminal = data.callStatus === 'completed' || data.callStatus === 'failed';
+            if (isTerminal && transcript.length === stored.length) {
+                // The live sync already delivered the whole call
+                alreadyFinal++;
+                results.push({ outreachId: call.outreachId, status: 'synced' });
+                return;
+            }
+            // Same server-derived turnCount rule as transcript-sync (F9-007)
+            const update: Record<string, unknown> = {
+                transcript,
+                turnCount: transcript.length,
+                voicePipelineMode: 'streaming',
+                updatedAt: now,
+            };
+            if (call.callStatus) update.callStatus = call.callStatus;
+            if (call.callSid) update.callSid = call.callSid;
+            if (typeof call.callDurationSeconds === 'number') {
+                update.callDurationSeconds = call.callDurationSeconds;
+            }
+            writes.push({ ref: refs[i], update, data, transcript });
+            results.push({ outreachId: call.outreachId, status: 'synced' });
+        });
+
+        for (let i = 0; i < writes.length; i += BATCH_LIMIT) {
+            const batch = db.batch();
+            writes.slice(i, i + BATCH_LIMIT).forEach(w => batch.update(w.ref, w.update));
+            await batch.commit();
+        }
+
+        // Backlog calls never went through transcript-sync's terminal path.
+        // The transcripts are already committed, so a failed claim is logged
+        // rather than failing the batch (twiml-status can still claim it).
+        const claims = await Promise.allSettled(
+            writes
+                .filter(w => (w.update.callStatus ?? w.data.callStatus) === 'completed'
+                    && w.transcript.length > 1)
+                .map(w => claimAndGenerateCallSummary(db, w.ref, w.data, w.transcript, 'call-sync')),
+        );
+        claims.forEach(c => {
+            if (c.status === 'rejected') console.error('[call-sync] Summary claim failed:', c.reason);
+        });
+
+        const notFound = calls.length - writes.length - alreadyFinal;
+        logger.info(`Bulk call sync: ${writes.length} synced, ${alreadyFinal} already final, ${notFound} not found`, 'call-sync', {
+            synced: writes.length,
+            alreadyFinal,
+            notFound,
+        });
+        return NextResponse.json({ results });
+    } catch (error) {
+        console.error('[call-sync] Error:', error);
+        return NextResponse.json({ error: 'Internal error' }, { status: 500 });
+    }
+}
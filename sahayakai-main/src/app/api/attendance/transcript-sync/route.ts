@@ -8,15 +8,20 @@
  * Auth: X-Internal-Key header (service-to-service, not user auth)
  *
  * POST /api/attendance/transcript-sync
- * Body: { outreachId, transcript, turnCount, callStatus? }
+ * Body (full):  { outreachId, transcript, turnCount, seq?, callStatus? }
+ * Body (delta): { outreachId, turns, fromTurn, seq, turnCount, callStatus? }
+ *
+ * Delta mode sends only the turns from index `fromTurn` on. They are
+ * merged in a transaction; `seq` (per call, increasing) makes retried or
+ * reordered requests no-ops. A delta that starts past the stored
+ * transcript gets 409 — the orchestrator then resends the full transcript.
  */
 
 import { NextRequest, NextResponse } from 'next/server';
 import { getDb } from '@/lib/firebase-admin';
-import { generateCallSummary } from '@/ai/flows/parent-call-agent';
+import { claimAndGenerateCallSummary } from '@/lib/parent-call-summary';
 import { timingSafeEqual } from 'crypto';
 import type { TranscriptTurn } from '@/types/attendance';
-import { logger } from '@/lib/logger';
 
 function safeCompare(a: string, b: string): boolean {
     if (a.length !== b.length) return false;
@@ -25,7 +30,10 @@ function safeCompare(a: string, b: string): boolean {
 
 interface TranscriptSyncBody {
     outreachId: string;
-    transcript: TranscriptTurn[];
+    transcript?: TranscriptTurn[];
+    turns?: TranscriptTurn[];
+    fromTurn?: number;
+    seq?: number;
     turnCount: number;
     callStatus?: 'completed' | 'failed';
 }
@@ -43,11 +51,15 @@ export async function POST(req: NextRequest) {
 
     try {
         const body: TranscriptSyncBody = await req.json();
-        const { outreachId, transcript, callStatus } = body;
+        const { outreachId, callStatus, seq } = body;
+        const isDelta = Array.isArray(body.turns);
 
-        if (!outreachId || !transcript) {
+        if (!outreachId || (!body.transcript && !isDelta)) {
             return NextResponse.json({ error: 'Missing outreachId or transcript' }, { status: 400 });
         }
+        if (isDelta && (typeof body.fromTurn !== 'number' || body.fromTurn < 0)) {
+            return NextResponse.json({ error: 'Delta sync requires fromTurn' }, { status: 400 });
+        }
 
         const db = await getDb();
         const docRef = db.collection('parent_outreach').doc(outreachId);
@@ -61,75 +73,58 @@ export async function POST(req: NextRequest) {
         // Trusting the client-supplied turnCount lets the orchestrator desync
         // from reality (or a bad actor lie about it). The transcript array is
         // the source of truth — compute the count from it.
-        const serverTurnCount = transcript.length;
-
-        const update: Record<string, unknown> = {
-            transcript,
-            turnCount: serverTurnCount,
-            updatedAt: new Date().toISOString(),
-        };
+        let transcript: TranscriptTurn[];
 
-        if (callStatus) {
-            update.callStatus = callStatus;
+        if (isDelta) {
+            const fromTurn = body.fromTurn!;
+            const merged = await db.runTransaction(async (tx) => {
+                const fresh = await tx.get(docRef);
+                const fd = fresh.data() ?? {};
+                const stored: TranscriptTurn[] = fd.transcript ?? [];
+                if (typeof seq === 'number' && typeof fd.transcriptSeq === 'number'
+                    && seq <= fd.transcriptSeq) {
+                    return stored;                          // duplicate / stale delta
+                }
+                if (fromTurn > stored.length) return null;  // gap — need full resync
+                const next = stored.slice(0, fromTurn).concat(body.turns!);
+                const update: Record<string, unknown> = {
+                    transcript: next,
+                    turnCount: next.length,
+                    updatedAt: new Date().toISOString(),
+                };
+                if (typeof seq === 'number') update.transcriptSeq = seq;
+                if (callStatus) update.callStatus = callStatus;
+                tx.update(docRef, update);
+                return next;
+            });
+            if (!merged) {
+                return NextResponse.json({ error: 'Transcript gap — resend full transcript' }, { status: 409 });
+            }
+            transcript = merged;
+        } else {
+            transcript = body.transcript!;
+            const update: Record<string, unknown> = {
+                transcript,
+                turnCount: transcript.length,
+                updatedAt: new Date().toISOString(),
+            };
+            if (typeof seq === 'number') update.transcriptSeq = seq;
+            if (callStatus) {
+                update.callStatus = callStatus;
+            }
+            await docRef.update(update);
         }
 
-        await docRef.update(update);
-
         // ── F9-002 fix: atomic summary-generation lock ────────────────────
         // Both this route AND twiml-status call generateCallSummary on terminal
-        // states. Without a lock, two concurrent terminal webhooks each read
-        // `!callSummary` (true) before either has written, and BOTH invoke the
-        // LLM. We use a transaction to claim the `_summaryGenerating` flag —
-        // whichever request claims it first runs the LLM call; the other
-        // request bails out cleanly.
+        // states; the shared helper claims `_summaryGenerating` in a
+        // transaction so only one request runs the LLM.
         const data = doc.data()!;
         const mergedStatus = callStatus ?? data.callStatus;
         const isTerminal = mergedStatus === 'completed' || mergedStatus === 'failed';
 
         if (isTerminal && transcript.length > 1) {
-            const claimed = await db.runTransaction(async (tx) => {
-                const fresh = await tx.get(docRef);
-                if (!fresh.exists) return false;
-                const fd = fresh.data()!;
-                if (fd.callSummary) return false;            // already generated
-                if (fd._summaryGenerating) return false;     // another request is generating
-                tx.update(docRef, {
-                    _summaryGenerating: true,
-                    _summaryGeneratingAt: new Date().toISOString(),
-                });
-                return true;
-            });
-
-            if (claimed) {
-                // Parent-call schema requires 2-letter ISO (en/hi/bn/...).
-                const { LANGUAGE_TO_ISO } = await import('@/types/index');
-                const parentLanguageIso = (LANGUAGE_TO_ISO as Record<string, string>)[
-                    data.parentLanguage ?? 'Hindi'
-                ] ?? 'hi';
-                generateCallSummary({
-                    studentName: data.studentName ?? '',
-                    className: data.className ?? '',
-                    subject: data.subject ?? '',
-                    reason: data.reason ?? '',
-                    teacherMessage: data.generatedMessage ?? '',
-                    teacherName: data.teacherName,
-                    schoolName: data.schoolName,
-                    parentLanguage: parentLanguageIso as 'en' | 'hi' | 'kn' | 'ta' | 'te' | 'mr' | 'bn' | 'gu' | 'pa' | 'ml' | 'or',
-                    callSid: data.callSid ?? doc.id,
-                    transcript: transcript.map(t => ({ role: t.role, text: t.text })),
-                }).then(async (summary) => {
-                    await docRef.update({
-                        callSummary: summary,
-                        _summaryGenerating: false,
-                        updatedAt: new Date().toISOString(),
-                    });
-                    logger.info(`Summary generated for ${outreachId}`, 'transcript-sync', { outreachId });
-                }).catch(async (err) => {
-                    console.error(`[transcript-sync] Summary generation failed for ${outreachId}:`, err);
-                    // Release lock on failure so a future retry/twiml-status can claim it.
-                    await docRef.update({ _summaryGenerating: false }).catch(() => {});
-                });
-            }
+            await claimAndGenerateCallSummary(db, docRef, data, transcript, 'transcript-sync');
         }
 
         return NextResponse.json({ ok: true });
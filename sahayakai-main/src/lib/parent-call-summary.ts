@@ -0,0 +1,78 @@
+/**
+ * Post-call summary for a parent_outreach record.
+ *
+ * Shared by the internal routes that write a call's final transcript:
+ * transcript-sync (live calls) and call-sync (backlog drained from a
+ * voice node's local store).
+ *
+ * F9-002: twiml-status and these routes can all see the same terminal
+ * call at once. Without a lock, each reads `!callSummary` before any has
+ * written and they all invoke the LLM. A transaction claims the
+ * `_summaryGenerating` flag; whichever request claims it runs the LLM
+ * call, the others bail out. A failed generation releases the claim so a
+ * later retry (or twiml-status) can take it.
+ */
+
+import { generateCallSummary } from '@/ai/flows/parent-call-agent';
+import type { TranscriptTurn } from '@/types/attendance';
+import { logger } from '@/lib/logger';
+
+type ParentLanguageIso = 'en' | 'hi' | 'kn' | 'ta' | 'te' | 'mr' | 'bn' | 'gu' | 'pa' | 'ml' | 'or';
+
+/**
+ * Claim the summary lock for `docRef` and, if claimed, generate the
+ * summary in the background. `data` is the record as read before the
+ * transcript write; `source` tags the log lines. Resolves to whether this
+ * request claimed the lock.
+ */
+export async function claimAndGenerateCallSummary(
+    db: FirebaseFirestore.Firestore,
+    docRef: FirebaseFirestore.DocumentReference,
+    data: FirebaseFirestore.DocumentData,
+    transcript: TranscriptTurn[],
+    source: string,
+): Promise<boolean> {
+    const claimed = await db.runTransaction(async (tx) => {
+        const fresh = await tx.get(docRef);
+        if (!fresh.exists) return false;
+        const fd = fresh.data()!;
+        if (fd.callSummary) return false;            // already generated
+        if (fd._summaryGenerating) return false;     // another request is generating
+        tx.update(docRef, {
+            _summaryGenerating: true,
+            _summaryGeneratingAt: new Date().toISOString(),
+        });
+        return true;
+    });
+    if (!claimed) return false;
+
+    // Parent-call schema requires 2-letter ISO (en/hi/bn/...).
+    const { LANGUAGE_TO_ISO } = await import('@/types/index');
+    const parentLanguageIso = (LANGUAGE_TO_ISO as Record<string, string>)[
+        data.parentLanguage ?? 'Hindi'
+    ] ?? 'hi';
+    generateCallSummary({
+        studentName: data.studentName ?? '',
+        className: data.className ?? '',
+        subject: data.subject ?? '',
+        reason: data.reason ?? '',
+        teacherMessage: data.generatedMessage ?? '',
+        teacherName: data.teacherName,
+        schoolName: data.schoolName,
+        parentLanguage: parentLanguageIso as ParentLanguageIso,
+        callSid: data.callSid ?? docRef.id,
+        transcript: transcript.map(t => ({ role: t.role, text: t.text })),
+    }).then(async (summary) => {
+        await docRef.update({
+            callSummary: summary,
+            _summaryGenerating: false,
+            updatedAt: new Date().toISOString(),
+        });
+        logger.info(`Summary generated for ${docRef.id}`, source, { outreachId: docRef.id });
+    }).catch(async (err) => {
+        console.error(`[${source}] Summary generation failed for ${docRef.id}:`, err);
+        // Release lock on failure so a future retry/twiml-status can claim it.
+        await docRef.update({ _summaryGenerating: false }).catch(() => {});
+    });
+    return true;
+}
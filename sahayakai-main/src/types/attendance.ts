@@ -127,6 +127,8 @@ export interface ParentOutreach {
     callStatus?: CallStatus;
     // Conversational call fields
     transcript?: TranscriptTurn[];
+    /** Highest transcript-sync sequence number applied (delta sync idempotency) */
+    transcriptSeq?: number;
     callSummary?: CallSummary;
     answeredBy?: string;
     callDurationSeconds?: number;